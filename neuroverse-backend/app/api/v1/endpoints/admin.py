@@ -8,8 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, desc
 from typing import Optional
 from datetime import datetime, timedelta
+import asyncio
 
 from app.db.database import get_db
+from app.db.loaders import RequestLoaders, get_loaders
 from app.core.security import (
     verify_password, 
     get_password_hash, 
@@ -398,7 +400,8 @@ async def list_tickets(
 async def get_ticket(
     ticket_id: str,
     current_admin: Admin = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: RequestLoaders = Depends(get_loaders)
 ):
     """Get ticket details."""
     result = await db.execute(select(SupportTicket).where(SupportTicket.id == ticket_id))
@@ -416,12 +419,12 @@ async def get_ticket(
     messages = messages_result.scalars().all()
     
     # Get assigned admin name
+    admin_loader = loaders[Admin]
+    admin_loader.prime(current_admin.id, current_admin)
     assigned_admin_name = None
-    if ticket.assigned_to:
-        admin_result = await db.execute(select(Admin).where(Admin.id == ticket.assigned_to))
-        assigned_admin = admin_result.scalar_one_or_none()
-        if assigned_admin:
-            assigned_admin_name = f"{assigned_admin.first_name} {assigned_admin.last_name}"
+    assigned_admin = await admin_loader.load(ticket.assigned_to)
+    if assigned_admin:
+        assigned_admin_name = f"{assigned_admin.first_name} {assigned_admin.last_name}"
     
     return TicketDetail(
         id=ticket.id,
@@ -546,7 +549,8 @@ async def reply_to_ticket(
 async def list_permissions(
     grantee_type: Optional[str] = None,
     current_admin: Admin = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: RequestLoaders = Depends(get_loaders)
 ):
     """List data permissions."""
     if not current_admin.can_manage_permissions:
@@ -560,19 +564,24 @@ async def list_permissions(
     result = await db.execute(query.order_by(desc(DataPermission.granted_at)))
     permissions = result.scalars().all()
     
+    # Resolve grantee and granting admin names in one query each
+    loaders[Admin].prime(current_admin.id, current_admin)
+    doctors, admins = await asyncio.gather(
+        loaders[Doctor].load_many(p.grantee_id for p in permissions if p.grantee_type == "doctor"),
+        loaders[Admin].load_many(p.granted_by for p in permissions),
+    )
+    
     permission_items = []
     for p in permissions:
         # Get grantee name
         grantee_name = "Unknown"
         if p.grantee_type == "doctor":
-            doc_result = await db.execute(select(Doctor).where(Doctor.id == p.grantee_id))
-            doc = doc_result.scalar_one_or_none()
+            doc = doctors.get(loaders[Doctor].key(p.grantee_id))
             if doc:
                 grantee_name = f"Dr. {doc.first_name} {doc.last_name}"
         
         # Get admin name
-        admin_result = await db.execute(select(Admin).where(Admin.id == p.granted_by))
-        granting_admin = admin_result.scalar_one_or_none()
+        granting_admin = admins.get(p.granted_by)
         granted_by_name = f"{granting_admin.first_name} {granting_admin.last_name}" if granting_admin else "System"
         
         permission_items.append(PermissionItem(
@@ -8,9 +8,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, desc
 from typing import Optional, List
 from datetime import datetime, timedelta
+import math
 from app.services.email_service import EmailService
 
 from app.db.database import get_db
+from app.db.loaders import RequestLoaders, get_loaders
+from app.db.queries import (
+    fetch_completed_sessions,
+    fetch_doctor_dashboard_counts,
+    fetch_feature_changes,
+    fetch_high_risk_patients,
+    fetch_recent_patients,
+)
 from app.core.security import (
     verify_password, 
     get_password_hash, 
@@ -24,6 +33,9 @@ from app.models.doctor_model import Doctor, ClinicalNote, PatientAccess, Dataset
 from app.models.user import User
 from app.models.test_session import TestSession
 from app.models.test_result import TestResult
+from app.services.global_importance_service import GlobalImportanceService
+from app.services.longitudinal_service import LongitudinalService
+from app.ml.fusion.scoring_registry import get_scoring_registry
 from app.schemas.doctor_schemas import (
     DoctorLogin,
     DoctorLoginResponse,
@@ -36,6 +48,7 @@ from app.schemas.doctor_schemas import (
     PatientListResponse,
     PatientDetailResponse,
     TestSessionSummary,
+    FeatureChangeSummary,
     ClinicalNoteCreate,
     ClinicalNoteUpdate,
     ClinicalNoteSummary,
@@ -48,6 +61,8 @@ from app.schemas.doctor_schemas import (
     DatasetRequestListResponse,
     AlertItem,
     AlertsResponse,
+    GlobalImportanceItem,
+    GlobalImportanceResponse,
     DoctorForgotPassword,
     DoctorResetPassword
 )
@@ -208,7 +223,6 @@ async def update_doctor_profile(
     
     current_doctor.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(current_doctor)
     
     return DoctorProfile.model_validate(current_doctor)
 
@@ -222,109 +236,45 @@ async def get_doctor_dashboard(
 ):
     """Get doctor's dashboard with statistics and recent activity."""
     
-    # Total patients count
-    total_patients_result = await db.execute(select(func.count(User.id)))
-    total_patients = total_patients_result.scalar() or 0
-    
-    # Pending reviews (completed sessions without doctor notes)
-    pending_result = await db.execute(
-        select(func.count(TestSession.id))
-        .where(
-            and_(
-                TestSession.status == "completed",
-                TestSession.completed_at >= datetime.utcnow() - timedelta(days=7)
-            )
-        )
-    )
-    pending_reviews = pending_result.scalar() or 0
-    
-    # Reports today
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    reports_today_result = await db.execute(
-        select(func.count(TestSession.id))
-        .where(
-            and_(
-                TestSession.status == "completed",
-                TestSession.completed_at >= today_start
-            )
-        )
-    )
-    reports_today = reports_today_result.scalar() or 0
-    
-    # Critical alerts (high risk patients)
-    critical_result = await db.execute(
-        select(func.count(User.id))
-        .where(
-            or_(
-                User.ad_risk_score >= 70,
-                User.pd_risk_score >= 70
-            )
-        )
-    )
-    critical_alerts = critical_result.scalar() or 0
+    counts = await fetch_doctor_dashboard_counts(db)
     
     # Recent patients
-    recent_patients_result = await db.execute(
-        select(User)
-        .join(TestSession, TestSession.user_id == User.id)
-        .where(TestSession.status == "completed")
-        .order_by(desc(TestSession.completed_at))
-        .limit(5)
-        .distinct()
-    )
-    recent_users = recent_patients_result.scalars().all()
-    
-    recent_patients = []
-    for user in recent_users:
-        risk_level = "Low"
-        max_risk = max(user.ad_risk_score or 0, user.pd_risk_score or 0)
-        if max_risk >= 70:
-            risk_level = "High"
-        elif max_risk >= 40:
-            risk_level = "Moderate"
-        
-        recent_patients.append(PatientSummary(
-            id=user.id,
-            name=f"{user.first_name} {user.last_name}",
-            age=_calculate_age(user.date_of_birth) if user.date_of_birth else 0,
-            gender=user.gender,
-            risk_level=risk_level,
-            ad_risk_score=user.ad_risk_score or 0,
-            pd_risk_score=user.pd_risk_score or 0,
-            last_test_date=None,
+    recent_patients = [
+        PatientSummary(
+            id=row.id,
+            name=f"{row.first_name} {row.last_name}",
+            age=_calculate_age(row.date_of_birth) if row.date_of_birth else 0,
+            gender=row.gender,
+            risk_level=_risk_level(row.ad_risk_score, row.pd_risk_score),
+            ad_risk_score=row.ad_risk_score or 0,
+            pd_risk_score=row.pd_risk_score or 0,
+            last_test_date=row.last_test_date,
             last_test_category=None
-        ))
+        )
+        for row in await fetch_recent_patients(db, limit=5)
+    ]
     
     # Pending diagnostics
-    pending_diag_result = await db.execute(
-        select(TestSession, User)
-        .join(User, User.id == TestSession.user_id)
-        .where(TestSession.status == "completed")
-        .order_by(desc(TestSession.completed_at))
-        .limit(5)
-    )
-    pending_rows = pending_diag_result.all()
-    
     pending_diagnostics = [
         PendingDiagnostic(
-            id=session.id,
-            patient_id=user.id,
-            patient_name=f"{user.first_name} {user.last_name}",
-            test_category=session.category,
-            test_name=session.test_name or session.category,
-            completed_at=session.completed_at,
+            id=row.session_id,
+            patient_id=row.patient_id,
+            patient_name=f"{row.first_name} {row.last_name}",
+            test_category=row.category,
+            test_name=row.category,
+            completed_at=row.completed_at,
             status="awaiting_review"
         )
-        for session, user in pending_rows
+        for row in await fetch_completed_sessions(db, limit=5)
     ]
     
     return DoctorDashboard(
         doctor_name=f"Dr. {current_doctor.first_name} {current_doctor.last_name}",
         specialization=current_doctor.specialization.value,
-        total_patients=total_patients,
-        pending_reviews=pending_reviews,
-        reports_today=reports_today,
-        critical_alerts=critical_alerts,
+        total_patients=counts.total_patients,
+        pending_reviews=counts.pending_reviews,
+        reports_today=counts.reports_today,
+        critical_alerts=counts.critical_alerts,
         recent_patients=recent_patients,
         pending_diagnostics=pending_diagnostics
     )
@@ -411,19 +361,12 @@ async def list_patients(
     
     patients = []
     for user in users:
-        risk_level_str = "Low"
-        max_risk = max(user.ad_risk_score or 0, user.pd_risk_score or 0)
-        if max_risk >= 70:
-            risk_level_str = "High"
-        elif max_risk >= 40:
-            risk_level_str = "Moderate"
-        
         patients.append(PatientSummary(
             id=user.id,
             name=f"{user.first_name} {user.last_name}",
             age=_calculate_age(user.date_of_birth) if user.date_of_birth else 0,
             gender=user.gender,
-            risk_level=risk_level_str,
+            risk_level=_risk_level(user.ad_risk_score, user.pd_risk_score),
             ad_risk_score=user.ad_risk_score or 0,
             pd_risk_score=user.pd_risk_score or 0,
             last_test_date=user.updated_at,
@@ -447,7 +390,8 @@ async def list_patients(
 async def get_patient_detail(
     patient_id: str,
     current_doctor: Doctor = Depends(get_current_doctor),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: RequestLoaders = Depends(get_loaders)
 ):
     """Get detailed patient information including test history."""
     
@@ -489,20 +433,41 @@ async def get_patient_detail(
         for s in sessions
     ]
     
+    # Per-feature change since earlier sessions (running stats, no result history scan)
+    feature_changes = [
+        FeatureChangeSummary(
+            category=stats.category,
+            feature=stats.feature,
+            sessions=stats.count,
+            last_value=stats.last_value,
+            mean=stats.mean,
+            sd=math.sqrt(stats.m2 / (stats.count - 1)) if stats.count > 1 else None,
+            ewma=stats.ewma,
+            rci=stats.rci,
+            reliable_change=stats.reliable_change,
+            trend_break=stats.trend_break,
+            last_completed_at=stats.last_completed_at
+        )
+        for stats in await LongitudinalService(db).feature_changes(patient.id)
+    ]
+    
     # Get clinical notes for this patient
     notes_result = await db.execute(
-        select(ClinicalNote, Doctor)
-        .join(Doctor, Doctor.id == ClinicalNote.doctor_id)
+        select(ClinicalNote)
         .where(ClinicalNote.patient_id == patient_id)
         .order_by(desc(ClinicalNote.created_at))
     )
-    notes_rows = notes_result.all()
+    notes = [
+        note for note in notes_result.scalars().all()
+        if not note.is_private or note.doctor_id == current_doctor.id
+    ]
+    doctors = await _load_note_authors(loaders, notes, current_doctor)
     
     clinical_notes = [
         ClinicalNoteSummary(
             id=note.id,
             doctor_id=note.doctor_id,
-            doctor_name=f"Dr. {doctor.first_name} {doctor.last_name}",
+            doctor_name=_doctor_display_name(doctors.get(note.doctor_id)),
             patient_id=note.patient_id,
             title=note.title,
             content=note.content,
@@ -512,8 +477,7 @@ async def get_patient_detail(
             created_at=note.created_at,
             updated_at=note.updated_at
         )
-        for note, doctor in notes_rows
-        if not note.is_private or note.doctor_id == current_doctor.id
+        for note in notes
     ]
     
     # Log access
@@ -545,6 +509,7 @@ async def get_patient_detail(
         total_tests_completed=len([s for s in sessions if s.status == "completed"]),
         test_sessions=test_sessions,
         clinical_notes=clinical_notes,
+        feature_changes=feature_changes,
         member_since=patient.created_at,
         last_active=patient.updated_at
     )
@@ -592,7 +557,6 @@ async def create_clinical_note(
     db.add(note)
     current_doctor.total_notes_created += 1
     await db.commit()
-    await db.refresh(note)
     
     return ClinicalNoteResponse(
         note=ClinicalNoteSummary(
@@ -619,11 +583,12 @@ async def list_clinical_notes(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     current_doctor: Doctor = Depends(get_current_doctor),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: RequestLoaders = Depends(get_loaders)
 ):
     """List clinical notes with filtering."""
     
-    query = select(ClinicalNote, Doctor).join(Doctor, Doctor.id == ClinicalNote.doctor_id)
+    query = select(ClinicalNote)
     
     # Only show own private notes, all public notes
     query = query.where(
@@ -662,13 +627,14 @@ async def list_clinical_notes(
     query = query.offset(offset).limit(limit)
     
     result = await db.execute(query)
-    notes_rows = result.all()
+    notes_page = result.scalars().all()
+    doctors = await _load_note_authors(loaders, notes_page, current_doctor)
     
     notes = [
         ClinicalNoteSummary(
             id=note.id,
             doctor_id=note.doctor_id,
-            doctor_name=f"Dr. {doctor.first_name} {doctor.last_name}",
+            doctor_name=_doctor_display_name(doctors.get(note.doctor_id)),
             patient_id=note.patient_id,
             title=note.title,
             content=note.content,
@@ -678,7 +644,7 @@ async def list_clinical_notes(
             created_at=note.created_at,
             updated_at=note.updated_at
         )
-        for note, doctor in notes_rows
+        for note in notes_page
     ]
     
     return ClinicalNotesListResponse(
@@ -723,7 +689,6 @@ async def update_clinical_note(
     
     note.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(note)
     
     return ClinicalNoteResponse(
         note=ClinicalNoteSummary(
@@ -785,20 +750,8 @@ async def get_alerts(
     alerts = []
     
     # High risk patients (recent)
-    high_risk_result = await db.execute(
-        select(User)
-        .where(
-            and_(
-                or_(User.ad_risk_score >= 70, User.pd_risk_score >= 70),
-                User.updated_at >= datetime.utcnow() - timedelta(days=7)
-            )
-        )
-        .order_by(desc(User.updated_at))
-        .limit(5)
-    )
-    high_risk_patients = high_risk_result.scalars().all()
-    
-    for patient in high_risk_patients:
+    since = datetime.utcnow() - timedelta(days=7)
+    for patient in await fetch_high_risk_patients(db, since=since, limit=5):
         alerts.append(AlertItem(
             id=f"high_risk_{patient.id}",
             type="high_risk",
@@ -811,32 +764,39 @@ async def get_alerts(
             created_at=patient.updated_at or datetime.utcnow()
         ))
     
-    # Recent completed tests
-    recent_tests_result = await db.execute(
-        select(TestSession, User)
-        .join(User, User.id == TestSession.user_id)
-        .where(
-            and_(
-                TestSession.status == "completed",
-                TestSession.completed_at >= datetime.utcnow() - timedelta(hours=24)
-            )
-        )
-        .order_by(desc(TestSession.completed_at))
-        .limit(5)
-    )
-    recent_tests = recent_tests_result.all()
+    # Meaningful changes vs the patient's earlier sessions (recent)
+    since = datetime.utcnow() - timedelta(days=7)
+    for row in await fetch_feature_changes(db, since=since, limit=5):
+        kinds = [
+            kind for kind, flagged in (("reliable change", row.reliable_change), ("trend break", row.trend_break))
+            if flagged
+        ]
+        direction = "" if row.rci is None else (" (increased)" if row.rci > 0 else " (decreased)")
+        alerts.append(AlertItem(
+            id=f"feature_change_{row.patient_id}_{row.feature}",
+            type="feature_change",
+            title="Significant Change Between Sessions",
+            message=f"{row.first_name} {row.last_name}: {' and '.join(kinds)} in {row.category} {row.feature}{direction}",
+            patient_id=row.patient_id,
+            patient_name=f"{row.first_name} {row.last_name}",
+            severity="warning" if row.reliable_change and row.trend_break else "info",
+            is_read=False,
+            created_at=row.last_completed_at or datetime.utcnow()
+        ))
     
-    for session, user in recent_tests:
+    # Recent completed tests
+    since = datetime.utcnow() - timedelta(hours=24)
+    for row in await fetch_completed_sessions(db, since=since, limit=5):
         alerts.append(AlertItem(
-            id=f"new_test_{session.id}",
+            id=f"new_test_{row.session_id}",
             type="new_test",
             title="New Test Completed",
-            message=f"{user.first_name} {user.last_name} completed {session.category} test",
-            patient_id=user.id,
-            patient_name=f"{user.first_name} {user.last_name}",
+            message=f"{row.first_name} {row.last_name} completed {row.category} test",
+            patient_id=row.patient_id,
+            patient_name=f"{row.first_name} {row.last_name}",
             severity="info",
             is_read=False,
-            created_at=session.completed_at or datetime.utcnow()
+            created_at=row.completed_at or datetime.utcnow()
         ))
     
     return AlertsResponse(
@@ -845,6 +805,41 @@ async def get_alerts(
     )
 
 
+# ==================== POPULATION INSIGHTS ====================
+
+@router.get("/feature-importance", response_model=GlobalImportanceResponse)
+async def get_feature_importance(
+    category: Optional[str] = None,
+    scoring_version: Optional[str] = None,
+    current_doctor: Doctor = Depends(get_current_doctor),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Which features drive AD/PD risk across all patients, per category.
+    Precomputed by the global feature importance job; served as stored.
+    """
+    scoring_version = scoring_version or get_scoring_registry().current().version
+    rows = await GlobalImportanceService(db).get_importance(category, scoring_version)
+    
+    return GlobalImportanceResponse(
+        scoring_version=scoring_version,
+        categories=[
+            GlobalImportanceItem(
+                category=row.category,
+                scoring_version=row.scoring_version,
+                explainer_version=row.explainer_version,
+                population=row.population or 0,
+                samples=row.samples or 0,
+                features=(row.summary or {}).get("features", []),
+                interactions=(row.summary or {}).get("interactions", []),
+                strata=(row.summary or {}).get("strata", []),
+                updated_at=row.updated_at
+            )
+            for row in rows
+        ]
+    )
+
+
 # ==================== DATASET REQUESTS ====================
 
 @router.post("/dataset-requests", response_model=DatasetRequestResponse)
@@ -876,7 +871,6 @@ async def create_dataset_request(
     
     db.add(dataset_request)
     await db.commit()
-    await db.refresh(dataset_request)
     
     return DatasetRequestResponse(
         id=dataset_request.id,
@@ -931,6 +925,34 @@ async def list_dataset_requests(
 
 # ==================== HELPERS ====================
 
+async def _load_note_authors(
+    loaders: RequestLoaders,
+    notes: List[ClinicalNote],
+    current_doctor: Doctor
+) -> dict:
+    """Resolve the authors of a page of notes with a single IN query."""
+    doctor_loader = loaders[Doctor]
+    doctor_loader.prime(current_doctor.id, current_doctor)
+    return await doctor_loader.load_many(note.doctor_id for note in notes)
+
+
+def _doctor_display_name(doctor: Optional[Doctor]) -> str:
+    """Format a doctor's display name, tolerating deleted accounts."""
+    if not doctor:
+        return "Unknown"
+    return f"Dr. {doctor.first_name} {doctor.last_name}"
+
+
+def _risk_level(ad_risk_score: Optional[float], pd_risk_score: Optional[float]) -> str:
+    """Bucket a patient by their higher AD/PD risk score."""
+    max_risk = max(ad_risk_score or 0, pd_risk_score or 0)
+    if max_risk >= 70:
+        return "High"
+    if max_risk >= 40:
+        return "Moderate"
+    return "Low"
+
+
 def _calculate_age(date_of_birth) -> int:
     """Calculate age from date of birth."""
     if not date_of_birth:
@@ -1,25 +1,40 @@
 """
 Test Endpoints
-GET /dashboard, POST /, GET /, GET /{id}, POST /{id}/start, POST /{id}/items, POST /{id}/items/batch, POST /{id}/complete, DELETE /{id}
+GET /dashboard, POST /, POST /sync, GET /, GET /{id}, POST /{id}/start, POST /{id}/items, POST /{id}/items/binary, POST /{id}/items/stream, POST /{id}/items/batch,
+POST /{id}/items/uploads, GET|PATCH|DELETE /{id}/items/uploads/{upload_id}, POST /{id}/items/uploads/{upload_id}/finalize,
+WS /{id}/stream/{item_name}, POST /{id}/complete, GET /{id}/explanation, DELETE /{id}
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, WebSocket, status
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
+from app.core.blob_store import BlobRef, get_blob_store
+from app.core.config import settings
+from app.core.idempotency import idempotent, request_fingerprint
 from app.db.database import get_db
-from app.core.security import get_current_user_id
+from app.core.security import get_current_user_id, get_websocket_user_id
+from app.services.explanation_service import ExplanationService
 from app.services.test_service import TestService
+from app.services.upload_service import UploadService
+from app.services.live_stream_service import LiveStreamService
 from app.schemas.test_session import (
     TestSessionCreate, TestSessionResponse, TestSessionDetailResponse,
-    TestSessionListResponse, TestDashboardResponse
+    TestSessionListResponse, TestDashboardResponse,
+    TestSyncRequest, TestSyncResponse
 )
-from app.schemas.test_item import TestItemCreate, TestItemBatchCreate, TestItemResponse
-from app.schemas.test_result import TestResultDetailResponse
+from app.schemas.test_item import (
+    CHANNEL_DTYPES, TestItemCreate, TestItemBatchCreate, TestItemResponse,
+    ItemUploadCreate, ItemUploadResponse, ItemUploadFinalizeResponse
+)
+from app.schemas.test_result import TestResultDetailResponse, XAIExplanation
 from app.schemas.auth import MessageResponse
 
 router = APIRouter()
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @router.get("/dashboard", response_model=TestDashboardResponse)
 async def get_test_dashboard(
@@ -43,6 +58,31 @@ async def create_test_session(
     return TestSessionResponse.model_validate(session)
 
 
+@router.post("/sync", response_model=TestSyncResponse, status_code=201)
+async def sync_test_sessions(
+    data: TestSyncRequest,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload sessions recorded offline and get all their results.
+    
+    Each session is created, its items stored and its pipeline run as if it
+    had been completed online. The request is validated as a whole (422 lists
+    every problem) and stored all-or-nothing. Idempotency-Key supported, so
+    a sync retried after a dropped connection is not stored twice.
+    """
+    service = TestService(db)
+    return await idempotent(
+        user_id, idempotency_key,
+        request_fingerprint("POST", request.url.path, data.model_dump_json().encode()),
+        lambda: service.sync_sessions(user_id, data),
+        status_code=201,
+    )
+
+
 @router.get("/", response_model=TestSessionListResponse)
 async def list_test_sessions(
     category: Optional[str] = Query(None),
@@ -90,6 +130,8 @@ async def start_test_session(
 async def add_test_item(
     session_id: int,
     data: TestItemCreate,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None),
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
@@ -100,28 +142,227 @@ async def add_test_item(
     - Stroop: {"responses": [...], "times": [...], "total_correct": 27, "total_errors": 3}
     - N-Back: {"level": 2, "accuracy": 0.78, "hits": 20, "false_alarms": 5}
     - Spiral: {"coordinates": [[x,y,t]...], "tremor_detected": false, "duration_ms": 45000}
+    
+    Send an Idempotency-Key header to make retries safe: a repeated key
+    returns the first response instead of adding the item again.
     """
     service = TestService(db)
-    item = await service.add_test_item(user_id, session_id, data)
-    return TestItemResponse.model_validate(item)
+    
+    async def add():
+        return await service.add_test_item(user_id, session_id, data)
+    
+    return await idempotent(
+        user_id, idempotency_key,
+        request_fingerprint("POST", request.url.path, data.model_dump_json().encode()),
+        add, status_code=201,
+    )
+
+
+@router.post("/{session_id}/items/binary", response_model=TestItemResponse, status_code=201)
+async def add_test_item_binary(
+    session_id: int,
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Add a test item with sensor channels and files sent as raw binary parts.
+    
+    multipart/form-data:
+    - item: TestItemCreate JSON; each channel declares its dtype only,
+      e.g. {"channels": {"accelerometer_data.x": {"dtype": "<f4"}}, ...}
+    - channel.<name>: the little-endian bytes for that channel
+    - file.<name>: an audio/video recording or other file for the item
+    
+    Parts are streamed into the blob store; the item row keeps references.
+    """
+    form = await request.form()
+    
+    try:
+        data = TestItemCreate.model_validate_json(form.get("item") or "")
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors())
+    
+    channels = data.channels or {}
+    stored_channels = {}
+    attachments = {}
+    for key, part in form.multi_items():
+        if key.startswith("channel."):
+            name = key[len("channel."):]
+            channel = channels.get(name)
+            if channel is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Channel {name!r} has no declared dtype in item.channels"
+                )
+            ref = await _store_part(part, name)
+            if ref.size % CHANNEL_DTYPES[channel.dtype]:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Channel {name!r} byte length is not a multiple of {channel.dtype} item size"
+                )
+            stored_channels[name] = ref
+        
+        elif key.startswith("file."):
+            name = key[len("file."):]
+            ref = await _store_part(part, name)
+            attachments[name] = {
+                "blob": ref.digest,
+                "size": ref.size,
+                "content_type": getattr(part, "content_type", None),
+                "filename": getattr(part, "filename", None),
+            }
+    
+    service = TestService(db)
+    return await service.add_test_item(user_id, session_id, data, stored_channels, attachments)
+
+
+@router.post("/{session_id}/items/stream", response_model=list[TestItemResponse], status_code=201)
+async def add_test_items_stream(
+    session_id: int,
+    request: Request,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Add one item or {"items": [...]} from a large JSON body without buffering it.
+    
+    Same JSON as POST /items; sensor arrays in raw_data such as
+    "accelerometer_data": [{"x": .., "y": .., "z": .., "timestamp": ..}, ...]
+    are stored as binary channels. Oversized bodies are rejected with 413
+    as soon as a limit is crossed, malformed JSON with 400.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_STREAM_REQUEST_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body exceeds {settings.MAX_STREAM_REQUEST_BYTES} bytes"
+        )
+    
+    service = TestService(db)
+    return await service.add_test_items_stream(user_id, session_id, request.stream())
 
 
 @router.post("/{session_id}/items/batch", response_model=list[TestItemResponse], status_code=201)
 async def add_test_items_batch(
     session_id: int,
     data: TestItemBatchCreate,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None),
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    """Add multiple test items at once."""
+    """Add multiple test items at once (Idempotency-Key supported)."""
     service = TestService(db)
-    items = await service.add_test_items_batch(user_id, session_id, data)
-    return [TestItemResponse.model_validate(i) for i in items]
+    
+    async def add():
+        return await service.add_test_items_batch(user_id, session_id, data)
+    
+    return await idempotent(
+        user_id, idempotency_key,
+        request_fingerprint("POST", request.url.path, data.model_dump_json().encode()),
+        add, status_code=201,
+    )
+
+
+# ============== RESUMABLE UPLOADS ==============
+
+@router.post("/{session_id}/items/uploads", response_model=ItemUploadResponse, status_code=201)
+async def create_item_upload(
+    session_id: int,
+    data: ItemUploadCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Start a resumable upload for a long recording (walking sensors, facial video).
+    
+    Declare the item and each part's size, e.g.
+    {"item": {"item_name": "walking_test", "channels": {"accelerometer_data.x": {"dtype": "<f4"}}},
+     "parts": {"channel.accelerometer_data.x": 480000, "file.video": 52428800}}
+    then PATCH the bytes of each part and finalize.
+    """
+    service = UploadService(db)
+    return await service.create_upload(user_id, session_id, data)
+
+
+@router.get("/{session_id}/items/uploads/{upload_id}", response_model=ItemUploadResponse)
+async def get_item_upload(
+    session_id: int,
+    upload_id: str,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get upload state; resume each part from its offset."""
+    service = UploadService(db)
+    return await service.get_upload(user_id, session_id, upload_id)
+
+
+@router.patch("/{session_id}/items/uploads/{upload_id}", response_model=ItemUploadResponse)
+async def upload_item_chunk(
+    session_id: int,
+    upload_id: str,
+    request: Request,
+    part: str = Query(..., description="Part name, e.g. file.video"),
+    upload_offset: int = Header(..., ge=0, description="Bytes of the part already received"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Append the raw request body to a part at Upload-Offset."""
+    service = UploadService(db)
+    return await service.write_chunk(user_id, session_id, upload_id, part, upload_offset, request.stream())
+
+
+@router.post("/{session_id}/items/uploads/{upload_id}/finalize", response_model=ItemUploadFinalizeResponse, status_code=201)
+async def finalize_item_upload(
+    session_id: int,
+    upload_id: str,
+    extract: bool = Query(False, description="Run the category's feature extraction on the item"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create the test item once every part is fully received."""
+    service = UploadService(db)
+    return await service.finalize_upload(user_id, session_id, upload_id, extract)
+
+
+@router.delete("/{session_id}/items/uploads/{upload_id}", response_model=MessageResponse)
+async def abort_item_upload(
+    session_id: int,
+    upload_id: str,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Abort an unfinished upload and discard its data."""
+    service = UploadService(db)
+    await service.abort_upload(user_id, session_id, upload_id)
+    return MessageResponse(message="Upload aborted", success=True)
+
+
+# ============== LIVE STREAMING ==============
+
+@router.websocket("/{session_id}/stream/{item_name}")
+async def stream_test_item(
+    websocket: WebSocket,
+    session_id: int,
+    item_name: str,
+    user_id: int = Depends(get_websocket_user_id),
+):
+    """
+    Stream sensor samples while a walking or tapping test runs (?token=<access token>).
+    
+    Features are computed online as samples arrive, so the item is final as
+    soon as the client sends {"end": true}. See LiveStreamService for the
+    message protocol.
+    """
+    await LiveStreamService().run(websocket, user_id, session_id, item_name)
 
 
 @router.post("/{session_id}/complete", response_model=TestResultDetailResponse)
 async def complete_test_session(
     session_id: int,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None),
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
@@ -131,13 +372,40 @@ async def complete_test_session(
     This triggers:
     1. Feature extraction from all test items
     2. Risk score calculation via ML fusion
-    3. XAI explanation generation
-    4. User score updates
+    3. User score updates
     
-    Returns complete result with XAI explanation.
+    Returns the scored result; its XAI explanation is generated on request
+    (GET /tests/{id}/explanation), so xai_explanation is null here. With an Idempotency-Key,
+    retries (including concurrent ones) get the first result back instead of
+    re-running the pipeline.
+    
+    A session whose items already showed invalid performance (see
+    session_validity in the item responses) is not scored: it is marked
+    invalid and 422 returns the validity details so the client can offer a
+    retest.
     """
     service = TestService(db)
-    return await service.complete_session(user_id, session_id)
+    return await idempotent(
+        user_id, idempotency_key,
+        request_fingerprint("POST", request.url.path),
+        lambda: service.complete_session(user_id, session_id),
+    )
+
+
+@router.get("/{session_id}/explanation", response_model=XAIExplanation)
+async def get_test_explanation(
+    session_id: int,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    XAI explanation of a completed session's result.
+    
+    Generated on the first request and stored; later requests return the
+    stored explanation until the explainer or scoring version changes.
+    """
+    service = ExplanationService(db)
+    return await service.get_explanation(user_id, session_id)
 
 
 @router.delete("/{session_id}", response_model=MessageResponse)
@@ -150,3 +418,21 @@ async def cancel_test_session(
     service = TestService(db)
     await service.cancel_session(user_id, session_id)
     return MessageResponse(message="Session cancelled", success=True)
+
+
+# ============== HELPERS ==============
+
+async def _store_part(part, name: str) -> BlobRef:
+    """Stream one multipart part into the blob store, enforcing MAX_FILE_SIZE."""
+    if isinstance(part, str):
+        return get_blob_store().put(part.encode())
+    
+    with get_blob_store().writer() as writer:
+        while chunk := await part.read(UPLOAD_CHUNK_SIZE):
+            writer.write(chunk)
+            if writer.size > settings.MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Part {name!r} too large. Max size: {settings.MAX_FILE_SIZE // (1024*1024)}MB"
+                )
+        return writer.commit()
@@ -0,0 +1,238 @@
+"""
+Content-addressed blob store
+Large item payloads (sensor channels, audio, video) live on disk under
+UPLOAD_DIR/blobs, named by their SHA-256 and sharded by hash prefix:
+
+    blobs/3f/a2/3fa2...e9
+
+Identical payloads are stored once. Writes go to a temp file and are renamed
+into place, so a blob path either holds the complete content or nothing.
+Reads memory-map the file; numpy arrays are views over the mapping.
+
+Content is re-hashed before it is trusted: when a write deduplicates against
+an existing file and on a blob's first read in the process. Files that no
+longer match their digest are moved to blobs/quarantine (replaced by the new
+content on a write, BlobIntegrityError on a read).
+"""
+
+import hashlib
+import mmap
+import os
+import tempfile
+import uuid
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from app.core.config import settings
+
+CHUNK_SIZE = 1024 * 1024
+VERIFIED_CACHE_SIZE = 100_000  # Digests already re-hashed by this process
+
+
+class BlobRef(NamedTuple):
+    digest: str  # sha256 hex
+    size: int
+
+
+class BlobIntegrityError(Exception):
+    """Stored blob does not match its digest (truncated or corrupted file)."""
+
+
+class BlobWriter:
+    """Incremental writer: hashes while writing, commits into the store atomically."""
+
+    def __init__(self, store: "BlobStore"):
+        self._store = store
+        self._hash = hashlib.sha256()
+        self._size = 0
+        fd, self._tmp_path = tempfile.mkstemp(dir=store.tmp_dir)
+        self._file = os.fdopen(fd, "wb")
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def write(self, chunk: Union[bytes, bytearray, memoryview]) -> None:
+        self._hash.update(chunk)
+        self._file.write(chunk)
+        self._size += len(chunk)
+
+    def commit(self) -> BlobRef:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+        ref = BlobRef(self._hash.hexdigest(), self._size)
+        self._store._place(self._tmp_path, ref)
+        return ref
+
+    def abort(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+
+
+class BlobStore:
+    """Local content-addressed storage with mmap reads."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(settings.UPLOAD_DIR, "blobs")
+        self.tmp_dir = os.path.join(self.root, "tmp")
+        self.quarantine_dir = os.path.join(self.root, "quarantine")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self._verified: "OrderedDict[str, None]" = OrderedDict()
+
+    def path(self, digest: str) -> str:
+        if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            raise ValueError(f"Invalid blob digest: {digest!r}")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    # ============== WRITE ==============
+
+    def put(self, data: Union[bytes, bytearray, memoryview]) -> BlobRef:
+        """Store bytes; returns the existing ref if the content is already present."""
+        with self.writer() as writer:
+            writer.write(data)
+            return writer.commit()
+
+    def put_chunks(self, chunks: Iterable[bytes]) -> BlobRef:
+        with self.writer() as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+            return writer.commit()
+
+    def writer(self) -> BlobWriter:
+        return BlobWriter(self)
+
+    def put_file(self, path: str, link: bool = False) -> BlobRef:
+        """
+        Move a finished file into the store (hashed in chunks, then renamed).
+
+        With link=True the file is hard-linked into place and left where it
+        is, so the caller can repeat the call until it no longer needs it.
+        The file must be on the same filesystem as the store, e.g. under tmp_dir.
+        """
+        h = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+                size += len(chunk)
+        ref = BlobRef(h.hexdigest(), size)
+        if link:
+            if self._intact(ref):
+                return ref
+            tmp_path = os.path.join(self.tmp_dir, f"link-{os.getpid()}-{uuid.uuid4().hex}")
+            os.link(path, tmp_path)
+            path = tmp_path
+        self._place(path, ref)
+        return ref
+
+    def _place(self, tmp_path: str, ref: BlobRef) -> None:
+        path = self.path(ref.digest)
+        if self._intact(ref):
+            os.unlink(tmp_path)  # deduplicated
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+            self._remember(ref.digest)
+
+    def _intact(self, ref: BlobRef) -> bool:
+        """Whether the stored copy of ref is complete and matches its digest (corrupt copies are quarantined)."""
+        path = self.path(ref.digest)
+        try:
+            if os.path.getsize(path) != ref.size:
+                return False
+        except FileNotFoundError:
+            return False
+        if self.verify(ref.digest):
+            self._remember(ref.digest)
+            return True
+        self.quarantine(ref.digest)
+        return False
+
+    # ============== READ ==============
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def open(self, digest: str, size: Optional[int] = None) -> Union[mmap.mmap, bytes]:
+        """Read-only memory map of a blob (b"" for empty blobs)."""
+        path = self.path(digest)
+        try:
+            with open(path, "rb") as f:
+                actual = os.fstat(f.fileno()).st_size
+                if size is not None and actual != size:
+                    raise BlobIntegrityError(f"Blob {digest} is {actual} bytes, expected {size}")
+                if actual == 0:
+                    return b""
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise BlobIntegrityError(f"Blob {digest} is missing")
+
+        if digest not in self._verified:
+            if hashlib.sha256(view).hexdigest() != digest:
+                view.close()
+                self.quarantine(digest)
+                raise BlobIntegrityError(f"Blob {digest} does not match its digest (quarantined)")
+            self._remember(digest)
+        return view
+
+    def checked_path(self, digest: str, size: Optional[int] = None) -> str:
+        """Filesystem path of a blob, verified like open() (for libraries that only take paths)."""
+        view = self.open(digest, size)
+        if isinstance(view, mmap.mmap):
+            view.close()
+        return self.path(digest)
+
+    def array(self, digest: str, dtype: str, size: Optional[int] = None) -> np.ndarray:
+        """Zero-copy numpy view of a blob."""
+        return np.frombuffer(self.open(digest, size), dtype=np.dtype(dtype))
+
+    def read(self, digest: str, size: Optional[int] = None) -> bytes:
+        return bytes(self.open(digest, size))
+
+    def verify(self, digest: str) -> bool:
+        """Re-hash a blob; False if its content no longer matches the digest."""
+        h = hashlib.sha256()
+        with open(self.path(digest), "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+        return h.hexdigest() == digest
+
+    def quarantine(self, digest: str) -> None:
+        """Move a corrupt blob out of the store, keeping it for inspection."""
+        os.makedirs(self.quarantine_dir, exist_ok=True)
+        self._verified.pop(digest, None)
+        try:
+            os.replace(self.path(digest), os.path.join(self.quarantine_dir, f"{digest}.{uuid.uuid4().hex}"))
+        except FileNotFoundError:
+            pass  # already moved by a concurrent reader
+
+    def _remember(self, digest: str) -> None:
+        self._verified[digest] = None
+        self._verified.move_to_end(digest)
+        while len(self._verified) > VERIFIED_CACHE_SIZE:
+            self._verified.popitem(last=False)
+
+
+_default_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Process-wide store rooted at settings.UPLOAD_DIR."""
+    global _default_store
+    root = os.path.join(settings.UPLOAD_DIR, "blobs")
+    if _default_store is None or _default_store.root != root:
+        _default_store = BlobStore(root)
+    return _default_store
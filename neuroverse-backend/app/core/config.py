@@ -49,6 +49,61 @@ class Settings(BaseSettings):
     ALLOWED_IMAGE_TYPES: List[str] = ["image/jpg", "image/jpeg", "image/png", "image/webp"]
     ALLOWED_FILE_TYPES: str = ".jpg,.jpeg,.png,.pdf,.docx,.txt"  # Added this
     
+    BLOB_INLINE_MAX_BYTES: int = 64 * 1024  # Larger sensor channels go to the blob store
+    
+    # Streamed item uploads (POST /tests/{id}/items/stream)
+    MAX_STREAM_REQUEST_BYTES: int = 64 * 1024 * 1024
+    MAX_STREAM_ITEM_BYTES: int = 32 * 1024 * 1024
+    MAX_STREAM_ITEMS: int = 100
+    SYNC_MAX_SESSIONS: int = 10  # Offline sessions per POST /tests/sync
+    
+    # Resumable item uploads (POST /tests/{id}/items/uploads)
+    RESUMABLE_UPLOAD_MAX_BYTES: int = 512 * 1024 * 1024  # All parts of one upload
+    RESUMABLE_UPLOAD_EXPIRY_HOURS: int = 24
+    
+    # Idempotency-Key handling for retried item posts / session completion
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_WAIT_SECONDS: int = 60  # How long a duplicate waits for the in-flight request
+    IDEMPOTENCY_STALE_SECONDS: int = 300  # In-progress keys older than this were abandoned
+    
+    # Test item archival (raw sensor payloads -> Parquet)
+    TEST_ITEM_RETENTION_DAYS: int = 90
+    TEST_ITEM_PARTITIONS_AHEAD: int = 2  # Monthly partitions created in advance
+    ARCHIVE_URI: str = "uploads/archive"  # Local directory or s3://bucket/prefix
+    
+    # Versioned clinical norms / fusion weights (scoring_versions table)
+    SCORING_REFRESH_SECONDS: int = 30  # How often each worker checks for a newly activated version
+    
+    # Population norms (per-feature t-digests by age band and gender)
+    NORMS_MIN_SAMPLES: int = 50  # Fewer values in a stratum -> use the pooled one
+    NORMS_CACHE_SECONDS: int = 300  # How long a worker reuses a stratum's loaded sketches
+    NORMS_COMPRESSION: int = 100  # t-digest compression (accuracy vs size)
+    
+    # Item-by-item validity tracking
+    VALIDITY_SKIP_INVALID: bool = True  # Don't score a session its items already showed invalid; ask for a retest
+    FINGERPRINT_MIN_TOKENS: int = 50  # Smaller payloads (summary scores) match by chance; not fingerprinted
+    FINGERPRINT_MAX_DISTANCE: int = 3  # SimHash bits apart still counted as a duplicate (at most 3: 4 bands)
+    
+    # Longitudinal change detection (per-user running feature statistics)
+    CHANGE_MIN_SESSIONS: int = 3  # Earlier sessions needed before a change is flagged
+    CHANGE_RCI_THRESHOLD: float = 1.96  # |RCI| above this is a reliable change (95%)
+    CHANGE_EWMA_ALPHA: float = 0.3  # Weight of the newest value in the EWMA
+    CHANGE_EWMA_LIMIT: float = 3.0  # EWMA control limit, in standard errors of the EWMA
+    
+    # SHAP explanations (background sample of stored results per category)
+    SHAP_BACKGROUND_SAMPLE: int = 2000  # Latest completed results read per category
+    SHAP_BACKGROUND_SIZE: int = 32  # Weighted rows kept (cost per explanation is linear in it)
+    SHAP_BACKGROUND_MIN_RESULTS: int = 50  # Fewer -> explain against the healthy reference profile
+    SHAP_BACKGROUND_REFRESH_SECONDS: int = 3600
+    XAI_PRECOMPUTE: bool = False  # Explain completed results in the background (else only when first read)
+    XAI_PRECOMPUTE_IDLE_SECONDS: float = 2.0  # Quiet time (no completions) before precomputing
+    
+    # Global feature importance (app/jobs/global_feature_importance.py)
+    GLOBAL_IMPORTANCE_BATCH: int = 5000  # New results read per category per refresh
+    GLOBAL_IMPORTANCE_STRATUM_SAMPLE: int = 200  # Results explained per age band/gender per refresh
+    GLOBAL_IMPORTANCE_TOP_INTERACTIONS: int = 10
+    GLOBAL_IMPORTANCE_LATE_MARGIN: int = 1000  # Result ids below the watermark re-checked for late commits
+    
     # CORS Settings
     ALLOWED_ORIGINS: str = "*"  # Added this
 
@@ -0,0 +1,252 @@
+"""
+Idempotency-Key support for retried requests
+The first successful execution for a (user, key) stores its response in
+idempotency_keys; retries replay it. A duplicate that arrives while the
+first request is still running waits for it (in-process via a shared
+future, across workers by polling the table) instead of running again.
+Failed executions release the key so the client can retry.
+
+Recently completed keys are also kept in a small in-process LRU so hot
+replays skip the database; entries expire with the key
+(IDEMPOTENCY_KEY_TTL_HOURS after it was claimed).
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.idempotency import IdempotencyKey, IdempotencyStatus
+from app.utils.helpers import naive_utc
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+CACHE_SIZE = 1024
+POLL_INTERVAL = 0.25
+
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    status_code: int
+    body: Any
+    created_at: datetime  # When the key was claimed; expires IDEMPOTENCY_KEY_TTL_HOURS later
+
+
+_inflight: Dict[Tuple[int, str], "asyncio.Future[Optional[StoredResponse]]"] = {}
+_completed: "OrderedDict[Tuple[int, str], StoredResponse]" = OrderedDict()
+
+
+def request_fingerprint(method: str, path: str, body: bytes = b"") -> str:
+    """sha256 identifying a request, to reject keys reused for different requests."""
+    h = hashlib.sha256(f"{method} {path}\n".encode())
+    h.update(body)
+    return h.hexdigest()
+
+
+async def idempotent(
+    user_id: int,
+    key: Optional[str],
+    request_hash: str,
+    handler: Callable[[], Awaitable[Any]],
+    status_code: int = 200,
+) -> Any:
+    """
+    Run handler() at most once per (user_id, key).
+
+    Returns the handler's result on first execution and a JSONResponse with
+    the stored body on replays. Without a key the handler just runs.
+    """
+    if not key:
+        return await handler()
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters"
+        )
+
+    cache_key = (user_id, key)
+    while True:
+        stored = _completed.get(cache_key)
+        if stored is not None:
+            if not _expired(stored):
+                _completed.move_to_end(cache_key)
+                return _replay(stored, request_hash)
+            del _completed[cache_key]
+
+        inflight = _inflight.get(cache_key)
+        if inflight is None:
+            break
+        stored = await asyncio.shield(inflight)
+        if stored is not None:
+            return _replay(stored, request_hash)
+        # The in-flight request failed and released the key; try to claim it
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    stored = None
+    try:
+        claimed_at = datetime.now(timezone.utc)
+        stored = await _claim_or_wait(user_id, key, request_hash)
+        if stored is not None:
+            return _replay(stored, request_hash)
+
+        try:
+            result = await handler()
+        except BaseException:
+            await _release(user_id, key)
+            raise
+
+        stored = StoredResponse(request_hash, status_code, jsonable_encoder(result), claimed_at)
+        await _store(user_id, key, stored)
+        return result
+    finally:
+        if stored is not None:
+            _remember(cache_key, stored)
+        future.set_result(stored)
+        _inflight.pop(cache_key, None)
+
+
+async def purge_expired_keys(now: Optional[datetime] = None) -> int:
+    """Delete keys older than IDEMPOTENCY_KEY_TTL_HOURS."""
+    now = now or datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.created_at < now - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+            )
+        )
+        await db.commit()
+    return result.rowcount
+
+
+# ============== PRIVATE HELPERS ==============
+
+async def _claim_or_wait(user_id: int, key: str, request_hash: str) -> Optional[StoredResponse]:
+    """
+    Claim the key (None) or return the stored response of an earlier execution,
+    polling while another worker holds it in progress.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.IDEMPOTENCY_WAIT_SECONDS
+    match = and_(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+
+    while True:
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as db:
+            # Expired keys and keys abandoned by a crashed worker can be reclaimed
+            await db.execute(
+                delete(IdempotencyKey).where(
+                    and_(
+                        match,
+                        or_(
+                            IdempotencyKey.created_at < now - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+                            and_(
+                                IdempotencyKey.status == IdempotencyStatus.IN_PROGRESS.value,
+                                IdempotencyKey.created_at < now - timedelta(seconds=settings.IDEMPOTENCY_STALE_SECONDS),
+                            ),
+                        ),
+                    )
+                )
+            )
+            db.add(IdempotencyKey(
+                user_id=user_id,
+                key=key,
+                request_hash=request_hash,
+                status=IdempotencyStatus.IN_PROGRESS.value,
+            ))
+            try:
+                await db.commit()
+                return None
+            except IntegrityError:
+                await db.rollback()
+
+            row = (await db.execute(
+                select(
+                    IdempotencyKey.request_hash,
+                    IdempotencyKey.status,
+                    IdempotencyKey.response_status,
+                    IdempotencyKey.response_body,
+                    IdempotencyKey.created_at,
+                ).where(match)
+            )).one_or_none()
+
+        if row is not None:
+            if row.request_hash != request_hash:
+                _raise_mismatch()
+            if row.status == IdempotencyStatus.COMPLETED.value:
+                return StoredResponse(row.request_hash, row.response_status, row.response_body, row.created_at)
+
+        if loop.time() > deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress"
+            )
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+async def _store(user_id: int, key: str, stored: StoredResponse) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(IdempotencyKey)
+            .where(and_(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key))
+            .values(
+                status=IdempotencyStatus.COMPLETED.value,
+                response_status=stored.status_code,
+                response_body=stored.body,
+                completed_at=datetime.now(timezone.utc),
+            )
+        )
+        await db.commit()
+
+
+async def _release(user_id: int, key: str) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(IdempotencyKey).where(
+                and_(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status == IdempotencyStatus.IN_PROGRESS.value,
+                )
+            )
+        )
+        await db.commit()
+
+
+def _remember(cache_key: Tuple[int, str], stored: StoredResponse) -> None:
+    _completed[cache_key] = stored
+    _completed.move_to_end(cache_key)
+    while len(_completed) > CACHE_SIZE:
+        _completed.popitem(last=False)
+
+
+def _expired(stored: StoredResponse) -> bool:
+    expires_at = naive_utc(stored.created_at) + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    return expires_at <= naive_utc(datetime.now(timezone.utc))
+
+
+def _replay(stored: StoredResponse, request_hash: str) -> JSONResponse:
+    if stored.request_hash != request_hash:
+        _raise_mismatch()
+    return JSONResponse(
+        content=stored.body,
+        status_code=stored.status_code,
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def _raise_mismatch():
+    raise HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=f"{IDEMPOTENCY_HEADER} was already used for a different request"
+    )
@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, WebSocketException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import secrets
 import string
@@ -170,6 +170,15 @@ async def get_current_user_id_optional(
     user_id = payload.get("sub")
     return int(user_id) if user_id else None
 
+
+async def get_websocket_user_id(token: Optional[str] = Query(None)) -> int:
+    """Extract user ID from the ?token= access token of a WebSocket connection."""
+    payload = decode_token(token) if token else None
+    if payload is None or payload.get("type") != "access" or payload.get("sub") is None:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Could not validate credentials")
+
+    return int(payload["sub"])
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -31,12 +31,28 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+class _ModelBase:
+    """
+    Shared mapper options for all models.
+
+    eager_defaults fetches server-generated columns (created_at, updated_at)
+    with RETURNING as part of the INSERT/UPDATE itself, so services can return
+    freshly written objects without a follow-up refresh() round trip.
+    """
+    __mapper_args__ = {"eager_defaults": True}
+
+
 # Base class for models
-Base = declarative_base()
+Base = declarative_base(cls=_ModelBase)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting async database sessions."""
+    """
+    Dependency for getting async database sessions.
+
+    Services commit their own unit of work once, before returning; the commit
+    here only flushes whatever an endpoint left pending and is free otherwise.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -0,0 +1,142 @@
+"""
+Request-scoped batch loaders (DataLoader pattern)
+Collects primary-key lookups made while handling one request and resolves
+them with a single `WHERE id IN (...)` query, memoizing results per request.
+"""
+
+import asyncio
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Type
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db
+
+
+class BatchLoader:
+    """
+    Batches `load(key)` calls issued in the same event-loop tick.
+
+    Usage:
+        doctors = await loader.load_many(ids)      # one query
+        doctor = await loader.load(doctor_id)      # cached after first load
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        model: Type,
+        key_column: str = "id",
+        lock: Optional[asyncio.Lock] = None,
+    ):
+        self.db = db
+        self.model = model
+        self.column = getattr(model, key_column)
+        self._key_type = self._python_type(self.column)
+        # AsyncSession does not allow concurrent statements; loaders sharing a
+        # session must share a lock too
+        self._lock = lock or asyncio.Lock()
+        self._cache: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+        self._dispatch_scheduled = False
+
+    async def load(self, key: Any) -> Optional[Any]:
+        """Load a single row by key, or None if it doesn't exist."""
+        key = self.key(key)
+        if key is None:
+            return None
+
+        future = self._cache.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._cache[key] = future
+            self._queue.append(key)
+            self._schedule_dispatch()
+
+        return await future
+
+    async def load_many(self, keys: Iterable[Any]) -> Dict[Hashable, Any]:
+        """Load several rows at once. Returns {key: row} for rows that exist."""
+        unique_keys = list(dict.fromkeys(k for k in (self.key(k) for k in keys) if k is not None))
+        rows = await asyncio.gather(*(self.load(k) for k in unique_keys))
+        return {k: row for k, row in zip(unique_keys, rows) if row is not None}
+
+    def prime(self, key: Any, row: Any) -> None:
+        """Seed the cache with a row that was already loaded elsewhere."""
+        key = self.key(key)
+        if key is None or key in self._cache:
+            return
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(row)
+        self._cache[key] = future
+
+    def key(self, raw: Any) -> Optional[Hashable]:
+        """Normalize a key to the column's Python type (e.g. "12" -> 12 for Integer ids)."""
+        if raw is None or self._key_type is None or isinstance(raw, self._key_type):
+            return raw
+        try:
+            return self._key_type(raw)
+        except (TypeError, ValueError):
+            return None
+
+    # ============== PRIVATE HELPERS ==============
+
+    def _schedule_dispatch(self):
+        if self._dispatch_scheduled:
+            return
+        self._dispatch_scheduled = True
+        # Defer until every coroutine gathered in this tick has queued its key
+        asyncio.get_running_loop().call_soon(
+            lambda: asyncio.ensure_future(self._dispatch())
+        )
+
+    async def _dispatch(self):
+        keys, self._queue = self._queue, []
+        self._dispatch_scheduled = False
+        if not keys:
+            return
+
+        try:
+            async with self._lock:
+                result = await self.db.execute(select(self.model).where(self.column.in_(keys)))
+            found = {self.key(getattr(row, self.column.key)): row for row in result.scalars().all()}
+        except Exception as e:
+            for key in keys:
+                future = self._cache.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        for key in keys:
+            future = self._cache[key]
+            if not future.done():
+                future.set_result(found.get(key))
+
+    @staticmethod
+    def _python_type(column) -> Optional[type]:
+        try:
+            return column.type.python_type
+        except NotImplementedError:
+            return None
+
+
+class RequestLoaders:
+    """Per-request registry of batch loaders, one per model."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._lock = asyncio.Lock()
+        self._loaders: Dict[Type, BatchLoader] = {}
+
+    def __getitem__(self, model: Type) -> BatchLoader:
+        loader = self._loaders.get(model)
+        if loader is None:
+            loader = BatchLoader(self.db, model, lock=self._lock)
+            self._loaders[model] = loader
+        return loader
+
+
+async def get_loaders(db: AsyncSession = Depends(get_db)) -> RequestLoaders:
+    """Dependency for request-scoped batch loaders (shares the request's session)."""
+    return RequestLoaders(db)
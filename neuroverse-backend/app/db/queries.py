@@ -0,0 +1,336 @@
+"""
+Hot-path read queries
+Column-level SQLAlchemy Core selects for dashboards and stats endpoints.
+They return plain row tuples (no ORM identity map, no attribute
+instrumentation) that callers map straight into Pydantic response models.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import and_, desc, func, or_, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.feedback import Feedback, FeedbackStatus
+from app.models.test_session import SessionStatus, TestSession
+from app.models.user import User
+from app.models.user_feature_stats import UserFeatureStats
+
+HIGH_RISK_THRESHOLD = 70
+
+
+# ============== ROW TYPES ==============
+
+class UserScoresRow(NamedTuple):
+    cognitive_score: Optional[float]
+    speech_score: Optional[float]
+    motor_score: Optional[float]
+    gait_score: Optional[float]
+    facial_score: Optional[float]
+
+
+class CategoryStatsRow(NamedTuple):
+    category: str
+    total_completed: int
+    last_completed: Optional[datetime]
+
+
+class SessionRow(NamedTuple):
+    id: int
+    user_id: int
+    category: str
+    status: str
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    created_at: Optional[datetime]
+
+
+class TestDashboardRows(NamedTuple):
+    scores: Optional[UserScoresRow]
+    total_sessions: int
+    completed_sessions: int
+    categories: Dict[str, CategoryStatsRow]
+    in_progress: Optional[SessionRow]
+
+
+class DoctorDashboardCounts(NamedTuple):
+    total_patients: int
+    pending_reviews: int
+    reports_today: int
+    critical_alerts: int
+
+
+class PatientRiskRow(NamedTuple):
+    id: int
+    first_name: str
+    last_name: str
+    date_of_birth: Optional[datetime]
+    gender: Optional[str]
+    ad_risk_score: Optional[float]
+    pd_risk_score: Optional[float]
+    last_test_date: Optional[datetime]
+
+
+class CompletedSessionRow(NamedTuple):
+    session_id: int
+    patient_id: int
+    first_name: str
+    last_name: str
+    category: str
+    completed_at: Optional[datetime]
+
+
+class HighRiskPatientRow(NamedTuple):
+    id: int
+    first_name: str
+    last_name: str
+    ad_risk_score: Optional[float]
+    pd_risk_score: Optional[float]
+    updated_at: Optional[datetime]
+
+
+class FeatureChangeRow(NamedTuple):
+    patient_id: int
+    first_name: str
+    last_name: str
+    category: str
+    feature: str
+    rci: Optional[float]
+    reliable_change: bool
+    trend_break: bool
+    last_completed_at: Optional[datetime]
+
+
+class FeedbackStatsRow(NamedTuple):
+    total: int
+    pending: int
+    resolved: int
+    average_rating: Optional[float]
+    categories: Dict[str, int]
+
+
+# ============== TEST DASHBOARD ==============
+
+async def fetch_test_dashboard(db: AsyncSession, user_id: int) -> TestDashboardRows:
+    """Scores, session counts and per-category stats for one user (3 queries)."""
+    completed = TestSession.status == SessionStatus.COMPLETED.value
+
+    scores = (await db.execute(
+        select(
+            User.cognitive_score,
+            User.speech_score,
+            User.motor_score,
+            User.gait_score,
+            User.facial_score,
+        ).where(User.id == user_id)
+    )).first()
+
+    rows = (await db.execute(
+        select(
+            TestSession.category,
+            func.count(TestSession.id),
+            func.count(TestSession.id).filter(completed),
+            func.max(TestSession.completed_at).filter(completed),
+        )
+        .where(TestSession.user_id == user_id)
+        .group_by(TestSession.category)
+    )).all()
+
+    in_progress = (await db.execute(
+        select(
+            TestSession.id,
+            TestSession.user_id,
+            TestSession.category,
+            TestSession.status,
+            TestSession.started_at,
+            TestSession.completed_at,
+            TestSession.created_at,
+        )
+        .where(
+            and_(
+                TestSession.user_id == user_id,
+                TestSession.status.in_([SessionStatus.CREATED.value, SessionStatus.IN_PROGRESS.value]),
+            )
+        )
+        .order_by(desc(TestSession.created_at))
+        .limit(1)
+    )).first()
+
+    return TestDashboardRows(
+        scores=UserScoresRow(*scores) if scores else None,
+        total_sessions=sum(row[1] for row in rows),
+        completed_sessions=sum(row[2] for row in rows),
+        categories={
+            category: CategoryStatsRow(category, completed_count, last_completed)
+            for category, _, completed_count, last_completed in rows
+        },
+        in_progress=SessionRow(*in_progress) if in_progress else None,
+    )
+
+
+# ============== DOCTOR DASHBOARD / ALERTS ==============
+
+async def fetch_doctor_dashboard_counts(db: AsyncSession) -> DoctorDashboardCounts:
+    """All four dashboard counters in a single round trip."""
+    now = datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    completed = TestSession.status == SessionStatus.COMPLETED.value
+
+    sessions = select(
+        func.count(TestSession.id).filter(
+            and_(completed, TestSession.completed_at >= now - timedelta(days=7))
+        ).label("pending_reviews"),
+        func.count(TestSession.id).filter(
+            and_(completed, TestSession.completed_at >= today_start)
+        ).label("reports_today"),
+    ).subquery()
+
+    users = select(
+        func.count(User.id).label("total_patients"),
+        func.count(User.id).filter(
+            or_(User.ad_risk_score >= HIGH_RISK_THRESHOLD, User.pd_risk_score >= HIGH_RISK_THRESHOLD)
+        ).label("critical_alerts"),
+    ).subquery()
+
+    # Both sides are single-row aggregates, so the cross join is one row
+    row = (await db.execute(
+        select(
+            users.c.total_patients,
+            sessions.c.pending_reviews,
+            sessions.c.reports_today,
+            users.c.critical_alerts,
+        ).select_from(users.join(sessions, true()))
+    )).one()
+    return DoctorDashboardCounts(*(value or 0 for value in row))
+
+
+async def fetch_recent_patients(db: AsyncSession, limit: int = 5) -> List[PatientRiskRow]:
+    """Patients with the most recently completed sessions, newest first."""
+    last_test = func.max(TestSession.completed_at).label("last_test_date")
+    result = await db.execute(
+        select(
+            User.id,
+            User.first_name,
+            User.last_name,
+            User.date_of_birth,
+            User.gender,
+            User.ad_risk_score,
+            User.pd_risk_score,
+            last_test,
+        )
+        .join(TestSession, TestSession.user_id == User.id)
+        .where(TestSession.status == SessionStatus.COMPLETED.value)
+        .group_by(User.id)
+        .order_by(desc(last_test))
+        .limit(limit)
+    )
+    return [PatientRiskRow(*row) for row in result.all()]
+
+
+async def fetch_completed_sessions(
+    db: AsyncSession,
+    since: Optional[datetime] = None,
+    limit: int = 5,
+) -> List[CompletedSessionRow]:
+    """Most recently completed sessions joined with the patient's name."""
+    query = (
+        select(
+            TestSession.id,
+            User.id,
+            User.first_name,
+            User.last_name,
+            TestSession.category,
+            TestSession.completed_at,
+        )
+        .join(User, User.id == TestSession.user_id)
+        .where(TestSession.status == SessionStatus.COMPLETED.value)
+    )
+    if since is not None:
+        query = query.where(TestSession.completed_at >= since)
+
+    result = await db.execute(query.order_by(desc(TestSession.completed_at)).limit(limit))
+    return [CompletedSessionRow(*row) for row in result.all()]
+
+
+async def fetch_high_risk_patients(
+    db: AsyncSession,
+    since: datetime,
+    limit: int = 5,
+) -> List[HighRiskPatientRow]:
+    """High-risk patients whose scores changed since `since`."""
+    result = await db.execute(
+        select(
+            User.id,
+            User.first_name,
+            User.last_name,
+            User.ad_risk_score,
+            User.pd_risk_score,
+            User.updated_at,
+        )
+        .where(
+            and_(
+                or_(User.ad_risk_score >= HIGH_RISK_THRESHOLD, User.pd_risk_score >= HIGH_RISK_THRESHOLD),
+                User.updated_at >= since,
+            )
+        )
+        .order_by(desc(User.updated_at))
+        .limit(limit)
+    )
+    return [HighRiskPatientRow(*row) for row in result.all()]
+
+
+async def fetch_feature_changes(
+    db: AsyncSession,
+    since: datetime,
+    limit: int = 5,
+) -> List[FeatureChangeRow]:
+    """Latest sessions since `since` with a reliable change or trend break in a feature."""
+    result = await db.execute(
+        select(
+            UserFeatureStats.user_id,
+            User.first_name,
+            User.last_name,
+            UserFeatureStats.category,
+            UserFeatureStats.feature,
+            UserFeatureStats.rci,
+            UserFeatureStats.reliable_change,
+            UserFeatureStats.trend_break,
+            UserFeatureStats.last_completed_at,
+        )
+        .join(User, User.id == UserFeatureStats.user_id)
+        .where(
+            and_(
+                or_(UserFeatureStats.reliable_change, UserFeatureStats.trend_break),
+                UserFeatureStats.last_completed_at >= since,
+            )
+        )
+        .order_by(desc(UserFeatureStats.last_completed_at))
+        .limit(limit)
+    )
+    return [FeatureChangeRow(*row) for row in result.all()]
+
+
+# ============== FEEDBACK ==============
+
+async def fetch_feedback_stats(db: AsyncSession) -> FeedbackStatsRow:
+    """Feedback totals, status counts, average rating and category breakdown (2 queries)."""
+    totals = (await db.execute(
+        select(
+            func.count(Feedback.id),
+            func.count(Feedback.id).filter(Feedback.status == FeedbackStatus.PENDING),
+            func.count(Feedback.id).filter(Feedback.status == FeedbackStatus.RESOLVED),
+            func.avg(Feedback.rating),
+        )
+    )).one()
+
+    categories = (await db.execute(
+        select(Feedback.category, func.count(Feedback.id)).group_by(Feedback.category)
+    )).all()
+
+    return FeedbackStatsRow(
+        total=totals[0] or 0,
+        pending=totals[1] or 0,
+        resolved=totals[2] or 0,
+        average_rating=totals[3],
+        categories={str(category.value): count for category, count in categories},
+    )
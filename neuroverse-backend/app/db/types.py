@@ -0,0 +1,155 @@
+"""
+Custom column types
+CompressedJSON stores JSON documents as bytes: encoded with orjson (falls back
+to the stdlib json module, producing the same documents) and zstd-compressed
+once they pass a size threshold.
+"""
+
+import enum
+import json
+import math
+from datetime import date, datetime, time
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - compression disabled without it
+    zstandard = None
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+DEFAULT_THRESHOLD = 1024  # bytes of encoded JSON
+DEFAULT_LEVEL = 3
+
+
+def dumps_json(value: Any) -> bytes:
+    """
+    Encode a JSON document to UTF-8 bytes with the fastest available encoder.
+
+    Both encoders write the same document: NaN/Infinity as null, keys
+    coerced to strings, numpy values and datetimes (ISO 8601) natively,
+    anything else via str().
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            value, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(
+        _plain(value), separators=(",", ":"), ensure_ascii=False, allow_nan=False, default=_json_default
+    ).encode("utf-8")
+
+
+def loads_json(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode(value: Any, threshold: int = DEFAULT_THRESHOLD, level: int = DEFAULT_LEVEL) -> bytes:
+    """Serialize a document to its stored form."""
+    data = dumps_json(value)
+    if zstandard is not None and len(data) >= threshold:
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return data
+
+
+def decode(value: Any) -> Any:
+    """Inverse of encode(); also accepts legacy plain-JSON bytes, text or decoded values."""
+    if isinstance(value, str):
+        return loads_json(value)
+    if not isinstance(value, (bytes, bytearray, memoryview)):
+        return value  # None, or already decoded by a legacy JSON column
+
+    return loads_json(to_json_bytes(value))
+
+
+def to_json_bytes(value: Any) -> Optional[bytes]:
+    """Stored form -> plain UTF-8 JSON bytes, decompressing without parsing."""
+    if value is None:
+        return None
+    data = bytes(value)
+    if data[:4] == ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("Compressed JSON column read without the zstandard package installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def is_compressed(value: Optional[bytes]) -> bool:
+    return value is not None and bytes(value[:4]) == ZSTD_MAGIC
+
+
+def recompress(value: Optional[bytes], threshold: int = DEFAULT_THRESHOLD, level: int = DEFAULT_LEVEL) -> Optional[bytes]:
+    """
+    Compressed form of a stored plain-JSON value, or None if it should stay as is
+    (already compressed, below the threshold, or zstandard unavailable).
+    """
+    if value is None or zstandard is None or is_compressed(value) or len(value) < threshold:
+        return None
+    return zstandard.ZstdCompressor(level=level).compress(bytes(value))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return str(value)
+
+
+def _plain(value: Any) -> Any:
+    """What orjson writes for a value, in types the stdlib encoder writes the same way."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {_plain_key(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_plain(v) for v in value]
+    if isinstance(value, np.floating):
+        # float32/float16 as their own shortest repr, like orjson
+        return _plain(float(str(value)) if value.dtype.itemsize < 8 else float(value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _plain_key(key: Any) -> Any:
+    if isinstance(key, (str, int, float, bool)) or key is None:
+        return key
+    return _json_default(_plain(key))
+
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON column stored as (optionally zstd-compressed) bytes.
+
+    Payloads below `threshold` bytes are stored as plain UTF-8 JSON, larger
+    ones as a zstd frame. Reads tell the two apart by the zstd magic number,
+    so rows written before compression was enabled keep working, as do
+    columns that are still the legacy JSON type (values arrive already
+    decoded or as text).
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, level: int = DEFAULT_LEVEL, **kwargs):
+        super().__init__(**kwargs)
+        self.threshold = threshold
+        self.level = level
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return encode(value, self.threshold, self.level)
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        return decode(value)
@@ -0,0 +1,3 @@
+"""
+Background / scheduled jobs (run via cron or a worker: python -m app.jobs.<name>)
+"""
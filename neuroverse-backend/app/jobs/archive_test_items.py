@@ -0,0 +1,65 @@
+"""
+Test item archival job
+Keeps test_items partitions provisioned ahead of time and moves raw payloads
+of partitions older than TEST_ITEM_RETENTION_DAYS to Parquet, then compacts
+those partitions so the hot table stays bounded.
+
+Schedule daily:
+    python -m app.jobs.archive_test_items [--dry-run] [--no-vacuum]
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import text
+
+from app.db.database import AsyncSessionLocal, engine
+from app.services.archive_service import ArchiveService
+
+
+async def vacuum_partition(name: str) -> None:
+    """
+    Rewrite an archived partition to return the freed payload space.
+
+    VACUUM FULL locks only this (cold) partition; current months are untouched.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f'VACUUM (FULL, ANALYZE) "{name}"'))
+
+
+async def run(dry_run: bool = False, vacuum: bool = True) -> None:
+    async with AsyncSessionLocal() as db:
+        service = ArchiveService(db)
+
+        provisioned = await service.ensure_partitions()
+        await db.commit()
+        print(f"Partitions provisioned: {', '.join(provisioned)}")
+
+        partitions = await service.archivable_partitions()
+        if dry_run:
+            for partition in partitions:
+                print(f"Would archive {partition.name}")
+            return
+
+        for partition in partitions:
+            archive = await service.archive_partition(partition)
+            if archive.location is None:
+                print(f"{partition.name}: nothing to archive")
+            else:
+                print(
+                    f"{partition.name}: archived {archive.items_count} items "
+                    f"({archive.size_bytes} bytes) to {archive.location}"
+                )
+            if archive.pending:
+                print(f"{partition.name}: {archive.pending} items of open sessions left for a later run")
+            elif vacuum:
+                await vacuum_partition(partition.name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old test_items raw payloads to Parquet")
+    parser.add_argument("--dry-run", action="store_true", help="List partitions that would be archived")
+    parser.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM FULL of archived partitions")
+    args = parser.parse_args()
+    asyncio.run(run(dry_run=args.dry_run, vacuum=not args.no_vacuum))
@@ -0,0 +1,86 @@
+"""
+CompressedJSON backfill job
+Compresses rows written as plain JSON (before migration 002, or while
+zstandard was unavailable) in small keyset-paginated batches, committing
+after each batch so no long-running transaction or lock is held.
+
+Run once after migrations/002_compress_json_columns.sql, safe to re-run:
+    python -m app.jobs.compress_json_columns [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+from typing import List, Tuple
+
+from sqlalchemy import LargeBinary, bindparam, select, type_coerce, update
+
+from app.db.database import AsyncSessionLocal
+from app.db.types import CompressedJSON, recompress
+from app.models.test_item import TestItem
+from app.models.test_result import TestResult
+
+COLUMNS = [
+    TestItem.raw_data,
+    TestResult.extracted_features,
+    TestResult.xai_explanation,
+]
+
+
+async def backfill_column(column, batch_size: int = 500) -> Tuple[int, int, int]:
+    """Compress one column. Returns (rows scanned, rows compressed, bytes saved)."""
+    table = column.table
+    id_column = table.c.id
+    stored = type_coerce(column, LargeBinary)  # bypass CompressedJSON decoding
+    column_type: CompressedJSON = column.type
+
+    scanned = compressed = saved = 0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(id_column, stored)
+                .where(id_column > last_id)
+                .where(column.isnot(None))
+                .order_by(id_column)
+                .limit(batch_size)
+            )).all()
+            if not rows:
+                break
+
+            updates: List[dict] = []
+            for row_id, value in rows:
+                packed = recompress(value, column_type.threshold, column_type.level)
+                if packed is not None:
+                    updates.append({"row_id": row_id, "payload": packed})
+                    saved += len(value) - len(packed)
+
+            if updates:
+                await db.execute(
+                    update(table)
+                    .where(id_column == bindparam("row_id"))
+                    .values({column.key: type_coerce(bindparam("payload"), LargeBinary)}),
+                    updates,
+                )
+                await db.commit()
+
+            scanned += len(rows)
+            compressed += len(updates)
+            last_id = rows[-1][0]
+
+    return scanned, compressed, saved
+
+
+async def run(batch_size: int = 500) -> None:
+    for column in COLUMNS:
+        scanned, compressed, saved = await backfill_column(column, batch_size)
+        print(
+            f"{column.table.name}.{column.key}: scanned {scanned}, "
+            f"compressed {compressed}, saved {saved / 1024 / 1024:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compress legacy plain-JSON rows in CompressedJSON columns")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
@@ -0,0 +1,23 @@
+"""
+Resumable upload cleanup job
+Aborts item uploads that were never finalized within
+RESUMABLE_UPLOAD_EXPIRY_HOURS and deletes their partial part files.
+
+Schedule hourly:
+    python -m app.jobs.expire_item_uploads
+"""
+
+import asyncio
+
+from app.db.database import AsyncSessionLocal
+from app.services.upload_service import UploadService
+
+
+async def run() -> None:
+    async with AsyncSessionLocal() as db:
+        purged = await UploadService(db).purge_expired()
+    print(f"Expired uploads purged: {purged}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,54 @@
+"""
+Global feature importance job
+Adds the results completed since the last run to each category's global
+feature importance for the active scoring version (or --version): a
+stratified sample of them is explained with the same SHAP explainers as
+single results (backgrounds reloaded first) and folded into the running
+sums in global_feature_importance. A new scoring or explainer version
+starts from the first result. Doctors read the stored summaries
+(GET /doctors/feature-importance).
+
+Schedule every 15 minutes:
+    python -m app.jobs.global_feature_importance [--version 2025-03]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.ml.fusion.batch_scoring import FEATURE_COLUMNS
+from app.ml.fusion.scoring_registry import get_scoring_registry
+from app.ml.xai.shap_explainer import get_explainer_cache
+from app.models import doctor_model, admin  # noqa: F401  (User relationships)
+from app.services.global_importance_service import GlobalImportanceService
+
+
+async def run(version: Optional[str] = None) -> None:
+    registry = get_scoring_registry()
+    scoring = await registry.get(version) if version else await registry.refresh(force=True)
+    if scoring is None:
+        raise SystemExit(f"Unknown version {version!r}")
+    backgrounds = await get_explainer_cache().load()
+    print(f"Scoring version: {scoring.version}, background rows: {backgrounds or 'reference profiles'}")
+
+    async with AsyncSessionLocal() as db:
+        service = GlobalImportanceService(db)
+        for category in FEATURE_COLUMNS:
+            started = time.monotonic()
+            total = 0
+            while True:  # Drain the backlog one batch (and commit) at a time
+                read = await service.refresh(category, scoring)
+                total += read
+                if read < settings.GLOBAL_IMPORTANCE_BATCH:
+                    break
+            print(f"  {category}: {total} new results ({time.monotonic() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update global feature importance with new results")
+    parser.add_argument("--version", help="Scoring version (default: the active one)")
+    args = parser.parse_args()
+    asyncio.run(run(args.version))
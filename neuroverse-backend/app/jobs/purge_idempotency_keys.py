@@ -0,0 +1,20 @@
+"""
+Idempotency key cleanup job
+Deletes stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL_HOURS.
+
+Schedule daily:
+    python -m app.jobs.purge_idempotency_keys
+"""
+
+import asyncio
+
+from app.core.idempotency import purge_expired_keys
+
+
+async def run() -> None:
+    purged = await purge_expired_keys()
+    print(f"Idempotency keys purged: {purged}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,28 @@
+"""
+User composite risk recompute job
+Rebuilds user_category_results and user_risk_sums from test_results and
+rewrites every user's composite AD/PD risk with the active scoring
+version's weights. Runs after a version is activated (scoring_versions);
+weekly it also clears float drift from the incrementally maintained sums.
+
+    python -m app.jobs.recompute_user_risk
+"""
+
+import asyncio
+
+from app.db.database import AsyncSessionLocal
+from app.ml.fusion.scoring_registry import get_scoring_registry
+from app.services.risk_aggregate_service import RiskAggregateService
+
+
+async def run() -> None:
+    scoring = await get_scoring_registry().refresh(force=True)
+    print(f"Scoring version: {scoring.version}")
+    async with AsyncSessionLocal() as db:
+        updated = await RiskAggregateService(db).recompute_all()
+        await db.commit()
+    print(f"Users recomputed: {updated}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,254 @@
+"""
+Batch re-scoring of stored test results
+Re-scores every test_results row from its stored extracted_features with a
+scoring version (the active one by default), after norms or scales change.
+
+test_results is split into id-range shards scored by a pool of worker
+processes. Each worker streams its shard with a server-side cursor, scores
+whole chunks as arrays (app/ml/fusion/batch_scoring.py) and writes back only
+the rows whose scores changed, in one bulk UPDATE per chunk that also
+advances the shard's checkpoint (rescore_checkpoints). Re-running the same
+run resumes it; a finished run does nothing. Users' composite risk is
+recomputed at the end. Stored explanations are regenerated on their next
+read (their xai_version names the scoring version they explain).
+
+    python -m app.jobs.rescore_results [--version 2025-03] [--run NAME] [--workers 4] [--chunk-size 2000]
+"""
+
+import argparse
+import asyncio
+import math
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, select, update
+
+from app.db.database import AsyncSessionLocal, engine
+from app.jobs import recompute_user_risk
+from app.ml.fusion.batch_scoring import score_features
+from app.ml.fusion.scoring_registry import ScoringConfig, get_scoring_registry
+from app.models import doctor_model, admin  # noqa: F401  (User relationships)
+from app.models.rescore_checkpoint import RescoreCheckpoint
+from app.models.test_result import TestResult
+from app.models.test_session import TestCategory, TestSession
+from app.services.fusion_service import CompositeFusionService
+
+SCORE_COLUMNS = ("ad_risk_score", "pd_risk_score", "category_score", "stage", "severity", "scoring_version")
+
+
+async def plan_run(run: str, scoring: ScoringConfig, shards: int) -> List[int]:
+    """Checkpoint ids of the run's unfinished shards, creating the shards on the first call."""
+    async with AsyncSessionLocal() as db:
+        checkpoints = (await db.execute(
+            select(RescoreCheckpoint).where(RescoreCheckpoint.run == run).order_by(RescoreCheckpoint.first_id)
+        )).scalars().all()
+
+        if checkpoints:
+            if checkpoints[0].scoring_version != scoring.version:
+                raise SystemExit(
+                    f"Run {run!r} re-scores with {checkpoints[0].scoring_version!r}, not {scoring.version!r}"
+                )
+            return [c.id for c in checkpoints if c.finished_at is None]
+
+        low, high = (await db.execute(select(func.min(TestResult.id), func.max(TestResult.id)))).one()
+        if low is None:
+            return []
+
+        step = math.ceil((high - low + 1) / shards)
+        await db.execute(insert(RescoreCheckpoint), [
+            {
+                "run": run,
+                "scoring_version": scoring.version,
+                "first_id": first_id,
+                "last_id": min(first_id + step - 1, high),
+                "done_through_id": first_id - 1,
+                "rows_scored": 0,
+                "rows_changed": 0,
+            }
+            for first_id in range(low, high + 1, step)
+        ])
+        await db.commit()
+
+        return (await db.execute(
+            select(RescoreCheckpoint.id).where(RescoreCheckpoint.run == run).order_by(RescoreCheckpoint.first_id)
+        )).scalars().all()
+
+
+async def rescore_shard(checkpoint_id: int, chunk_size: int) -> Tuple[int, int]:
+    """Score one shard from its checkpoint onwards. Returns (rows scored, rows changed)."""
+    async with AsyncSessionLocal() as db:
+        checkpoint = await db.get(RescoreCheckpoint, checkpoint_id)
+    scoring = await get_scoring_registry().get(checkpoint.scoring_version)
+    if scoring is None:
+        raise RuntimeError(f"Scoring version {checkpoint.scoring_version!r} no longer exists")
+    composite = CompositeFusionService(scoring)
+
+    scored = changed = 0
+    async with AsyncSessionLocal() as reader, AsyncSessionLocal() as writer:
+        rows = await reader.stream(
+            select(TestResult.id, TestSession.category, TestResult.extracted_features,
+                   *(getattr(TestResult, column) for column in SCORE_COLUMNS))
+            .join(TestSession, TestSession.id == TestResult.session_id)
+            .where(TestResult.id > checkpoint.done_through_id, TestResult.id <= checkpoint.last_id)
+            .order_by(TestResult.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for chunk in rows.partitions():
+            updates = rescore_chunk(chunk, scoring, composite)
+            if updates:
+                await writer.execute(update(TestResult), updates)
+            await writer.execute(
+                update(RescoreCheckpoint)
+                .where(RescoreCheckpoint.id == checkpoint_id)
+                .values(
+                    done_through_id=chunk[-1].id,
+                    rows_scored=RescoreCheckpoint.rows_scored + len(chunk),
+                    rows_changed=RescoreCheckpoint.rows_changed + len(updates),
+                )
+            )
+            await writer.commit()
+            scored += len(chunk)
+            changed += len(updates)
+
+        await writer.execute(
+            update(RescoreCheckpoint).where(RescoreCheckpoint.id == checkpoint_id).values(finished_at=func.now())
+        )
+        await writer.commit()
+
+    return scored, changed
+
+
+def rescore_chunk(rows: Sequence[Any], scoring: ScoringConfig, composite: CompositeFusionService) -> List[Dict[str, Any]]:
+    """Bulk-update parameter sets for the rows whose scores change."""
+    by_category: Dict[str, list] = defaultdict(list)
+    screenings = []
+    for row in rows:
+        if row.category == TestCategory.FULL_SCREENING.value:
+            screenings.append(row)
+        else:
+            by_category[row.category].append(row)
+
+    updates = []
+    for category, group in by_category.items():
+        scores = score_features(category, [row.extracted_features or {} for row in group], scoring)
+        for i, row in enumerate(group):
+            values = _result_values(scores.row(i), scoring)
+            if _changed(row, values):
+                updates.append({"id": row.id, **values})
+
+    if screenings:
+        updates += _rescore_screenings(screenings, scoring, composite)
+    return updates
+
+
+def _rescore_screenings(rows: Sequence[Any], scoring: ScoringConfig, composite: CompositeFusionService) -> List[Dict[str, Any]]:
+    """Re-score each category of full screenings (with validity) in bulk, then re-fuse every screening."""
+    features = [(row.extracted_features or {}).get("categories") or {} for row in rows]
+    category_results: List[Dict[str, dict]] = [{} for _ in rows]
+
+    by_category: Dict[str, List[int]] = defaultdict(list)
+    for i, categories in enumerate(features):
+        for category in categories:
+            by_category[category].append(i)
+
+    fusion = composite.fusion
+    for category, indices in by_category.items():
+        scores = fusion.score_batch(category, fusion.features_matrix(category, [features[i][category] for i in indices]))
+        for j, i in enumerate(indices):
+            category_results[i][category] = {
+                "ad_risk": scores["ad_risk"][j].item(),
+                "pd_risk": scores["pd_risk"][j].item(),
+                "category_score": scores["category_score"][j].item(),
+                "validity": {"status": scores["validity_status"][j], "is_valid": bool(scores["is_valid"][j])},
+            }
+
+    updates = []
+    for row, categories, results in zip(rows, features, category_results):
+        # Fuse in the stored category order, as the pipeline did
+        fused = composite.calculate_composite({category: results[category] for category in categories})
+        values = {
+            "ad_risk_score": fused["composite_ad_risk"],
+            "pd_risk_score": fused["composite_pd_risk"],
+            "category_score": fused["overall_score"],
+            "stage": fused["stage"],
+            "severity": fused["severity"],
+            "scoring_version": scoring.version,
+        }
+        stored = (row.extracted_features or {}).get("composite") or {}
+        if _changed(row, values) or stored.get("category_breakdown") != fused["category_breakdown"]:
+            # The breakdown feeds user_category_results (RiskAggregateService.recompute_all)
+            updates.append({"id": row.id, **values, "extracted_features": {**(row.extracted_features or {}), "composite": fused}})
+    return updates
+
+
+def _result_values(scores: Dict[str, Any], scoring: ScoringConfig) -> Dict[str, Any]:
+    return {
+        "ad_risk_score": scores["ad_risk"],
+        "pd_risk_score": scores["pd_risk"],
+        "category_score": scores["category_score"],
+        "stage": scores["stage"],
+        "severity": scores["severity"],
+        "scoring_version": scoring.version,
+    }
+
+
+def _changed(row: Any, values: Dict[str, Any]) -> bool:
+    return any(getattr(row, column) != values[column] for column in SCORE_COLUMNS)
+
+
+def _rescore_shard_process(checkpoint_id: int, chunk_size: int) -> Tuple[int, int]:
+    # Entry point in a worker process: own event loop and database connections
+    async def rescore() -> Tuple[int, int]:
+        try:
+            return await rescore_shard(checkpoint_id, chunk_size)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(rescore())
+
+
+async def run(
+    version: Optional[str] = None,
+    run_name: Optional[str] = None,
+    workers: int = 4,
+    chunk_size: int = 2000,
+    shards: Optional[int] = None,
+) -> None:
+    registry = get_scoring_registry()
+    scoring = await registry.get(version) if version else await registry.refresh(force=True)
+    if scoring is None:
+        raise SystemExit(f"Unknown version {version!r}")
+    run_name = run_name or scoring.version
+
+    pending = await plan_run(run_name, scoring, shards or workers * 4)
+    print(f"Run {run_name!r} with scoring version {scoring.version}: {len(pending)} shards to score")
+
+    started = time.monotonic()
+    scored = changed = 0
+    if pending:
+        loop = asyncio.get_running_loop()
+        # spawn: workers must not inherit the parent's event loop or connections
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            shard_jobs = [loop.run_in_executor(pool, _rescore_shard_process, checkpoint_id, chunk_size) for checkpoint_id in pending]
+            for done, shard in enumerate(asyncio.as_completed(shard_jobs), 1):
+                shard_scored, shard_changed = await shard
+                scored += shard_scored
+                changed += shard_changed
+                print(f"  {done}/{len(pending)} shards, {scored} rows scored, {changed} changed")
+
+    print(f"Rows scored: {scored}, changed: {changed} ({time.monotonic() - started:.1f}s)")
+    await recompute_user_risk.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score stored test results with a scoring version")
+    parser.add_argument("--version", help="Scoring version (default: the active one)")
+    parser.add_argument("--run", dest="run_name", help="Run name to resume (default: the version)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--shards", type=int, help="Id-range shards for a new run (default: 4 per worker)")
+    args = parser.parse_args()
+    asyncio.run(run(args.version, args.run_name, args.workers, args.chunk_size, args.shards))
@@ -0,0 +1,93 @@
+"""
+Scoring version management
+Imports norms/weights versions from JSON files and activates them. Workers
+switch to the active version within SCORING_REFRESH_SECONDS; activating
+also recomputes every user's composite risk with the new weights.
+
+    python -m app.jobs.scoring_versions list
+    python -m app.jobs.scoring_versions import norms-2025-03.json [--activate]
+    python -m app.jobs.scoring_versions activate 2025-03
+
+File format: {"version": "2025-03", "description": "...", "norms": {...},
+"weights": {"ad": {...}, "pd": {...}}, "scales": {...}} (see ScoringVersion).
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+
+from app.db.database import AsyncSessionLocal
+from app.jobs import recompute_user_risk
+from app.ml.fusion.scoring_registry import BUILTIN_VERSION, ScoringConfig
+from app.models.scoring_version import ScoringVersion
+
+
+async def list_versions() -> None:
+    async with AsyncSessionLocal() as db:
+        versions = (await db.execute(select(ScoringVersion).order_by(ScoringVersion.created_at))).scalars().all()
+    if not any(v.is_active for v in versions):
+        print(f"* {BUILTIN_VERSION} (built-in)")
+    for v in versions:
+        print(f"{'*' if v.is_active else ' '} {v.version}  {v.description or ''}")
+
+
+async def import_version(path: str, activate: bool = False) -> None:
+    with open(path) as f:
+        data = json.load(f)
+    version = data.pop("version")
+    description = data.pop("description", None)
+    if version == BUILTIN_VERSION:
+        raise SystemExit(f"{BUILTIN_VERSION!r} is reserved")
+
+    ScoringConfig(version, data)  # Fails on unknown norms or malformed scales
+
+    async with AsyncSessionLocal() as db:
+        db.add(ScoringVersion(version=version, config=data, description=description))
+        await db.commit()
+    print(f"Imported {version}")
+
+    if activate:
+        await activate_version(version)
+
+
+async def activate_version(version: str) -> None:
+    async with AsyncSessionLocal() as db:
+        exists = (await db.execute(
+            select(ScoringVersion.id).where(ScoringVersion.version == version)
+        )).scalar_one_or_none()
+        if exists is None and version != BUILTIN_VERSION:
+            raise SystemExit(f"Unknown version {version!r}")
+
+        # One transaction: readers see either the old or the new active version
+        await db.execute(update(ScoringVersion).values(is_active=False))
+        await db.execute(
+            update(ScoringVersion)
+            .where(ScoringVersion.version == version)
+            .values(is_active=True, activated_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+    print(f"Activated {version}")
+
+    await recompute_user_risk.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage versioned clinical norms and fusion weights")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List versions (* = active)")
+    import_parser = commands.add_parser("import", help="Import a version from a JSON file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--activate", action="store_true", help="Activate it after importing")
+    activate_parser = commands.add_parser("activate", help=f"Activate a version ({BUILTIN_VERSION!r} = built-in values)")
+    activate_parser.add_argument("version")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        asyncio.run(list_versions())
+    elif args.command == "import":
+        asyncio.run(import_version(args.path, activate=args.activate))
+    else:
+        asyncio.run(activate_version(args.version))
@@ -5,11 +5,15 @@ NeuroVerse FastAPI Application
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import os
 
 from app.core.config import settings
 from app.api.v1.router import api_router
 from app.db.database import engine, Base
+from app.ml.fusion.scoring_registry import get_scoring_registry
+from app.ml.xai.shap_explainer import get_explainer_cache
+from app.services.explanation_service import get_explanation_precomputer
 
 # Create uploads directory if it doesn't exist
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
@@ -66,6 +70,14 @@ async def startup():
     print(f"🚀 Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     print(f"📧 Email configured: {bool(settings.MAIL_USERNAME)}")
     print(f"🗄️ Database: Connected")
+    # Follow the active norms/weights version (hot-swapped, no restart needed)
+    app.state.scoring_refresh = asyncio.create_task(get_scoring_registry().run_refresh_loop())
+    # SHAP background samples of stored results (explainers compiled per scoring version)
+    app.state.explainer_refresh = asyncio.create_task(get_explainer_cache().run_refresh_loop())
+    # Explanations of new results while the worker is idle (else generated on first read)
+    app.state.explanation_precompute = (
+        asyncio.create_task(get_explanation_precomputer().run()) if settings.XAI_PRECOMPUTE else None
+    )
     # Uncomment below to auto-create tables (use Alembic in production)
     # async with engine.begin() as conn:
     #     await conn.run_sync(Base.metadata.create_all)
@@ -74,4 +86,8 @@ async def startup():
 @app.on_event("shutdown")
 async def shutdown():
     """Run on application shutdown."""
+    app.state.scoring_refresh.cancel()
+    app.state.explainer_refresh.cancel()
+    if app.state.explanation_precompute:
+        app.state.explanation_precompute.cancel()
     print("👋 Shutting down NeuroVerse API")
\ No newline at end of file
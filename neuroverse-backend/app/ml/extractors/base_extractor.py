@@ -0,0 +1,113 @@
+"""
+Base extractor helpers - access to sensor arrays in TestItem.raw_data
+Sensor streams arrive either as binary channels (raw_data["_channels"],
+little-endian arrays) or, from older clients, as JSON lists of dicts
+(raw_data["taps"] = [{"timestamp_ms": ..., "x": ...}, ...]). Extractors read
+both through the same numpy interface.
+
+Large channels and uploaded files (raw_data["_attachments"]) are references
+into the blob store and are memory-mapped rather than loaded. Items streamed
+live over the WebSocket also carry their online features (raw_data["_features"]),
+and fingerprinted items their payload SimHash and any earlier submission
+they duplicate (raw_data["_fingerprint"]).
+"""
+
+import base64
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+import numpy as np
+
+from app.core.blob_store import get_blob_store
+
+CHANNELS_KEY = "_channels"
+ATTACHMENTS_KEY = "_attachments"
+FEATURES_KEY = "_features"
+FINGERPRINT_KEY = "_fingerprint"
+
+
+def decode_channel(channel: Mapping[str, Any]) -> np.ndarray:
+    """
+    Decode one stored channel: {"dtype": "<f4", "data": <base64 or bytes>}
+    inline, or {"dtype": "<f4", "blob": <sha256>, "size": n} in the blob store.
+
+    The array is a read-only view (np.frombuffer) over the decoded buffer or
+    the blob's memory map, no per-element conversion.
+    """
+    if "blob" in channel:
+        return get_blob_store().array(channel["blob"], channel["dtype"], channel.get("size"))
+    data = channel["data"]
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    return np.frombuffer(data, dtype=np.dtype(channel["dtype"]))
+
+
+def get_channel(raw: Optional[Mapping[str, Any]], name: str) -> Optional[np.ndarray]:
+    """Binary channel "<stream>.<field>" from raw_data, or None if not sent that way."""
+    channels = (raw or {}).get(CHANNELS_KEY) or {}
+    channel = channels.get(name)
+    return decode_channel(channel) if channel else None
+
+
+def stream_columns(
+    raw: Optional[Mapping[str, Any]],
+    stream: str,
+    fields: Iterable[str],
+    dtype: str = "<f8",
+) -> Dict[str, np.ndarray]:
+    """
+    Columns of a sensor stream, e.g. stream_columns(raw, "taps", ["timestamp_ms"]).
+
+    Prefers binary channels; falls back to the legacy list-of-dicts JSON shape.
+    Fields missing from both are omitted from the result.
+    """
+    raw = raw or {}
+    records = raw.get(stream)
+    columns: Dict[str, np.ndarray] = {}
+
+    for field in fields:
+        array = get_channel(raw, f"{stream}.{field}")
+        if array is None and isinstance(records, list) and records and isinstance(records[0], Mapping):
+            if field in records[0]:
+                array = np.fromiter(
+                    (r.get(field, np.nan) for r in records), dtype=np.dtype(dtype), count=len(records)
+                )
+        if array is not None:
+            columns[field] = array
+
+    return columns
+
+
+def stream_length(raw: Optional[Mapping[str, Any]], stream: str) -> int:
+    """Number of samples in a stream, whichever encoding it was sent in."""
+    raw = raw or {}
+    prefix = f"{stream}."
+    for name, channel in (raw.get(CHANNELS_KEY) or {}).items():
+        if name.startswith(prefix):
+            if "blob" in channel:
+                return channel["size"] // np.dtype(channel["dtype"]).itemsize
+            data = channel["data"]
+            size = len(data) * 3 // 4 - data[-2:].count("=") if isinstance(data, str) else len(data)
+            return size // np.dtype(channel["dtype"]).itemsize
+    records = raw.get(stream)
+    return len(records) if isinstance(records, list) else 0
+
+
+def duplicate_of(raw: Optional[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Earlier submission this item's payload duplicates ({"session_id", "distance", "same_user"}), if any."""
+    return ((raw or {}).get(FINGERPRINT_KEY) or {}).get("duplicate_of")
+
+
+def get_attachment(raw: Optional[Mapping[str, Any]], name: str):
+    """Memory map of an uploaded file (audio, video, ...) or None if absent."""
+    attachment = ((raw or {}).get(ATTACHMENTS_KEY) or {}).get(name)
+    if not attachment:
+        return None
+    return get_blob_store().open(attachment["blob"], attachment.get("size"))
+
+
+def attachment_path(raw: Optional[Mapping[str, Any]], name: str) -> Optional[str]:
+    """Filesystem path of an uploaded file, for libraries that only take paths."""
+    attachment = ((raw or {}).get(ATTACHMENTS_KEY) or {}).get(name)
+    if not attachment:
+        return None
+    return get_blob_store().checked_path(attachment["blob"], attachment.get("size"))
@@ -0,0 +1,89 @@
+"""
+Gait extractor - walking test features from the accelerometer stream
+Steps are upward crossings of the gravity-removed acceleration magnitude,
+at least STEP_MIN_INTERVAL_MS apart. The same OnlineGaitExtractor runs on
+live WebSocket chunks and on stored items.
+"""
+
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+from app.ml.extractors.base_extractor import stream_columns
+from app.ml.extractors.online_stats import RunningStats, WindowedSpectrum
+
+GRAVITY = 9.80665  # accelerometer_data includes gravity (m/s^2)
+STEP_THRESHOLD = 1.5  # m/s^2 above gravity
+STEP_MIN_INTERVAL_MS = 250
+SPECTRUM_WINDOW = 256
+
+
+class OnlineGaitExtractor:
+    """Incremental walking features: steps, cadence, regularity, dominant frequency."""
+
+    stream = "accelerometer_data"
+    fields = ("x", "y", "z", "timestamp")
+
+    def __init__(self):
+        self.samples = 0
+        self.steps = 0
+        self.magnitude = RunningStats()
+        self.step_intervals = RunningStats()  # ms
+        self.spectrum = WindowedSpectrum(SPECTRUM_WINDOW)
+        self._first_ts: Optional[float] = None
+        self._last_ts: Optional[float] = None
+        self._last_step_ts: Optional[float] = None
+        self._prev_dynamic = -np.inf
+
+    def update(self, columns: Mapping[str, np.ndarray]) -> None:
+        x, y, z, t = (np.asarray(columns[field], dtype=np.float64) for field in self.fields)
+        if not len(t):
+            return
+
+        magnitude = np.sqrt(x * x + y * y + z * z)
+        dynamic = magnitude - GRAVITY
+        self.magnitude.update(magnitude)
+        self.spectrum.update(dynamic)
+
+        previous = np.concatenate(([self._prev_dynamic], dynamic[:-1]))
+        crossings = np.flatnonzero((previous < STEP_THRESHOLD) & (dynamic >= STEP_THRESHOLD))
+        intervals = []
+        for i in crossings:
+            ts = t[i]
+            if self._last_step_ts is not None:
+                if ts - self._last_step_ts < STEP_MIN_INTERVAL_MS:
+                    continue
+                intervals.append(ts - self._last_step_ts)
+            self._last_step_ts = ts
+            self.steps += 1
+        self.step_intervals.update(np.asarray(intervals))
+
+        if self._first_ts is None:
+            self._first_ts = float(t[0])
+        self._last_ts = float(t[-1])
+        self._prev_dynamic = float(dynamic[-1])
+        self.samples += len(t)
+
+    def features(self) -> Dict[str, Any]:
+        duration = (self._last_ts - self._first_ts) / 1000.0 if self.samples > 1 else 0.0
+        sample_rate = (self.samples - 1) / duration if duration > 0 else 0.0
+        mean_interval = self.step_intervals.mean
+
+        return {
+            "steps": self.steps,
+            "walk_duration": duration,
+            "cadence": 60000.0 / mean_interval if mean_interval > 0 else 0.0,  # steps/min
+            "step_regularity": max(0.0, 1.0 - self.step_intervals.std / mean_interval) if mean_interval > 0 else 0.0,
+            "acc_magnitude_std": self.magnitude.std,
+            "gait_dominant_freq": self.spectrum.dominant_frequency(sample_rate),
+        }
+
+
+def extract_walking_features(raw: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Walking features from a stored item's accelerometer stream ({} if absent)."""
+    columns = stream_columns(raw, OnlineGaitExtractor.stream, OnlineGaitExtractor.fields)
+    if len(columns) < len(OnlineGaitExtractor.fields):
+        return {}
+    extractor = OnlineGaitExtractor()
+    extractor.update(columns)
+    return extractor.features()
@@ -0,0 +1,77 @@
+"""
+Motor extractor - finger tapping features from tap timestamps
+Shared by the live WebSocket stream (chunk by chunk) and stored items.
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from app.ml.extractors.base_extractor import stream_columns
+from app.ml.extractors.online_stats import RunningStats
+
+FATIGUE_WINDOW = 10  # intervals compared at the start vs the end of the test
+
+
+class OnlineTappingExtractor:
+    """Incremental tapping rate, regularity and fatigue."""
+
+    stream = "taps"
+    fields = ("timestamp_ms",)
+
+    def __init__(self):
+        self.taps = 0
+        self.intervals = RunningStats()  # seconds
+        self._first_intervals: List[float] = []
+        self._last_intervals = deque(maxlen=FATIGUE_WINDOW)
+        self._first_ts: Optional[float] = None
+        self._last_ts: Optional[float] = None
+
+    def update(self, columns: Mapping[str, np.ndarray]) -> None:
+        t = np.asarray(columns["timestamp_ms"], dtype=np.float64)
+        if not len(t):
+            return
+
+        if self._last_ts is not None:
+            t_with_previous = np.concatenate(([self._last_ts], t))
+        else:
+            t_with_previous = t
+            self._first_ts = float(t[0])
+        intervals = np.diff(t_with_previous) / 1000.0
+
+        self.intervals.update(intervals)
+        missing = FATIGUE_WINDOW - len(self._first_intervals)
+        if missing > 0:
+            self._first_intervals.extend(intervals[:missing].tolist())
+        self._last_intervals.extend(intervals[-FATIGUE_WINDOW:].tolist())
+
+        self._last_ts = float(t[-1])
+        self.taps += len(t)
+
+    def features(self) -> Dict[str, Any]:
+        span = (self._last_ts - self._first_ts) / 1000.0 if self.taps > 1 else 0.0
+        mean_interval = self.intervals.mean
+
+        fatigue = 0.0
+        if self.intervals.count >= 2 * FATIGUE_WINDOW:
+            start = float(np.mean(self._first_intervals))
+            end = float(np.mean(self._last_intervals))
+            fatigue = (end - start) / start if start > 0 else 0.0  # > 0: slowing down
+
+        return {
+            "tapping_rate": (self.taps - 1) / span if span > 0 else 0,
+            "tapping_regularity": max(0.0, 1.0 - self.intervals.std / mean_interval) if mean_interval > 0 else 0,
+            "tapping_fatigue": fatigue,
+            "tapping_total": self.taps,
+        }
+
+
+def extract_tapping_features(raw: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Tapping features from a stored item's tap timestamps ({} if fewer than two taps)."""
+    timestamps = stream_columns(raw, OnlineTappingExtractor.stream, OnlineTappingExtractor.fields).get("timestamp_ms")
+    if timestamps is None or len(timestamps) < 2:
+        return {}
+    extractor = OnlineTappingExtractor()
+    extractor.update({"timestamp_ms": timestamps})
+    return extractor.features()
@@ -0,0 +1,80 @@
+"""
+Online statistics shared by the batch and live (WebSocket) extractors
+Every accumulator takes samples in chunks of any size and gives the same
+result as one pass over the whole recording, so a live stream and a stored
+item produce the same features.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class RunningStats:
+    """Welford mean/variance, merged a chunk at a time (Chan et al.)."""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: np.ndarray) -> None:
+        n = len(values)
+        if not n:
+            return
+        chunk_mean = float(np.mean(values))
+        chunk_m2 = float(np.sum((values - chunk_mean) ** 2))
+
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        """Population variance (as np.var)."""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+
+class WindowedSpectrum:
+    """
+    Average magnitude spectrum over consecutive non-overlapping windows.
+
+    Samples that don't fill a window yet are carried to the next update;
+    a trailing partial window is ignored.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.windows = 0
+        self._taper = np.hanning(window)
+        self._pending = np.empty(0)
+        self._total: Optional[np.ndarray] = None
+
+    def update(self, values: np.ndarray) -> None:
+        buffer = np.concatenate((self._pending, values)) if len(self._pending) else np.asarray(values, dtype=np.float64)
+        count = len(buffer) // self.window
+        if count:
+            frames = buffer[:count * self.window].reshape(count, self.window)
+            frames = frames - frames.mean(axis=1, keepdims=True)
+            spectra = np.abs(np.fft.rfft(frames * self._taper, axis=1))
+            if self._total is None:
+                self._total = np.zeros(spectra.shape[1])
+            for spectrum in spectra:  # window by window, so chunking doesn't change the sum
+                self._total += spectrum
+            self.windows += count
+        self._pending = buffer[count * self.window:].copy()
+
+    def dominant_frequency(self, sample_rate: float) -> float:
+        """Frequency (Hz) of the strongest non-DC bin, 0 before the first full window."""
+        if not self.windows or sample_rate <= 0:
+            return 0.0
+        peak = int(np.argmax(self._total[1:])) + 1
+        return peak * sample_rate / self.window
@@ -0,0 +1,390 @@
+"""
+Batch scoring - Vectorized FusionService category assessments
+Scores a whole chunk of feature sets as numpy arrays with exactly the
+rules (and norms/scales of a ScoringConfig) that FusionService applies to
+one dict at a time: same risks, category scores and stage/severity labels.
+Clinical notes and interpretations are per-record only.
+
+A category's matrix has its FEATURE_COLUMNS followed by the features the
+validity checks read (see matrix_columns()); NaN marks an absent feature.
+Exposed as FusionService.score_batch / ValidityDetector.assess_batch and
+used to re-score stored results in bulk (app/jobs/rescore_results.py).
+"""
+
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.ml.fusion.clinical_norms import ClinicalNorms, CognitiveStage, ParkinsonStage
+from app.ml.fusion.scoring_registry import ScoringConfig
+
+# Feature columns of each category's matrix and the value used when a
+# feature is missing (the default of FusionService's features.get()).
+FEATURE_COLUMNS: Dict[str, Tuple[Tuple[str, float], ...]] = {
+    "cognitive": (
+        ("stroop_accuracy", 0), ("stroop_interference", 100), ("stroop_mean_rt", 0),
+        ("nback_accuracy", 0), ("nback_dprime", 0),
+        ("recall_accuracy", 0), ("delayed_recall_accuracy", 0), ("recognition_accuracy", 0),
+    ),
+    "speech": (
+        ("story_recall_accuracy", 0), ("vowel_duration", 0), ("speech_rate", 0), ("fluency_word_count", 0),
+    ),
+    "motor": (
+        ("tapping_rate", 0), ("tapping_regularity", 0), ("tapping_fatigue", 0),
+        ("spiral_duration", 0), ("spiral_tremor", 0),
+    ),
+    "gait": (
+        ("steps", 0), ("gait_speed", 0), ("step_regularity", 0),
+        ("balance_duration", 0), ("balance_sway", 0), ("balance_stability", 0),
+    ),
+    "facial": (
+        ("blink_rate", 0), ("smile_count", 0), ("smile_intensity", 0),
+    ),
+}
+
+# Features ValidityDetector reads (absent != 0 there). The two response
+# counts are derived from the "reaction_times" list when stacking dicts.
+VALIDITY_COLUMNS: Tuple[str, ...] = (
+    "nback_accuracy", "recognition_accuracy", "recall_accuracy", "stroop_accuracy", "tapping_regularity",
+    "stroop_congruent_accuracy", "stroop_incongruent_accuracy",
+    "simple_reaction_time", "choice_reaction_time",
+    "easy_items_correct", "hard_items_correct", "cognitive_score", "motor_score", "duplicate_items",
+    "too_fast_responses", "too_slow_responses",
+)
+
+COGNITIVE_STAGES = np.array([
+    CognitiveStage.NORMAL.value,
+    CognitiveStage.MCI.value,
+    CognitiveStage.MILD_DEMENTIA.value,
+    CognitiveStage.MODERATE_DEMENTIA.value,
+    CognitiveStage.SEVERE_DEMENTIA.value,
+], dtype=object)
+
+HOEHN_YAHR_STAGES = np.array([
+    ParkinsonStage.STAGE_0.value,
+    ParkinsonStage.STAGE_1.value,
+    ParkinsonStage.STAGE_2.value,
+    ParkinsonStage.STAGE_3.value,
+], dtype=object)
+
+COGNITIVE_DOMAIN_MAX = 6 + 5 + 5 + 5 + 4 + 3 + 3  # Sum of the seven MoCA-style domain maxima
+
+
+class BatchScores(NamedTuple):
+    """One entry per input row, rounded like FusionService's results."""
+    ad_risk: np.ndarray
+    pd_risk: np.ndarray
+    category_score: np.ndarray
+    stage: np.ndarray
+    severity: np.ndarray
+    ad_stage: np.ndarray
+    pd_stage: np.ndarray
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Row i as a risk_scores-style dict."""
+        return {field: value[i].item() if isinstance(value[i], np.generic) else value[i]
+                for field, value in zip(self._fields, self)}
+
+
+def matrix_columns(category: str) -> Tuple[str, ...]:
+    """Column names of a category's feature matrix, in order."""
+    scored = tuple(name for name, _ in FEATURE_COLUMNS.get(category, ()))
+    return scored + tuple(name for name in VALIDITY_COLUMNS if name not in scored)
+
+
+def features_matrix(
+    category: str, features: Sequence[Mapping[str, Any]], norms: Optional[ClinicalNorms] = None
+) -> np.ndarray:
+    """
+    Stack feature dicts into the category's matrix (see matrix_columns()).
+
+    Missing and null features are NaN; the response-time counts use the
+    norms' valid range, as ValidityDetector does.
+    """
+    norms = norms or ClinicalNorms()
+    columns = matrix_columns(category)[:-2]
+    matrix = np.empty((len(features), len(columns) + 2))
+    matrix[:, :-2] = np.array(
+        [[row.get(name) for name in columns] for row in features],
+        dtype=float,
+    ).reshape(len(features), len(columns))
+
+    for i, row in enumerate(features):
+        reaction_times = row.get("reaction_times") or []
+        too_fast = too_slow = 0
+        if len(reaction_times) > 5:
+            for rt in reaction_times:
+                if rt < norms.RT_MIN_VALID:
+                    too_fast += 1
+                elif rt > norms.RT_MAX_VALID:
+                    too_slow += 1
+        matrix[i, -2:] = too_fast, too_slow
+    return matrix
+
+
+def score_batch(category: str, matrix: np.ndarray, scoring: ScoringConfig) -> BatchScores:
+    """Score every row of a category's feature matrix (validity aside)."""
+    matrix = _with_defaults(category, matrix)
+    n = matrix.shape[0]
+
+    if category == "cognitive":
+        ad_risk, pd_risk, category_score, stage = _cognitive(matrix, scoring.norms)
+        stage = COGNITIVE_STAGES[stage]
+        severity = scoring.severity.map(ad_risk)
+        ad_stage = stage
+        pd_stage = scoring.pd_stage.map(pd_risk)
+    elif category == "speech":
+        ad_risk, pd_risk, category_score = _speech(matrix, scoring.norms)
+        worst = np.maximum(ad_risk, pd_risk)
+        stage = scoring.stage.map(worst)
+        severity = scoring.severity.map(worst)
+        ad_stage = scoring.ad_stage.map(ad_risk)
+        pd_stage = scoring.pd_stage.map(pd_risk)
+    elif category in ("motor", "gait"):
+        assess = _motor if category == "motor" else _gait
+        ad_risk, pd_risk, category_score, hoehn_yahr = assess(matrix, scoring.norms)
+        stage = pd_stage = HOEHN_YAHR_STAGES[hoehn_yahr]
+        severity = scoring.severity.map(pd_risk)
+        ad_stage = scoring.ad_stage.map(ad_risk)
+    elif category == "facial":
+        ad_risk, pd_risk, category_score = _facial(matrix, scoring.norms)
+        stage = scoring.stage.map(pd_risk)
+        severity = scoring.severity.map(pd_risk)
+        ad_stage = scoring.ad_stage.map(ad_risk)
+        pd_stage = scoring.pd_stage.map(pd_risk)
+    else:
+        # FusionService._default_assessment
+        ad_risk = pd_risk = np.zeros(n)
+        category_score = np.full(n, 50.0)
+        stage = np.full(n, "Unknown", dtype=object)
+        severity = np.full(n, "low", dtype=object)
+        ad_stage = np.full(n, CognitiveStage.NORMAL.value, dtype=object)
+        pd_stage = np.full(n, ParkinsonStage.STAGE_0.value, dtype=object)
+
+    return BatchScores(
+        ad_risk=round_half_even(ad_risk, 2),
+        pd_risk=round_half_even(pd_risk, 2),
+        category_score=round_half_even(category_score, 2),
+        stage=stage,
+        severity=severity,
+        ad_stage=ad_stage,
+        pd_stage=pd_stage,
+    )
+
+
+def risk_batch(category: str, matrix: np.ndarray, norms: ClinicalNorms) -> np.ndarray:
+    """
+    Unrounded (AD risk, PD risk) of every row, shape (n, 2).
+
+    Only the category's FEATURE_COLUMNS are read, so the matrix may stop
+    after them. These are the model outputs ShapExplainer attributes.
+    """
+    matrix = _with_defaults(category, matrix)
+    assess = {"cognitive": _cognitive, "speech": _speech, "motor": _motor, "gait": _gait, "facial": _facial}.get(category)
+    if assess is None:
+        return np.zeros((matrix.shape[0], 2))
+    ad_risk, pd_risk = assess(matrix, norms)[:2]
+    return np.column_stack([ad_risk, pd_risk])
+
+
+def score_features(
+    category: str, features: Sequence[Mapping[str, Any]], scoring: ScoringConfig
+) -> BatchScores:
+    """score_batch() over feature dicts."""
+    return score_batch(category, features_matrix(category, features, scoring.norms), scoring)
+
+
+def round_half_even(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    Python's round(value, digits) for every element.
+
+    np.round scales by 10**digits first, which can land a value on the other
+    side of a .5 tie; those few elements are rounded with round() itself.
+    """
+    rounded = np.round(values, digits)
+    scaled = values * 10.0 ** digits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        # Scores take few distinct values, so round each distinct one once
+        ties, positions = np.unique(values[near_tie], return_inverse=True)
+        rounded[near_tie] = np.array([round(float(tie), digits) for tie in ties])[positions]
+    return rounded
+
+
+def _with_defaults(category: str, matrix: np.ndarray) -> np.ndarray:
+    """The scored columns, absent features set to FusionService's features.get() defaults."""
+    columns = FEATURE_COLUMNS.get(category, ())
+    scored = np.asarray(matrix, dtype=float)[:, :len(columns)]
+    return np.where(np.isnan(scored), np.array([default for _, default in columns], dtype=float), scored)
+
+
+# ============== CATEGORY ASSESSMENTS ==============
+# Each mirrors the FusionService._assess_* method of the same name, branch
+# for branch; np.select picks the first matching condition like an if/elif.
+
+def _cognitive(x: np.ndarray, norms: ClinicalNorms) -> Tuple[np.ndarray, ...]:
+    (stroop_accuracy, stroop_interference, stroop_rt, nback_accuracy, nback_dprime,
+     recall_accuracy, delayed_recall, recognition_accuracy) = x.T
+
+    # Stroop -> attention, executive function, processing speed
+    stroop = stroop_accuracy > 0
+    attention = np.where(stroop, np.select(
+        [stroop_accuracy >= 0.95, stroop_accuracy >= 0.85, stroop_accuracy >= 0.70], [3, 2, 1], 0), 0)
+    executive = np.where(stroop, np.select(
+        [stroop_interference <= norms.STROOP_INTERFERENCE_NORMAL, stroop_interference <= 30,
+         stroop_interference <= norms.STROOP_INTERFERENCE_IMPAIRED], [3, 2, 1], 0), 0)
+    speed = np.where(stroop, np.select(
+        [(stroop_rt > 0) & (stroop_rt < 800), stroop_rt < 1200], [2, 1], 0), 0)
+
+    # N-back -> working memory (+ attention)
+    nback = nback_accuracy > 0
+    working_memory = np.where(nback, np.select(
+        [nback_accuracy >= norms.NBACK_ACCURACY_NORMAL, nback_accuracy >= norms.NBACK_ACCURACY_MCI,
+         nback_accuracy >= norms.NBACK_ACCURACY_IMPAIRED], [3, 2, 1], 0)
+        + (nback_dprime >= norms.NBACK_DPRIME_NORMAL), 0)
+    attention = attention + np.where(nback, np.select(
+        [nback_accuracy >= norms.NBACK_ACCURACY_NORMAL, nback_accuracy >= norms.NBACK_ACCURACY_MCI], [2, 1], 0), 0)
+
+    # Word recall -> memory
+    memory_immediate = np.where(recall_accuracy > 0, np.select(
+        [recall_accuracy >= norms.RECALL_IMMEDIATE_NORMAL, recall_accuracy >= 0.60,
+         recall_accuracy >= norms.RECALL_IMMEDIATE_MCI], [5, 4, 2], 1), 0)
+    memory_immediate = memory_immediate + (
+        (recognition_accuracy > 0) & (recognition_accuracy >= norms.RECALL_RECOGNITION_NORMAL))
+    memory_delayed = np.where(delayed_recall > 0, np.select(
+        [delayed_recall >= norms.RECALL_DELAYED_NORMAL, delayed_recall >= 0.55,
+         delayed_recall >= norms.RECALL_DELAYED_MCI], [5, 3, 1], 0), 0)
+
+    total_earned = attention + executive + speed + working_memory + memory_immediate + memory_delayed
+    moca = (total_earned / COGNITIVE_DOMAIN_MAX) * 30
+
+    stage = np.select(
+        [moca >= norms.MOCA_NORMAL, moca >= norms.MOCA_MCI_CUTOFF, moca >= norms.MOCA_DEMENTIA_CUTOFF, moca >= 10],
+        [0, 1, 2, 3], 4)
+    ad_risk = np.select(
+        [stage == 0, stage == 1, stage == 2, stage == 3],
+        [np.maximum(0, (30 - moca) * 1.5), 15 + (26 - moca) * 5, 35 + (22 - moca) * 5, 60 + (17 - moca) * 3],
+        80 + (10 - moca) * 2)
+    ad_risk = np.minimum(100, np.maximum(0, ad_risk))
+
+    return ad_risk, ad_risk * 0.25, (moca / 30) * 100, stage
+
+
+def _speech(x: np.ndarray, norms: ClinicalNorms) -> Tuple[np.ndarray, ...]:
+    story_accuracy, vowel_duration, speech_rate, word_count = x.T
+    max_ad = max_pd = 10
+
+    ad_score = np.where(story_accuracy > 0, np.select(
+        [story_accuracy >= 0.80, story_accuracy >= 0.60, story_accuracy >= 0.40], [5, 3, 1], 0), 0)
+    pd_score = np.where(vowel_duration > 0, np.select(
+        [vowel_duration >= norms.VOWEL_DURATION_NORMAL, vowel_duration >= norms.VOWEL_DURATION_IMPAIRED,
+         vowel_duration >= 5], [5, 3, 1], 0), 0)
+
+    normal_rate = (speech_rate > 0) & (norms.SPEECH_RATE_NORMAL_MIN <= speech_rate) & (speech_rate <= norms.SPEECH_RATE_NORMAL_MAX)
+    ad_score = ad_score + 2 * normal_rate
+    pd_score = pd_score + 2 * normal_rate
+
+    ad_score = ad_score + np.where(word_count > 0, np.select(
+        [word_count >= norms.FLUENCY_NORMAL, word_count >= norms.FLUENCY_MCI, word_count >= norms.FLUENCY_IMPAIRED],
+        [3, 2, 1], 0), 0)
+
+    category_score = ((ad_score + pd_score) / (max_ad + max_pd)) * 100
+    return (1 - ad_score / max_ad) * 25, (1 - pd_score / max_pd) * 25, category_score
+
+
+def _motor(x: np.ndarray, norms: ClinicalNorms) -> Tuple[np.ndarray, ...]:
+    tapping_rate, tapping_regularity, tapping_fatigue, spiral_duration, spiral_tremor = x.T
+
+    # Bradykinesia (UPDRS 3.4)
+    has_tapping = tapping_rate > 0
+    bradykinesia = np.select(
+        [
+            (tapping_rate >= norms.TAPPING_NORMAL_MIN) & (tapping_regularity >= 0.90) & (tapping_fatigue <= 0.10),
+            (tapping_rate >= norms.TAPPING_NORMAL_MIN) & (tapping_regularity >= 0.80),
+            tapping_rate >= norms.TAPPING_NORMAL_MIN,
+            (tapping_rate >= norms.TAPPING_PD_THRESHOLD) & (tapping_regularity >= 0.70),
+            tapping_rate >= norms.TAPPING_PD_THRESHOLD,
+            tapping_rate >= 2.0,
+        ],
+        [0, 1, 2, 2, 3, 3], 4)
+
+    # Tremor (UPDRS 3.15-3.18)
+    has_spiral = spiral_duration != 0
+    tremor = np.select(
+        [spiral_tremor <= 0.10, spiral_tremor <= 0.25, spiral_tremor <= 0.50, spiral_tremor <= 0.75],
+        [0, 1, 2, 3], 4)
+
+    return _updrs_scores(
+        [(has_tapping, bradykinesia), (has_spiral, tremor)], None, risk_scale=60, ad_factor=0.1)
+
+
+def _gait(x: np.ndarray, norms: ClinicalNorms) -> Tuple[np.ndarray, ...]:
+    steps, gait_speed, step_regularity, balance_duration, balance_sway, balance_stability = x.T
+
+    # Gait (UPDRS 3.10)
+    has_walk = steps != 0
+    gait = np.select(
+        [
+            (gait_speed >= norms.GAIT_SPEED_NORMAL) & (step_regularity >= 0.90),
+            gait_speed >= norms.GAIT_SPEED_SLOW,
+            gait_speed >= norms.GAIT_SPEED_VERY_SLOW,
+        ],
+        [0, 1, 2], 3)
+
+    # Postural stability (UPDRS 3.12)
+    has_balance = balance_duration != 0
+    postural = np.select(
+        [
+            (balance_sway <= norms.SWAY_NORMAL) & (balance_stability >= 0.90),
+            balance_sway <= 0.4,
+            balance_sway <= norms.SWAY_ABNORMAL,
+        ],
+        [0, 1, 2], 3)
+
+    return _updrs_scores(
+        [(has_walk, gait), (has_balance, postural)], np.where(has_balance, postural, 0), risk_scale=40, ad_factor=0.15)
+
+
+def _facial(x: np.ndarray, norms: ClinicalNorms) -> Tuple[np.ndarray, ...]:
+    blink_rate, smile_count, smile_intensity = x.T
+
+    # Blink rate / hypomimia (UPDRS 3.2)
+    has_blink = blink_rate > 0
+    blink = np.select(
+        [
+            (norms.BLINK_NORMAL_MIN <= blink_rate) & (blink_rate <= norms.BLINK_NORMAL_MAX),
+            blink_rate >= 12,
+            blink_rate >= norms.BLINK_PD_THRESHOLD,
+        ],
+        [0, 1, 2], 3)
+
+    has_smile = smile_count != 0
+    expression = np.select(
+        [smile_intensity >= 0.80, smile_intensity >= 0.60, smile_intensity >= 0.40], [0, 1, 2], 3)
+
+    ad_risk, pd_risk, category_score, _ = _updrs_scores(
+        [(has_blink, blink), (has_smile, expression)], None, risk_scale=20, ad_factor=0.05)
+    return ad_risk, pd_risk, category_score
+
+
+def _updrs_scores(
+    items: List[Tuple[np.ndarray, np.ndarray]],
+    postural: Any,
+    risk_scale: float,
+    ad_factor: float,
+) -> Tuple[np.ndarray, ...]:
+    """Risks, health score and Hoehn & Yahr index from the UPDRS items each row has."""
+    total = sum(np.where(present, score, 0) for present, score in items)
+    assessed = sum(present.astype(int) for present, _ in items)
+    max_score = np.where(assessed > 0, assessed * 4, 8)
+
+    health = ((max_score - total) / max_score) * 100
+    pd_risk = (total / max_score) * risk_scale
+
+    # FusionService._calculate_hoehn_yahr
+    postural = 0 if postural is None else postural
+    hoehn_yahr = np.select(
+        [total == 0, (total <= 4) & (postural <= 1), (total <= 8) & (postural <= 1), postural >= 2],
+        [0, 1, 2, 3], 2)
+
+    return pd_risk * ad_factor, pd_risk, health, hoehn_yahr
@@ -0,0 +1,192 @@
+"""
+Clinical norms - Built-in normative cutoffs, stage scales and fusion weights
+These are the defaults ("builtin" scoring version); the scoring registry
+(app/ml/fusion/scoring_registry.py) overrides them with versioned configs.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+
+
+# ==================== STAGES ====================
+
+class CognitiveStage(Enum):
+    """Clinical Dementia Rating (CDR) based staging"""
+    NORMAL = "Normal"
+    SUBJECTIVE_DECLINE = "Subjective Cognitive Decline"
+    MCI = "Mild Cognitive Impairment"
+    MILD_DEMENTIA = "Mild Dementia"
+    MODERATE_DEMENTIA = "Moderate Dementia"
+    SEVERE_DEMENTIA = "Severe Dementia"
+
+
+class ParkinsonStage(Enum):
+    """Hoehn & Yahr Scale"""
+    STAGE_0 = "No signs of disease"
+    STAGE_1 = "Unilateral involvement only"
+    STAGE_1_5 = "Unilateral and axial involvement"
+    STAGE_2 = "Bilateral without balance impairment"
+    STAGE_2_5 = "Mild bilateral with recovery on pull test"
+    STAGE_3 = "Mild-moderate bilateral; postural instability"
+    STAGE_4 = "Severe disability; able to walk/stand unassisted"
+    STAGE_5 = "Wheelchair bound or bedridden"
+
+
+# ==================== CLINICAL NORMS ====================
+
+@dataclass
+class ClinicalNorms:
+    """
+    Age-adjusted normative data from peer-reviewed literature
+    """
+    
+    # ===== MoCA (Nasreddine et al., 2005) =====
+    MOCA_MAX = 30
+    MOCA_NORMAL = 26          # ≥26 normal
+    MOCA_MCI_CUTOFF = 22      # 22-25 MCI
+    MOCA_DEMENTIA_CUTOFF = 17 # <17 dementia
+    
+    # ===== MMSE (Folstein et al., 1975) =====
+    MMSE_MAX = 30
+    MMSE_NORMAL = 27          # 27-30 normal
+    MMSE_MILD = 21            # 21-26 mild
+    MMSE_MODERATE = 11        # 11-20 moderate
+    MMSE_SEVERE = 0           # 0-10 severe
+    
+    # ===== ADAS-Cog (Rosen et al., 1984) =====
+    # Lower score = better (unlike MoCA/MMSE)
+    ADAS_COG_MAX = 70
+    ADAS_NORMAL = 5           # 0-5 normal
+    ADAS_MCI = 12             # 6-12 MCI
+    ADAS_MILD_AD = 25         # 13-25 mild AD
+    ADAS_MODERATE_AD = 40     # 26-40 moderate AD
+    
+    # ===== Trail Making Test (Tombaugh, 2004) =====
+    # Time in seconds (age 55-59 norms)
+    TMT_A_NORMAL = 35         # seconds
+    TMT_A_IMPAIRED = 78       # >78 impaired
+    TMT_B_NORMAL = 79         # seconds
+    TMT_B_IMPAIRED = 273      # >273 impaired
+    TMT_BA_RATIO_NORMAL = 2.5 # B/A ratio, >3 suggests executive dysfunction
+    
+    # ===== Clock Drawing Test (Shulman, 2000) =====
+    CDT_MAX = 5               # 5-point scale
+    CDT_NORMAL = 4            # ≥4 normal
+    CDT_IMPAIRED = 2          # ≤2 significant impairment
+    
+    # ===== Category Fluency (Animals in 60s) =====
+    FLUENCY_NORMAL = 18       # ≥18 words normal
+    FLUENCY_MCI = 14          # 14-17 borderline
+    FLUENCY_IMPAIRED = 10     # <10 impaired
+    
+    # ===== Digit Span (Wechsler, 2008) =====
+    DIGIT_FORWARD_NORMAL = 7  # ±2
+    DIGIT_BACKWARD_NORMAL = 5 # ±2
+    DIGIT_SPAN_IMPAIRED = 4   # <4 impaired
+    
+    # ===== Stroop Test (MacLeod, 1991) =====
+    STROOP_INTERFERENCE_NORMAL = 20    # seconds
+    STROOP_INTERFERENCE_IMPAIRED = 40  # seconds
+    STROOP_ACCURACY_NORMAL = 0.95
+    STROOP_ACCURACY_FLOOR = 0.50       # Below chance suggests invalid
+    
+    # ===== N-Back (Jaeggi et al., 2010) =====
+    NBACK_ACCURACY_NORMAL = 0.80
+    NBACK_ACCURACY_MCI = 0.65
+    NBACK_ACCURACY_IMPAIRED = 0.50
+    NBACK_ACCURACY_CHANCE = 0.50       # At or below = possibly invalid
+    NBACK_DPRIME_NORMAL = 2.0
+    
+    # ===== Word Recall - CERAD (Morris et al., 1989) =====
+    RECALL_IMMEDIATE_NORMAL = 0.70     # 70% of words
+    RECALL_IMMEDIATE_MCI = 0.50
+    RECALL_DELAYED_NORMAL = 0.70
+    RECALL_DELAYED_MCI = 0.40
+    RECALL_RECOGNITION_NORMAL = 0.90   # Recognition should be high
+    RECALL_RECOGNITION_FLOOR = 0.60    # Below suggests invalid
+    
+    # ===== Motor - Finger Tapping (Shimoyama, 1990) =====
+    TAPPING_NORMAL_MIN = 4.0   # taps/second
+    TAPPING_NORMAL_MAX = 6.0
+    TAPPING_PD_THRESHOLD = 3.0
+    TAPPING_FLOOR = 1.0        # Below = suspicious
+    
+    # ===== Gait Speed (Studenski et al., 2011) =====
+    GAIT_SPEED_NORMAL = 1.0    # m/s
+    GAIT_SPEED_SLOW = 0.8
+    GAIT_SPEED_VERY_SLOW = 0.6
+    GAIT_SPEED_FLOOR = 0.3     # Below = suspicious unless severe
+    
+    # ===== Balance Sway (Era et al., 2006) =====
+    SWAY_NORMAL = 0.3
+    SWAY_ABNORMAL = 0.6
+    
+    # ===== Blink Rate (Karson et al., 1984) =====
+    BLINK_NORMAL_MIN = 15
+    BLINK_NORMAL_MAX = 20
+    BLINK_PD_THRESHOLD = 10
+    
+    # ===== Voice/Speech (Rusz et al., 2011) =====
+    VOWEL_DURATION_NORMAL = 15  # seconds
+    VOWEL_DURATION_IMPAIRED = 10
+    SPEECH_RATE_NORMAL_MIN = 120  # wpm
+    SPEECH_RATE_NORMAL_MAX = 180
+    
+    # ===== REACTION TIME NORMS (for validity) =====
+    RT_MIN_VALID = 150         # ms - below is too fast (anticipation)
+    RT_MAX_VALID = 3000        # ms - above is too slow (deliberate)
+    RT_COEFFICIENT_OF_VARIATION_MAX = 0.5  # CV > 0.5 suggests inconsistency
+
+
+# ==================== RISK SCALES ====================
+# (upper bound, label): the first bound the risk is below wins, None = above all
+
+SEVERITY_SCALE = [(20, "low"), (40, "mild"), (60, "moderate"), (80, "high"), (None, "severe")]
+
+STAGE_SCALE = [(15, "Normal"), (30, "Minimal"), (50, "Mild"), (70, "Moderate"), (None, "Severe")]
+
+AD_STAGE_SCALE = [
+    (10, CognitiveStage.NORMAL.value),
+    (25, CognitiveStage.SUBJECTIVE_DECLINE.value),
+    (40, CognitiveStage.MCI.value),
+    (60, CognitiveStage.MILD_DEMENTIA.value),
+    (80, CognitiveStage.MODERATE_DEMENTIA.value),
+    (None, CognitiveStage.SEVERE_DEMENTIA.value),
+]
+
+PD_STAGE_SCALE = [
+    (10, ParkinsonStage.STAGE_0.value),
+    (25, ParkinsonStage.STAGE_1.value),
+    (40, ParkinsonStage.STAGE_2.value),
+    (60, ParkinsonStage.STAGE_3.value),
+    (80, ParkinsonStage.STAGE_4.value),
+    (None, ParkinsonStage.STAGE_5.value),
+]
+
+
+# ==================== COMPOSITE WEIGHTS ====================
+# Evidence-based category weights for multi-category fusion
+
+COMPOSITE_WEIGHTS_AD = {
+    "cognitive": 0.45,   # Primary: Memory, executive
+    "speech": 0.20,      # Language, semantic fluency
+    "gait": 0.20,        # Falls risk, spatial navigation
+    "motor": 0.05,       # Late-stage only
+    "facial": 0.10,      # Minimal contribution
+}
+
+COMPOSITE_WEIGHTS_PD = {
+    "motor": 0.35,       # Cardinal: Bradykinesia, tremor, rigidity
+    "gait": 0.25,        # Festination, freezing, postural instability
+    "speech": 0.15,      # Hypokinetic dysarthria
+    "cognitive": 0.15,   # PD-MCI, PD-dementia
+    "facial": 0.10,      # Hypomimia
+}
+
+DEFAULT_CATEGORY_WEIGHT = 0.1  # Categories without an explicit weight
+
+
+# ==================== NORMATIVE STRATA ====================
+# Age bands of the population norms (app/services/normative_service.py), same format as the risk scales
+
+AGE_BAND_SCALE = [(50, "<50"), (60, "50-59"), (70, "60-69"), (80, "70-79"), (None, "80+")]
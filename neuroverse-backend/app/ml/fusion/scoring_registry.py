@@ -0,0 +1,172 @@
+"""
+Scoring registry - Versioned clinical norms and fusion weights
+A version is a config of norm overrides, composite weights and risk scales
+(scoring_versions table, importable from JSON files). Each version is
+compiled once into a ScoringConfig: a norms object, per-category weight
+tuples and bisect threshold arrays for the stage/severity scales.
+
+The active version is swapped in by replacing a single reference. Services
+take a snapshot when created, so one pipeline run never mixes versions.
+Every worker polls the active version every SCORING_REFRESH_SECONDS, so an
+activation reaches all of them without a restart.
+"""
+
+import asyncio
+import time
+from bisect import bisect_right
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.ml.fusion.clinical_norms import (
+    AD_STAGE_SCALE, COMPOSITE_WEIGHTS_AD, COMPOSITE_WEIGHTS_PD, DEFAULT_CATEGORY_WEIGHT,
+    PD_STAGE_SCALE, SEVERITY_SCALE, STAGE_SCALE, ClinicalNorms,
+)
+from app.models.scoring_version import ScoringVersion
+
+BUILTIN_VERSION = "builtin"
+
+SCALES = {
+    "severity": SEVERITY_SCALE,
+    "stage": STAGE_SCALE,
+    "ad_stage": AD_STAGE_SCALE,
+    "pd_stage": PD_STAGE_SCALE,
+}
+
+
+class ThresholdScale:
+    """Risk -> label: labels[i] applies below bounds[i], the last label above all."""
+
+    __slots__ = ("bounds", "labels", "_label_array")
+
+    def __init__(self, scale: Sequence[Sequence[Any]]):
+        *steps, (last_bound, last_label) = scale
+        if last_bound is not None or any(bound is None for bound, _ in steps):
+            raise ValueError("Only the last step of a scale may be unbounded (null)")
+        self.bounds = [float(bound) for bound, _ in steps]
+        if self.bounds != sorted(self.bounds):
+            raise ValueError("Scale bounds must be increasing")
+        self.labels = [label for _, label in steps] + [last_label]
+        self._label_array = np.array(self.labels, dtype=object)
+
+    def __call__(self, value: float) -> str:
+        return self.labels[bisect_right(self.bounds, value)]
+
+    def map(self, values: np.ndarray) -> np.ndarray:
+        """Labels for an array of risks (same bisect_right rule as a single value)."""
+        return self._label_array[np.searchsorted(self.bounds, values, side="right")]
+
+
+class ScoringConfig:
+    """A compiled scoring version."""
+
+    def __init__(self, version: str, config: Mapping[str, Any]):
+        self.version = version
+
+        self.norms = ClinicalNorms()
+        for name, value in (config.get("norms") or {}).items():
+            if not name.isupper() or not hasattr(ClinicalNorms, name):
+                raise ValueError(f"Unknown norm {name!r}")
+            setattr(self.norms, name, value)
+
+        weights = config.get("weights") or {}
+        self.weights_ad = {**COMPOSITE_WEIGHTS_AD, **(weights.get("ad") or {})}
+        self.weights_pd = {**COMPOSITE_WEIGHTS_PD, **(weights.get("pd") or {})}
+        self.default_weight = float(weights.get("default", DEFAULT_CATEGORY_WEIGHT))
+        self._default_weights = (self.default_weight, self.default_weight)
+        self._weights: Dict[str, Tuple[float, float]] = {
+            category: (
+                float(self.weights_ad.get(category, self.default_weight)),
+                float(self.weights_pd.get(category, self.default_weight)),
+            )
+            for category in {*self.weights_ad, *self.weights_pd}
+        }
+
+        scales = config.get("scales") or {}
+        unknown = set(scales) - set(SCALES)
+        if unknown:
+            raise ValueError(f"Unknown scales: {', '.join(sorted(unknown))}")
+        self.severity = ThresholdScale(scales.get("severity", SEVERITY_SCALE))
+        self.stage = ThresholdScale(scales.get("stage", STAGE_SCALE))
+        self.ad_stage = ThresholdScale(scales.get("ad_stage", AD_STAGE_SCALE))
+        self.pd_stage = ThresholdScale(scales.get("pd_stage", PD_STAGE_SCALE))
+
+    def category_weights(self, category: str) -> Tuple[float, float]:
+        """(AD weight, PD weight) of a category."""
+        return self._weights.get(category, self._default_weights)
+
+
+class ScoringRegistry:
+    """Compiled scoring versions and the one currently active."""
+
+    def __init__(self):
+        self._compiled: Dict[str, ScoringConfig] = {}
+        self._current = self.compile(BUILTIN_VERSION, {})
+        self._checked_at: Optional[float] = None
+
+    def current(self) -> ScoringConfig:
+        """Snapshot of the active version (never blocks)."""
+        return self._current
+
+    def compile(self, version: str, config: Mapping[str, Any]) -> ScoringConfig:
+        """Compile a version once; later calls return the cached one."""
+        compiled = self._compiled.get(version)
+        if compiled is None:
+            compiled = self._compiled[version] = ScoringConfig(version, config)
+        return compiled
+
+    async def get(self, version: str) -> Optional[ScoringConfig]:
+        """A specific (possibly inactive) version, e.g. to rescore with it."""
+        if version in self._compiled:
+            return self._compiled[version]
+        async with AsyncSessionLocal() as db:
+            config = (await db.execute(
+                select(ScoringVersion.config).where(ScoringVersion.version == version)
+            )).scalar_one_or_none()
+        return self.compile(version, config) if config is not None else None
+
+    async def refresh(self, force: bool = False) -> ScoringConfig:
+        """
+        Swap in the active version if it changed.
+
+        Checks at most every SCORING_REFRESH_SECONDS unless forced; only the
+        version name is read unless it is one not compiled yet.
+        """
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < settings.SCORING_REFRESH_SECONDS:
+            return self._current
+        self._checked_at = now
+
+        async with AsyncSessionLocal() as db:
+            version = (await db.execute(
+                select(ScoringVersion.version).where(ScoringVersion.is_active.is_(True))
+            )).scalar_one_or_none()
+
+        if version is None:
+            self._current = self.compile(BUILTIN_VERSION, {})
+        elif version != self._current.version:
+            self._current = await self.get(version) or self._current
+        return self._current
+
+    async def run_refresh_loop(self) -> None:
+        """Keep this worker on the active version (started with the app)."""
+        while True:
+            try:
+                await self.refresh(force=True)
+            except Exception as e:  # Keep scoring with the current version
+                print(f"⚠️ Scoring version refresh failed: {e}")
+            await asyncio.sleep(settings.SCORING_REFRESH_SECONDS)
+
+
+_registry: Optional[ScoringRegistry] = None
+
+
+def get_scoring_registry() -> ScoringRegistry:
+    """Process-wide registry."""
+    global _registry
+    if _registry is None:
+        _registry = ScoringRegistry()
+    return _registry
@@ -0,0 +1,187 @@
+"""
+Saliency generator - Spiral drawing heatmaps for the XAI view
+Scores every point of a spiral trace by local tremor energy (squared
+distance from the moving average of the TREMOR_WINDOW points around it)
+and by deviation from the Archimedean spiral fitted to the whole trace
+(r = a + b * theta around a fitted centre). The points are binned onto a
+HEATMAP x HEATMAP raster of the drawing's square bounding box with
+np.bincount; each cell is the mean weight of its points, shrunk towards
+the trace's mean by CELL_PRIOR_POINTS so sparse cells don't stand out on
+noise alone.
+
+The output (SaliencyData shape) carries the heatmap (0-255) and the
+TOP_REGIONS most salient, non-adjacent cells in drawing coordinates. It is
+computed once per item and stored in item_saliency (ExplanationService).
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.ml.extractors.base_extractor import stream_columns
+
+SALIENCY_VERSION = "spiral-1"  # Bump when maps change for the same trace; stored maps are regenerated
+HEATMAP = 16  # Heatmap cells per side
+TOP_REGIONS = 5
+MIN_POINTS = 10  # Shorter traces get no saliency
+MIN_CELL_POINTS = 3  # Sparser cells are not highlighted
+CELL_PRIOR_POINTS = 5  # Weight of the trace's mean in each cell's score, in points
+TREMOR_WINDOW = 9  # Points in the moving average tremor is measured against
+CENTRE_SEARCH_ROUNDS = 3  # Grid refinements of the fitted spiral's centre
+CENTRE_SEARCH_POINTS = 300  # Trace subsample used to search for the centre
+TREMOR_WEIGHT = 0.5  # Share of tremor vs deviation in a point's weight
+
+
+def spiral_points(raw: Optional[Mapping[str, Any]]) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    (x, y, timestamp ms) of a spiral trace, from binary channels
+    (coordinates.x, ...), [{x, y, timestamp_ms}, ...] or [[x, y, t], ...].
+    """
+    raw = raw or {}
+    columns = stream_columns(raw, "coordinates", ("x", "y", "timestamp_ms"))
+    if "x" in columns and "y" in columns:
+        x, y = columns["x"], columns["y"]
+        t = columns.get("timestamp_ms", np.arange(len(x), dtype=float))
+    else:
+        records = raw.get("coordinates")
+        if not isinstance(records, list) or not records or not isinstance(records[0], (list, tuple)):
+            return None
+        width = min(len(r) for r in records)
+        if width < 2:
+            return None
+        points = np.array([r[:3] for r in records] if width >= 3 else [r[:2] for r in records], dtype=float)
+        x, y = points[:, 0], points[:, 1]
+        t = points[:, 2] if width >= 3 else np.arange(len(points), dtype=float)
+
+    x, y, t = (np.asarray(a, dtype=float) for a in (x, y, t))
+    finite = np.isfinite(x) & np.isfinite(y) & np.isfinite(t)
+    if finite.sum() < MIN_POINTS:
+        return None
+    return x[finite], y[finite], t[finite]
+
+
+def spiral_saliency(raw: Optional[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+    """SaliencyData dict ("spiral_path") of a spiral drawing item, None without a usable trace."""
+    points = spiral_points(raw)
+    if points is None:
+        return None
+    x, y, t = points
+
+    # Local tremor energy: squared distance from the local moving average
+    tremor = (x - _moving_average(x)) ** 2 + (y - _moving_average(y)) ** 2
+
+    # Deviation from the fitted Archimedean spiral
+    deviation = _spiral_deviation(x, y)
+
+    weight = TREMOR_WEIGHT * _scaled(tremor) + (1 - TREMOR_WEIGHT) * _scaled(deviation)
+
+    # Bin onto the square raster of the bounding box
+    side = max(np.ptp(x), np.ptp(y)) or 1.0
+    x0, y0 = x.min(), y.min()
+    col = np.minimum(((x - x0) / side * HEATMAP).astype(int), HEATMAP - 1)
+    row = np.minimum(((y - y0) / side * HEATMAP).astype(int), HEATMAP - 1)
+    cell = row * HEATMAP + col
+
+    counts = np.bincount(cell, minlength=HEATMAP * HEATMAP).reshape(HEATMAP, HEATMAP)
+    sums = np.bincount(cell, weights=weight, minlength=HEATMAP * HEATMAP).reshape(HEATMAP, HEATMAP)
+    heatmap = np.where(counts > 0, (sums + CELL_PRIOR_POINTS * weight.mean()) / (counts + CELL_PRIOR_POINTS), 0.0)
+
+    cell_size = side / HEATMAP
+    highlights = []
+    for index in _top_cells(heatmap, counts):
+        in_cell = cell == index
+        r, c = divmod(index, HEATMAP)
+        score = float(heatmap[r, c])
+        highlights.append({
+            "x": round(float(x0 + c * cell_size), 2),
+            "y": round(float(y0 + r * cell_size), 2),
+            "width": round(float(cell_size), 2),
+            "height": round(float(cell_size), 2),
+            "score": round(score, 3),
+            "level": "high" if score >= 2 / 3 else "moderate" if score >= 1 / 3 else "low",
+            "tremor": round(float(np.sqrt(tremor[in_cell].mean())), 3),
+            "deviation": round(float(deviation[in_cell].mean()), 3),
+            "points": int(in_cell.sum()),
+            "start_ms": round(float(t[in_cell].min()), 1),
+            "end_ms": round(float(t[in_cell].max()), 1),
+        })
+
+    return {
+        "type": "spiral_path",
+        "data": {
+            "grid": HEATMAP,
+            "bounds": [round(float(v), 2) for v in (x0, y0, x0 + side, y0 + side)],
+            "heatmap": np.round(heatmap * 255).astype(int).tolist(),  # Rows top to bottom (y), 0-255
+            "points": int(len(x)),
+            "tremor_rms": round(float(np.sqrt(tremor.mean())), 3),
+            "mean_deviation": round(float(deviation.mean()), 3),
+            "tremor_weight": TREMOR_WEIGHT,
+        },
+        "highlights": highlights,
+    }
+
+
+# ============== HELPERS ==============
+
+def _scaled(values: np.ndarray) -> np.ndarray:
+    """0-1 relative to the trace's 95th percentile (robust to single spikes)."""
+    top = np.percentile(values, 95)
+    return np.clip(values / top, 0, 1) if top > 0 else np.zeros_like(values)
+
+
+def _moving_average(values: np.ndarray) -> np.ndarray:
+    """Centred TREMOR_WINDOW-point moving average (shorter windows at the ends)."""
+    half = TREMOR_WINDOW // 2
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    index = np.arange(len(values))
+    low, high = np.maximum(index - half, 0), np.minimum(index + half + 1, len(values))
+    return (sums[high] - sums[low]) / (high - low)
+
+
+def _spiral_deviation(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    |r - (a + b * theta)| of each point from the best Archimedean spiral.
+
+    The centre is found by a coarse-to-fine grid search around the
+    centroid (a spiral's centroid is not its centre) on a subsample of the
+    trace, all candidates of a round at once; a and b by least squares on
+    the unwrapped angle.
+    """
+    step = max(len(x) // CENTRE_SEARCH_POINTS, 1)
+    sx, sy = x[::step], y[::step]
+    centre = np.array([x.mean(), y.mean()])
+    span = max(np.ptp(x), np.ptp(y)) / 4
+    for _ in range(CENTRE_SEARCH_ROUNDS):
+        offsets = np.linspace(-span, span, 7)
+        candidates = centre + np.stack(np.meshgrid(offsets, offsets), axis=-1).reshape(-1, 2)
+        errors = _spiral_residuals(sx, sy, candidates).mean(axis=1)
+        centre = candidates[np.argmin(errors)]  # Includes the current centre (zero offset)
+        span /= 3
+    return _spiral_residuals(x, y, centre[None])[0]
+
+
+def _spiral_residuals(x: np.ndarray, y: np.ndarray, centres: np.ndarray) -> np.ndarray:
+    """(centres, points) |r - (a + b * theta)| of the least-squares spiral around each centre."""
+    dx, dy = x - centres[:, :1], y - centres[:, 1:]
+    radius = np.hypot(dx, dy)
+    theta = np.unwrap(np.arctan2(dy, dx), axis=1)
+    theta_c = theta - theta.mean(axis=1, keepdims=True)
+    radius_c = radius - radius.mean(axis=1, keepdims=True)
+    spread = (theta_c ** 2).sum(axis=1, keepdims=True)
+    slope = np.divide((theta_c * radius_c).sum(axis=1, keepdims=True), spread,
+                      out=np.zeros_like(spread), where=spread > 0)
+    return np.abs(radius_c - slope * theta_c)
+
+
+def _top_cells(heatmap: np.ndarray, counts: np.ndarray) -> List[int]:
+    """Flat indices of the TOP_REGIONS most salient cells, none adjacent to an earlier pick."""
+    candidates = np.where(counts >= MIN_CELL_POINTS, heatmap, -1.0)
+    picked = []
+    for _ in range(TOP_REGIONS):
+        index = int(np.argmax(candidates))
+        r, c = divmod(index, HEATMAP)
+        if candidates[r, c] <= 0:
+            break
+        picked.append(index)
+        candidates[max(r - 1, 0):r + 2, max(c - 1, 0):c + 2] = -1.0
+    return picked
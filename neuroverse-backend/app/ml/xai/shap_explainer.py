@@ -0,0 +1,322 @@
+"""
+SHAP explainer - Exact Shapley attributions of the category risk scores
+The model explained is the category's scoring rules (AD and PD risk from
+app/ml/fusion/batch_scoring.py, the same numbers FusionService returns)
+for the active scoring version. Attributions are interventional SHAP
+values against a weighted background sample of stored results:
+
+    v(S) = sum_k w_k * f(x on S, background row k elsewhere)
+
+Every category scores at most 8 features, so all 2^M coalitions are
+evaluated in one vectorized scoring call and the Shapley values follow
+exactly from a precomputed (2^M x M) weight matrix - no sampling, and the
+attributions of a sample always add up to f(x) - E[f]. Where the rules
+are additive in their features (checked when an explainer is compiled),
+the M single-feature swaps suffice. SHAP interaction values follow from
+the same coalition values with a (2^M x M x M) weight tensor.
+
+Explainers are compiled once per (scoring version, category): background
+rows, weights and the expected risks are kept by ExplainerCache, which
+reloads the background samples every SHAP_BACKGROUND_REFRESH_SECONDS.
+"""
+
+import asyncio
+import math
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.ml.fusion.batch_scoring import FEATURE_COLUMNS, features_matrix, risk_batch
+from app.ml.fusion.clinical_norms import ClinicalNorms
+from app.ml.fusion.scoring_registry import ScoringConfig, get_scoring_registry
+from app.models.test_result import TestResult
+from app.models.test_session import SessionStatus, TestSession
+
+OUTPUTS = ("ad_risk", "pd_risk")
+MAX_ROWS = 1 << 18  # Model rows scored per vectorized call
+ADDITIVITY_TOLERANCE = 1e-9  # Risk points
+
+
+class ShapValues(NamedTuple):
+    """Attributions of a batch of samples, in risk points."""
+    features: Tuple[str, ...]
+    base_values: np.ndarray  # (outputs,) expected risks over the background
+    values: np.ndarray  # (samples, features, outputs)
+
+    def row(self, i: int, output: str) -> Dict[str, float]:
+        """Sample i's attributions to one output, by feature."""
+        column = self.values[i, :, OUTPUTS.index(output)]
+        return dict(zip(self.features, column.tolist()))
+
+
+class ShapExplainer:
+    """Exact SHAP values of one category's risk scores under one scoring version."""
+
+    def __init__(
+        self,
+        category: str,
+        scoring: ScoringConfig,
+        background: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+    ):
+        self.category = category
+        self.scoring_version = scoring.version
+        self.norms = scoring.norms
+        self.features = tuple(name for name, _ in FEATURE_COLUMNS.get(category, ()))
+        m = len(self.features)
+
+        self.background = np.asarray(background, dtype=float)[:, :m]
+        weights = np.ones(len(self.background)) if weights is None else np.asarray(weights, dtype=float)
+        self.weights = weights / weights.sum()
+        self.base_values = self.weights @ self._model(self.background)
+
+        # Coalition s holds feature i when bit i of s is set; phi = v(coalitions) @ phi_weights
+        self._coalitions = ((np.arange(1 << m)[:, None] >> np.arange(m)) & 1).astype(bool)
+        size = self._coalitions.sum(axis=1)
+        shapley = [math.factorial(s) * math.factorial(m - s - 1) / math.factorial(m) for s in range(m)]
+        joined = np.array([0.0] + shapley)[size]  # Weight of v(S) where i in S: |S| - 1 others before i
+        left = np.array(shapley + [0.0])[size]  # ... and where i not in S
+        self._phi_weights = np.where(self._coalitions, joined[:, None], -left[:, None])
+        self._interaction_weights = _interaction_weights(self._coalitions)
+
+        self.additive = m > 0 and self._is_additive()
+
+    def explain(self, matrix: np.ndarray) -> ShapValues:
+        """Attributions of every row of a feature matrix (matrix_columns() order)."""
+        samples = np.asarray(matrix, dtype=float)[:, :len(self.features)]
+        values = np.zeros((len(samples), len(self.features), len(OUTPUTS)))
+        if not self.features or not len(samples):
+            return ShapValues(self.features, self.base_values, values)
+
+        exact = np.ones(len(samples), dtype=bool)
+        if self.additive:
+            values = self._chunked(samples, self._main_effects)
+            # Efficiency holds for an additive model; rows where it doesn't interact somewhere
+            total = self._model(samples) - self.base_values
+            exact = ~np.all(np.abs(values.sum(axis=1) - total) <= 1e-6, axis=1)
+        if exact.any():
+            values[exact] = self._chunked(samples[exact], self._exact)
+        return ShapValues(self.features, self.base_values, values)
+
+    def explain_features(self, features: Sequence[Mapping[str, Any]]) -> ShapValues:
+        """explain() over feature dicts."""
+        return self.explain(features_matrix(self.category, features, self.norms))
+
+    def interactions(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        SHAP interaction values (samples, features, features, outputs) of
+        every row of a feature matrix. Off-diagonal [i, j] is half the
+        pair's interaction, the diagonal is each feature's main effect;
+        summing over the last feature axis gives the SHAP values.
+        """
+        samples = np.asarray(matrix, dtype=float)[:, :len(self.features)]
+        m = len(self.features)
+        if not m or not len(samples):
+            return np.zeros((len(samples), m, m, len(OUTPUTS)))
+        return self._chunked(samples, self._interactions)
+
+    # ============== PRIVATE HELPERS ==============
+
+    def _model(self, rows: np.ndarray) -> np.ndarray:
+        return risk_batch(self.category, rows, self.norms)
+
+    def _chunked(self, samples: np.ndarray, method) -> np.ndarray:
+        """Run method over chunks of samples of at most MAX_ROWS model rows each."""
+        per_sample = len(self._coalitions) * len(self.background)
+        step = max(1, MAX_ROWS // per_sample)
+        return np.concatenate([method(samples[i:i + step]) for i in range(0, len(samples), step)])
+
+    def _coalition_values(self, samples: np.ndarray) -> np.ndarray:
+        """(samples, coalitions, outputs) expected risks with the coalition's features from the sample."""
+        m = len(self.features)
+        rows = np.where(self._coalitions[None, :, None, :], samples[:, None, None, :], self.background[None, None])
+        risks = self._model(rows.reshape(-1, m)).reshape(len(samples), len(self._coalitions), len(self.background), -1)
+        return np.einsum("cskj,k->csj", risks, self.weights)
+
+    def _exact(self, samples: np.ndarray) -> np.ndarray:
+        """Shapley values from every coalition's expected risks."""
+        return np.einsum("csj,si->cij", self._coalition_values(samples), self._phi_weights)
+
+    def _interactions(self, samples: np.ndarray) -> np.ndarray:
+        expected = self._coalition_values(samples)
+        values = np.einsum("csj,sab->cabj", expected, self._interaction_weights)
+        main = np.einsum("csj,si->cij", expected, self._phi_weights) - values.sum(axis=2)
+        diagonal = np.arange(len(self.features))
+        values[:, diagonal, diagonal] = main
+        return values
+
+    def _main_effects(self, samples: np.ndarray) -> np.ndarray:
+        """E[f(background with feature i from the sample)] - E[f]: the SHAP values of an additive model."""
+        m = len(self.features)
+        single = np.eye(m, dtype=bool)
+        rows = np.where(single[None, :, None, :], samples[:, None, None, :], self.background[None, None])
+        risks = self._model(rows.reshape(-1, m)).reshape(len(samples), m, len(self.background), -1)
+        return np.einsum("cikj,k->cij", risks, self.weights) - self.base_values
+
+    def _is_additive(self) -> bool:
+        """
+        No pairwise interaction between any two features over the background.
+
+        Probes f(a) - f(a, i from b) - f(a, j from b) + f(a, i and j from b)
+        for all background pairs (a, b), plus an all-absent row. explain()
+        still checks efficiency per sample and falls back to exact values.
+        """
+        m = len(self.features)
+        probes = np.vstack([self.background, np.full((1, m), np.nan)])
+        a = np.repeat(probes, len(probes), axis=0)
+        b = np.tile(probes, (len(probes), 1))
+        base = self._model(a)
+        for i in range(m):
+            swap_i = a.copy()
+            swap_i[:, i] = b[:, i]
+            only_i = self._model(swap_i)
+            for j in range(i + 1, m):
+                swap_j = a.copy()
+                swap_j[:, j] = b[:, j]
+                swap_ij = swap_i.copy()
+                swap_ij[:, j] = b[:, j]
+                interaction = base - only_i - self._model(swap_j) + self._model(swap_ij)
+                if np.abs(interaction).max() > ADDITIVITY_TOLERANCE:
+                    return False
+        return True
+
+
+def _interaction_weights(coalitions: np.ndarray) -> np.ndarray:
+    """
+    (2^M x M x M) weights of each coalition value in the Shapley
+    interaction index of each pair (Lundberg et al. 2018, halved for [i, j]
+    and [j, i]): for S without i and j, |S|! (M - |S| - 2)! / (2 (M - 1)!)
+    times v(S + ij) - v(S + i) - v(S + j) + v(S). Zero on the diagonal.
+    """
+    m = coalitions.shape[1]
+    if m < 2:
+        return np.zeros((len(coalitions), m, m))
+    size = coalitions.sum(axis=1)
+    members = coalitions[:, :, None].astype(int) + coalitions[:, None, :]  # |{i, j} & S'|
+    others = size[:, None, None] - members  # |S|
+    pair = [math.factorial(k) * math.factorial(m - k - 2) / (2 * math.factorial(m - 1)) for k in range(m - 1)]
+    weights = np.array(pair + [0.0])[np.clip(others, 0, m - 1)] * np.array([1.0, -1.0, 1.0])[members]
+    weights[:, np.arange(m), np.arange(m)] = 0.0
+    return weights
+
+
+def summarize_background(rows: np.ndarray, size: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    At most `size` distinct rows with weights: a uniform sample (with
+    replacement) of the rows, duplicates merged into their count.
+    """
+    if len(rows) > size:
+        rows = rows[np.random.default_rng(seed).choice(len(rows), size, replace=True)]
+    keys = np.where(np.isnan(rows), np.inf, rows)  # NaN (absent) never equals itself
+    _, first, counts = np.unique(keys, axis=0, return_index=True, return_counts=True)
+    return rows[first], counts.astype(float)
+
+
+def reference_background(category: str, norms: ClinicalNorms) -> np.ndarray:
+    """
+    A single healthy reference row (literature normal values), the
+    background until enough results of the category are stored.
+    """
+    reference = {
+        "stroop_accuracy": norms.STROOP_ACCURACY_NORMAL,
+        "stroop_interference": norms.STROOP_INTERFERENCE_NORMAL,
+        "stroop_mean_rt": 700,
+        "nback_accuracy": norms.NBACK_ACCURACY_NORMAL,
+        "nback_dprime": norms.NBACK_DPRIME_NORMAL,
+        "recall_accuracy": norms.RECALL_IMMEDIATE_NORMAL,
+        "delayed_recall_accuracy": norms.RECALL_DELAYED_NORMAL,
+        "recognition_accuracy": norms.RECALL_RECOGNITION_NORMAL,
+        "story_recall_accuracy": 0.80,
+        "vowel_duration": norms.VOWEL_DURATION_NORMAL,
+        "speech_rate": (norms.SPEECH_RATE_NORMAL_MIN + norms.SPEECH_RATE_NORMAL_MAX) / 2,
+        "fluency_word_count": norms.FLUENCY_NORMAL,
+        "tapping_rate": (norms.TAPPING_NORMAL_MIN + norms.TAPPING_NORMAL_MAX) / 2,
+        "tapping_regularity": 0.90,
+        "tapping_fatigue": 0.10,
+        "spiral_duration": 20,
+        "spiral_tremor": 0.0,
+        "steps": 20,
+        "gait_speed": norms.GAIT_SPEED_NORMAL,
+        "step_regularity": 0.90,
+        "balance_duration": 30,
+        "balance_sway": norms.SWAY_NORMAL,
+        "balance_stability": 0.90,
+        "blink_rate": (norms.BLINK_NORMAL_MIN + norms.BLINK_NORMAL_MAX) / 2,
+        "smile_count": 3,
+        "smile_intensity": 0.80,
+    }
+    return np.array([[reference[name] for name, _ in FEATURE_COLUMNS.get(category, ())]], dtype=float)
+
+
+class ExplainerCache:
+    """Background samples per category and the explainers compiled from them."""
+
+    def __init__(self):
+        self._backgrounds: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}  # category -> (rows, weights)
+        self._explainers: Dict[Tuple[str, str], ShapExplainer] = {}
+
+    def get(self, category: str, scoring: ScoringConfig) -> ShapExplainer:
+        """The category's explainer for a scoring version, compiled on first use."""
+        key = (scoring.version, category)
+        explainer = self._explainers.get(key)
+        if explainer is None:
+            rows, weights = self._backgrounds.get(category) or (reference_background(category, scoring.norms), None)
+            explainer = self._explainers[key] = ShapExplainer(category, scoring, rows, weights)
+        return explainer
+
+    async def load(self) -> Dict[str, int]:
+        """
+        Sample each category's latest completed results as its background
+        and compile the active version's explainers. Returns the number of
+        background rows kept per category.
+        """
+        backgrounds = {}
+        async with AsyncSessionLocal() as db:
+            for category in FEATURE_COLUMNS:
+                features = (await db.execute(
+                    select(TestResult.extracted_features)
+                    .join(TestSession, TestSession.id == TestResult.session_id)
+                    .where(TestSession.category == category)
+                    .where(TestSession.status == SessionStatus.COMPLETED.value)
+                    .order_by(TestResult.id.desc())
+                    .limit(settings.SHAP_BACKGROUND_SAMPLE)
+                )).scalars().all()
+                features = [f for f in features if f]
+                if len(features) >= settings.SHAP_BACKGROUND_MIN_RESULTS:
+                    backgrounds[category] = summarize_background(
+                        features_matrix(category, features)[:, :len(FEATURE_COLUMNS[category])],
+                        settings.SHAP_BACKGROUND_SIZE,
+                    )
+
+        scoring = get_scoring_registry().current()
+        compiled = await asyncio.to_thread(lambda: {
+            (scoring.version, category): ShapExplainer(
+                category, scoring, *(backgrounds.get(category) or (reference_background(category, scoring.norms), None))
+            )
+            for category in FEATURE_COLUMNS
+        })
+        self._backgrounds, self._explainers = backgrounds, compiled
+        return {category: len(rows) for category, (rows, _) in backgrounds.items()}
+
+    async def run_refresh_loop(self) -> None:
+        """Reload the backgrounds periodically (started with the app)."""
+        while True:
+            try:
+                await self.load()
+            except Exception as e:  # Keep explaining with the current backgrounds
+                print(f"⚠️ SHAP background refresh failed: {e}")
+            await asyncio.sleep(settings.SHAP_BACKGROUND_REFRESH_SECONDS)
+
+
+_cache: Optional[ExplainerCache] = None
+
+
+def get_explainer_cache() -> ExplainerCache:
+    """Process-wide explainer cache."""
+    global _cache
+    if _cache is None:
+        _cache = ExplainerCache()
+    return _cache
@@ -4,8 +4,18 @@ NeuroVerse Models
 
 from app.models.user import User
 from app.models.test_session import TestSession, TestCategory, SessionStatus
-from app.models.test_item import TestItem
+from app.models.test_item import TestItem, TestItemArchive
+from app.models.item_fingerprint import ItemFingerprint
+from app.models.item_saliency import ItemSaliency
+from app.models.item_upload import ItemUpload, UploadStatus
+from app.models.idempotency import IdempotencyKey, IdempotencyStatus
+from app.models.scoring_version import ScoringVersion
+from app.models.rescore_checkpoint import RescoreCheckpoint
 from app.models.test_result import TestResult
+from app.models.user_risk import UserCategoryResult, UserRiskSums
+from app.models.norm_sketch import NormSketch
+from app.models.user_feature_stats import UserFeatureStats
+from app.models.global_importance import GlobalFeatureImportance
 from app.models.wellness import WellnessEntry
 from app.models.report import Report
 from app.models.feedback import Feedback, FeedbackCategory, FeedbackStatus
@@ -16,7 +26,21 @@ __all__ = [
     "TestCategory",
     "SessionStatus",
     "TestItem",
+    "TestItemArchive",
+    "ItemFingerprint",
+    "ItemSaliency",
+    "ItemUpload",
+    "UploadStatus",
+    "IdempotencyKey",
+    "IdempotencyStatus",
+    "ScoringVersion",
+    "RescoreCheckpoint",
     "TestResult",
+    "UserCategoryResult",
+    "UserRiskSums",
+    "NormSketch",
+    "UserFeatureStats",
+    "GlobalFeatureImportance",
     "WellnessEntry",
     "Report",
     "Feedback",
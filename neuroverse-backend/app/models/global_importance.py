@@ -0,0 +1,39 @@
+"""
+GlobalFeatureImportance Model - Cohort-wide attributions of one category
+One row per (category, scoring version): weighted running sums of the
+SHAP values and interaction values of a stratified sample of completed
+results, by age band and gender, and the summary served to doctors.
+Updated incrementally by GlobalImportanceService from last_result_id on
+(less a margin, for results committed after higher ids).
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class GlobalFeatureImportance(Base):
+    __tablename__ = "global_feature_importance"
+    __table_args__ = (
+        UniqueConstraint("category", "scoring_version", name="uq_global_feature_importance_version"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    category = Column(String, nullable=False)  # cognitive, speech, motor, gait, facial
+    scoring_version = Column(String(64), nullable=False)  # scoring_versions.version, or "builtin"
+    explainer_version = Column(String(64), nullable=False)  # Sums are reset when the explainer changes
+
+    # Watermark: results up to this id are included, except late commits below
+    # it not yet seen; ids within GLOBAL_IMPORTANCE_LATE_MARGIN of it already
+    # included are listed so the margin is re-read without double counting
+    last_result_id = Column(Integer, default=0)
+    recent_result_ids = Column(JSON, nullable=True)
+    population = Column(Integer, default=0)  # Results covered (sampled or weighted in)
+    samples = Column(Integer, default=0)  # Results explained
+
+    # {"features": [...], "strata": {"60-69/female": {population, samples, weighted sums}}}
+    sums = Column(JSON, nullable=True)
+    # Served as is: ranked features and top interactions
+    summary = Column(JSON, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
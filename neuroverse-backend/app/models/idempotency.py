@@ -0,0 +1,36 @@
+"""
+IdempotencyKey Model - First successful response per client Idempotency-Key
+Retried requests with the same key replay the stored response instead of
+running again (see app/core/idempotency.py).
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+from app.db.types import CompressedJSON
+import enum
+
+
+class IdempotencyStatus(str, enum.Enum):
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String(255), nullable=False)
+
+    # sha256 of method, path and body; a key reused for another request is rejected
+    request_hash = Column(String(64), nullable=False)
+    status = Column(String, default=IdempotencyStatus.IN_PROGRESS.value)
+
+    # Stored response, replayed for retries
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(CompressedJSON(), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,32 @@
+"""
+ItemFingerprint Model - SimHash of a submitted test item's payload
+One row per fingerprinted item (app/utils/simhash.py): the 64-bit hash and
+its four 16-bit bands, each indexed with the mini-test name, so a new item
+finds earlier exact or near-identical payloads with four index lookups.
+Written by FingerprintService on ingestion.
+"""
+
+from sqlalchemy import BigInteger, Column, Integer, SmallInteger, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class ItemFingerprint(Base):
+    __tablename__ = "item_fingerprints"
+    __table_args__ = tuple(
+        Index(f"ix_item_fingerprints_band{i}", "item_name", f"band{i}") for i in range(4)
+    )
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey("test_sessions.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    item_name = Column(String(64), nullable=False)  # Only the same mini-test is compared
+
+    simhash = Column(BigInteger, nullable=False)  # Signed 64-bit
+    # 16-bit bands of the hash, shifted into SmallInteger range (band - 32768)
+    band0 = Column(SmallInteger, nullable=False)
+    band1 = Column(SmallInteger, nullable=False)
+    band2 = Column(SmallInteger, nullable=False)
+    band3 = Column(SmallInteger, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,25 @@
+"""
+ItemSaliency Model - Saliency map of an explained spiral drawing item
+Generated once per item (and saliency generator version) by
+ExplanationService and kept here rather than in the item's raw_data, so it
+survives the payload being archived. data is NULL when the item had no
+usable trace.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class ItemSaliency(Base):
+    __tablename__ = "item_saliency"
+
+    # No FK because test_items is partitioned (PK is (id, created_at))
+    item_id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey("test_sessions.id"), nullable=False, index=True)
+    version = Column(String(32), nullable=False)  # saliency_generator.SALIENCY_VERSION
+
+    # SaliencyData dict ("spiral_path")
+    data = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
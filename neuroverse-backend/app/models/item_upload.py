@@ -0,0 +1,46 @@
+"""
+ItemUpload Model - Resumable uploads of large test item recordings
+An upload declares its item metadata and binary parts up front; parts are
+appended to disk chunk by chunk and the TestItem is created on finalize.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.database import Base
+import enum
+
+
+class UploadStatus(str, enum.Enum):
+    UPLOADING = "uploading"
+    COMPLETED = "completed"
+    ABORTED = "aborted"
+
+
+class ItemUpload(Base):
+    __tablename__ = "item_uploads"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex, used in upload URLs
+    session_id = Column(Integer, ForeignKey("test_sessions.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
+    # TestItemCreate fields (channels declare their dtype only)
+    item = Column(JSON, nullable=False)
+    # Declared byte size per part: {"channel.accelerometer_data.x": 960000, "file.video": 52428800}
+    # Received offsets are the on-disk sizes of the part files, not stored here
+    parts = Column(JSON, nullable=False)
+
+    status = Column(String, default=UploadStatus.UPLOADING.value)
+
+    # Set on finalize; no FK because test_items is partitioned (PK is (id, created_at))
+    test_item_id = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Relationships
+    test_item = relationship(
+        "TestItem",
+        primaryjoin="foreign(ItemUpload.test_item_id) == TestItem.id",
+        uselist=False,
+    )
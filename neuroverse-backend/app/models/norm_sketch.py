@@ -0,0 +1,25 @@
+"""
+NormSketch Model - Population distribution of one feature in one stratum
+A serialized t-digest (app/utils/tdigest.py) over the feature's values in
+all valid completed sessions of users in an age band and gender ("all" for
+the pooled strata). Updated on every completion by NormativeService.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class NormSketch(Base):
+    __tablename__ = "norm_sketches"
+    __table_args__ = (UniqueConstraint("feature", "age_band", "gender", name="uq_norm_sketches_stratum"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    feature = Column(String(64), nullable=False)  # e.g. "gait_speed"
+    age_band = Column(String(16), nullable=False)  # "60-69", "unknown" or "all"
+    gender = Column(String(16), nullable=False)  # "female", "male", "other", "unknown" or "all"
+
+    count = Column(Integer, default=0)  # Values in the digest
+    digest = Column(LargeBinary, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,31 @@
+"""
+RescoreCheckpoint Model - Progress of a batch re-scoring run
+A run splits test_results into id-range shards, one row each; the worker
+scoring a shard advances done_through_id in the same transaction as each
+chunk's score updates, so a killed run resumes exactly where it stopped
+(see app/jobs/rescore_results.py).
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class RescoreCheckpoint(Base):
+    __tablename__ = "rescore_checkpoints"
+    __table_args__ = (UniqueConstraint("run", "first_id", name="uq_rescore_checkpoints_run_first_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run = Column(String(64), nullable=False, index=True)
+    scoring_version = Column(String(64), nullable=False)
+
+    # Shard: test_results.id in [first_id, last_id]
+    first_id = Column(Integer, nullable=False)
+    last_id = Column(Integer, nullable=False)
+    done_through_id = Column(Integer, nullable=False)  # first_id - 1 until the first chunk commits
+
+    rows_scored = Column(Integer, default=0)
+    rows_changed = Column(Integer, default=0)
+
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
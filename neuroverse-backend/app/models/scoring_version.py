@@ -0,0 +1,28 @@
+"""
+ScoringVersion Model - Versioned clinical norms, risk scales and fusion weights
+Exactly one version is active; workers pick it up without a restart
+(see app/ml/fusion/scoring_registry.py). TestResult.scoring_version records
+which version scored each result.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class ScoringVersion(Base):
+    __tablename__ = "scoring_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(String(64), unique=True, nullable=False)
+
+    # {"norms": {"MOCA_NORMAL": 26, ...}, "weights": {"ad": {...}, "pd": {...}, "default": 0.1},
+    #  "scales": {"severity": [[20, "low"], ..., [null, "severe"]], ...}}
+    # Anything omitted falls back to the built-in values (app/ml/fusion/clinical_norms.py)
+    config = Column(JSON, nullable=False)
+    description = Column(String, nullable=True)
+
+    is_active = Column(Boolean, default=False, index=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    activated_at = Column(DateTime(timezone=True), nullable=True)
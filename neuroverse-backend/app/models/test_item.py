@@ -5,13 +5,17 @@ Examples: Stroop, N-Back, Word Recall (within Cognitive session)
           Finger Tapping, Spiral Drawing (within Motor session)
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
+from app.db.types import CompressedJSON
 
 
 class TestItem(Base):
+    # On PostgreSQL this table is range-partitioned by month on created_at
+    # (see migrations/001_partition_test_items.sql); the physical primary key
+    # there is (id, created_at).
     __tablename__ = "test_items"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -27,7 +31,11 @@ class TestItem(Base):
     # N-Back: {"sequence": [...], "user_responses": [...], "accuracy": 0.78, "level": 2}
     # Spiral: {"coordinates": [[x,y,t], ...], "pressure": [...], "duration_ms": 45000}
     # Speech: {"audio_path": "...", "transcript": "...", "duration_s": 30}
-    raw_data = Column(JSON, nullable=True)
+    raw_data = Column(CompressedJSON(), nullable=True)
+
+    # Set once raw_data has been moved to cold storage (raw_data is then NULL);
+    # ArchiveService.rehydrate() loads it back on demand
+    raw_data_archive = Column(String, nullable=True)
 
     # Processed/extracted value (optional - for quick access)
     raw_value = Column(String, nullable=True)      # Text representation if needed
@@ -36,7 +44,26 @@ class TestItem(Base):
     # Timestamps
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
     session = relationship("TestSession", back_populates="test_items")
+
+
+class TestItemArchive(Base):
+    """One archived month of test_items raw payloads (a Parquet file)."""
+    __tablename__ = "test_item_archives"
+
+    id = Column(Integer, primary_key=True, index=True)
+    partition_name = Column(String, nullable=False, unique=True)  # "test_items_2025_01"
+    period_start = Column(DateTime(timezone=True), nullable=False)
+    period_end = Column(DateTime(timezone=True), nullable=False)
+
+    # Parquet file path or object-store URI (the last file if archiving took
+    # several runs; items keep their own file in raw_data_archive). NULL if
+    # the partition had no payloads to archive.
+    location = Column(String, nullable=True)
+    items_count = Column(Integer, default=0)
+    size_bytes = Column(BigInteger, default=0)
+
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
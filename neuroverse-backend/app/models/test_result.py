@@ -3,10 +3,11 @@ TestResult Model - Aggregated result for a test session after ML fusion
 One result per session, contains scores and XAI explanations
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
+from app.db.types import CompressedJSON
 
 
 class TestResult(Base):
@@ -28,7 +29,7 @@ class TestResult(Base):
 
     # Extracted features from ML processing (JSON)
     # Example: {"speech_rate": 4.2, "pause_count": 8, "tremor_amplitude": 0.3, ...}
-    extracted_features = Column(JSON, nullable=True)
+    extracted_features = Column(CompressedJSON(), nullable=True)
 
     # XAI Explanations (JSON)
     # Structure matches frontend XAI.dart requirements:
@@ -38,7 +39,11 @@ class TestResult(Base):
     #   "interpretation": [{"title": "...", "description": "..."}, ...],
     #   "saliency_data": {...}  # For visualization
     # }
-    xai_explanation = Column(JSON, nullable=True)
+    xai_explanation = Column(CompressedJSON(), nullable=True)  # Generated on first read (ExplanationService)
+    xai_version = Column(String(64), nullable=True)  # Explainer/scoring version of xai_explanation
+
+    # Norms/weights version that produced the scores (scoring_versions.version, or "builtin")
+    scoring_version = Column(String(64), nullable=True, index=True)
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -3,7 +3,7 @@ TestSession Model - One session per test category (Cognitive, Speech, Motor, etc
 Contains multiple test_items (mini-tests) and one aggregated test_result
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
@@ -16,6 +16,7 @@ class TestCategory(str, enum.Enum):
     MOTOR = "motor"
     GAIT = "gait"
     FACIAL = "facial"
+    FULL_SCREENING = "full_screening"  # All five categories in one session
 
 
 class SessionStatus(str, enum.Enum):
@@ -23,6 +24,7 @@ class SessionStatus(str, enum.Enum):
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
+    INVALID = "invalid"  # Items already showed invalid performance; not scored, retest
 
 
 class TestSession(Base):
@@ -31,12 +33,15 @@ class TestSession(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
-    # Category: cognitive, speech, motor, gait, facial
+    # Category: cognitive, speech, motor, gait, facial (or full_screening)
     category = Column(String, nullable=False, index=True)
 
     # Status tracking
     status = Column(String, default=SessionStatus.CREATED.value)
 
+    # Running validity counters, updated as items are added (SessionValidityTracker)
+    validity_state = Column(JSON, nullable=True)
+
     # Timestamps
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,35 @@
+"""
+UserFeatureStats Model - Running statistics of one user's feature over time
+Welford count/mean/M2, the latest value and an EWMA, updated on every valid
+completion by LongitudinalService, plus the change flags computed for the
+latest value against the sessions before it.
+"""
+
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class UserFeatureStats(Base):
+    __tablename__ = "user_feature_stats"
+    __table_args__ = (UniqueConstraint("user_id", "feature", name="uq_user_feature_stats_user_feature"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    category = Column(String, nullable=False)  # cognitive, speech, motor, gait, facial
+    feature = Column(String(64), nullable=False)  # e.g. "gait_speed"
+
+    # Running statistics over all valid sessions
+    count = Column(Integer, default=0)
+    mean = Column(Float, default=0.0)
+    m2 = Column(Float, default=0.0)  # Sum of squared deviations from the mean
+    last_value = Column(Float, nullable=True)
+    ewma = Column(Float, nullable=True)
+
+    # Latest value vs the sessions before it
+    rci = Column(Float, nullable=True)  # Reliable change index (None until enough sessions)
+    reliable_change = Column(Boolean, default=False)
+    trend_break = Column(Boolean, default=False)
+
+    last_completed_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,52 @@
+"""
+User Risk Models - Latest result per category and running composite sums
+UserCategoryResult keeps each user's most recent score per category;
+UserRiskSums keeps the CompositeFusionService-weighted sums over those rows,
+so a completion updates the user's composite AD/PD risk in O(1).
+(Rebuilt in bulk by app/jobs/recompute_user_risk.py when weights change.)
+"""
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.db.database import Base
+
+
+class UserCategoryResult(Base):
+    __tablename__ = "user_category_results"
+    __table_args__ = (UniqueConstraint("user_id", "category", name="uq_user_category_results_user_category"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    category = Column(String, nullable=False)  # cognitive, speech, motor, gait, facial
+
+    # Result the scores came from (a full screening's result covers several categories)
+    test_result_id = Column(Integer, ForeignKey("test_results.id"), nullable=True)
+
+    ad_risk = Column(Float, default=0.0)
+    pd_risk = Column(Float, default=0.0)
+    category_score = Column(Float, default=0.0)
+
+    # Composite weights the risks were added to the user's sums with
+    ad_weight = Column(Float, nullable=False)
+    pd_weight = Column(Float, nullable=False)
+
+    completed_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    test_result = relationship("TestResult")
+
+
+class UserRiskSums(Base):
+    __tablename__ = "user_risk_sums"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    # sum(weight * risk) and sum(weight) over the user's latest category results
+    ad_weighted_sum = Column(Float, default=0.0)
+    pd_weighted_sum = Column(Float, default=0.0)
+    ad_weight_total = Column(Float, default=0.0)
+    pd_weight_total = Column(Float, default=0.0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -4,7 +4,7 @@
 # ============================================================
 
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
 
@@ -194,6 +194,9 @@ class PatientDetailResponse(BaseModel):
     test_sessions: List["TestSessionSummary"]
     clinical_notes: List["ClinicalNoteSummary"]
     
+    # Longitudinal change per feature (latest session vs earlier ones)
+    feature_changes: List["FeatureChangeSummary"] = []
+    
     # Metadata
     member_since: datetime
     last_active: Optional[datetime] = None
@@ -210,6 +213,20 @@ class TestSessionSummary(BaseModel):
     category_score: Optional[int] = None
 
 
+class FeatureChangeSummary(BaseModel):
+    category: str
+    feature: str
+    sessions: int
+    last_value: Optional[float] = None
+    mean: float
+    sd: Optional[float] = None  # Within-person SD (None with fewer than 2 sessions)
+    ewma: Optional[float] = None
+    rci: Optional[float] = None  # Reliable change index of the latest value
+    reliable_change: bool = False
+    trend_break: bool = False
+    last_completed_at: Optional[datetime] = None
+
+
 # ==================== CLINICAL NOTES SCHEMAS ====================
 
 class ClinicalNoteCreate(BaseModel):
@@ -363,7 +380,7 @@ class DatasetRequestListResponse(BaseModel):
 
 class AlertItem(BaseModel):
     id: str  # Keep as str for composite IDs like "high_risk_123"
-    type: str  # high_risk, pending_review, new_test, critical
+    type: str  # high_risk, pending_review, new_test, feature_change, critical
     title: str
     message: str
     patient_id: Optional[int] = None  # ← FIXED: Changed from str to int
@@ -379,6 +396,48 @@ class AlertsResponse(BaseModel):
     unread_count: int
 
 
+# ==================== POPULATION INSIGHT SCHEMAS ====================
+
+class GlobalFeatureRank(BaseModel):
+    feature: str
+    name: str
+    rank: int
+    mean_abs: Dict[str, float]  # Mean |SHAP value| per risk ("ad_risk", "pd_risk"), risk points
+    mean: Dict[str, float]  # Mean SHAP value (positive = raises risk)
+    coverage: float  # Share of results where the feature was measured
+
+
+class GlobalInteraction(BaseModel):
+    features: List[str]
+    names: List[str]
+    mean_abs: Dict[str, float]  # Mean |interaction| of the pair per risk, risk points
+
+
+class GlobalStratum(BaseModel):
+    age_band: str
+    gender: str
+    population: int
+    samples: int  # Results explained
+
+
+class GlobalImportanceItem(BaseModel):
+    category: str
+    scoring_version: str
+    explainer_version: str
+    population: int
+    samples: int
+    features: List[GlobalFeatureRank] = []
+    interactions: List[GlobalInteraction] = []
+    strata: List[GlobalStratum] = []
+    updated_at: Optional[datetime] = None
+
+
+class GlobalImportanceResponse(BaseModel):
+    success: bool = True
+    scoring_version: str
+    categories: List[GlobalImportanceItem]
+
+
 # Forward references update
 DoctorLoginResponse.model_rebuild()
 DoctorDashboard.model_rebuild()
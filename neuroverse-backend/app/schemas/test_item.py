@@ -4,10 +4,18 @@ Matches Flutter test screens: cognitive_memory_test.dart, speech_language_test.d
 motor_functions_test.dart, gait_movement_test.dart
 """
 
-from pydantic import BaseModel, Field
+import base64
+import binascii
+
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+# Binary sensor channels: little-endian numeric arrays, one per field
+CHANNEL_DTYPES = {"<f4": 4, "<f8": 8, "<i4": 4, "<i8": 8}
+CHANNEL_DTYPE_ALIASES = {"float32": "<f4", "float64": "<f8", "int32": "<i4", "int64": "<i8",
+                         "f4": "<f4", "f8": "<f8", "i4": "<i4", "i8": "<i8"}
+
 
 # ============== RAW DATA STRUCTURES ==============
 # These match what Flutter sends for each mini-test
@@ -144,24 +152,125 @@ class FacialAnalysisTestData(BaseModel):
 
 # ============== REQUEST SCHEMAS ==============
 
+class SensorChannel(BaseModel):
+    """
+    One sensor field as a packed little-endian array.
+
+    Channel names are "<stream>.<field>", e.g. "accelerometer_data.x" or
+    "taps.timestamp_ms", replacing raw_data["accelerometer_data"][i]["x"].
+    `data` is base64 in JSON bodies; multipart uploads send the bytes as a
+    separate part and leave it empty.
+    """
+    dtype: str = Field(..., description="<f4, <f8, <i4 or <i8 (float32, int64, ... accepted)")
+    data: Optional[str] = Field(None, description="Base64 of the raw little-endian bytes")
+
+    @field_validator("dtype")
+    @classmethod
+    def normalize_dtype(cls, v: str) -> str:
+        v = CHANNEL_DTYPE_ALIASES.get(v, v)
+        if v not in CHANNEL_DTYPES:
+            raise ValueError(f"Unsupported dtype {v!r}; use one of {sorted(CHANNEL_DTYPES)}")
+        return v
+
+    @field_validator("data")
+    @classmethod
+    def validate_data(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        try:
+            base64.b64decode(v, validate=True)
+        except (binascii.Error, ValueError):
+            raise ValueError("Channel data must be valid base64")
+        return v
+
+    @model_validator(mode="after")
+    def check_length(self):
+        if self.data is not None and _decoded_length(self.data) % CHANNEL_DTYPES[self.dtype]:
+            raise ValueError(f"Channel byte length is not a multiple of {self.dtype} item size")
+        return self
+
+
+def _decoded_length(b64: str) -> int:
+    return len(b64) * 3 // 4 - b64[-2:].count("=")
+
+
 class TestItemCreate(BaseModel):
     """Create a single test item - generic structure."""
     item_name: str = Field(..., description="Mini-test name: stroop, nback, word_recall, spiral, etc.")
     item_type: Optional[str] = Field(None, description="Type: cognitive, audio, motor, sensor, video")
-    raw_data: Dict[str, Any] = Field(..., description="Test-specific data structure")
+    raw_data: Dict[str, Any] = Field(default_factory=dict, description="Test-specific data structure")
+    channels: Optional[Dict[str, SensorChannel]] = Field(
+        None, description="Sensor arrays as binary channels instead of lists of dicts in raw_data"
+    )
     raw_value: Optional[str] = None
     processed_value: Optional[float] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
+    @field_validator("raw_data")
+    @classmethod
+    def reject_reserved_keys(cls, v: Dict[str, Any]) -> Dict[str, Any]:
+        # "_channels", "_features", ... are set by the server only
+        reserved = sorted(key for key in v if key.startswith("_"))
+        if reserved:
+            raise ValueError(f"raw_data keys starting with '_' are reserved: {', '.join(reserved)}")
+        return v
+
 
 class TestItemBatchCreate(BaseModel):
     """Create multiple test items at once."""
     items: List[TestItemCreate]
 
 
+class ItemUploadCreate(BaseModel):
+    """
+    Start a resumable upload for one test item.
+
+    Parts use the multipart naming of POST /items/binary: "channel.<name>"
+    (declared with its dtype in item.channels) or "file.<name>".
+    """
+    item: TestItemCreate
+    parts: Dict[str, int] = Field(..., description="Byte size of each part, e.g. {\"file.video\": 52428800}")
+
+    @field_validator("parts")
+    @classmethod
+    def validate_parts(cls, v: Dict[str, int]) -> Dict[str, int]:
+        if not v:
+            raise ValueError("At least one part is required")
+        for name, size in v.items():
+            kind, _, rest = name.partition(".")
+            if kind not in ("channel", "file") or not rest or "/" in rest or rest.startswith("."):
+                raise ValueError(f"Invalid part name {name!r}; use channel.<name> or file.<name>")
+            if size < 0:
+                raise ValueError(f"Part {name!r} has a negative size")
+        return v
+
+    @model_validator(mode="after")
+    def check_channels(self):
+        channels = self.item.channels or {}
+        for name, size in self.parts.items():
+            if name.startswith("channel."):
+                channel = channels.get(name[len("channel."):])
+                if channel is None:
+                    raise ValueError(f"Part {name!r} has no declared dtype in item.channels")
+                if size % CHANNEL_DTYPES[channel.dtype]:
+                    raise ValueError(f"Part {name!r} size is not a multiple of {channel.dtype} item size")
+        return self
+
+
 # ============== RESPONSE SCHEMAS ==============
 
+class SessionValidity(BaseModel):
+    """Validity of the session so far, from the items added."""
+    status: str
+    confidence: float
+    concerns: List[str] = []
+    is_valid: bool
+    retest_recommended: bool = False  # Clearly invalid: prompt a retest (completing it won't be scored)
+    items_checked: int = 0
+    trials_checked: int = 0
+
+
 class TestItemResponse(BaseModel):
     """Test item response."""
     id: int
@@ -174,6 +283,7 @@ class TestItemResponse(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     created_at: Optional[datetime] = None
+    session_validity: Optional[SessionValidity] = None
 
     class Config:
         from_attributes = True
@@ -183,3 +293,25 @@ class TestItemListResponse(BaseModel):
     """List of test items."""
     items: List[TestItemResponse]
     total: int
+
+
+class UploadPartStatus(BaseModel):
+    """Declared size and bytes received so far for one part."""
+    size: int
+    offset: int
+
+
+class ItemUploadResponse(BaseModel):
+    """Resumable upload state; clients resume each part from its offset."""
+    id: str
+    session_id: int
+    status: str
+    parts: Dict[str, UploadPartStatus]
+    test_item_id: Optional[int] = None
+    expires_at: datetime
+
+
+class ItemUploadFinalizeResponse(BaseModel):
+    """Item created from a finished upload, with its features if requested."""
+    item: TestItemResponse
+    features: Optional[Dict[str, Any]] = None
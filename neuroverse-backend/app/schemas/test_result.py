@@ -115,9 +115,12 @@ class TestResultDetailResponse(BaseModel):
     # Extracted features from ML
     extracted_features: Optional[Dict[str, Any]] = None
     
-    # XAI Explanation (full structure)
+    # XAI Explanation (full structure) - generated lazily, see GET /tests/{id}/explanation
     xai_explanation: Optional[XAIExplanation] = None
     
+    # Norms/weights version used for scoring
+    scoring_version: Optional[str] = None
+    
     # Session info
     category: Optional[str] = None
     items_processed: int = 0
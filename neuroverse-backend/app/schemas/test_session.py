@@ -3,11 +3,14 @@ Test Session Schemas - Test session management
 Matches Flutter: testsscreen.dart, cognitive_memory_test.dart, etc.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
+from app.schemas.test_item import SessionValidity, TestItemCreate
+from app.schemas.test_result import TestResultDetailResponse
+
 
 class TestCategory(str, Enum):
     """Test categories matching frontend."""
@@ -16,6 +19,7 @@ class TestCategory(str, Enum):
     MOTOR = "motor"
     GAIT = "gait"
     FACIAL = "facial"
+    FULL_SCREENING = "full_screening"  # All five categories in one session
 
 
 class SessionStatus(str, Enum):
@@ -24,6 +28,7 @@ class SessionStatus(str, Enum):
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
+    INVALID = "invalid"
 
 
 # ============== REQUEST SCHEMAS ==============
@@ -43,6 +48,28 @@ class TestSessionComplete(BaseModel):
     pass  # Just triggers completion
 
 
+class SyncSession(BaseModel):
+    """A whole session recorded offline on the device."""
+    client_id: str = Field(..., min_length=1, max_length=64, description="Device-side session id, echoed back")
+    category: TestCategory
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    items: List[TestItemCreate] = Field(..., min_length=1)
+
+    @field_validator("started_at", "completed_at")
+    @classmethod
+    def to_naive_utc(cls, v: Optional[datetime]) -> Optional[datetime]:
+        # Stored like server-side timestamps (naive UTC), so sessions sort correctly
+        if v is not None and v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+
+class TestSyncRequest(BaseModel):
+    """Upload several offline sessions at once - each is stored and processed."""
+    sessions: List[SyncSession] = Field(..., min_length=1)
+
+
 # ============== RESPONSE SCHEMAS ==============
 
 class TestItemSummary(BaseModel):
@@ -111,6 +138,20 @@ class TestSessionListResponse(BaseModel):
     page_size: int = 20
 
 
+class SyncSessionResult(BaseModel):
+    """Outcome of one synced session (no result if its items showed it invalid)."""
+    client_id: str
+    session_id: int
+    status: str
+    result: Optional[TestResultDetailResponse] = None
+    validity: Optional[SessionValidity] = None
+
+
+class TestSyncResponse(BaseModel):
+    """Results of a sync, in request order."""
+    sessions: List[SyncSessionResult]
+
+
 class CategoryTestInfo(BaseModel):
     """Category info for test dashboard."""
     category: str
@@ -0,0 +1,290 @@
+"""
+Archive Service - Cold storage for test_items raw sensor payloads
+Moves raw_data of old monthly partitions to zstd-compressed Parquet files
+(local disk or object storage) and loads it back on demand for re-scoring.
+"""
+
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import LargeBinary, and_, exists, func, or_, select, text, type_coerce, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.db.types import loads_json, to_json_bytes
+from app.models.test_item import TestItem, TestItemArchive
+from app.models.test_result import TestResult
+from app.models.test_session import SessionStatus, TestSession
+
+PARTITION_PREFIX = "test_items_"
+ARCHIVE_BATCH_SIZE = 5000
+PARQUET_ROW_GROUP_SIZE = 10000
+
+# Sessions that will never extract features from their items
+CLOSED_STATUSES = (SessionStatus.CANCELLED.value, SessionStatus.INVALID.value)
+
+
+class Partition(NamedTuple):
+    name: str
+    period_start: datetime
+    period_end: datetime
+
+
+class ArchiveRun(NamedTuple):
+    """One archive_partition run: the file written and the payloads still in the table."""
+    location: Optional[str]  # None if no payload was ready to archive
+    items_count: int
+    size_bytes: int
+    pending: int  # Items of sessions still open; the partition is archived again later
+
+
+class ArchiveService:
+    """Partition maintenance, archival and rehydration for test_items."""
+
+    def __init__(self, db: AsyncSession, archive_uri: Optional[str] = None):
+        self.db = db
+        self.archive_uri = archive_uri or settings.ARCHIVE_URI
+
+    # ============== PARTITIONS ==============
+
+    async def ensure_partitions(self, now: Optional[datetime] = None, months_ahead: Optional[int] = None) -> List[str]:
+        """Create the current and upcoming monthly partitions (idempotent)."""
+        now = now or datetime.now(timezone.utc)
+        months_ahead = settings.TEST_ITEM_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+
+        created = []
+        month = _month_start(now)
+        for _ in range(months_ahead + 1):
+            result = await self.db.execute(
+                text("SELECT create_test_items_partition(:month)"),
+                {"month": month.date()},
+            )
+            created.append(result.scalar())
+            month = _next_month(month)
+        return created
+
+    async def archivable_partitions(self, now: Optional[datetime] = None) -> List[Partition]:
+        """Monthly partitions entirely older than the retention window and not yet archived."""
+        cutoff = _retention_cutoff(now)
+
+        result = await self.db.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'test_items'"
+        ))
+        archived = set((await self.db.execute(select(TestItemArchive.partition_name))).scalars().all())
+
+        partitions = []
+        for name in result.scalars().all():
+            partition = _parse_partition(name)
+            if partition and partition.period_end <= cutoff and name not in archived:
+                partitions.append(partition)
+        return sorted(partitions, key=lambda p: p.period_start)
+
+    # ============== ARCHIVAL ==============
+
+    async def archive_partition(self, partition: Partition, now: Optional[datetime] = None) -> ArchiveRun:
+        """
+        Write the partition's raw payloads to Parquet, then clear them from the table.
+
+        Only items whose session is done with them are moved: it has a
+        TestResult (features extracted), was closed without one, or was
+        abandoned (still open, but no item added within the retention
+        window; completing it later rehydrates the payloads). The
+        partition is recorded as archived once no payload is left behind,
+        even if this run had nothing to write; until then it stays
+        archivable and each run writes the newly finished items to a file
+        of its own.
+        """
+        pa, pq, fs, base_path = _open_filesystem(self.archive_uri)
+        cutoff = _retention_cutoff(now)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        location = f"{base_path}/test_items/{partition.name}.{stamp}.parquet"
+        in_partition = and_(
+            TestItem.created_at >= partition.period_start,
+            TestItem.created_at < partition.period_end,
+        )
+        recent_item = aliased(TestItem)
+
+        query = (
+            select(
+                TestItem.id,
+                TestItem.session_id,
+                TestItem.item_name,
+                TestItem.created_at,
+                # Stored bytes as-is; only decompressed, never parsed
+                type_coerce(TestItem.raw_data, LargeBinary),
+            )
+            .where(
+                and_(
+                    in_partition,
+                    TestItem.raw_data.isnot(None),
+                    or_(
+                        TestItem.session_id.in_(select(TestResult.session_id)),
+                        TestItem.session_id.in_(
+                            select(TestSession.id).where(TestSession.status.in_(CLOSED_STATUSES))
+                        ),
+                        ~exists().where(
+                            and_(recent_item.session_id == TestItem.session_id, recent_item.created_at >= cutoff)
+                        ),
+                    ),
+                )
+            )
+            .order_by(TestItem.id)  # keeps row-group id ranges tight for rehydration
+        )
+
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("session_id", pa.int64()),
+            ("item_name", pa.string()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+            ("raw_data", pa.large_string()),
+        ])
+
+        archived_ids: List[int] = []
+        writer = None
+        try:
+            stream = await self.db.stream(query.execution_options(yield_per=ARCHIVE_BATCH_SIZE))
+            async for rows in stream.partitions():
+                if writer is None:
+                    fs.create_dir(os.path.dirname(location), recursive=True)
+                    writer = pq.ParquetWriter(
+                        location, schema, filesystem=fs, compression="zstd",
+                    )
+                columns = list(zip(*rows))
+                columns[4] = [to_json_bytes(payload).decode("utf-8") for payload in columns[4]]
+                writer.write_table(
+                    pa.Table.from_arrays([pa.array(col, type=schema.field(i).type) for i, col in enumerate(columns)], schema=schema),
+                    row_group_size=PARQUET_ROW_GROUP_SIZE,
+                )
+                archived_ids.extend(columns[0])
+        finally:
+            if writer is not None:
+                writer.close()
+
+        # The file is complete; only now drop the payloads from the hot table
+        for start in range(0, len(archived_ids), ARCHIVE_BATCH_SIZE):
+            await self.db.execute(
+                update(TestItem)
+                .where(
+                    and_(
+                        TestItem.id.in_(archived_ids[start:start + ARCHIVE_BATCH_SIZE]),
+                        in_partition,
+                    )
+                )
+                .values(raw_data=None, raw_data_archive=location)
+                .execution_options(synchronize_session=False)
+            )
+
+        run = ArchiveRun(
+            location=location if archived_ids else None,
+            items_count=len(archived_ids),
+            size_bytes=(fs.get_file_info(location).size or 0) if archived_ids else 0,
+            pending=(await self.db.execute(
+                select(func.count()).select_from(TestItem).where(and_(in_partition, TestItem.raw_data.isnot(None)))
+            )).scalar_one(),
+        )
+        if not run.pending:
+            files = (await self.db.execute(
+                select(TestItem.raw_data_archive, func.count())
+                .where(and_(in_partition, TestItem.raw_data_archive.isnot(None)))
+                .group_by(TestItem.raw_data_archive)
+            )).all()
+            self.db.add(TestItemArchive(
+                partition_name=partition.name,
+                period_start=partition.period_start,
+                period_end=partition.period_end,
+                location=run.location or max((path for path, _ in files), default=None),
+                items_count=sum(count for _, count in files),
+                size_bytes=sum(fs.get_file_info(path).size or 0 for path, _ in files),
+            ))
+        await self.db.commit()
+
+        return run
+
+    # ============== REHYDRATION ==============
+
+    async def rehydrate(self, items: Iterable[TestItem]) -> int:
+        """
+        Load archived raw_data back onto TestItem objects, one read per archive file.
+
+        Values are set as already-committed state, so they are visible to
+        extractors but never written back to the hot table. Returns the number
+        of items rehydrated.
+        """
+        by_location: Dict[str, List[TestItem]] = defaultdict(list)
+        for item in items:
+            if item.raw_data is None and item.raw_data_archive:
+                by_location[item.raw_data_archive].append(item)
+
+        if not by_location:
+            return 0
+
+        count = 0
+        for location, archived_items in by_location.items():
+            payloads = await asyncio.to_thread(
+                _read_payloads, self.archive_uri, location, [item.id for item in archived_items],
+            )
+            for item in archived_items:
+                payload = payloads.get(item.id)
+                if payload is not None:
+                    set_committed_value(item, "raw_data", loads_json(payload))
+                    count += 1
+        return count
+
+
+# ============== PRIVATE HELPERS ==============
+
+def _retention_cutoff(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now(timezone.utc)) - timedelta(days=settings.TEST_ITEM_RETENTION_DAYS)
+
+
+def _month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(month: datetime) -> datetime:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def _parse_partition(name: str) -> Optional[Partition]:
+    """test_items_2025_01 -> Partition(2025-01-01, 2025-02-01); None for DEFAULT etc."""
+    try:
+        start = datetime.strptime(name[len(PARTITION_PREFIX):], "%Y_%m").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    return Partition(name, start, _next_month(start))
+
+
+def _open_filesystem(uri: str) -> Tuple:
+    """Resolve an archive URI (local directory or s3://, gs://, ...) to a pyarrow filesystem."""
+    try:
+        import pyarrow as pa
+        import pyarrow.fs as pafs
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Test item archival requires pyarrow (pip install pyarrow)") from e
+
+    if "://" in uri:
+        fs, base_path = pafs.FileSystem.from_uri(uri)
+    else:
+        fs, base_path = pafs.LocalFileSystem(), os.path.abspath(uri)
+    return pa, pq, fs, base_path.rstrip("/")
+
+
+def _read_payloads(archive_uri: str, location: str, ids: List[int]) -> Dict[int, str]:
+    """Read raw_data for the given ids from one archive file (row groups pruned by id stats)."""
+    _, pq, fs, _ = _open_filesystem(archive_uri)
+    table = pq.read_table(
+        location,
+        filesystem=fs,
+        columns=["id", "raw_data"],
+        filters=[("id", "in", ids)],
+    )
+    return dict(zip(table.column("id").to_pylist(), table.column("raw_data").to_pylist()))
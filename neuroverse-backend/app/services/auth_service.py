@@ -60,7 +60,6 @@ class AuthService:
         
         self.db.add(user)
         await self.db.commit()
-        await self.db.refresh(user)
         
         # Send OTP email (async, don't wait)
         try:
@@ -98,7 +97,6 @@ class AuthService:
         user.otp_expires_at = None
         
         await self.db.commit()
-        await self.db.refresh(user)
         
         return user
     
@@ -0,0 +1,187 @@
+"""
+Explanation Service - Lazy, cached XAI explanations of stored results
+Completing a session no longer generates an explanation. The first read
+of a result's explanation generates it from the stored extracted features
+(with the result's own scoring version) and stores it in
+test_results.xai_explanation, tagged with xai_version. Later reads return
+the stored copy until the explainer or the result's scoring version
+changes (e.g. after a re-scoring run).
+
+With XAI_PRECOMPUTE on, completed results are queued and explained in the
+background once the worker has had no completion for
+XAI_PRECOMPUTE_IDLE_SECONDS, so explanations never compete with scoring.
+
+Motor and full-screening explanations include the spiral drawing's
+saliency map, computed once per item and kept in item_saliency (so it
+survives re-explanation after a re-scoring and archival of the payload).
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.ml.fusion.scoring_registry import BUILTIN_VERSION, get_scoring_registry
+from app.ml.xai.saliency_generator import SALIENCY_VERSION, spiral_saliency
+from app.models.item_saliency import ItemSaliency
+from app.models.test_item import TestItem
+from app.models.test_result import TestResult
+from app.models.test_session import TestCategory, TestSession
+from app.models.user import User
+from app.schemas.test_result import XAIExplanation
+from app.services.archive_service import ArchiveService
+from app.services.normative_service import NormativeService
+from app.services.pipeline_service import PipelineService
+
+EXPLAINER_VERSION = "shap-1"  # Bump when explanations change for the same scores
+SALIENCY_CATEGORIES = (TestCategory.MOTOR.value, TestCategory.FULL_SCREENING.value)
+
+
+def explainer_version(scoring_version: Optional[str]) -> str:
+    """xai_version of an explanation of a result scored with scoring_version."""
+    return f"{EXPLAINER_VERSION}/{scoring_version or BUILTIN_VERSION}"
+
+
+class ExplanationService:
+    """On-demand explanations of test results, stored once generated."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.normative = NormativeService(db)
+
+    async def get_explanation(self, user_id: int, session_id: int) -> XAIExplanation:
+        """The explanation of one of the user's completed sessions."""
+        row = (await self.db.execute(
+            select(TestResult, TestSession)
+            .join(TestSession, TestSession.id == TestResult.session_id)
+            .where(TestResult.session_id == session_id)
+            .where(TestSession.user_id == user_id)
+        )).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Test result not found"
+            )
+        return XAIExplanation.model_validate(await self.explain(*row))
+
+    async def explain(self, result: TestResult, session: TestSession) -> Dict[str, Any]:
+        """The result's stored explanation if current, else a newly generated (and stored) one."""
+        version = explainer_version(result.scoring_version)
+        if result.xai_explanation is not None and result.xai_version == version:
+            return result.xai_explanation
+
+        registry = get_scoring_registry()
+        scoring = await registry.get(result.scoring_version or BUILTIN_VERSION) or registry.current()
+        user = await self.db.get(User, session.user_id)
+        reference = await self.normative.reference_for(user, session.completed_at)
+
+        saliency = await self._spiral_saliency(session) if session.category in SALIENCY_CATEGORIES else None
+
+        explanation = await PipelineService(scoring).explain(
+            session.category, result.extracted_features or {}, reference, saliency
+        )
+        result.xai_explanation = explanation
+        result.xai_version = version
+        await self.db.commit()
+        return explanation
+
+    async def precompute(self, result_id: int) -> bool:
+        """Explain a result unless it already has a current explanation. Returns whether one was generated."""
+        row = (await self.db.execute(
+            select(TestResult, TestSession)
+            .join(TestSession, TestSession.id == TestResult.session_id)
+            .where(TestResult.id == result_id)
+        )).first()
+        if row is None or row[0].xai_version == explainer_version(row[0].scoring_version):
+            return False
+        await self.explain(*row)
+        return True
+
+    # ============== PRIVATE HELPERS ==============
+
+    async def _spiral_saliency(self, session: TestSession) -> Optional[Dict[str, Any]]:
+        """Saliency map of the session's latest spiral drawing with a usable trace, generated and stored if new."""
+        item_ids = (await self.db.execute(
+            select(TestItem.id)
+            .where(TestItem.session_id == session.id)
+            .where(TestItem.item_name == "spiral_drawing")
+            .order_by(TestItem.created_at.desc(), TestItem.id.desc())
+        )).scalars().all()
+        if not item_ids:
+            return None
+
+        stored = {
+            row.item_id: row
+            for row in (await self.db.execute(
+                select(ItemSaliency).where(ItemSaliency.item_id.in_(item_ids))
+            )).scalars().all()
+        }
+        for item_id in item_ids:
+            row = stored.get(item_id)
+            if row is not None and row.version == SALIENCY_VERSION:
+                if row.data is not None:
+                    return row.data
+                continue  # No usable trace
+
+            item = (await self.db.execute(select(TestItem).where(TestItem.id == item_id))).scalar_one()
+            await ArchiveService(self.db).rehydrate([item])  # Read back only, never written to the hot table
+            if item.raw_data is None:
+                continue
+            saliency = spiral_saliency(item.raw_data)
+
+            if row is None:
+                try:
+                    async with self.db.begin_nested():
+                        row = ItemSaliency(item_id=item_id, session_id=session.id, version=SALIENCY_VERSION)
+                        self.db.add(row)
+                except IntegrityError:
+                    row = await self.db.get(ItemSaliency, item_id)  # Stored concurrently
+            row.version, row.data = SALIENCY_VERSION, saliency  # Committed with the explanation
+            if saliency is not None:
+                return saliency
+        return None
+
+
+class ExplanationPrecomputer:
+    """Queue of results to explain while this worker is idle."""
+
+    def __init__(self):
+        self._queue: "asyncio.Queue[int]" = asyncio.Queue()
+        self._last_activity = 0.0
+
+    def touch(self) -> None:
+        """Note foreground work (a completion); precomputing waits for it to settle."""
+        self._last_activity = time.monotonic()
+
+    def enqueue(self, result_id: int) -> None:
+        if settings.XAI_PRECOMPUTE:
+            self._queue.put_nowait(result_id)
+
+    async def run(self) -> None:
+        """Explain queued results one at a time, only after XAI_PRECOMPUTE_IDLE_SECONDS without completions."""
+        while True:
+            result_id = await self._queue.get()
+            while (idle := time.monotonic() - self._last_activity) < settings.XAI_PRECOMPUTE_IDLE_SECONDS:
+                await asyncio.sleep(settings.XAI_PRECOMPUTE_IDLE_SECONDS - idle)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await ExplanationService(db).precompute(result_id)
+            except Exception as e:  # Explained on first read instead
+                print(f"⚠️ Explanation precompute failed for result {result_id}: {e}")
+
+
+_precomputer: Optional[ExplanationPrecomputer] = None
+
+
+def get_explanation_precomputer() -> ExplanationPrecomputer:
+    """Process-wide precompute queue."""
+    global _precomputer
+    if _precomputer is None:
+        _precomputer = ExplanationPrecomputer()
+    return _precomputer
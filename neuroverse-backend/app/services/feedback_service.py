@@ -7,6 +7,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional
 from datetime import datetime, timedelta
 
+from app.db.queries import fetch_feedback_stats
 from app.models.feedback import Feedback, FeedbackCategory, FeedbackStatus
 from app.schemas.feedback import FeedbackCreate, FeedbackUpdate, FeedbackStats
 
@@ -41,7 +42,6 @@ class FeedbackService:
             
             db.add(feedback)
             await db.commit()
-            await db.refresh(feedback)
             
             if feedback.id is None:
                 raise ValueError("Feedback was not assigned an ID after commit")
@@ -145,7 +145,6 @@ class FeedbackService:
             feedback.admin_notes = update_data.admin_notes
         
         await db.commit()
-        await db.refresh(feedback)
         return feedback
 
     @staticmethod
@@ -194,40 +193,13 @@ class FeedbackService:
     @staticmethod
     async def get_feedback_stats(db: AsyncSession) -> FeedbackStats:
         """Get feedback statistics (admin use)"""
-        # Total count
-        total_result = await db.execute(select(func.count(Feedback.id)))
-        total = total_result.scalar() or 0
-        
-        # Pending count
-        pending_result = await db.execute(
-            select(func.count(Feedback.id)).where(Feedback.status == FeedbackStatus.PENDING)
-        )
-        pending = pending_result.scalar() or 0
-        
-        # Resolved count
-        resolved_result = await db.execute(
-            select(func.count(Feedback.id)).where(Feedback.status == FeedbackStatus.RESOLVED)
-        )
-        resolved = resolved_result.scalar() or 0
-        
-        # Average rating
-        avg_result = await db.execute(
-            select(func.avg(Feedback.rating)).where(Feedback.rating.isnot(None))
-        )
-        avg_rating = avg_result.scalar()
-        
-        # Category breakdown
-        category_result = await db.execute(
-            select(Feedback.category, func.count(Feedback.id))
-            .group_by(Feedback.category)
-        )
-        category_counts = category_result.all()
-        category_breakdown = {str(cat.value): count for cat, count in category_counts}
+        stats = await fetch_feedback_stats(db)
+        avg_rating = stats.average_rating
         
         return FeedbackStats(
-            total_feedbacks=total,
-            pending_count=pending,
-            resolved_count=resolved,
+            total_feedbacks=stats.total,
+            pending_count=stats.pending,
+            resolved_count=stats.resolved,
             average_rating=round(float(avg_rating), 2) if avg_rating else None,
-            category_breakdown=category_breakdown
+            category_breakdown=stats.categories
         )
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+Fingerprint Service - Exact and near-duplicate submission detection
+Every ingested item with enough payload gets a 64-bit SimHash
+(app/utils/simhash.py) over tokens of its raw data. The tokens are
+quantized step shingles of each numeric stream (offset-free, so replays
+with shifted timestamps match), plus scalar values and attachment digests.
+The hash is looked up in item_fingerprints by its four 16-bit bands, so
+the expected cost per item is constant however many items are indexed.
+
+An item within FINGERPRINT_MAX_DISTANCE bits of an earlier session's
+item is marked in raw_data["_fingerprint"]; ValidityDetector counts
+such items as duplicate_items. Items of cancelled or invalid sessions
+stay indexed but are never matched.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.ml.extractors.base_extractor import (
+    ATTACHMENTS_KEY, CHANNELS_KEY, FEATURES_KEY, FINGERPRINT_KEY, decode_channel,
+)
+from app.models.item_fingerprint import ItemFingerprint
+from app.models.test_item import TestItem
+from app.models.test_session import SessionStatus, TestSession
+from app.utils.simhash import bands, from_signed, hamming, mix64, simhash, to_signed
+
+QUANT_STEP = 0.5  # Quantization level, as a fraction of a stream's typical step
+SHINGLE = 5  # Consecutive steps per stream token
+DISCARDED_STATUSES = (SessionStatus.CANCELLED.value, SessionStatus.INVALID.value)  # Not matched against
+
+
+class FingerprintService:
+    """Payload fingerprint index of submitted test items."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # Rows added but not flushed yet (e.g. earlier sessions of the same sync)
+        self._pending: List[ItemFingerprint] = []
+
+    async def check_items(self, user_id: int, session_id: int, items: Sequence[TestItem]) -> int:
+        """
+        Fingerprint new items, mark those duplicating an earlier session's
+        item, and add them to the index. Returns the number marked.
+
+        Runs without autoflush, so the items (and their updated raw_data)
+        are inserted once, with the caller's commit.
+        """
+        duplicates = 0
+        with self.db.no_autoflush:
+            for item in items:
+                tokens = payload_tokens(item.raw_data)
+                if len(tokens) < settings.FINGERPRINT_MIN_TOKENS:
+                    continue
+                fingerprint = simhash(tokens)
+
+                mark: Dict[str, Any] = {"simhash": f"{fingerprint:016x}"}
+                match = await self._nearest(item.item_name, fingerprint, session_id)
+                if match:
+                    (match_session_id, match_user_id), distance = match
+                    mark["duplicate_of"] = {
+                        "session_id": match_session_id,
+                        "distance": distance,
+                        "same_user": match_user_id == user_id,
+                    }
+                    duplicates += 1
+                item.raw_data = {**(item.raw_data or {}), FINGERPRINT_KEY: mark}
+
+                row = ItemFingerprint(
+                    session_id=session_id,
+                    user_id=user_id,
+                    item_name=item.item_name,
+                    simhash=to_signed(fingerprint),
+                    **{f"band{i}": band - 32768 for i, band in enumerate(bands(fingerprint))},
+                )
+                self.db.add(row)
+                self._pending.append(row)
+        return duplicates
+
+    # ============== PRIVATE HELPERS ==============
+
+    async def _nearest(
+        self, item_name: str, fingerprint: int, session_id: int
+    ) -> Optional[Tuple[Tuple[int, int], int]]:
+        """((session id, user id), distance) of the closest earlier duplicate, if any."""
+        rows = (await self.db.execute(
+            select(ItemFingerprint.session_id, ItemFingerprint.user_id, ItemFingerprint.simhash)
+            .join(TestSession, TestSession.id == ItemFingerprint.session_id)
+            .where(ItemFingerprint.item_name == item_name)
+            .where(ItemFingerprint.session_id != session_id)
+            .where(TestSession.status.notin_(DISCARDED_STATUSES))
+            .where(or_(*(
+                getattr(ItemFingerprint, f"band{i}") == band - 32768
+                for i, band in enumerate(bands(fingerprint))
+            )))
+        )).all()
+        for row in self._pending:
+            if row.item_name == item_name and row.session_id != session_id:
+                pending_session = await self.db.get(TestSession, row.session_id)  # In the identity map
+                if pending_session is None or pending_session.status not in DISCARDED_STATUSES:
+                    rows.append((row.session_id, row.user_id, row.simhash))
+
+        best = None
+        for match_session_id, match_user_id, match_hash in rows:
+            distance = hamming(fingerprint, from_signed(match_hash))
+            if distance <= settings.FINGERPRINT_MAX_DISTANCE and (best is None or distance < best[1]):
+                best = ((match_session_id, match_user_id), distance)
+        return best
+
+
+def payload_tokens(raw_data: Optional[Mapping[str, Any]]) -> np.ndarray:
+    """Distinct 64-bit token hashes of an item's raw data (uint64 array)."""
+    tokens: List[np.ndarray] = []
+    scalars: List[str] = []
+    _walk(raw_data or {}, "", tokens, scalars)
+    if scalars:
+        tokens.append(np.array([_string_hash(s) for s in scalars], dtype=np.uint64))
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    return np.unique(np.concatenate(tokens))
+
+
+def _walk(value: Any, path: str, tokens: List[np.ndarray], scalars: List[str]) -> None:
+    if isinstance(value, Mapping):
+        for key in sorted(value, key=str):
+            child = value[key]
+            if key in (FINGERPRINT_KEY, FEATURES_KEY):
+                continue  # Added by the server
+            if key == CHANNELS_KEY:
+                for name in sorted(child):
+                    tokens.append(_stream_tokens(f"{path}{name}", decode_channel(child[name])))
+            elif key == ATTACHMENTS_KEY:
+                scalars.extend(f"{path}{name}#{child[name].get('blob')}" for name in sorted(child))
+            else:
+                _walk(child, f"{path}{key}.", tokens, scalars)
+    elif isinstance(value, list):
+        if value and all(isinstance(v, Mapping) for v in value):
+            # Legacy sensor records: one stream per numeric field
+            for field in sorted({k for record in value for k in record}, key=str):
+                column = [record.get(field) for record in value]
+                if all(_is_number(v) for v in column):
+                    tokens.append(_stream_tokens(f"{path}{field}", np.asarray(column, dtype=float)))
+                else:
+                    _walk(column, f"{path}{field}.", tokens, scalars)
+        elif value and all(_is_number(v) for v in value):
+            tokens.append(_stream_tokens(path, np.asarray(value, dtype=float)))
+        else:
+            for i, child in enumerate(value):
+                _walk(child, f"{path}{i}.", tokens, scalars)
+    elif _is_number(value):
+        scalars.append(f"{path}={value:.4g}")
+    else:
+        scalars.append(f"{path}={value}")
+
+
+def _stream_tokens(path: str, values: np.ndarray) -> np.ndarray:
+    """SHINGLE-grams of a stream's quantized steps, seeded with its path."""
+    values = values[np.isfinite(values)].astype(float)
+    if len(values) <= SHINGLE:
+        return np.array([_string_hash(f"{path}={v:.4g}") for v in values], dtype=np.uint64)
+
+    steps = np.diff(values)
+    # Power-of-two step scale: the same for a trimmed or slightly altered copy
+    typical = np.median(np.abs(steps)) or np.abs(steps).max() or 1.0
+    scale = 2.0 ** np.round(np.log2(typical))
+    levels = np.round(steps / (scale * QUANT_STEP)).astype(np.int64).view(np.uint64)
+
+    shingles = np.full(len(levels) - SHINGLE + 1, np.uint64(_string_hash(path)))
+    for offset in range(SHINGLE):
+        shingles = mix64(shingles ^ levels[offset:len(levels) - SHINGLE + 1 + offset])
+    return shingles
+
+
+def _string_hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
@@ -36,36 +36,21 @@ References:
 - Bigler (2012) - Performance Validity Testing
 """
 
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Sequence, Tuple, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 import statistics
 
+import numpy as np
 
-# ==================== ENUMS ====================
-
-class CognitiveStage(Enum):
-    """Clinical Dementia Rating (CDR) based staging"""
-    NORMAL = "Normal"
-    SUBJECTIVE_DECLINE = "Subjective Cognitive Decline"
-    MCI = "Mild Cognitive Impairment"
-    MILD_DEMENTIA = "Mild Dementia"
-    MODERATE_DEMENTIA = "Moderate Dementia"
-    SEVERE_DEMENTIA = "Severe Dementia"
-
+from app.ml.fusion import batch_scoring
+from app.ml.fusion.clinical_norms import ClinicalNorms, CognitiveStage, ParkinsonStage
+from app.ml.fusion.scoring_registry import ScoringConfig, get_scoring_registry
+from app.services.normative_service import NormativeReference
 
-class ParkinsonStage(Enum):
-    """Hoehn & Yahr Scale"""
-    STAGE_0 = "No signs of disease"
-    STAGE_1 = "Unilateral involvement only"
-    STAGE_1_5 = "Unilateral and axial involvement"
-    STAGE_2 = "Bilateral without balance impairment"
-    STAGE_2_5 = "Mild bilateral with recovery on pull test"
-    STAGE_3 = "Mild-moderate bilateral; postural instability"
-    STAGE_4 = "Severe disability; able to walk/stand unassisted"
-    STAGE_5 = "Wheelchair bound or bedridden"
 
+# ==================== ENUMS ====================
 
 class ValidityStatus(Enum):
     """Data validity classification"""
@@ -76,110 +61,13 @@ class ValidityStatus(Enum):
     INVALID_RANDOM = "Invalid - Random Responding"
 
 
-# ==================== CLINICAL NORMS ====================
-
-@dataclass
-class ClinicalNorms:
-    """
-    Age-adjusted normative data from peer-reviewed literature
-    """
-    
-    # ===== MoCA (Nasreddine et al., 2005) =====
-    MOCA_MAX = 30
-    MOCA_NORMAL = 26          # ≥26 normal
-    MOCA_MCI_CUTOFF = 22      # 22-25 MCI
-    MOCA_DEMENTIA_CUTOFF = 17 # <17 dementia
-    
-    # ===== MMSE (Folstein et al., 1975) =====
-    MMSE_MAX = 30
-    MMSE_NORMAL = 27          # 27-30 normal
-    MMSE_MILD = 21            # 21-26 mild
-    MMSE_MODERATE = 11        # 11-20 moderate
-    MMSE_SEVERE = 0           # 0-10 severe
-    
-    # ===== ADAS-Cog (Rosen et al., 1984) =====
-    # Lower score = better (unlike MoCA/MMSE)
-    ADAS_COG_MAX = 70
-    ADAS_NORMAL = 5           # 0-5 normal
-    ADAS_MCI = 12             # 6-12 MCI
-    ADAS_MILD_AD = 25         # 13-25 mild AD
-    ADAS_MODERATE_AD = 40     # 26-40 moderate AD
-    
-    # ===== Trail Making Test (Tombaugh, 2004) =====
-    # Time in seconds (age 55-59 norms)
-    TMT_A_NORMAL = 35         # seconds
-    TMT_A_IMPAIRED = 78       # >78 impaired
-    TMT_B_NORMAL = 79         # seconds
-    TMT_B_IMPAIRED = 273      # >273 impaired
-    TMT_BA_RATIO_NORMAL = 2.5 # B/A ratio, >3 suggests executive dysfunction
-    
-    # ===== Clock Drawing Test (Shulman, 2000) =====
-    CDT_MAX = 5               # 5-point scale
-    CDT_NORMAL = 4            # ≥4 normal
-    CDT_IMPAIRED = 2          # ≤2 significant impairment
-    
-    # ===== Category Fluency (Animals in 60s) =====
-    FLUENCY_NORMAL = 18       # ≥18 words normal
-    FLUENCY_MCI = 14          # 14-17 borderline
-    FLUENCY_IMPAIRED = 10     # <10 impaired
-    
-    # ===== Digit Span (Wechsler, 2008) =====
-    DIGIT_FORWARD_NORMAL = 7  # ±2
-    DIGIT_BACKWARD_NORMAL = 5 # ±2
-    DIGIT_SPAN_IMPAIRED = 4   # <4 impaired
-    
-    # ===== Stroop Test (MacLeod, 1991) =====
-    STROOP_INTERFERENCE_NORMAL = 20    # seconds
-    STROOP_INTERFERENCE_IMPAIRED = 40  # seconds
-    STROOP_ACCURACY_NORMAL = 0.95
-    STROOP_ACCURACY_FLOOR = 0.50       # Below chance suggests invalid
-    
-    # ===== N-Back (Jaeggi et al., 2010) =====
-    NBACK_ACCURACY_NORMAL = 0.80
-    NBACK_ACCURACY_MCI = 0.65
-    NBACK_ACCURACY_IMPAIRED = 0.50
-    NBACK_ACCURACY_CHANCE = 0.50       # At or below = possibly invalid
-    NBACK_DPRIME_NORMAL = 2.0
-    
-    # ===== Word Recall - CERAD (Morris et al., 1989) =====
-    RECALL_IMMEDIATE_NORMAL = 0.70     # 70% of words
-    RECALL_IMMEDIATE_MCI = 0.50
-    RECALL_DELAYED_NORMAL = 0.70
-    RECALL_DELAYED_MCI = 0.40
-    RECALL_RECOGNITION_NORMAL = 0.90   # Recognition should be high
-    RECALL_RECOGNITION_FLOOR = 0.60    # Below suggests invalid
-    
-    # ===== Motor - Finger Tapping (Shimoyama, 1990) =====
-    TAPPING_NORMAL_MIN = 4.0   # taps/second
-    TAPPING_NORMAL_MAX = 6.0
-    TAPPING_PD_THRESHOLD = 3.0
-    TAPPING_FLOOR = 1.0        # Below = suspicious
-    
-    # ===== Gait Speed (Studenski et al., 2011) =====
-    GAIT_SPEED_NORMAL = 1.0    # m/s
-    GAIT_SPEED_SLOW = 0.8
-    GAIT_SPEED_VERY_SLOW = 0.6
-    GAIT_SPEED_FLOOR = 0.3     # Below = suspicious unless severe
-    
-    # ===== Balance Sway (Era et al., 2006) =====
-    SWAY_NORMAL = 0.3
-    SWAY_ABNORMAL = 0.6
-    
-    # ===== Blink Rate (Karson et al., 1984) =====
-    BLINK_NORMAL_MIN = 15
-    BLINK_NORMAL_MAX = 20
-    BLINK_PD_THRESHOLD = 10
-    
-    # ===== Voice/Speech (Rusz et al., 2011) =====
-    VOWEL_DURATION_NORMAL = 15  # seconds
-    VOWEL_DURATION_IMPAIRED = 10
-    SPEECH_RATE_NORMAL_MIN = 120  # wpm
-    SPEECH_RATE_NORMAL_MAX = 180
-    
-    # ===== REACTION TIME NORMS (for validity) =====
-    RT_MIN_VALID = 150         # ms - below is too fast (anticipation)
-    RT_MAX_VALID = 3000        # ms - above is too slow (deliberate)
-    RT_COEFFICIENT_OF_VARIATION_MAX = 0.5  # CV > 0.5 suggests inconsistency
+# Status codes of ValidityDetector.assess_batch
+VALIDITY_STATUS_VALUES = np.array([
+    ValidityStatus.VALID.value,
+    ValidityStatus.QUESTIONABLE.value,
+    ValidityStatus.INVALID.value,
+    ValidityStatus.INVALID_POOR_EFFORT.value,
+], dtype=object)
 
 
 # ==================== VALIDITY DETECTOR ====================
@@ -201,6 +89,9 @@ class ValidityIndicators:
     # Statistical improbabilities
     improbable_scores: List[str] = field(default_factory=list)
     
+    # Items replaying an earlier submission (payload fingerprint match)
+    duplicate_items: int = 0
+    
     # Overall validity
     validity_status: ValidityStatus = ValidityStatus.VALID
     validity_confidence: float = 1.0
@@ -217,8 +108,8 @@ class ValidityDetector:
     - Slick et al. (1999) - Malingered neurocognitive dysfunction criteria
     """
     
-    def __init__(self):
-        self.norms = ClinicalNorms()
+    def __init__(self, norms: Optional[ClinicalNorms] = None):
+        self.norms = norms or ClinicalNorms()
     
     def assess_validity(self, features: Dict[str, Any]) -> ValidityIndicators:
         """
@@ -230,6 +121,7 @@ class ValidityDetector:
         3. Response time anomalies
         4. Statistical improbabilities
         5. Effort indicators
+        6. Items duplicating earlier submissions
         """
         indicators = ValidityIndicators()
         
@@ -249,11 +141,66 @@ class ValidityDetector:
         # ===== 5. EFFORT INDICATORS =====
         self._check_effort(features, indicators)
         
+        # ===== 6. REPLAYED SUBMISSIONS =====
+        self._check_duplicates(features, indicators)
+        
         # ===== DETERMINE OVERALL VALIDITY =====
         indicators.validity_status, indicators.validity_confidence = self._determine_validity(indicators)
         
         return indicators
     
+    def assess_batch(self, category: str, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Validity status values and confidences for every row of a category's
+        feature matrix (batch_scoring.matrix_columns; NaN = absent).
+        
+        Same status and confidence as assess_validity() per row; only the
+        checks that weigh into the status apply (concern texts are per-record).
+        """
+        column = dict(zip(batch_scoring.matrix_columns(category), np.asarray(matrix, dtype=float).T))
+        
+        # Comparisons with NaN are False, like the per-record "is not None" guards
+        below_chance = (
+            (column["nback_accuracy"] <= 0.50).astype(int)
+            + (column["recognition_accuracy"] < 0.60)
+            + (column["stroop_congruent_accuracy"] < 0.70)
+        )
+        inconsistent = (
+            (column["recall_accuracy"] > column["recognition_accuracy"] + 0.15).astype(int)
+            + (column["stroop_incongruent_accuracy"] > column["stroop_congruent_accuracy"] + 0.10)
+            + (column["simple_reaction_time"] > column["choice_reaction_time"] * 1.5)
+        )
+        
+        floor_tests = np.stack([column[name] for name in (
+            "stroop_accuracy", "nback_accuracy", "recall_accuracy", "tapping_regularity")])
+        present = ~np.isnan(floor_tests)
+        floor = (present.sum(axis=0) >= 3) & np.where(present, floor_tests < 0.3, True).all(axis=0)
+        improbable = (
+            ((column["easy_items_correct"] < 0.3) & (column["hard_items_correct"] > 0.7)).astype(int)
+            + ((column["cognitive_score"] < 10) & (column["motor_score"] > 95))
+            + floor
+        )
+        
+        timing = (column["too_fast_responses"] > 10) | (column["too_slow_responses"] > 10)
+        duplicates = np.nan_to_num(column["duplicate_items"]).astype(int)
+        
+        # _determine_validity
+        total_score = below_chance * 3 + inconsistent * 3 + improbable * 2 + timing + duplicates * 3
+        confidence = np.where(total_score == 0, 1.0, np.maximum(0, 1 - (total_score * 0.1)))
+        status = np.select(
+            [
+                total_score == 0,
+                total_score <= 2,
+                below_chance > 0,
+                inconsistent > 0,
+                duplicates > 0,
+                total_score >= 5,
+            ],
+            [0, 1, 2, 2, 2, 3],
+            1,
+        )
+        return VALIDITY_STATUS_VALUES[status], confidence
+    
     def _check_below_chance(self, features: Dict, indicators: ValidityIndicators):
         """
         Check for performance at or below chance level.
@@ -437,6 +384,20 @@ class ValidityDetector:
                 "Performance declined with practice - opposite of expected pattern"
             )
     
+    def _check_duplicates(self, features: Dict, indicators: ValidityIndicators):
+        """
+        Check for items whose payload duplicates an earlier submission.
+        
+        A recording replayed (or barely altered) from another session says
+        nothing about this session's performance.
+        """
+        duplicates = features.get("duplicate_items")
+        if duplicates:
+            indicators.duplicate_items = int(duplicates)
+            indicators.validity_concerns.append(
+                f"{int(duplicates)} test item(s) duplicate an earlier submission - possible replayed data"
+            )
+    
     def _determine_validity(self, indicators: ValidityIndicators) -> Tuple[ValidityStatus, float]:
         """
         Determine overall validity status and confidence.
@@ -450,6 +411,7 @@ class ValidityDetector:
             "improbable": 2,
             "timing": 1,
             "effort": 1,
+            "duplicate": 3,
         }
         
         total_score = 0
@@ -467,6 +429,9 @@ class ValidityDetector:
         if indicators.too_fast_responses > 10 or indicators.too_slow_responses > 10:
             total_score += weights["timing"]
         
+        # Replayed submissions
+        total_score += indicators.duplicate_items * weights["duplicate"]
+        
         # Calculate confidence
         confidence = max(0, 1 - (total_score * 0.1))
         
@@ -479,12 +444,165 @@ class ValidityDetector:
             return ValidityStatus.INVALID, confidence
         elif indicators.inconsistent_patterns:
             return ValidityStatus.INVALID, confidence
+        elif indicators.duplicate_items:
+            return ValidityStatus.INVALID, confidence
         elif total_score >= 5:
             return ValidityStatus.INVALID_POOR_EFFORT, confidence
         else:
             return ValidityStatus.QUESTIONABLE, confidence
 
 
+# Raw item fields holding per-trial reaction times (ms)
+REACTION_TIME_FIELDS = ("reaction_times", "response_times", "times")
+
+# Statuses for which scoring the session is pointless (retest instead)
+INVALID_STATUSES = (
+    ValidityStatus.INVALID,
+    ValidityStatus.INVALID_POOR_EFFORT,
+    ValidityStatus.INVALID_RANDOM,
+)
+
+
+class SessionValidityTracker:
+    """
+    Validity of a session so far, updated as each item is added.
+    
+    Keeps streaming counters over trial reaction times (count, too fast /
+    too slow, Welford mean and M2 for the CV), the validity-relevant scores
+    and the number of duplicate items seen so far. The state is a small JSON dict
+    (test_sessions.validity_state), so an update costs O(trials in the item).
+    Status and confidence use ValidityDetector's checks and weighting; on
+    top of those, anticipatory responses on more than 20% of over 10 trials
+    mark the session as random responding.
+    """
+    
+    # Features read by ValidityDetector's below-chance, consistency,
+    # improbability and effort checks
+    SCORE_FEATURES = (
+        "nback_accuracy", "recognition_accuracy", "recall_accuracy",
+        "stroop_accuracy", "stroop_congruent_accuracy", "stroop_incongruent_accuracy",
+        "simple_reaction_time", "choice_reaction_time",
+        "easy_items_correct", "hard_items_correct",
+        "cognitive_score", "motor_score", "tapping_regularity",
+        "test_completion_rate", "response_rate", "practice_improvement",
+    )
+    
+    def __init__(self, state: Optional[Dict[str, Any]] = None, detector: Optional[ValidityDetector] = None):
+        self.detector = detector or ValidityDetector()
+        state = state or {}
+        self.items = state.get("items", 0)
+        self.scores: Dict[str, float] = dict(state.get("scores", {}))
+        self.rt_count = state.get("rt_count", 0)
+        self.rt_mean = state.get("rt_mean", 0.0)
+        self.rt_m2 = state.get("rt_m2", 0.0)
+        self.too_fast = state.get("too_fast", 0)
+        self.too_slow = state.get("too_slow", 0)
+        self.duplicates = state.get("duplicates", 0)
+    
+    @property
+    def state(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "scores": self.scores,
+            "rt_count": self.rt_count,
+            "rt_mean": self.rt_mean,
+            "rt_m2": self.rt_m2,
+            "too_fast": self.too_fast,
+            "too_slow": self.too_slow,
+            "duplicates": self.duplicates,
+        }
+    
+    def add(self, features: Dict[str, Any], reaction_times: Sequence[float] = (), duplicate: bool = False) -> None:
+        """Fold one item's extracted features, trial reaction times and duplicate flag in."""
+        self.items += 1
+        self.duplicates += int(duplicate)
+        for name in self.SCORE_FEATURES:
+            value = features.get(name)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.scores[name] = value
+        
+        norms = self.detector.norms
+        for rt in reaction_times:
+            if rt < norms.RT_MIN_VALID:
+                self.too_fast += 1
+            elif rt > norms.RT_MAX_VALID:
+                self.too_slow += 1
+            self.rt_count += 1
+            delta = rt - self.rt_mean
+            self.rt_mean += delta / self.rt_count
+            self.rt_m2 += delta * (rt - self.rt_mean)
+    
+    def assess(self) -> ValidityIndicators:
+        """ValidityDetector's assessment of everything added so far."""
+        detector = self.detector
+        indicators = ValidityIndicators()
+        detector._check_below_chance(self.scores, indicators)
+        self._check_response_times(indicators)
+        detector._check_consistency(self.scores, indicators)
+        detector._check_improbability(self.scores, indicators)
+        detector._check_effort(self.scores, indicators)
+        detector._check_duplicates({"duplicate_items": self.duplicates}, indicators)
+        indicators.validity_status, indicators.validity_confidence = detector._determine_validity(indicators)
+        
+        if self._random_responding() and indicators.validity_status not in INVALID_STATUSES:
+            indicators.validity_status = ValidityStatus.INVALID_RANDOM
+            indicators.validity_confidence = min(
+                indicators.validity_confidence, 1 - self.too_fast / self.rt_count
+            )
+        return indicators
+    
+    def summary(self) -> Dict[str, Any]:
+        """Status so far, as in risk_scores["validity"], plus whether to prompt a retest."""
+        indicators = self.assess()
+        return {
+            "status": indicators.validity_status.value,
+            "confidence": round(indicators.validity_confidence, 2),
+            "concerns": indicators.validity_concerns,
+            "is_valid": indicators.validity_status == ValidityStatus.VALID,
+            "retest_recommended": indicators.validity_status in INVALID_STATUSES,
+            "items_checked": self.items,
+            "trials_checked": self.rt_count,
+        }
+    
+    def _check_response_times(self, indicators: ValidityIndicators):
+        """ValidityDetector._check_response_times over the streaming counters."""
+        if self.rt_count <= 5:
+            return
+        indicators.too_fast_responses = self.too_fast
+        indicators.too_slow_responses = self.too_slow
+        
+        if self.too_fast > self.rt_count * 0.2:
+            indicators.validity_concerns.append(
+                f"{self.too_fast} responses too fast (<150ms) - suggests anticipation/random"
+            )
+        if self.too_slow > self.rt_count * 0.3:
+            indicators.validity_concerns.append(
+                f"{self.too_slow} responses excessively slow (>3s) - suggests deliberate slowing"
+            )
+        
+        if self.rt_count > 10:
+            std_rt = (self.rt_m2 / (self.rt_count - 1)) ** 0.5
+            cv = std_rt / self.rt_mean if self.rt_mean > 0 else 0
+            if cv > self.detector.norms.RT_COEFFICIENT_OF_VARIATION_MAX:
+                indicators.validity_concerns.append(
+                    f"Response time variability (CV={cv:.2f}) suggests inconsistent effort"
+                )
+    
+    def _random_responding(self) -> bool:
+        return self.rt_count > 10 and self.too_fast > self.rt_count * 0.2
+
+
+def item_reaction_times(raw_data: Optional[Dict[str, Any]]) -> List[float]:
+    """Per-trial reaction times (ms) in a test item's raw data, if it has any."""
+    for name in REACTION_TIME_FIELDS:
+        values = (raw_data or {}).get(name)
+        if isinstance(values, list) and values and all(
+            isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+        ):
+            return [float(v) for v in values]
+    return []
+
+
 # ==================== MAIN FUSION SERVICE ====================
 
 class FusionService:
@@ -498,17 +616,23 @@ class FusionService:
     Always consult healthcare professionals.
     """
     
-    def __init__(self):
-        self.norms = ClinicalNorms()
-        self.validity_detector = ValidityDetector()
+    def __init__(self, scoring: Optional[ScoringConfig] = None):
+        # Snapshot of the active norms/scales version, used for this instance's lifetime
+        self.scoring = scoring or get_scoring_registry().current()
+        self.norms = self.scoring.norms
+        self.validity_detector = ValidityDetector(self.norms)
     
     async def calculate_risk_scores(
         self, 
         category: str, 
-        features: Dict[str, Any]
+        features: Dict[str, Any],
+        reference: Optional[NormativeReference] = None
     ) -> Dict[str, Any]:
         """
         Calculate clinical risk scores with validity checking.
+        
+        With the user's population norms (`reference`), results also carry
+        each feature's percentile rank among peers.
         """
         # STEP 1: Check validity first
         validity = self.validity_detector.assess_validity(features)
@@ -535,6 +659,11 @@ class FusionService:
             "is_valid": validity.validity_status == ValidityStatus.VALID,
         }
         
+        results["scoring_version"] = self.scoring.version
+        
+        if reference is not None:
+            results["percentiles"] = reference.percentiles(category, features)
+        
         # STEP 4: Adjust risk if validity is questionable
         if validity.validity_status != ValidityStatus.VALID:
             results["clinical_notes"].insert(0, 
@@ -547,6 +676,32 @@ class FusionService:
         
         return results
     
+    def score_batch(self, category: str, matrix: np.ndarray) -> Dict[str, Any]:
+        """
+        Score many feature sets of one category at once.
+        
+        `matrix` has a row per feature set and the columns of
+        batch_scoring.matrix_columns(category), NaN where a feature is absent
+        (features_matrix() builds it from dicts). Returns arrays with one entry
+        per row, equal to what calculate_risk_scores() gives for that row:
+        ad_risk, pd_risk, category_score, stage, severity, ad_stage, pd_stage,
+        validity_status, validity_confidence and is_valid.
+        """
+        scores = batch_scoring.score_batch(category, matrix, self.scoring)
+        validity_status, validity_confidence = self.validity_detector.assess_batch(category, matrix)
+        
+        return {
+            **scores._asdict(),
+            "validity_status": validity_status,
+            "validity_confidence": batch_scoring.round_half_even(validity_confidence, 2),
+            "is_valid": validity_status == ValidityStatus.VALID.value,
+            "scoring_version": self.scoring.version,
+        }
+    
+    def features_matrix(self, category: str, features: List[Dict[str, Any]]) -> np.ndarray:
+        """Stack feature dicts into score_batch()'s matrix."""
+        return batch_scoring.features_matrix(category, features, self.norms)
+    
     async def _assess_cognitive(self, features: Dict[str, Any]) -> Dict[str, Any]:
         """
         Comprehensive cognitive assessment using multiple clinical scales.
@@ -1017,56 +1172,16 @@ class FusionService:
             return ParkinsonStage.STAGE_2
     
     def _get_severity(self, risk: float) -> str:
-        if risk < 20:
-            return "low"
-        elif risk < 40:
-            return "mild"
-        elif risk < 60:
-            return "moderate"
-        elif risk < 80:
-            return "high"
-        else:
-            return "severe"
+        return self.scoring.severity(risk)
     
     def _get_stage_from_risk(self, risk: float) -> str:
-        if risk < 15:
-            return "Normal"
-        elif risk < 30:
-            return "Minimal"
-        elif risk < 50:
-            return "Mild"
-        elif risk < 70:
-            return "Moderate"
-        else:
-            return "Severe"
+        return self.scoring.stage(risk)
     
     def _get_ad_stage_from_risk(self, risk: float) -> str:
-        if risk < 10:
-            return CognitiveStage.NORMAL.value
-        elif risk < 25:
-            return CognitiveStage.SUBJECTIVE_DECLINE.value
-        elif risk < 40:
-            return CognitiveStage.MCI.value
-        elif risk < 60:
-            return CognitiveStage.MILD_DEMENTIA.value
-        elif risk < 80:
-            return CognitiveStage.MODERATE_DEMENTIA.value
-        else:
-            return CognitiveStage.SEVERE_DEMENTIA.value
+        return self.scoring.ad_stage(risk)
     
     def _get_pd_stage_from_risk(self, risk: float) -> str:
-        if risk < 10:
-            return ParkinsonStage.STAGE_0.value
-        elif risk < 25:
-            return ParkinsonStage.STAGE_1.value
-        elif risk < 40:
-            return ParkinsonStage.STAGE_2.value
-        elif risk < 60:
-            return ParkinsonStage.STAGE_3.value
-        elif risk < 80:
-            return ParkinsonStage.STAGE_4.value
-        else:
-            return ParkinsonStage.STAGE_5.value
+        return self.scoring.pd_stage(risk)
     
     def _interpret_cognitive(self, moca: float, domains: Dict) -> str:
         if moca >= 26:
@@ -1120,24 +1235,15 @@ class CompositeFusionService:
     - Gait: Important for both (falls in AD, freezing in PD)
     - Speech: Moderate both (semantic issues AD, dysarthria PD)
     - Facial: Hypomimia primarily PD
-    """
     
-    # Evidence-based category weights
-    WEIGHTS_AD = {
-        "cognitive": 0.45,   # Primary: Memory, executive
-        "speech": 0.20,      # Language, semantic fluency
-        "gait": 0.20,        # Falls risk, spatial navigation
-        "motor": 0.05,       # Late-stage only
-        "facial": 0.10,      # Minimal contribution
-    }
+    Built-in weights are in app/ml/fusion/clinical_norms.py; scoring versions
+    can override them.
+    """
     
-    WEIGHTS_PD = {
-        "motor": 0.35,       # Cardinal: Bradykinesia, tremor, rigidity
-        "gait": 0.25,        # Festination, freezing, postural instability
-        "speech": 0.15,      # Hypokinetic dysarthria
-        "cognitive": 0.15,   # PD-MCI, PD-dementia
-        "facial": 0.10,      # Hypomimia
-    }
+    def __init__(self, scoring: Optional[ScoringConfig] = None):
+        # Evidence-based category weights and scales from the active scoring version
+        self.scoring = scoring or get_scoring_registry().current()
+        self.fusion = FusionService(self.scoring)
     
     def calculate_composite(self, category_results: Dict[str, Dict]) -> Dict[str, Any]:
         """Calculate weighted composite risk scores."""
@@ -1155,8 +1261,7 @@ class CompositeFusionService:
                 validity_concerns.append(f"{category}: {validity.get('status', 'Unknown')}")
             
             # Weighted scores
-            ad_weight = self.WEIGHTS_AD.get(category, 0.1)
-            pd_weight = self.WEIGHTS_PD.get(category, 0.1)
+            ad_weight, pd_weight = self.category_weights(category)
             
             ad_weighted += results.get("ad_risk", 0) * ad_weight
             pd_weighted += results.get("pd_risk", 0) * pd_weight
@@ -1176,23 +1281,62 @@ class CompositeFusionService:
         else:
             primary = "Mixed/Undetermined"
         
+        overall = max(composite_ad, composite_pd)
+        category_scores = [results.get("category_score", 0) for results in category_results.values()]
+        
         return {
             "composite_ad_risk": round(composite_ad, 2),
             "composite_pd_risk": round(composite_pd, 2),
             "primary_concern": primary,
-            "overall_risk": round(max(composite_ad, composite_pd), 2),
+            "overall_risk": round(overall, 2),
+            "overall_score": round(sum(category_scores) / len(category_scores), 2) if category_scores else 0,
+            "stage": self.fusion._get_stage_from_risk(overall),
+            "severity": self.fusion._get_severity(overall),
+            "ad_stage": self.fusion._get_ad_stage_from_risk(composite_ad),
+            "pd_stage": self.fusion._get_pd_stage_from_risk(composite_pd),
             "categories_assessed": list(category_results.keys()),
+            "category_breakdown": {
+                category: {
+                    "ad_risk": results.get("ad_risk", 0),
+                    "pd_risk": results.get("pd_risk", 0),
+                    "category_score": results.get("category_score", 0),
+                }
+                for category, results in category_results.items()
+            },
             "validity_summary": {
                 "all_valid": len(validity_concerns) == 0,
                 "concerns": validity_concerns,
             },
             "recommendation": self._get_recommendation(composite_ad, composite_pd, validity_concerns),
+            "scoring_version": self.scoring.version,
             "disclaimer": (
                 "SCREENING TOOL ONLY. This assessment does not constitute a medical diagnosis. "
                 "Please consult a qualified healthcare professional for proper evaluation and diagnosis."
             ),
         }
     
+    def category_weights(self, category: str) -> Tuple[float, float]:
+        """(AD weight, PD weight) of a category."""
+        return self.scoring.category_weights(category)
+    
+    def composite_from_sums(
+        self,
+        ad_weighted_sum: float,
+        ad_weight_total: float,
+        pd_weighted_sum: float,
+        pd_weight_total: float,
+    ) -> Dict[str, Any]:
+        """Composite risk from running weighted sums (same normalization as calculate_composite)."""
+        composite_ad = ad_weighted_sum / ad_weight_total if ad_weight_total > 0 else 0
+        composite_pd = pd_weighted_sum / pd_weight_total if pd_weight_total > 0 else 0
+        
+        return {
+            "composite_ad_risk": round(composite_ad, 2),
+            "composite_pd_risk": round(composite_pd, 2),
+            "ad_stage": self.fusion._get_ad_stage_from_risk(composite_ad),
+            "pd_stage": self.fusion._get_pd_stage_from_risk(composite_pd),
+        }
+    
     def _get_recommendation(self, ad: float, pd: float, validity_concerns: List) -> str:
         if validity_concerns:
             return "Results may be unreliable due to validity concerns. Consider re-testing under standardized conditions."
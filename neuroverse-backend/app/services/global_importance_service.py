@@ -0,0 +1,233 @@
+"""
+Global Importance Service - Cohort-wide feature importance per scoring version
+Which features drive risk across all users, without reading stored
+explanations. The scheduled job (app/jobs/global_feature_importance.py)
+explains completed results of each category - single-category sessions
+and the category's part of full screenings - with the category's SHAP
+explainer, and keeps weighted sums of |SHAP value|, SHAP value and
+|pair interaction| in global_feature_importance, one row per (category,
+scoring version).
+
+A refresh reads the results added since the row's watermark (at most
+GLOBAL_IMPORTANCE_BATCH). Ids are assigned before commit, so a result can
+appear below the watermark after it moved on; the last
+GLOBAL_IMPORTANCE_LATE_MARGIN ids are re-read every time, skipping those
+already included. Results are grouped by the user's age band and gender at
+completion, and explains at most GLOBAL_IMPORTANCE_STRATUM_SAMPLE per
+stratum. Each explained result is weighted by its stratum's new results
+per sample, so small strata are always represented and the cost per
+refresh is bounded. Means are over the results where the feature (both
+features, for a pair) was measured. Results are explained against the
+background current when they are added; doctors read the stored summary.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.ml.fusion.batch_scoring import features_matrix
+from app.ml.fusion.scoring_registry import ScoringConfig, get_scoring_registry
+from app.ml.xai.shap_explainer import OUTPUTS, get_explainer_cache
+from app.models.global_importance import GlobalFeatureImportance
+from app.models.test_result import TestResult
+from app.models.test_session import SessionStatus, TestCategory, TestSession
+from app.models.user import User
+from app.services.explanation_service import explainer_version
+from app.services.normative_service import stratum_of
+from app.services.xai_service import XAIService
+
+
+class GlobalImportanceService:
+    """Incrementally maintained global feature importance."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_importance(
+        self, category: Optional[str] = None, scoring_version: Optional[str] = None
+    ) -> List[GlobalFeatureImportance]:
+        """Stored rows for a scoring version (the active one by default), optionally one category."""
+        query = (
+            select(GlobalFeatureImportance)
+            .where(GlobalFeatureImportance.scoring_version == (scoring_version or get_scoring_registry().current().version))
+            .order_by(GlobalFeatureImportance.category)
+        )
+        if category:
+            query = query.where(GlobalFeatureImportance.category == category)
+        return list((await self.db.execute(query)).scalars().all())
+
+    async def refresh(self, category: str, scoring: ScoringConfig) -> int:
+        """
+        Add the category's results since the watermark to its row for the
+        scoring version and commit. Returns the number of results read
+        (GLOBAL_IMPORTANCE_BATCH if more are waiting).
+        """
+        explainer = get_explainer_cache().get(category, scoring)
+        row = await self._lock_row(category, scoring.version)
+        version = explainer_version(scoring.version)
+        features = list(explainer.features)
+        if row.explainer_version != version or (row.sums or {}).get("features") != features:
+            # Different attributions for the same results: start over
+            row.explainer_version, row.last_result_id, row.population, row.samples = version, 0, 0, 0
+            row.sums, row.summary, row.recent_result_ids = {"features": features, "strata": {}}, None, []
+
+        seen = set(row.recent_result_ids or [])
+        results = (await self.db.execute(
+            select(TestResult.id, TestResult.extracted_features, TestSession.category, TestSession.completed_at, User)
+            .join(TestSession, TestSession.id == TestResult.session_id)
+            .join(User, User.id == TestSession.user_id)
+            .where(TestSession.category.in_([category, TestCategory.FULL_SCREENING.value]))
+            .where(TestSession.status == SessionStatus.COMPLETED.value)
+            .where(TestResult.id > row.last_result_id - settings.GLOBAL_IMPORTANCE_LATE_MARGIN)
+            .where(TestResult.id.notin_(seen))
+            .order_by(TestResult.id)
+            .limit(settings.GLOBAL_IMPORTANCE_BATCH)
+        )).all()
+        if not results:
+            await self.db.commit()
+            return 0
+
+        by_stratum: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for _, extracted, session_category, completed_at, user in results:
+            if session_category == TestCategory.FULL_SCREENING.value:
+                extracted = ((extracted or {}).get("categories") or {}).get(category)
+            if extracted:
+                by_stratum["/".join(stratum_of(user, completed_at))].append(extracted)
+
+        # Stratified sample; each explained result stands in for population / samples of its stratum
+        rng = np.random.default_rng(row.last_result_id)
+        sampled, weights, keys = [], [], []
+        for key, group in by_stratum.items():
+            take = min(len(group), settings.GLOBAL_IMPORTANCE_STRATUM_SAMPLE)
+            picks = rng.choice(len(group), take, replace=False) if take < len(group) else range(take)
+            sampled.extend(group[i] for i in picks)
+            weights.extend([len(group) / take] * take)
+            keys.extend([key] * take)
+
+        if sampled and features:
+            matrix = features_matrix(category, sampled, scoring.norms)[:, :len(features)]
+            interactions = await asyncio.to_thread(explainer.interactions, matrix)
+            strata = dict(row.sums["strata"])  # Copied: JSON changes are detected by comparison
+            for key in by_stratum:
+                mask = np.array([k == key for k in keys])
+                strata[key] = _accumulate(
+                    strata.get(key), matrix[mask], interactions[mask], np.array(weights)[mask], len(by_stratum[key])
+                )
+            row.sums = {"features": features, "strata": strata}
+            row.summary = _summarize(features, strata)
+
+        row.last_result_id = max(row.last_result_id, results[-1][0])
+        row.recent_result_ids = sorted(
+            result_id for result_id in seen.union(result[0] for result in results)
+            if result_id > row.last_result_id - settings.GLOBAL_IMPORTANCE_LATE_MARGIN
+        )
+        row.population = (row.population or 0) + sum(len(group) for group in by_stratum.values())
+        row.samples = (row.samples or 0) + len(sampled)
+        await self.db.commit()
+        return len(results)
+
+    # ============== PRIVATE HELPERS ==============
+
+    async def _lock_row(self, category: str, scoring_version: str) -> GlobalFeatureImportance:
+        """The (category, version) row, created if missing, locked FOR UPDATE."""
+        query = (
+            select(GlobalFeatureImportance)
+            .where(GlobalFeatureImportance.category == category)
+            .where(GlobalFeatureImportance.scoring_version == scoring_version)
+        )
+        if (await self.db.execute(query)).scalar_one_or_none() is None:
+            try:
+                async with self.db.begin_nested():
+                    self.db.add(GlobalFeatureImportance(
+                        category=category, scoring_version=scoring_version, explainer_version="",
+                        last_result_id=0, population=0, samples=0,
+                    ))
+            except IntegrityError:
+                pass  # Created concurrently; the locking select below picks it up
+
+        result = await self.db.execute(query.with_for_update().execution_options(populate_existing=True))
+        return result.scalar_one()
+
+
+def _accumulate(
+    stats: Optional[Dict[str, Any]],
+    matrix: np.ndarray,
+    interactions: np.ndarray,
+    weights: np.ndarray,
+    population: int,
+) -> Dict[str, Any]:
+    """A stratum's running sums with a weighted batch of interaction values added."""
+    measured = ~np.isnan(matrix)
+    phi = interactions.sum(axis=2)
+    single = weights[:, None] * measured  # (n, M)
+    pair = single[:, :, None] * measured[:, None, :]  # (n, M, M)
+
+    stats = stats or {}
+
+    def add(key: str, batch: np.ndarray) -> list:
+        return (np.array(stats[key]) + batch if key in stats else batch).tolist()
+
+    return {
+        "population": stats.get("population", 0) + population,
+        "samples": stats.get("samples", 0) + len(matrix),
+        "measured": add("measured", single.sum(axis=0)),
+        "abs_sum": add("abs_sum", np.einsum("nm,nmj->mj", single, np.abs(phi))),
+        "sum": add("sum", np.einsum("nm,nmj->mj", single, phi)),
+        "pair_measured": add("pair_measured", pair.sum(axis=0)),
+        # A pair's interaction is [i, j] + [j, i]
+        "interaction_abs_sum": add("interaction_abs_sum", np.einsum("nab,nabj->abj", pair, 2 * np.abs(interactions))),
+    }
+
+
+def _summarize(features: List[str], strata: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Ranked features and top interactions (risk points) over all strata."""
+    def total(key: str) -> np.ndarray:
+        return sum(np.array(stats[key]) for stats in strata.values())
+
+    def outputs(values: np.ndarray) -> Dict[str, float]:
+        return {output: round(float(v), 3) for output, v in zip(OUTPUTS, values)}
+
+    def name(feature: str) -> str:
+        return XAIService.FEATURE_NAMES.get(feature, feature.replace("_", " ").title())
+
+    population = sum(stats["population"] for stats in strata.values())
+    measured, pair_measured = total("measured"), total("pair_measured")
+    mean_abs = total("abs_sum") / np.maximum(measured, 1e-12)[:, None]
+    mean = total("sum") / np.maximum(measured, 1e-12)[:, None]
+    interaction = total("interaction_abs_sum") / np.maximum(pair_measured, 1e-12)[:, :, None]
+
+    ranked = sorted(range(len(features)), key=lambda i: -mean_abs[i].max())
+    pairs = sorted(
+        ((i, j) for i in range(len(features)) for j in range(i + 1, len(features)) if interaction[i, j].max() > 1e-9),
+        key=lambda p: -interaction[p].max(),
+    )[:settings.GLOBAL_IMPORTANCE_TOP_INTERACTIONS]
+
+    return {
+        "features": [
+            {
+                "feature": features[i],
+                "name": name(features[i]),
+                "rank": rank,
+                "mean_abs": outputs(mean_abs[i]),
+                "mean": outputs(mean[i]),  # Positive = raises risk on average
+                "coverage": round(float(measured[i] / population), 3) if population else 0.0,
+            }
+            for rank, i in enumerate(ranked, 1)
+        ],
+        "interactions": [
+            {"features": [features[i], features[j]], "names": [name(features[i]), name(features[j])],
+             "mean_abs": outputs(interaction[i, j])}
+            for i, j in pairs
+        ],
+        "strata": [
+            {"age_band": key.split("/")[0], "gender": key.split("/")[1],
+             "population": stats["population"], "samples": stats["samples"]}
+            for key, stats in sorted(strata.items())
+        ],
+    }
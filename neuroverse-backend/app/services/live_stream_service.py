@@ -0,0 +1,188 @@
+"""
+Live Stream Service - Sensor samples streamed over a WebSocket during a test
+Features are computed online as chunks arrive (same extractors as stored
+items), and samples are written straight to the blob store, so nothing
+large is held in memory and the item's features are final when it ends.
+
+Protocol (JSON text messages):
+    client: {"samples": {"x": [...], "y": [...], "z": [...], "timestamp": [...]}}
+            (or "samples": [{"x": .., ...}, ...]; optional "stream" for
+            secondary streams such as "gyroscope_data", stored but not featurized)
+    server: {"received": 1200, "features": {...}}  after each message
+    client: {"end": true, "raw_data": {...}, "item_type": "sensor"}
+    server: {"item_id": 42, "features": {...}}  then closes
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect, WebSocketException, status
+from pydantic import ValidationError
+
+from app.core.blob_store import BlobRef, BlobWriter, get_blob_store
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.ml.extractors.base_extractor import FEATURES_KEY
+from app.ml.extractors.gait_extractor import OnlineGaitExtractor
+from app.ml.extractors.motor_extractor import OnlineTappingExtractor
+from app.models.test_item import TestItem
+from app.schemas.test_item import TestItemCreate
+from app.services.test_service import TestService
+
+# Items that can be streamed live, by item_name
+ONLINE_EXTRACTORS = {
+    "walking_test": OnlineGaitExtractor,
+    "finger_tapping": OnlineTappingExtractor,
+}
+
+CHANNEL_DTYPE = "<f8"  # Every field, timestamps included (clients may send fractional ms)
+
+
+class LiveItem:
+    """Online extractor plus one blob writer per channel for a streamed item."""
+
+    def __init__(self, extractor):
+        self.extractor = extractor
+        self.samples = 0
+        self.bytes = 0
+        self.started_at = datetime.utcnow()
+        self._writers: Dict[str, BlobWriter] = {}
+        self._dtypes: Dict[str, str] = {}
+
+    def add(self, stream: Optional[str], samples: Any) -> None:
+        """Write one chunk of samples and update the online features."""
+        stream = stream or self.extractor.stream
+        columns = _to_columns(samples)
+
+        if stream == self.extractor.stream:
+            missing = [field for field in self.extractor.fields if field not in columns]
+            if missing:
+                raise ValueError(f"Samples are missing fields: {', '.join(missing)}")
+
+        for field, values in columns.items():
+            name = f"{stream}.{field}"
+            dtype = self._dtypes.setdefault(name, CHANNEL_DTYPE)
+            data = values.astype(dtype).tobytes()
+            self.bytes += len(data)
+            if self.bytes > settings.MAX_STREAM_ITEM_BYTES:
+                raise OverflowError(f"Stream exceeds {settings.MAX_STREAM_ITEM_BYTES} bytes")
+            if name not in self._writers:
+                self._writers[name] = get_blob_store().writer()
+            self._writers[name].write(data)
+
+        if stream == self.extractor.stream:
+            self.extractor.update(columns)
+            self.samples += len(next(iter(columns.values())))
+
+    def finish(self) -> Dict[str, BlobRef]:
+        """Commit every channel to the blob store."""
+        return {name: writer.commit() for name, writer in self._writers.items()}
+
+    def abort(self) -> None:
+        for writer in self._writers.values():
+            writer.abort()
+
+    @property
+    def dtypes(self) -> Dict[str, str]:
+        return dict(self._dtypes)
+
+
+class LiveStreamService:
+    """Runs the live streaming protocol for one WebSocket connection."""
+
+    async def run(self, websocket: WebSocket, user_id: int, session_id: int, item_name: str) -> None:
+        extractor_class = ONLINE_EXTRACTORS.get(item_name)
+        if extractor_class is None:
+            raise WebSocketException(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason=f"Live streaming is supported for: {', '.join(ONLINE_EXTRACTORS)}"
+            )
+
+        # Short transactions only; no connection is held while samples stream
+        async with AsyncSessionLocal() as db:
+            try:
+                await TestService(db).get_open_session(session_id, user_id, lock=False)
+            except HTTPException as e:
+                raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+            await db.commit()
+
+        await websocket.accept()
+        live = LiveItem(extractor_class())
+        try:
+            while True:
+                message = await websocket.receive_json()
+                if message.get("end"):
+                    break
+                live.add(message.get("stream"), message.get("samples"))
+                await websocket.send_json({"received": live.samples, "features": live.extractor.features()})
+        except WebSocketDisconnect:
+            live.abort()  # Test abandoned mid-way: nothing is saved
+            return
+        except OverflowError as e:
+            live.abort()
+            await websocket.close(code=status.WS_1009_MESSAGE_TOO_BIG, reason=str(e))
+            return
+        except (ValueError, TypeError, KeyError) as e:
+            live.abort()
+            await websocket.close(code=status.WS_1007_INVALID_FRAME_PAYLOAD_DATA, reason=str(e)[:120])
+            return
+
+        try:
+            item = await self._save_item(user_id, session_id, item_name, live, message)
+        except HTTPException as e:
+            live.abort()
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+            return
+
+        await websocket.send_json({"item_id": item.id, "features": item.raw_data[FEATURES_KEY]})
+        await websocket.close()
+
+    async def _save_item(
+        self,
+        user_id: int,
+        session_id: int,
+        item_name: str,
+        live: LiveItem,
+        end_message: Mapping[str, Any],
+    ) -> TestItem:
+        """Create the TestItem with channel references and the final online features."""
+        try:
+            data = TestItemCreate(
+                item_name=item_name,
+                item_type=end_message.get("item_type") or "sensor",
+                raw_data=end_message.get("raw_data") or {},
+                channels={name: {"dtype": dtype} for name, dtype in live.dtypes.items()},
+                started_at=live.started_at,
+            )
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors()[0]["msg"][:120]
+            )
+
+        async with AsyncSessionLocal() as db:
+            tests = TestService(db)
+            session = await tests.get_open_session(session_id, user_id)
+
+            stored_channels = live.finish()
+            item = tests.build_item(session_id, data, stored_channels, features=live.extractor.features())
+            await tests.track_validity(session, [item])
+            db.add(item)
+            await db.commit()
+
+        return item
+
+
+def _to_columns(samples: Any) -> Dict[str, np.ndarray]:
+    """Columnar {"field": [...]} or records [{"field": ..}, ...] to equal-length arrays."""
+    if isinstance(samples, list):
+        if not samples:
+            raise ValueError("Empty samples")
+        samples = {field: [record[field] for record in samples] for field in samples[0]}
+    if not isinstance(samples, dict) or not samples:
+        raise ValueError("samples must be an object of arrays or a list of records")
+
+    columns = {field: np.asarray(values, dtype=np.float64) for field, values in samples.items()}
+    if any(values.ndim != 1 for values in columns.values()) or len({len(v) for v in columns.values()}) != 1:
+        raise ValueError("All sample fields must be flat arrays of the same length")
+    return columns
@@ -0,0 +1,143 @@
+"""
+Longitudinal Service - Per-user change detection from running feature statistics
+Each valid completion folds its feature values into the user's running
+statistics (user_feature_stats: Welford count/mean/M2, last value, EWMA)
+and flags, per feature in O(1), whether the new value is a change beyond
+the user's own session-to-session variability:
+
+- reliable change: Jacobson-Truax RCI, (new - previous) / (sqrt(2) * SD),
+  with the within-person SD over earlier sessions as the measurement error;
+- trend break: the EWMA leaves the EWMA control limits around the earlier
+  sessions' mean (a sustained drift that single changes may not show).
+"""
+
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.user_feature_stats import UserFeatureStats
+from app.services.normative_service import valid_feature_values
+from app.utils.helpers import naive_utc
+
+
+class LongitudinalService:
+    """Running per-user feature statistics and change flags."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_result(
+        self,
+        user_id: int,
+        category: str,
+        extracted_features: Dict[str, Any],
+        risk_scores: Dict[str, Any],
+        completed_at: datetime,
+    ) -> int:
+        """
+        Fold a completed session's valid feature values into the user's stats.
+
+        A result older than the latest one folded in (synced late) only
+        updates count/mean/M2; the last value, EWMA and flags stay with
+        the latest session. Returns the number of features updated.
+        """
+        values = {
+            feature: (name, value)
+            for name, features in valid_feature_values(category, extracted_features, risk_scores).items()
+            for feature, value in features.items()
+        }
+        if not values:
+            return 0
+
+        for stats in await self._lock_stats(user_id, values):
+            fold_value(stats, values[stats.feature][1], completed_at)
+        return len(values)
+
+    async def feature_changes(self, user_id: int) -> List[UserFeatureStats]:
+        """The user's feature statistics, by category and feature."""
+        result = await self.db.execute(
+            select(UserFeatureStats)
+            .where(UserFeatureStats.user_id == user_id)
+            .order_by(UserFeatureStats.category, UserFeatureStats.feature)
+        )
+        return list(result.scalars().all())
+
+    # ============== PRIVATE HELPERS ==============
+
+    async def _lock_stats(self, user_id: int, values: Dict[str, Tuple[str, float]]) -> List[UserFeatureStats]:
+        """The user's rows for these features, created if missing, locked FOR UPDATE."""
+        in_features = and_(UserFeatureStats.user_id == user_id, UserFeatureStats.feature.in_(list(values)))
+        existing = set((await self.db.execute(select(UserFeatureStats.feature).where(in_features))).scalars().all())
+        missing = [
+            UserFeatureStats(user_id=user_id, category=category, feature=feature, count=0, mean=0.0, m2=0.0)
+            for feature, (category, _) in values.items()
+            if feature not in existing
+        ]
+        if missing:
+            try:
+                async with self.db.begin_nested():
+                    self.db.add_all(missing)
+            except IntegrityError:
+                pass  # Created concurrently; the locking select below picks them up
+
+        result = await self.db.execute(
+            select(UserFeatureStats)
+            .where(in_features)
+            .order_by(UserFeatureStats.feature)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
+
+def fold_value(stats: UserFeatureStats, value: float, completed_at: datetime) -> None:
+    """Add one session's value to a feature's running statistics (Welford)."""
+    count, mean, m2 = stats.count or 0, stats.mean or 0.0, stats.m2 or 0.0
+
+    late = stats.last_completed_at is not None and naive_utc(stats.last_completed_at) > naive_utc(completed_at)
+    if not late:
+        rci, ewma, trend_break = change_indices(count, mean, m2, stats.last_value, stats.ewma, value)
+        stats.rci = None if rci is None else round(rci, 2)
+        stats.reliable_change = rci is not None and abs(rci) > settings.CHANGE_RCI_THRESHOLD
+        stats.trend_break = trend_break
+        stats.ewma = ewma
+        stats.last_value = value
+        stats.last_completed_at = completed_at
+
+    count += 1
+    delta = value - mean
+    mean += delta / count
+    stats.count, stats.mean, stats.m2 = count, mean, m2 + delta * (value - mean)
+
+
+def change_indices(
+    count: int,
+    mean: float,
+    m2: float,
+    last_value: Optional[float],
+    ewma: Optional[float],
+    value: float,
+) -> Tuple[Optional[float], float, bool]:
+    """
+    (RCI, updated EWMA, trend break) for a new value given the earlier sessions' stats.
+
+    RCI is None until CHANGE_MIN_SESSIONS earlier sessions exist, or when
+    they never varied (no measurement error to compare against).
+    """
+    alpha = settings.CHANGE_EWMA_ALPHA
+    new_ewma = value if ewma is None else ewma + alpha * (value - ewma)
+
+    if count < max(2, settings.CHANGE_MIN_SESSIONS) or last_value is None:
+        return None, new_ewma, False
+    sd = math.sqrt(m2 / (count - 1))
+    if sd == 0:
+        return None, new_ewma, False
+
+    rci = (value - last_value) / (math.sqrt(2) * sd)
+    ewma_limit = settings.CHANGE_EWMA_LIMIT * sd * math.sqrt(alpha / (2 - alpha))
+    return rci, new_ewma, abs(new_ewma - mean) > ewma_limit
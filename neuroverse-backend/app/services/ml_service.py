@@ -4,6 +4,10 @@ This is a placeholder that will be replaced with actual ML models
 """
 
 from typing import Dict, Any, List
+
+from app.ml.extractors.base_extractor import FEATURES_KEY, duplicate_of, stream_columns
+from app.ml.extractors.gait_extractor import extract_walking_features
+from app.ml.extractors.motor_extractor import extract_tapping_features
 from app.models.test_item import TestItem
 
 
@@ -51,7 +55,14 @@ class MLService:
         if not extractor:
             return {}
         
-        return await extractor(test_items)
+        features = await extractor(test_items)
+        
+        # Items replaying an earlier submission (validity indicator)
+        duplicates = sum(1 for item in test_items if duplicate_of(item.raw_data))
+        if duplicates:
+            features["duplicate_items"] = duplicates
+        
+        return features
     
     async def _extract_cognitive_features(self, items: List[TestItem]) -> Dict[str, Any]:
         """Extract features from cognitive tests (Stroop, N-Back, Word Recall)."""
@@ -149,6 +160,12 @@ class MLService:
                     "tapping_fatigue": raw.get("fatigue_index", 0),
                     "tapping_total": raw.get("total_taps", 0),
                 })
+                # Streamed live: features were computed online as taps arrived
+                if FEATURES_KEY in raw:
+                    features.update(raw[FEATURES_KEY])
+                # Clients that only send the tap stream: derive the summary here
+                elif "tapping_rate" not in raw:
+                    features.update(extract_tapping_features(raw))
             
             elif item.item_name == "spiral_drawing":
                 features.update({
@@ -177,6 +194,14 @@ class MLService:
                     "step_length": raw.get("avg_step_length", 0),
                     "step_regularity": raw.get("step_regularity", 0.5),
                 })
+                # Streamed live: features were computed online as samples arrived
+                if FEATURES_KEY in raw:
+                    features.update(raw[FEATURES_KEY])
+                # Clients that only send the accelerometer stream: derive them here
+                elif "steps_detected" not in raw:
+                    features.update(extract_walking_features(raw))
+                elif not features["walk_duration"]:
+                    features["walk_duration"] = self._stream_duration(raw, "accelerometer_data", "timestamp")
             
             elif item.item_name == "turn_in_place":
                 features.update({
@@ -222,3 +247,12 @@ class MLService:
                 features["smile_count"] = len(smile_events)
         
         return features
+    
+    # ============== SENSOR STREAM HELPERS ==============
+    
+    def _stream_duration(self, raw: Dict[str, Any], stream: str, time_field: str) -> float:
+        """Seconds spanned by a sensor stream's millisecond timestamps."""
+        timestamps = stream_columns(raw, stream, [time_field]).get(time_field)
+        if timestamps is None or len(timestamps) < 2:
+            return 0
+        return float(timestamps[-1] - timestamps[0]) / 1000.0
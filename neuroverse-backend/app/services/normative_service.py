@@ -0,0 +1,233 @@
+"""
+Normative Service - Population percentile ranks from streaming sketches
+ClinicalNorms holds literature cutoffs, some for a single age band. This
+service keeps the observed distribution of every scored feature per age
+band and gender as t-digests (norm_sketches), updated on each valid
+completed session, so a new result gets its percentile among peers in
+O(log k) without scanning history.
+
+Each value updates three strata: (age band, gender), (age band, "all") and
+("all", "all"). A lookup uses the most specific one with at least
+NORMS_MIN_SAMPLES values.
+"""
+
+import math
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.ml.fusion.batch_scoring import FEATURE_COLUMNS
+from app.ml.fusion.clinical_norms import AGE_BAND_SCALE
+from app.ml.fusion.scoring_registry import ThresholdScale
+from app.models.norm_sketch import NormSketch
+from app.models.test_session import TestCategory
+from app.models.user import User
+from app.utils.tdigest import TDigest
+
+ALL = "all"
+UNKNOWN = "unknown"
+
+AGE_BANDS = ThresholdScale(AGE_BAND_SCALE)
+
+Stratum = Tuple[str, str]  # (age band, gender)
+
+
+def stratum_of(user: User, at: Optional[datetime] = None) -> Stratum:
+    """A user's (age band, gender) on a date (today by default)."""
+    on = (at or datetime.utcnow()).date()
+    dob: Optional[date] = user.date_of_birth
+    if dob:
+        age = on.year - dob.year - ((on.month, on.day) < (dob.month, dob.day))
+        age_band = AGE_BANDS(age)
+    else:
+        age_band = UNKNOWN
+    return age_band, (user.gender or UNKNOWN).lower()
+
+
+def pooled_strata(stratum: Stratum) -> List[Stratum]:
+    """The stratum and its pooled fallbacks, most specific first."""
+    age_band, gender = stratum
+    return list(dict.fromkeys([(age_band, gender), (age_band, ALL), (ALL, ALL)]))
+
+
+class NormativeReference:
+    """A stratum's loaded sketches; percentile lookups need no database access."""
+
+    def __init__(self, stratum: Stratum, sketches: Dict[str, Tuple[Stratum, TDigest]]):
+        self.stratum = stratum
+        self.sketches = sketches  # feature -> (stratum used, digest)
+
+    def percentile(self, feature: str, value: float) -> Optional[float]:
+        """Percentile rank (0-100) of value among peers, None without enough data."""
+        sketch = self.sketches.get(feature)
+        if sketch is None:
+            return None
+        return round(sketch[1].percentile_rank(value), 1)
+
+    def percentiles(self, category: str, features: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Percentile rank of each of a result's scored features that has norms."""
+        ranks = {}
+        for feature, value in _feature_values(category, features).items():
+            sketch = self.sketches.get(feature)
+            if sketch is not None:
+                (age_band, gender), digest = sketch
+                ranks[feature] = {
+                    "percentile": round(digest.percentile_rank(value), 1),
+                    "age_band": age_band,
+                    "gender": gender,
+                    "n": digest.count,
+                }
+        return ranks
+
+
+# Loaded references per stratum in this worker: stratum -> (loaded at, reference)
+_references: Dict[Stratum, Tuple[float, NormativeReference]] = {}
+
+
+class NormativeService:
+    """Population feature distributions by age band and gender."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def reference_for(self, user: Optional[User], at: Optional[datetime] = None) -> Optional[NormativeReference]:
+        """
+        Norms for the user's stratum (cached per worker for NORMS_CACHE_SECONDS).
+
+        One query loads every feature's sketch for the stratum and its
+        pooled fallbacks; the most specific with enough values is kept.
+        """
+        if user is None:
+            return None
+        stratum = stratum_of(user, at)
+        cached = _references.get(stratum)
+        if cached and time.monotonic() - cached[0] < settings.NORMS_CACHE_SECONDS:
+            return cached[1]
+
+        strata = pooled_strata(stratum)
+        rows = (await self.db.execute(
+            select(NormSketch.feature, NormSketch.age_band, NormSketch.gender, NormSketch.digest)
+            .where(_in_strata(strata))
+            .where(NormSketch.count >= settings.NORMS_MIN_SAMPLES)
+        )).all()
+
+        best: Dict[str, Tuple[int, Stratum, bytes]] = {}
+        for feature, age_band, gender, digest in rows:
+            rank = strata.index((age_band, gender))
+            if feature not in best or rank < best[feature][0]:
+                best[feature] = (rank, (age_band, gender), digest)
+
+        reference = NormativeReference(stratum, {
+            feature: (used, TDigest.from_bytes(digest)) for feature, (_, used, digest) in best.items()
+        })
+        _references[stratum] = (time.monotonic(), reference)
+        return reference
+
+    async def record_result(
+        self,
+        user: User,
+        category: str,
+        extracted_features: Dict[str, Any],
+        risk_scores: Dict[str, Any],
+        completed_at: Optional[datetime] = None,
+    ) -> int:
+        """
+        Add a completed session's valid feature values to the norms.
+
+        Rows are locked in key order for the rest of the caller's
+        transaction, so concurrent completions never lose an update.
+        Returns the number of sketches updated.
+        """
+        values: Dict[str, float] = {}
+        for features in valid_feature_values(category, extracted_features, risk_scores).values():
+            values.update(features)
+        if not values:
+            return 0
+
+        strata = pooled_strata(stratum_of(user, completed_at))
+        sketches = await self._lock_sketches(list(values), strata)
+        for sketch in sketches:
+            digest = TDigest.from_bytes(sketch.digest) if sketch.digest else TDigest(settings.NORMS_COMPRESSION)
+            digest.add(values[sketch.feature])
+            sketch.digest = digest.to_bytes()
+            sketch.count = digest.count
+        return len(sketches)
+
+    # ============== PRIVATE HELPERS ==============
+
+    async def _lock_sketches(self, features: List[str], strata: List[Stratum]) -> List[NormSketch]:
+        """The (feature, stratum) rows, created if missing, locked FOR UPDATE."""
+        query = (
+            select(NormSketch)
+            .where(NormSketch.feature.in_(features))
+            .where(_in_strata(strata))
+            .order_by(NormSketch.feature, NormSketch.age_band, NormSketch.gender)
+        )
+        existing = {
+            (row.feature, row.age_band, row.gender)
+            for row in (await self.db.execute(
+                select(NormSketch.feature, NormSketch.age_band, NormSketch.gender)
+                .where(NormSketch.feature.in_(features))
+                .where(_in_strata(strata))
+            )).all()
+        }
+        missing = [
+            NormSketch(feature=feature, age_band=age_band, gender=gender, count=0)
+            for feature in features
+            for age_band, gender in strata
+            if (feature, age_band, gender) not in existing
+        ]
+        if missing:
+            try:
+                async with self.db.begin_nested():
+                    self.db.add_all(missing)
+            except IntegrityError:
+                pass  # Created concurrently; the locking select below picks them up
+
+        result = await self.db.execute(query.with_for_update().execution_options(populate_existing=True))
+        return list(result.scalars().all())
+
+
+def valid_feature_values(
+    category: str,
+    extracted_features: Dict[str, Any],
+    risk_scores: Dict[str, Any],
+) -> Dict[str, Dict[str, float]]:
+    """
+    A completed result's measured scored features, by category.
+
+    A full screening is split into its categories; categories flagged by
+    the validity checks are left out (they would skew any statistics).
+    """
+    if category == TestCategory.FULL_SCREENING.value:
+        per_category = [
+            (name, ((extracted_features or {}).get("categories") or {}).get(name) or {}, scores)
+            for name, scores in (risk_scores.get("categories") or {}).items()
+        ]
+    else:
+        per_category = [(category, extracted_features or {}, risk_scores)]
+
+    return {
+        name: _feature_values(name, features)
+        for name, features, scores in per_category
+        if (scores.get("validity") or {}).get("is_valid", True)
+    }
+
+
+def _in_strata(strata: List[Stratum]):
+    return or_(*(and_(NormSketch.age_band == age_band, NormSketch.gender == gender) for age_band, gender in strata))
+
+
+def _feature_values(category: str, features: Dict[str, Any]) -> Dict[str, float]:
+    """A result's scored features that were measured (present, numeric, finite)."""
+    values = {}
+    for name, _ in FEATURE_COLUMNS.get(category, ()):
+        value = features.get(name)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            values[name] = float(value)
+    return values
@@ -0,0 +1,149 @@
+"""
+Pipeline Service - Feature extraction -> risk fusion for one session
+Pure computation over already-loaded test items (no database access), so
+a batch of pipelines (a sync, a full screening's categories) can run off the
+event loop in a worker thread.
+
+A full screening runs the five category pipelines and fuses them with
+CompositeFusionService.
+
+XAI is not part of a run: explain() explains a stored result on demand
+(ExplanationService), from its extracted features.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from app.ml.fusion.scoring_registry import ScoringConfig, get_scoring_registry
+from app.models.test_item import TestItem
+from app.models.test_session import TestCategory
+from app.services.fusion_service import CompositeFusionService, FusionService
+from app.services.ml_service import MLService
+from app.services.normative_service import NormativeReference
+from app.services.xai_service import XAIService
+
+
+class PipelineResult(NamedTuple):
+    extracted_features: Dict[str, Any]
+    risk_scores: Dict[str, Any]
+
+
+# A category's items, or for a full screening its items grouped by category
+PipelineItems = Union[Sequence[TestItem], Mapping[str, Sequence[TestItem]]]
+
+
+class PipelineService:
+    """Runs the ML pipeline for a category's test items."""
+
+    def __init__(self, scoring: Optional[ScoringConfig] = None):
+        # One norms/weights version for everything this instance scores
+        self.scoring = scoring or get_scoring_registry().current()
+        self.ml_service = MLService()
+        self.fusion_service = FusionService(self.scoring)
+        self.composite_fusion_service = CompositeFusionService(self.scoring)
+        self.xai_service = XAIService(self.scoring)
+
+    async def run(
+        self, category: str, items: PipelineItems, reference: Optional[NormativeReference] = None
+    ) -> PipelineResult:
+        """Extract features and calculate risk scores (with percentiles if `reference`)."""
+        if category == TestCategory.FULL_SCREENING.value:
+            return await self.run_screening(items, reference)
+
+        extracted_features = await self.ml_service.extract_features(
+            category=category,
+            test_items=list(items)
+        )
+
+        risk_scores = await self.fusion_service.calculate_risk_scores(
+            category=category,
+            features=extracted_features,
+            reference=reference
+        )
+
+        return PipelineResult(extracted_features, risk_scores)
+
+    async def run_screening(
+        self, items_by_category: Mapping[str, Sequence[TestItem]], reference: Optional[NormativeReference] = None
+    ) -> PipelineResult:
+        """
+        Run every category's pipeline and fuse the results.
+
+        risk_scores has the usual per-session keys (from the composite) plus
+        "composite" and the per-category "categories" scores.
+        """
+        categories = list(items_by_category)
+        outcomes = dict(zip(categories, await self.run_many(list(items_by_category.items()), reference)))
+
+        category_scores = {category: outcome.risk_scores for category, outcome in outcomes.items()}
+        composite = self.composite_fusion_service.calculate_composite(category_scores)
+
+        risk_scores = {
+            "ad_risk": composite["composite_ad_risk"],
+            "pd_risk": composite["composite_pd_risk"],
+            "category_score": composite["overall_score"],
+            "stage": composite["stage"],
+            "severity": composite["severity"],
+            "ad_stage": composite["ad_stage"],
+            "pd_stage": composite["pd_stage"],
+            "composite": composite,
+            "categories": category_scores,
+            "scoring_version": composite["scoring_version"],
+        }
+        extracted_features = {
+            "category": TestCategory.FULL_SCREENING.value,
+            "items_processed": sum(len(items) for items in items_by_category.values()),
+            "categories": {category: outcome.extracted_features for category, outcome in outcomes.items()},
+            "composite": composite,
+        }
+        return PipelineResult(extracted_features, risk_scores)
+
+    async def explain(
+        self,
+        category: str,
+        extracted_features: Dict[str, Any],
+        reference: Optional[NormativeReference] = None,
+        saliency: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        XAI explanation of a result from its extracted features.
+
+        The risk scores are recalculated with this instance's scoring
+        version (the result's own, to match its stored scores). saliency
+        (the spiral drawing's map) goes with the motor explanation.
+        """
+        if category == TestCategory.FULL_SCREENING.value:
+            explanations = {}
+            for name, features in (extracted_features.get("categories") or {}).items():
+                risk_scores = await self.fusion_service.calculate_risk_scores(name, features, reference)
+                explanations[name] = await self.xai_service.generate_explanation(
+                    name, features, risk_scores, saliency if name == TestCategory.MOTOR.value else None
+                )
+            return self.xai_service.combine_explanations(explanations, extracted_features["composite"])
+
+        risk_scores = await self.fusion_service.calculate_risk_scores(category, extracted_features, reference)
+        return await self.xai_service.generate_explanation(category, extracted_features, risk_scores, saliency)
+
+    async def run_many(
+        self, jobs: Sequence[Tuple[str, PipelineItems]], reference: Optional[NormativeReference] = None
+    ) -> List[PipelineResult]:
+        """
+        Run several pipelines (of one user) one after another in a worker thread.
+
+        Results are in the order of `jobs`. The event loop stays free while
+        they run. A pipeline takes a few milliseconds (a full screening with
+        a 2-minute walk ~4 ms), less than a thread and event loop per job
+        cost, so they are not spread over threads.
+        """
+        return await asyncio.to_thread(_run_in_thread, self.scoring, jobs, reference)
+
+
+def _run_in_thread(
+    scoring: ScoringConfig, jobs: Sequence[Tuple[str, PipelineItems]], reference: Optional[NormativeReference]
+) -> List[PipelineResult]:
+    # Own service instances and event loop; only the (read-only) scoring version and norms are shared
+    async def run_all() -> List[PipelineResult]:
+        pipeline = PipelineService(scoring)
+        return [await pipeline.run(category, items, reference) for category, items in jobs]
+
+    return asyncio.run(run_all())
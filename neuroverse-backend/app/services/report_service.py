@@ -80,8 +80,8 @@ class ReportService:
         )
         
         self.db.add(report)
-        await self.db.commit()
-        await self.db.refresh(report)
+        # Flush for report.id; _generate_pdf commits the whole unit of work
+        await self.db.flush()
         
         # Generate PDF (async in background ideally)
         await self._generate_pdf(report, user, sessions)
@@ -322,7 +322,6 @@ class ReportService:
             report.is_ready = True
             
             await self.db.commit()
-            await self.db.refresh(report)
             
         except Exception as e:
             print(f"Error generating PDF: {e}")
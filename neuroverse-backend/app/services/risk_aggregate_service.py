@@ -0,0 +1,238 @@
+"""
+Risk Aggregate Service - Per-user composite AD/PD risk, maintained incrementally
+Each completion replaces the user's latest result for that category and
+adjusts the running CompositeFusionService-weighted sums, so the composite
+never needs every category's latest result reloaded.
+recompute_all() rebuilds everything from test_results (weights changed, or
+to correct float drift in the running sums).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.test_result import TestResult
+from app.models.test_session import SessionStatus, TestCategory, TestSession
+from app.models.user import User
+from app.models.user_risk import UserCategoryResult, UserRiskSums
+from app.services.fusion_service import CompositeFusionService
+from app.utils.helpers import naive_utc
+
+
+class RiskAggregateService:
+    """Latest category results and running composite sums per user."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.composite = CompositeFusionService()
+
+    async def record_result(
+        self,
+        user_id: int,
+        category: str,
+        risk_scores: Dict[str, Any],
+        test_result: Optional[TestResult],
+        completed_at: datetime,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Fold a category result into the user's composite.
+
+        Returns the composite and whether the result was applied: a result
+        older than the stored one (e.g. synced late) leaves it in place.
+        The user's sums row is locked first, so concurrent completions of
+        the same user are applied one after the other.
+        """
+        sums = await self._lock_sums(user_id)
+
+        result = await self.db.execute(
+            select(UserCategoryResult)
+            .where(
+                and_(
+                    UserCategoryResult.user_id == user_id,
+                    UserCategoryResult.category == category,
+                )
+            )
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        latest = result.scalar_one_or_none()
+
+        ad_weight, pd_weight = self.composite.category_weights(category)
+
+        if latest is None:
+            # No concurrent insert: other completions of this user wait on the sums row
+            latest = UserCategoryResult(user_id=user_id, category=category)
+            self.db.add(latest)
+            sums.ad_weight_total += ad_weight
+            sums.pd_weight_total += pd_weight
+        elif naive_utc(latest.completed_at) > naive_utc(completed_at):
+            return self._composite(sums), False
+        else:
+            # Take out the old result with the weights it was added with (weights may have changed since)
+            sums.ad_weighted_sum -= latest.ad_weight * latest.ad_risk
+            sums.pd_weighted_sum -= latest.pd_weight * latest.pd_risk
+            sums.ad_weight_total += ad_weight - latest.ad_weight
+            sums.pd_weight_total += pd_weight - latest.pd_weight
+
+        latest.test_result = test_result
+        latest.ad_risk = risk_scores["ad_risk"]
+        latest.pd_risk = risk_scores["pd_risk"]
+        latest.category_score = risk_scores["category_score"]
+        latest.ad_weight = ad_weight
+        latest.pd_weight = pd_weight
+        latest.completed_at = completed_at
+
+        sums.ad_weighted_sum += ad_weight * latest.ad_risk
+        sums.pd_weighted_sum += pd_weight * latest.pd_risk
+
+        return self._composite(sums), True
+
+    async def recompute_all(self) -> int:
+        """
+        Rebuild latest results, sums and users' composite risk from test_results.
+
+        Window functions pick each user's latest completed result per
+        category (and latest full screening, whose per-category scores are
+        in its composite breakdown). Returns the number of users updated.
+        Runs in the caller's transaction.
+        """
+        latest: Dict[tuple, dict] = {}
+
+        for row in await self._latest_results(single_category=True):
+            latest[(row.user_id, row.category)] = {
+                "user_id": row.user_id,
+                "category": row.category,
+                "test_result_id": row.id,
+                "ad_risk": row.ad_risk_score,
+                "pd_risk": row.pd_risk_score,
+                "category_score": row.category_score,
+                "completed_at": row.completed_at,
+            }
+
+        for row in await self._latest_results(single_category=False):
+            breakdown = ((row.extracted_features or {}).get("composite") or {}).get("category_breakdown", {})
+            for category, scores in breakdown.items():
+                current = latest.get((row.user_id, category))
+                if current and naive_utc(current["completed_at"]) > naive_utc(row.completed_at):
+                    continue
+                latest[(row.user_id, category)] = {
+                    "user_id": row.user_id,
+                    "category": category,
+                    "test_result_id": row.id,
+                    "ad_risk": scores["ad_risk"],
+                    "pd_risk": scores["pd_risk"],
+                    "category_score": scores["category_score"],
+                    "completed_at": row.completed_at,
+                }
+
+        for row in latest.values():
+            row["ad_weight"], row["pd_weight"] = self.composite.category_weights(row["category"])
+
+        await self.db.execute(delete(UserCategoryResult))
+        if latest:
+            await self.db.execute(insert(UserCategoryResult), list(latest.values()))
+
+        # Weighted sums in one aggregate over the rebuilt table
+        await self.db.execute(delete(UserRiskSums))
+        await self.db.execute(
+            insert(UserRiskSums).from_select(
+                ["user_id", "ad_weighted_sum", "pd_weighted_sum", "ad_weight_total", "pd_weight_total"],
+                select(
+                    UserCategoryResult.user_id,
+                    func.sum(UserCategoryResult.ad_weight * UserCategoryResult.ad_risk),
+                    func.sum(UserCategoryResult.pd_weight * UserCategoryResult.pd_risk),
+                    func.sum(UserCategoryResult.ad_weight),
+                    func.sum(UserCategoryResult.pd_weight),
+                ).group_by(UserCategoryResult.user_id),
+            )
+        )
+
+        sums = (await self.db.execute(select(UserRiskSums))).scalars().all()
+        if sums:
+            users = []
+            for user_sums in sums:
+                composite = self._composite(user_sums)
+                users.append({
+                    "id": user_sums.user_id,
+                    "ad_risk_score": composite["composite_ad_risk"],
+                    "pd_risk_score": composite["composite_pd_risk"],
+                    "ad_stage": composite["ad_stage"],
+                    "pd_stage": composite["pd_stage"],
+                })
+            await self.db.execute(update(User), users)
+
+        return len(sums)
+
+    # ============== PRIVATE HELPERS ==============
+
+    async def _lock_sums(self, user_id: int) -> UserRiskSums:
+        """The user's sums row, created if missing, locked FOR UPDATE."""
+        if await self.db.get(UserRiskSums, user_id) is None:
+            try:
+                async with self.db.begin_nested():
+                    self.db.add(UserRiskSums(
+                        user_id=user_id,
+                        ad_weighted_sum=0.0,
+                        pd_weighted_sum=0.0,
+                        ad_weight_total=0.0,
+                        pd_weight_total=0.0,
+                    ))
+            except IntegrityError:
+                pass  # Created concurrently; the locking select below picks it up
+
+        result = await self.db.execute(
+            select(UserRiskSums)
+            .where(UserRiskSums.user_id == user_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
+
+    async def _latest_results(self, single_category: bool):
+        """Latest completed result per (user, category), or per user for full screenings."""
+        is_screening = TestSession.category == TestCategory.FULL_SCREENING.value
+        partition = (TestSession.user_id, TestSession.category) if single_category else (TestSession.user_id,)
+
+        ranked = (
+            select(
+                TestSession.user_id,
+                TestSession.category,
+                TestSession.completed_at,
+                TestResult.id,
+                func.row_number().over(
+                    partition_by=partition,
+                    order_by=(TestSession.completed_at.desc(), TestResult.id.desc()),
+                ).label("rank"),
+            )
+            .join(TestResult, TestResult.session_id == TestSession.id)
+            .where(
+                and_(
+                    TestSession.status == SessionStatus.COMPLETED.value,
+                    ~is_screening if single_category else is_screening,
+                )
+            )
+            .subquery()
+        )
+
+        columns = [ranked.c.user_id, ranked.c.category, ranked.c.completed_at, ranked.c.id]
+        if single_category:
+            columns += [TestResult.ad_risk_score, TestResult.pd_risk_score, TestResult.category_score]
+        else:
+            columns += [TestResult.extracted_features]
+
+        result = await self.db.execute(
+            select(*columns)
+            .join(TestResult, TestResult.id == ranked.c.id)
+            .where(ranked.c.rank == 1)
+        )
+        return result.all()
+
+    def _composite(self, sums: UserRiskSums) -> Dict[str, Any]:
+        return self.composite.composite_from_sums(
+            sums.ad_weighted_sum, sums.ad_weight_total,
+            sums.pd_weighted_sum, sums.pd_weight_total,
+        )
+
@@ -3,26 +3,39 @@ Test Service - Test sessions, items, and result management
 Core business logic for test flow
 """
 
+import base64
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 
+from app.core.blob_store import BlobRef, get_blob_store
+from app.core.config import settings
+from app.db.queries import fetch_test_dashboard
 from app.models.user import User
-from app.models.test_session import TestSession, SessionStatus
+from app.models.test_session import TestSession, TestCategory, SessionStatus
 from app.models.test_item import TestItem
 from app.models.test_result import TestResult
 from app.schemas.test_session import (
     TestSessionCreate, TestSessionResponse, TestSessionDetailResponse,
-    TestDashboardResponse, CategoryTestInfo
+    TestDashboardResponse, CategoryTestInfo,
+    TestSyncRequest, TestSyncResponse, SyncSessionResult
 )
-from app.schemas.test_item import TestItemCreate, TestItemBatchCreate, TestItemResponse
+from app.schemas.test_item import TestItemCreate, TestItemBatchCreate, TestItemResponse, SessionValidity
 from app.schemas.test_result import TestResultDetailResponse
-from app.services.ml_service import MLService
-from app.services.fusion_service import FusionService
-from app.services.xai_service import XAIService
+from app.ml.extractors.base_extractor import ATTACHMENTS_KEY, CHANNELS_KEY, FEATURES_KEY, duplicate_of
+from app.services.archive_service import ArchiveService
+from app.services.explanation_service import get_explanation_precomputer
+from app.services.fusion_service import SessionValidityTracker, item_reaction_times
+from app.services.fingerprint_service import FingerprintService
+from app.services.longitudinal_service import LongitudinalService
+from app.services.normative_service import NormativeService
+from app.services.pipeline_service import PipelineItems, PipelineService
+from app.services.risk_aggregate_service import RiskAggregateService
+from app.utils.json_stream import StreamedItem, StreamFormatError, StreamLimitError, iter_items
 
 
 # Category configuration
@@ -59,15 +72,23 @@ CATEGORY_CONFIG = {
     }
 }
 
+# Mini-test -> category, to split a full screening's items
+MINI_TEST_CATEGORIES = {
+    mini_test: category
+    for category, config in CATEGORY_CONFIG.items()
+    for mini_test in config["mini_tests"]
+}
+
 
 class TestService:
     """Test session and result management service."""
     
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.ml_service = MLService()
-        self.fusion_service = FusionService()
-        self.xai_service = XAIService()
+        self.pipeline = PipelineService()
+        self.fingerprints = FingerprintService(db)
+        self.normative = NormativeService(db)
+        self.longitudinal = LongitudinalService(db)
     
     # ============== SESSION MANAGEMENT ==============
     
@@ -96,7 +117,6 @@ class TestService:
         
         self.db.add(session)
         await self.db.commit()
-        await self.db.refresh(session)
         
         return session
     
@@ -114,16 +134,16 @@ class TestService:
         session.started_at = datetime.utcnow()
         
         await self.db.commit()
-        await self.db.refresh(session)
         
         return session
     
     async def complete_session(self, user_id: int, session_id: int) -> TestResultDetailResponse:
         """
         Complete a test session and process results.
-        This triggers ML feature extraction, fusion, and XAI generation.
+        This triggers ML feature extraction and fusion; XAI is generated on
+        first request (ExplanationService).
         """
-        session = await self._get_session(session_id, user_id, load_items=True)
+        session = await self._get_session(session_id, user_id, load_items=True, lock=True)
         
         if session.status == SessionStatus.COMPLETED.value:
             raise HTTPException(
@@ -131,69 +151,135 @@ class TestService:
                 detail="Session already completed"
             )
         
+        if session.status == SessionStatus.INVALID.value:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Session was found invalid. Please retake the test."
+            )
+        
         if not session.test_items or len(session.test_items) == 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No test items in session. Please complete at least one test."
             )
         
-        # 1. Extract features from all test items
-        extracted_features = await self.ml_service.extract_features(
-            category=session.category,
-            test_items=session.test_items
-        )
+        # Items already showed the session is invalid: ask for a retest instead of scoring it
+        validity = SessionValidityTracker(session.validity_state).summary()
+        if validity["retest_recommended"] and settings.VALIDITY_SKIP_INVALID:
+            session.status = SessionStatus.INVALID.value
+            session.completed_at = datetime.utcnow()
+            await self.db.commit()
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"message": "Session results are not valid. Please retake the test.", "validity": validity}
+            )
         
-        # 2. Calculate risk scores using fusion
-        risk_scores = await self.fusion_service.calculate_risk_scores(
-            category=session.category,
-            features=extracted_features
-        )
+        # Population norms of the user's age band and gender, for percentile ranks
+        user = await self._get_user(user_id)
+        reference = await self.normative.reference_for(user)
+        precomputer = get_explanation_precomputer()
+        precomputer.touch()
         
-        # 3. Generate XAI explanations
-        xai_explanation = await self.xai_service.generate_explanation(
-            category=session.category,
-            features=extracted_features,
-            risk_scores=risk_scores
-        )
+        await ArchiveService(self.db).rehydrate(session.test_items)
         
-        # 4. Create test result
-        test_result = TestResult(
-            session_id=session.id,
-            ad_risk_score=risk_scores["ad_risk"],
-            pd_risk_score=risk_scores["pd_risk"],
-            category_score=risk_scores["category_score"],
-            stage=risk_scores.get("stage"),
-            severity=risk_scores.get("severity"),
-            extracted_features=extracted_features,
-            xai_explanation=xai_explanation,
+        # 1-3. Feature extraction and risk fusion (XAI is generated when first requested)
+        # (a full screening runs all its categories, then fuses them)
+        extracted_features, risk_scores = await self.pipeline.run(
+            session.category, self._pipeline_items(session.category, session.test_items), reference
         )
         
+        # 4. Create test result
+        test_result = self._build_result(session, extracted_features, risk_scores)
         self.db.add(test_result)
         
         # 5. Update session status
         session.status = SessionStatus.COMPLETED.value
         session.completed_at = datetime.utcnow()
         
-        # 6. Update user's scores
-        await self._update_user_scores(user_id, session.category, risk_scores)
+        # 6. Update user's scores and the population norms
+        await self._apply_user_scores(user, session, test_result, risk_scores)
         
         await self.db.commit()
-        await self.db.refresh(test_result)
+        precomputer.enqueue(test_result.id)
         
-        return TestResultDetailResponse(
-            id=test_result.id,
-            session_id=test_result.session_id,
-            ad_risk_score=test_result.ad_risk_score,
-            pd_risk_score=test_result.pd_risk_score,
-            category_score=test_result.category_score,
-            stage=test_result.stage,
-            severity=test_result.severity,
-            extracted_features=test_result.extracted_features,
-            xai_explanation=xai_explanation,
-            category=session.category,
-            items_processed=len(session.test_items),
-            created_at=test_result.created_at,
-        )
+        return self._result_response(test_result, session, len(session.test_items))
+    
+    async def sync_sessions(self, user_id: int, data: TestSyncRequest) -> TestSyncResponse:
+        """
+        Store several sessions recorded offline and score them in one call.
+        
+        Everything is validated before anything is written; sessions and
+        items are inserted in batches, the pipelines run in a worker thread, and
+        the whole sync is committed once. Items go through the same validity
+        checks as items added online; a session they show to be invalid is
+        marked so and not scored (its result is null).
+        """
+        errors = self._validate_sync(data)
+        if errors:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=errors)
+        
+        now = datetime.utcnow()
+        sessions = [
+            TestSession(
+                user_id=user_id,
+                category=synced.category.value,
+                status=SessionStatus.IN_PROGRESS.value,
+                started_at=synced.started_at or now,
+            )
+            for synced in data.sessions
+        ]
+        self.db.add_all(sessions)
+        await self.db.flush()  # one batched INSERT, assigns session ids
+        
+        session_items, validities = [], []
+        for session, synced in zip(sessions, data.sessions):
+            items = [self.build_item(session.id, item) for item in synced.items]
+            validity = await self.track_validity(session, items)
+            self.db.add_all(items)
+            session_items.append(items)
+            validities.append(validity)
+            if validity.retest_recommended and settings.VALIDITY_SKIP_INVALID:
+                # Set now, so later sessions of the sync don't count its items as originals
+                session.status = SessionStatus.INVALID.value
+                session.completed_at = synced.completed_at or now
+        
+        scored = [i for i, session in enumerate(sessions) if session.status != SessionStatus.INVALID.value]
+        user = await self._get_user(user_id)
+        precomputer = get_explanation_precomputer()
+        precomputer.touch()
+        outcomes = dict(zip(scored, await self.pipeline.run_many([
+            (sessions[i].category, self._pipeline_items(sessions[i].category, session_items[i]))
+            for i in scored
+        ], await self.normative.reference_for(user))))
+        
+        results: Dict[int, TestResult] = {}
+        for i in scored:
+            results[i] = self._build_result(sessions[i], *outcomes[i])
+            self.db.add(results[i])
+            sessions[i].status = SessionStatus.COMPLETED.value
+            sessions[i].completed_at = data.sessions[i].completed_at or now
+        
+        # Latest session per category wins, as if completed one by one
+        order = sorted(scored, key=lambda i: sessions[i].completed_at)
+        for i in order:
+            await self._apply_user_scores(user, sessions[i], results[i], outcomes[i].risk_scores)
+        
+        await self.db.commit()
+        for test_result in results.values():
+            precomputer.enqueue(test_result.id)
+        
+        return TestSyncResponse(sessions=[
+            SyncSessionResult(
+                client_id=synced.client_id,
+                session_id=session.id,
+                status=session.status,
+                result=self._result_response(results[i], session, len(items)) if i in results else None,
+                validity=validity,
+            )
+            for i, (synced, session, items, validity) in enumerate(
+                zip(data.sessions, sessions, session_items, validities)
+            )
+        ])
     
     async def cancel_session(self, user_id: int, session_id: int) -> TestSession:
         """Cancel a test session."""
@@ -208,7 +294,6 @@ class TestService:
         session.status = SessionStatus.CANCELLED.value
         
         await self.db.commit()
-        await self.db.refresh(session)
         
         return session
     
@@ -255,105 +340,207 @@ class TestService:
         self, 
         user_id: int, 
         session_id: int, 
-        data: TestItemCreate
-    ) -> TestItem:
-        """Add a test item to a session."""
-        session = await self._get_session(session_id, user_id)
+        data: TestItemCreate,
+        stored_channels: Optional[Dict[str, BlobRef]] = None,
+        attachments: Optional[Dict[str, dict]] = None,
+    ) -> TestItemResponse:
+        """
+        Add a test item to a session.
         
-        if session.status == SessionStatus.COMPLETED.value:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot add items to completed session"
-            )
+        stored_channels / attachments are payloads the caller already streamed
+        into the blob store (multipart uploads); only references are saved.
+        The response carries the session's validity so far.
+        """
+        session = await self.get_open_session(session_id, user_id)
         
-        # Auto-start session if not started
-        if session.status == SessionStatus.CREATED.value:
-            session.status = SessionStatus.IN_PROGRESS.value
-            session.started_at = datetime.utcnow()
-        
-        item = TestItem(
-            session_id=session_id,
-            item_name=data.item_name,
-            item_type=data.item_type,
-            raw_data=data.raw_data,
-            raw_value=data.raw_value,
-            processed_value=data.processed_value,
-            started_at=data.started_at,
-            completed_at=data.completed_at or datetime.utcnow(),
-        )
+        item = self.build_item(session_id, data, stored_channels, attachments)
+        validity = await self.track_validity(session, [item])
         
         self.db.add(item)
         await self.db.commit()
-        await self.db.refresh(item)
         
-        return item
+        return self._item_response(item, validity)
     
     async def add_test_items_batch(
         self, 
         user_id: int, 
         session_id: int, 
         data: TestItemBatchCreate
-    ) -> List[TestItem]:
+    ) -> List[TestItemResponse]:
         """Add multiple test items at once."""
-        session = await self._get_session(session_id, user_id)
+        session = await self.get_open_session(session_id, user_id)
         
-        if session.status == SessionStatus.COMPLETED.value:
+        items = []
+        for item_data in data.items:
+            item = self.build_item(session_id, item_data)
+            self.db.add(item)
+            items.append(item)
+        validity = await self.track_validity(session, items)
+        
+        await self.db.commit()
+        
+        return [self._item_response(item, validity) for item in items]
+    
+    async def add_test_items_stream(
+        self,
+        user_id: int,
+        session_id: int,
+        chunks: AsyncIterator[bytes],
+    ) -> List[TestItemResponse]:
+        """
+        Add items from a JSON body read incrementally (one item or {"items": [...]}).
+        
+        The session is checked before any of the body is read (and locked
+        only once it has been). Sensor streams are parsed into typed channels
+        as they arrive, and size limits abort the upload as soon as they are
+        exceeded.
+        """
+        await self.get_open_session(session_id, user_id, lock=False)
+        
+        items = []
+        try:
+            async for streamed in iter_items(
+                chunks,
+                max_request_bytes=settings.MAX_STREAM_REQUEST_BYTES,
+                max_item_bytes=settings.MAX_STREAM_ITEM_BYTES,
+                max_items=settings.MAX_STREAM_ITEMS,
+            ):
+                data, stored_channels = self._streamed_item_create(streamed)
+                items.append(self.build_item(session_id, data, stored_channels))
+        except StreamLimitError as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        except StreamFormatError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        if not items:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot add items to completed session"
+                detail="Request body contains no items"
+            )
+        
+        session = await self.get_open_session(session_id, user_id)
+        self.db.add_all(items)
+        validity = await self.track_validity(session, items)
+        await self.db.commit()
+        
+        return [self._item_response(item, validity) for item in items]
+    
+    async def get_open_session(self, session_id: int, user_id: int, lock: bool = True) -> TestSession:
+        """
+        Session that still accepts items; auto-starts it if not started.
+        
+        Locked FOR UPDATE by default, so concurrent requests adding items
+        update its validity state one after the other.
+        """
+        session = await self._get_session(session_id, user_id, lock=lock)
+        
+        if session.status in (SessionStatus.COMPLETED.value, SessionStatus.INVALID.value):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot add items to {session.status} session"
             )
         
         if session.status == SessionStatus.CREATED.value:
             session.status = SessionStatus.IN_PROGRESS.value
             session.started_at = datetime.utcnow()
         
-        items = []
-        for item_data in data.items:
-            item = TestItem(
-                session_id=session_id,
-                item_name=item_data.item_name,
-                item_type=item_data.item_type,
-                raw_data=item_data.raw_data,
-                raw_value=item_data.raw_value,
-                processed_value=item_data.processed_value,
-                started_at=item_data.started_at,
-                completed_at=item_data.completed_at or datetime.utcnow(),
-            )
-            self.db.add(item)
-            items.append(item)
+        return session
+    
+    async def track_validity(self, session: TestSession, items: Sequence[TestItem]) -> SessionValidity:
+        """
+        Check new items against earlier submissions' fingerprints and fold
+        them into the session's running validity checks.
         
-        await self.db.commit()
+        Only cheap inputs are used: payload fingerprints, trial reaction
+        times in raw_data and the cognitive mini-tests' scores (sensor
+        features wait for completion).
+        """
+        await self.fingerprints.check_items(session.user_id, session.id, items)
         
+        tracker = SessionValidityTracker(session.validity_state)
         for item in items:
-            await self.db.refresh(item)
+            category = MINI_TEST_CATEGORIES.get(item.item_name, session.category)
+            features = {}
+            if category == TestCategory.COGNITIVE.value:
+                features = await self.pipeline.ml_service.extract_features(category, [item])
+            tracker.add(features, item_reaction_times(item.raw_data), bool(duplicate_of(item.raw_data)))
+        
+        session.validity_state = tracker.state
+        return SessionValidity(**tracker.summary())
+    
+    def build_item(
+        self,
+        session_id: int,
+        data: TestItemCreate,
+        stored_channels: Optional[Dict[str, BlobRef]] = None,
+        attachments: Optional[Dict[str, dict]] = None,
+        features: Optional[Dict[str, Any]] = None,
+    ) -> TestItem:
+        """
+        TestItem from a create request.
         
-        return items
+        Binary channels are kept next to raw_data: inline (base64) when small,
+        otherwise as a reference into the blob store so the row stays small.
+        Reserved "_" keys only ever come from the server (features computed
+        online are passed in), never from the client's raw_data.
+        """
+        raw_data = {key: value for key, value in data.raw_data.items() if not key.startswith("_")}
+        stored_channels = stored_channels or {}
+        
+        if data.channels:
+            missing = [
+                name for name, channel in data.channels.items()
+                if channel.data is None and name not in stored_channels
+            ]
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"No data for channels: {', '.join(missing)}"
+                )
+            
+            channels = {}
+            for name, channel in data.channels.items():
+                ref = stored_channels.get(name)
+                if ref is None and len(channel.data) * 3 // 4 > settings.BLOB_INLINE_MAX_BYTES:
+                    ref = get_blob_store().put(base64.b64decode(channel.data))
+                
+                if ref is not None:
+                    channels[name] = {"dtype": channel.dtype, "blob": ref.digest, "size": ref.size}
+                else:
+                    channels[name] = {"dtype": channel.dtype, "data": channel.data}
+            raw_data[CHANNELS_KEY] = channels
+        
+        if attachments:
+            raw_data[ATTACHMENTS_KEY] = attachments
+        
+        if features is not None:
+            raw_data[FEATURES_KEY] = features
+        
+        return TestItem(
+            session_id=session_id,
+            item_name=data.item_name,
+            item_type=data.item_type,
+            raw_data=raw_data,
+            raw_value=data.raw_value,
+            processed_value=data.processed_value,
+            started_at=data.started_at,
+            completed_at=data.completed_at or datetime.utcnow(),
+        )
     
     # ============== DASHBOARD ==============
     
     async def get_dashboard(self, user_id: int) -> TestDashboardResponse:
         """Get test dashboard data."""
-        # Get user for current scores
-        result = await self.db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
-        
-        # Get session counts
-        total_sessions = await self._count_sessions(user_id)
-        completed_sessions = await self._count_sessions(user_id, status="completed")
-        
-        # Get in-progress session
-        in_progress = await self._get_in_progress_session(user_id)
+        rows = await fetch_test_dashboard(self.db, user_id)
         
         # Build category info
         categories = []
         for cat_id, config in CATEGORY_CONFIG.items():
-            last_completed = await self._get_last_category_session(user_id, cat_id)
-            total_cat = await self._count_sessions(user_id, category=cat_id, status="completed")
+            stats = rows.categories.get(cat_id)
             
             current_score = None
-            if user:
-                score_field = f"{cat_id}_score"
-                current_score = getattr(user, score_field, None)
+            if rows.scores:
+                current_score = getattr(rows.scores, f"{cat_id}_score", None)
             
             categories.append(CategoryTestInfo(
                 category=cat_id,
@@ -361,29 +548,24 @@ class TestService:
                 description=config["description"],
                 mini_tests=config["mini_tests"],
                 estimated_duration=config["estimated_duration"],
-                last_completed=last_completed,
-                total_completed=total_cat,
+                last_completed=stats.last_completed if stats else None,
+                total_completed=stats.total_completed if stats else 0,
                 current_score=current_score,
             ))
         
         # Determine recommendation
         recommended = self._get_recommended_category(categories)
+        in_progress = rows.in_progress
         
         return TestDashboardResponse(
             user_id=user_id,
-            total_sessions=total_sessions,
-            completed_sessions=completed_sessions,
+            total_sessions=rows.total_sessions,
+            completed_sessions=rows.completed_sessions,
             categories=categories,
-           in_progress_session=TestSessionResponse(
-    id=in_progress.id,
-    user_id=in_progress.user_id,
-    category=in_progress.category,
-    status=in_progress.status,
-    started_at=in_progress.started_at,
-    completed_at=in_progress.completed_at,
-    created_at=in_progress.created_at,
-    items_count=0
-) if in_progress else None,
+            in_progress_session=TestSessionResponse(
+                **in_progress._asdict(),
+                items_count=0,
+            ) if in_progress else None,
             recommended_category=recommended,
             recommendation_reason="Based on your test history" if recommended else None,
         )
@@ -395,9 +577,10 @@ class TestService:
         session_id: int, 
         user_id: int,
         load_items: bool = False,
-        load_result: bool = False
+        load_result: bool = False,
+        lock: bool = False
     ) -> TestSession:
-        """Get session by ID, verify ownership."""
+        """Get session by ID, verify ownership (locked FOR UPDATE if lock)."""
         query = select(TestSession).where(
             and_(
                 TestSession.id == session_id,
@@ -409,6 +592,8 @@ class TestService:
             query = query.options(selectinload(TestSession.test_items))
         if load_result:
             query = query.options(selectinload(TestSession.test_result))
+        if lock:
+            query = query.with_for_update(of=TestSession).execution_options(populate_existing=True)
         
         result = await self.db.execute(query)
         session = result.scalar_one_or_none()
@@ -421,86 +606,151 @@ class TestService:
         
         return session
     
-    async def _update_user_scores(self, user_id: int, category: str, risk_scores: dict):
-        """Update user's overall scores after test completion."""
-        result = await self.db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+    def _streamed_item_create(self, streamed: StreamedItem) -> Tuple[TestItemCreate, Dict[str, BlobRef]]:
+        """Validate a streamed item; its column buffers become binary channels."""
+        fields = streamed.fields
+        channels = dict(fields.get("channels") or {})
+        stored_channels = {}
+        
+        for name, (dtype, buffer) in streamed.channels().items():
+            if len(buffer) > settings.BLOB_INLINE_MAX_BYTES:
+                stored_channels[name] = get_blob_store().put(buffer)
+                channels[name] = {"dtype": dtype}
+            else:
+                channels[name] = {"dtype": dtype, "data": base64.b64encode(buffer).decode("ascii")}
+        if channels:
+            fields["channels"] = channels
+        
+        try:
+            return TestItemCreate.model_validate(fields), stored_channels
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors())
+    
+    def _build_result(
+        self,
+        session: TestSession,
+        extracted_features: dict,
+        risk_scores: dict,
+    ) -> TestResult:
+        return TestResult(
+            session_id=session.id,
+            ad_risk_score=risk_scores["ad_risk"],
+            pd_risk_score=risk_scores["pd_risk"],
+            category_score=risk_scores["category_score"],
+            stage=risk_scores.get("stage"),
+            severity=risk_scores.get("severity"),
+            extracted_features=extracted_features,
+            scoring_version=risk_scores.get("scoring_version"),
+        )
+    
+    def _item_response(self, item: TestItem, validity: SessionValidity) -> TestItemResponse:
+        response = TestItemResponse.model_validate(item)
+        response.session_validity = validity
+        return response
+    
+    def _result_response(self, test_result: TestResult, session: TestSession, items_processed: int) -> TestResultDetailResponse:
+        return TestResultDetailResponse(
+            id=test_result.id,
+            session_id=test_result.session_id,
+            ad_risk_score=test_result.ad_risk_score,
+            pd_risk_score=test_result.pd_risk_score,
+            category_score=test_result.category_score,
+            stage=test_result.stage,
+            severity=test_result.severity,
+            extracted_features=test_result.extracted_features,
+            xai_explanation=test_result.xai_explanation,
+            scoring_version=test_result.scoring_version,
+            category=session.category,
+            items_processed=items_processed,
+            created_at=test_result.created_at,
+        )
+    
+    def _pipeline_items(self, category: str, items: Sequence[TestItem]) -> PipelineItems:
+        """A session's items as the pipeline takes them (grouped by category for a full screening)."""
+        if category != TestCategory.FULL_SCREENING.value:
+            return items
+        
+        items_by_category: Dict[str, List[TestItem]] = {}
+        for item in items:
+            item_category = MINI_TEST_CATEGORIES.get(item.item_name)
+            if item_category:
+                items_by_category.setdefault(item_category, []).append(item)
         
+        if not items_by_category:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No recognised mini-tests in full screening session"
+            )
+        return items_by_category
+    
+    def _validate_sync(self, data: TestSyncRequest) -> List[dict]:
+        """All problems in a sync request at once, so the client can fix them in one go."""
+        errors = []
+        
+        if len(data.sessions) > settings.SYNC_MAX_SESSIONS:
+            errors.append({"detail": f"At most {settings.SYNC_MAX_SESSIONS} sessions per sync"})
+        
+        seen = set()
+        for index, synced in enumerate(data.sessions):
+            problems = []
+            if synced.client_id in seen:
+                problems.append("Duplicate client_id")
+            seen.add(synced.client_id)
+            
+            for item in synced.items:
+                missing = [name for name, channel in (item.channels or {}).items() if channel.data is None]
+                if missing:
+                    problems.append(f"Item {item.item_name!r} has no data for channels: {', '.join(missing)}")
+            
+            if synced.started_at and synced.completed_at and synced.completed_at < synced.started_at:
+                problems.append("completed_at is before started_at")
+            
+            if synced.category.value == TestCategory.FULL_SCREENING.value:
+                try:
+                    self._pipeline_items(synced.category.value, synced.items)
+                except HTTPException as e:
+                    problems.append(e.detail)
+            
+            errors.extend({"index": index, "client_id": synced.client_id, "detail": p} for p in problems)
+        
+        return errors
+    
+    async def _get_user(self, user_id: int) -> Optional[User]:
+        result = await self.db.execute(select(User).where(User.id == user_id))
+        return result.scalar_one_or_none()
+    
+    async def _apply_user_scores(self, user: Optional[User], session: TestSession, test_result: TestResult, risk_scores: dict):
         if not user:
             return
         
-        # Update category score
-        score_field = f"{category}_score"
-        setattr(user, score_field, risk_scores["category_score"])
-        
-        # Recalculate overall AD/PD risk (simple average for now)
-        # TODO: Use proper fusion weights
-        scores = [
-            user.cognitive_score or 0,
-            user.speech_score or 0,
-            user.motor_score or 0,
-            user.gait_score or 0,
-            user.facial_score or 0,
-        ]
-        
-        # Only average non-zero scores
-        active_scores = [s for s in scores if s > 0]
-        if active_scores:
-            # For now, use category contributions
-            user.ad_risk_score = risk_scores["ad_risk"]
-            user.pd_risk_score = risk_scores["pd_risk"]
-            user.ad_stage = risk_scores.get("ad_stage")
-            user.pd_stage = risk_scores.get("pd_stage")
+        # A full screening updates each of its categories
+        if session.category == TestCategory.FULL_SCREENING.value:
+            category_scores = risk_scores["categories"]
+        else:
+            category_scores = {session.category: risk_scores}
         
-        user.updated_at = datetime.utcnow()
-    
-    async def _count_sessions(
-        self, 
-        user_id: int, 
-        category: Optional[str] = None,
-        status: Optional[str] = None
-    ) -> int:
-        """Count sessions with filters."""
-        from sqlalchemy import func
+        aggregates = RiskAggregateService(self.db)
+        for category, scores in category_scores.items():
+            composite, applied = await aggregates.record_result(
+                user.id, category, scores, test_result, session.completed_at
+            )
+            if applied:  # Not when a newer result of the category is already in
+                setattr(user, f"{category}_score", scores["category_score"])
         
-        query = select(func.count(TestSession.id)).where(TestSession.user_id == user_id)
+        # Overall AD/PD risk: composite-weighted over the latest result of every category
+        user.ad_risk_score = composite["composite_ad_risk"]
+        user.pd_risk_score = composite["composite_pd_risk"]
+        user.ad_stage = composite["ad_stage"]
+        user.pd_stage = composite["pd_stage"]
         
-        if category:
-            query = query.where(TestSession.category == category)
-        if status:
-            query = query.where(TestSession.status == status)
+        user.updated_at = datetime.utcnow()
         
-        result = await self.db.execute(query)
-        return result.scalar() or 0
-    
-    async def _get_in_progress_session(self, user_id: int) -> Optional[TestSession]:
-        """Get current in-progress session."""
-        result = await self.db.execute(
-            select(TestSession).where(
-                and_(
-                    TestSession.user_id == user_id,
-                    TestSession.status.in_(["created", "in_progress"])
-                )
-            )
+        await self.normative.record_result(
+            user, session.category, test_result.extracted_features, risk_scores, session.completed_at
         )
-        return result.scalar_one_or_none()
-    
-    async def _get_last_category_session(self, user_id: int, category: str) -> Optional[datetime]:
-        """Get last completed session date for category."""
-        result = await self.db.execute(
-            select(TestSession.completed_at)
-            .where(
-                and_(
-                    TestSession.user_id == user_id,
-                    TestSession.category == category,
-                    TestSession.status == "completed"
-                )
-            )
-            .order_by(TestSession.completed_at.desc())
-            .limit(1)
+        await self.longitudinal.record_result(
+            user.id, session.category, test_result.extracted_features, risk_scores, session.completed_at
         )
-        row = result.first()
-        return row[0] if row else None
     
     def _get_recommended_category(self, categories: List[CategoryTestInfo]) -> Optional[str]:
         """Determine recommended test category."""
@@ -0,0 +1,317 @@
+"""
+Upload Service - Resumable chunked uploads of long test recordings
+Each part is appended to a file on disk as chunks arrive (PATCH at the
+client's offset), so a dropped connection only costs the unsent remainder.
+Finalize links the parts into the blob store and creates the TestItem;
+the part files are only removed once the item is committed.
+"""
+
+import asyncio
+import fcntl
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.blob_store import BlobRef, get_blob_store
+from app.core.config import settings
+from app.models.item_upload import ItemUpload, UploadStatus
+from app.models.test_session import TestSession
+from app.schemas.test_item import (
+    ItemUploadCreate, ItemUploadResponse, ItemUploadFinalizeResponse,
+    TestItemCreate, TestItemResponse, UploadPartStatus
+)
+from app.services.ml_service import MLService
+from app.services.test_service import TestService
+
+
+class UploadService:
+    """Resumable item uploads: create, append chunks, finalize, abort."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.store = get_blob_store()
+
+    # ============== UPLOADS ==============
+
+    async def create_upload(self, user_id: int, session_id: int, data: ItemUploadCreate) -> ItemUploadResponse:
+        """Declare an item and the byte size of each of its parts."""
+        await TestService(self.db).get_open_session(session_id, user_id)
+
+        total = sum(data.parts.values())
+        if total > settings.RESUMABLE_UPLOAD_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Upload too large. Max size: {settings.RESUMABLE_UPLOAD_MAX_BYTES // (1024*1024)}MB"
+            )
+
+        upload = ItemUpload(
+            id=uuid.uuid4().hex,
+            session_id=session_id,
+            user_id=user_id,
+            item=data.item.model_dump(mode="json", exclude_none=True),
+            parts=data.parts,
+            status=UploadStatus.UPLOADING.value,
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=settings.RESUMABLE_UPLOAD_EXPIRY_HOURS),
+        )
+        os.makedirs(self._upload_dir(upload.id), exist_ok=True)
+
+        self.db.add(upload)
+        await self.db.commit()
+
+        return self._to_response(upload)
+
+    async def get_upload(self, user_id: int, session_id: int, upload_id: str) -> ItemUploadResponse:
+        """Upload state with the received offset of every part."""
+        upload = await self._get_upload(upload_id, session_id, user_id)
+        return self._to_response(upload)
+
+    async def write_chunk(
+        self,
+        user_id: int,
+        session_id: int,
+        upload_id: str,
+        part: str,
+        offset: int,
+        chunks: AsyncIterator[bytes],
+    ) -> ItemUploadResponse:
+        """
+        Append a request body to a part, starting at `offset`.
+
+        The offset must equal the bytes already received (409 otherwise, with
+        the current offset in the detail). Bytes are on disk as they arrive;
+        if the connection drops mid-chunk, whatever was written is kept and
+        the next PATCH resumes from there.
+        """
+        upload = await self._get_upload(upload_id, session_id, user_id, uploading=True)
+
+        size = upload.parts.get(part)
+        if size is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Upload has no part {part!r}"
+            )
+
+        with open(self._part_path(upload.id, part), "ab") as f:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Part {part!r} is being written by another request"
+                )
+
+            received = f.seek(0, os.SEEK_END)
+            if offset != received:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Offset mismatch for part {part!r}: {received} bytes received"
+                )
+
+            try:
+                async for chunk in chunks:
+                    if received + len(chunk) > size:
+                        f.flush()
+                        f.truncate(offset)
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"Part {part!r} exceeds its declared size of {size} bytes"
+                        )
+                    f.write(chunk)
+                    received += len(chunk)
+            finally:
+                f.flush()
+                os.fsync(f.fileno())
+
+        return self._to_response(upload)
+
+    async def finalize_upload(
+        self,
+        user_id: int,
+        session_id: int,
+        upload_id: str,
+        extract: bool = False,
+    ) -> ItemUploadFinalizeResponse:
+        """
+        Create the TestItem from a fully received upload.
+
+        Safe to retry: finalizing a completed upload returns the same item.
+        The upload row is locked, so concurrent finalizes create one item, and
+        the part files stay until the item is committed, so a retry after a
+        failed commit finds them. With extract=True the category's feature
+        extraction is run on the new item and returned alongside it.
+        """
+        upload = await self._get_upload(upload_id, session_id, user_id, load_item=True, lock=True)
+
+        if upload.status == UploadStatus.ABORTED.value:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload was aborted"
+            )
+
+        if upload.status == UploadStatus.COMPLETED.value:
+            item = upload.test_item
+        else:
+            offsets = self._offsets(upload)
+            incomplete = [part for part, size in upload.parts.items() if offsets[part] != size]
+            if incomplete:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Parts not fully received: {', '.join(incomplete)}"
+                )
+
+            tests = TestService(self.db)
+            session = await tests.get_open_session(session_id, user_id)
+
+            stored_channels, attachments = await asyncio.to_thread(self._store_parts, upload)
+
+            item = tests.build_item(
+                session_id, TestItemCreate.model_validate(upload.item), stored_channels, attachments
+            )
+            upload.test_item = item
+            upload.status = UploadStatus.COMPLETED.value
+            await tests.track_validity(session, [item])
+
+            self.db.add(item)
+            await self.db.commit()
+
+            shutil.rmtree(self._upload_dir(upload.id), ignore_errors=True)
+
+        features = None
+        if extract:
+            category = (await self.db.execute(
+                select(TestSession.category).where(TestSession.id == session_id)
+            )).scalar_one()
+            features = await MLService().extract_features(category, [item])
+
+        return ItemUploadFinalizeResponse(item=TestItemResponse.model_validate(item), features=features)
+
+    async def abort_upload(self, user_id: int, session_id: int, upload_id: str) -> None:
+        """Discard an unfinished upload and its received bytes."""
+        upload = await self._get_upload(upload_id, session_id, user_id, uploading=True)
+        upload.status = UploadStatus.ABORTED.value
+        await self.db.commit()
+
+        shutil.rmtree(self._upload_dir(upload.id), ignore_errors=True)
+
+    async def purge_expired(self, now: Optional[datetime] = None) -> int:
+        """Abort uploads past their expiry and free their disk space."""
+        now = now or datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(ItemUpload).where(
+                and_(
+                    ItemUpload.status == UploadStatus.UPLOADING.value,
+                    ItemUpload.expires_at < now,
+                )
+            )
+        )
+        uploads = result.scalars().all()
+
+        for upload in uploads:
+            upload.status = UploadStatus.ABORTED.value
+        await self.db.commit()
+
+        for upload in uploads:
+            shutil.rmtree(self._upload_dir(upload.id), ignore_errors=True)
+        return len(uploads)
+
+    # ============== PRIVATE HELPERS ==============
+
+    async def _get_upload(
+        self,
+        upload_id: str,
+        session_id: int,
+        user_id: int,
+        uploading: bool = False,
+        load_item: bool = False,
+        lock: bool = False,
+    ) -> ItemUpload:
+        """Get upload by ID, verify ownership (and that it still accepts data)."""
+        query = select(ItemUpload).where(
+            and_(
+                ItemUpload.id == upload_id,
+                ItemUpload.session_id == session_id,
+                ItemUpload.user_id == user_id,
+            )
+        )
+        if load_item:
+            query = query.options(selectinload(ItemUpload.test_item))
+        if lock:
+            query = query.with_for_update(of=ItemUpload).execution_options(populate_existing=True)
+
+        result = await self.db.execute(query)
+        upload = result.scalar_one_or_none()
+
+        if not upload:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found"
+            )
+
+        if upload.status == UploadStatus.UPLOADING.value and _as_utc(upload.expires_at) < datetime.now(timezone.utc):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload has expired"
+            )
+
+        if uploading and upload.status != UploadStatus.UPLOADING.value:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload is {upload.status}"
+            )
+
+        return upload
+
+    def _upload_dir(self, upload_id: str) -> str:
+        # Under the blob store's tmp dir so finalize can rename parts into place
+        return os.path.join(self.store.tmp_dir, "uploads", upload_id)
+
+    def _part_path(self, upload_id: str, part: str) -> str:
+        return os.path.join(self._upload_dir(upload_id), part)
+
+    def _store_parts(self, upload: ItemUpload) -> Tuple[Dict[str, BlobRef], Dict[str, dict]]:
+        """Link every part into the blob store (blocking: hashes up to the upload's size)."""
+        stored_channels, attachments = {}, {}
+        for part in upload.parts:
+            ref = self.store.put_file(self._part_path(upload.id, part), link=True)
+            kind, name = part.split(".", 1)
+            if kind == "channel":
+                stored_channels[name] = ref
+            else:
+                attachments[name] = {"blob": ref.digest, "size": ref.size}
+        return stored_channels, attachments
+
+    def _offsets(self, upload: ItemUpload) -> Dict[str, int]:
+        offsets = {}
+        for part in upload.parts:
+            path = self._part_path(upload.id, part)
+            offsets[part] = os.path.getsize(path) if os.path.exists(path) else 0
+        return offsets
+
+    def _to_response(self, upload: ItemUpload) -> ItemUploadResponse:
+        if upload.status == UploadStatus.UPLOADING.value:
+            offsets = self._offsets(upload)
+        else:
+            offsets = dict(upload.parts) if upload.status == UploadStatus.COMPLETED.value else {}
+
+        return ItemUploadResponse(
+            id=upload.id,
+            session_id=upload.session_id,
+            status=upload.status,
+            parts={
+                part: UploadPartStatus(size=size, offset=offsets.get(part, 0))
+                for part, size in upload.parts.items()
+            },
+            test_item_id=upload.test_item_id,
+            expires_at=upload.expires_at,
+        )
+
+
+def _as_utc(moment: datetime) -> datetime:
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
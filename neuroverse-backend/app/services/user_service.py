@@ -51,7 +51,6 @@ class UserService:
         user.updated_at = datetime.utcnow()
         
         await self.db.commit()
-        await self.db.refresh(user)
         
         return user
     
@@ -130,7 +129,6 @@ class UserService:
         user.updated_at = datetime.utcnow()
         
         await self.db.commit()
-        await self.db.refresh(user)
         
         return user
     
@@ -59,7 +59,6 @@ class WellnessService:
         
         self.db.add(entry)
         await self.db.commit()
-        await self.db.refresh(entry)
         
         return entry
     
@@ -79,7 +78,6 @@ class WellnessService:
             setattr(entry, field, value)
         
         await self.db.commit()
-        await self.db.refresh(entry)
         
         return entry
     
@@ -2,9 +2,16 @@
 XAI Service - Explainable AI explanation generation
 Generates SHAP values, feature importance, and human-readable interpretations
 Output structure matches Flutter XAI.dart requirements
+
+SHAP values are exact attributions of the category's AD/PD risk scores
+(app/ml/xai/shap_explainer.py) under the same scoring version. Motor
+explanations carry the spiral drawing's saliency map when one is given
+(app/ml/xai/saliency_generator.py).
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from app.ml.fusion.scoring_registry import ScoringConfig, get_scoring_registry
+from app.ml.xai.shap_explainer import ShapValues, get_explainer_cache
 from app.schemas.test_result import (
     XAIExplanation, ShapValue, FeatureImportance, 
     Interpretation, SaliencyData
@@ -15,10 +22,9 @@ class XAIService:
     """
     Explainable AI Service for generating interpretable explanations.
     
-    This is a placeholder implementation. In production, this will:
-    1. Use SHAP library for actual SHAP value calculation
-    2. Generate saliency maps for visual data
-    3. Use NLP for human-readable explanations
+    SHAP values come from the cached per-version explainers. Still to come:
+    1. Saliency maps for the other visual tests (gait, facial)
+    2. Use NLP for human-readable explanations
     """
     
     # Feature display names
@@ -104,23 +110,28 @@ class XAIService:
         },
     }
     
-    def __init__(self):
-        # TODO: Load SHAP explainer models
-        pass
+    def __init__(self, scoring: Optional[ScoringConfig] = None):
+        # Explain with the scoring version the risks were calculated with
+        self.scoring = scoring or get_scoring_registry().current()
+        self.explainers = get_explainer_cache()
     
     async def generate_explanation(
         self,
         category: str,
         features: Dict[str, Any],
-        risk_scores: Dict[str, Any]
+        risk_scores: Dict[str, Any],
+        saliency: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Generate complete XAI explanation for test results.
         
-        Returns dict matching XAIExplanation schema for frontend XAI.dart
+        Returns dict matching XAIExplanation schema for frontend XAI.dart;
+        saliency (SaliencyData shape) is passed through as saliency_data.
         """
-        # Generate SHAP values
-        shap_values = self._generate_shap_values(features, risk_scores)
+        # Exact SHAP values of both risks; the headline list explains the higher one
+        attributions = self.explainers.get(category, self.scoring).explain_features([features])
+        primary = "ad_risk" if risk_scores.get("ad_risk", 0) >= risk_scores.get("pd_risk", 0) else "pd_risk"
+        shap_values = self._generate_shap_values(features, attributions, primary)[:10]
         
         # Calculate feature importance
         feature_importance = self._calculate_feature_importance(features, category)
@@ -129,8 +140,8 @@ class XAIService:
         interpretations = self._generate_interpretations(features, risk_scores, category)
         
         # Generate AD/PD specific factors
-        ad_factors = self._get_ad_factors(features, shap_values)
-        pd_factors = self._get_pd_factors(features, shap_values)
+        ad_factors = self._generate_shap_values(features, attributions, "ad_risk")[:5]
+        pd_factors = self._generate_shap_values(features, attributions, "pd_risk")[:5]
         
         # Create summary
         summary = self._generate_summary(risk_scores, category)
@@ -141,60 +152,100 @@ class XAIService:
             "shap_values": [sv.model_dump() for sv in shap_values],
             "feature_importance": [fi.model_dump() for fi in feature_importance],
             "interpretations": [i.model_dump() for i in interpretations],
-            "saliency_data": None,  # TODO: Add for visual tests
+            "saliency_data": SaliencyData.model_validate(saliency).model_dump() if saliency else None,
             "category_explanations": {
                 category: f"Analysis based on {features.get('items_processed', 0)} tests"
             },
             "ad_factors": [f.model_dump() for f in ad_factors],
             "pd_factors": [f.model_dump() for f in pd_factors],
-            "comparison_with_baseline": None,
+            "comparison_with_baseline": self._compare_with_norms(risk_scores.get("percentiles")),
+            "trend_analysis": None,
+        }
+    
+    def combine_explanations(
+        self,
+        explanations: Dict[str, Dict[str, Any]],
+        composite: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Merge per-category explanations of a full screening into one.
+        
+        Attributions are pooled and re-ranked across categories; the summary
+        comes from the composite assessment.
+        """
+        shap_values = [sv for e in explanations.values() for sv in e["shap_values"]]
+        shap_values.sort(key=lambda sv: abs(sv["contribution"]), reverse=True)
+        
+        feature_importance = [fi for e in explanations.values() for fi in e["feature_importance"]]
+        feature_importance.sort(key=lambda fi: fi["value"], reverse=True)
+        for rank, fi in enumerate(feature_importance, 1):
+            fi["rank"] = rank
+        
+        return {
+            "summary": f"{composite['primary_concern']}: {composite['recommendation']}",
+            "confidence": min((e["confidence"] for e in explanations.values()), default=0.0),
+            "shap_values": shap_values,
+            "feature_importance": feature_importance,
+            "interpretations": [i for e in explanations.values() for i in e["interpretations"]],
+            "saliency_data": next(
+                (e["saliency_data"] for e in explanations.values() if e.get("saliency_data")), None
+            ),
+            "category_explanations": {
+                category: text
+                for e in explanations.values()
+                for category, text in e["category_explanations"].items()
+            },
+            "ad_factors": [sv for e in explanations.values() for sv in e["ad_factors"]],
+            "pd_factors": [sv for e in explanations.values() for sv in e["pd_factors"]],
+            "comparison_with_baseline": self._compare_with_norms({
+                feature: rank
+                for e in explanations.values()
+                for feature, rank in ((e.get("comparison_with_baseline") or {}).get("percentiles") or {}).items()
+            }),
             "trend_analysis": None,
         }
     
     def _generate_shap_values(
         self, 
         features: Dict[str, Any],
-        risk_scores: Dict[str, Any]
+        attributions: ShapValues,
+        output: str
     ) -> List[ShapValue]:
         """
-        Generate SHAP values for features.
-        In production, this will use actual SHAP library.
+        SHAP values of the measured features for one risk ("ad_risk" or "pd_risk").
+        
+        value is the attribution as a fraction of the 0-100 risk scale
+        (positive = raises risk); contribution is its share in percent.
         """
         shap_values = []
+        phi = {
+            key: attribution
+            for key, attribution in attributions.row(0, output).items()
+            if isinstance(features.get(key), (int, float)) and not isinstance(features.get(key), bool)
+        }
+        total = sum(abs(attribution) for attribution in phi.values())
         
-        # Skip metadata fields
-        skip_fields = ["category", "items_processed"]
-        
-        for key, value in features.items():
-            if key in skip_fields or not isinstance(value, (int, float)):
+        for key, attribution in phi.items():
+            if abs(attribution) < 1e-9:
                 continue
             
             display_name = self.FEATURE_NAMES.get(key, key.replace("_", " ").title())
-            
-            # Calculate simulated SHAP contribution
-            # In production, this comes from actual SHAP computation
-            normalized_value = self._normalize_value(key, value)
-            contribution = self._calculate_contribution(key, normalized_value)
-            
-            # Determine level
-            level = self._value_to_level(normalized_value)
-            
-            # Determine direction
-            direction = "positive" if contribution > 0 else "negative" if contribution < 0 else "neutral"
+            level = self._value_to_level(self._normalize_value(key, features[key]))
+            direction = "positive" if attribution > 0 else "negative"
             
             shap_values.append(ShapValue(
                 name=display_name,
-                value=round(contribution, 3),
-                contribution=abs(round(contribution * 100, 1)),
+                value=round(attribution / 100, 3),
+                contribution=round(abs(attribution) / total * 100, 1),
                 level=level,
                 description=self._get_feature_description(key, level),
                 direction=direction,
             ))
         
         # Sort by absolute contribution
-        shap_values.sort(key=lambda x: abs(x.value), reverse=True)
+        shap_values.sort(key=lambda x: x.contribution, reverse=True)
         
-        return shap_values[:10]  # Return top 10 factors
+        return shap_values
     
     def _calculate_feature_importance(
         self, 
@@ -435,23 +486,16 @@ class XAIService:
         
         return interps
     
-    def _get_ad_factors(
-        self, 
-        features: Dict[str, Any],
-        shap_values: List[ShapValue]
-    ) -> List[ShapValue]:
-        """Get factors most relevant to AD risk."""
-        ad_relevant = ["stroop", "nback", "recall", "story", "coherence"]
-        return [sv for sv in shap_values if any(r in sv.name.lower() for r in ad_relevant)][:5]
-    
-    def _get_pd_factors(
-        self, 
-        features: Dict[str, Any],
-        shap_values: List[ShapValue]
-    ) -> List[ShapValue]:
-        """Get factors most relevant to PD risk."""
-        pd_relevant = ["tapping", "tremor", "spiral", "gait", "balance", "blink"]
-        return [sv for sv in shap_values if any(r in sv.name.lower() for r in pd_relevant)][:5]
+    def _compare_with_norms(self, percentiles: Optional[Dict[str, Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Percentile ranks among same-age/gender users (NormativeService), with the extremes called out."""
+        if not percentiles:
+            return None
+        return {
+            "reference": "population_norms",
+            "percentiles": percentiles,
+            "below_5th_percentile": [f for f, rank in percentiles.items() if rank["percentile"] < 5],
+            "above_95th_percentile": [f for f, rank in percentiles.items() if rank["percentile"] > 95],
+        }
     
     def _generate_summary(self, risk_scores: Dict[str, Any], category: str) -> str:
         """Generate overall summary text."""
@@ -486,19 +530,6 @@ class XAIService:
         
         return min(1, max(0, value))
     
-    def _calculate_contribution(self, key: str, normalized: float) -> float:
-        """Calculate simulated SHAP contribution."""
-        # Simplified contribution calculation
-        # Positive = increases risk, Negative = decreases risk
-        
-        # Features where higher is better (decreases risk)
-        inverse_features = ["accuracy", "regularity", "stability", "coherence"]
-        
-        if any(f in key for f in inverse_features):
-            return -(normalized - 0.5) * 0.5  # Higher value = lower risk
-        else:
-            return (normalized - 0.5) * 0.5  # Higher value = higher risk
-    
     def _value_to_level(self, normalized: float) -> str:
         """Convert normalized value to level string."""
         if normalized >= 0.7:
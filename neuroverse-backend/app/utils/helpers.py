@@ -4,7 +4,7 @@ Utility Helper Functions
 
 import os
 import uuid
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from typing import Optional, Any
 import json
 
@@ -34,6 +34,11 @@ def calculate_age(birth_date: date) -> int:
     )
 
 
+def naive_utc(moment: datetime) -> datetime:
+    """Naive UTC datetime (timestamps are stored naive but may come back timezone-aware)."""
+    return moment.astimezone(timezone.utc).replace(tzinfo=None) if moment.tzinfo else moment
+
+
 def safe_json_loads(json_str: str, default: Any = None) -> Any:
     """Safely parse JSON string."""
     try:
@@ -0,0 +1,306 @@
+"""
+Incremental JSON parsing for test item uploads
+Reads a request body chunk by chunk with ijson and yields items as soon as
+each one is complete. Sensor streams in raw_data (SENSOR_STREAMS: arrays of
+flat numeric records such as [{"x": .., "y": .., "z": .., "timestamp": ..}, ...])
+are written straight into typed column buffers instead of lists of dicts.
+Other lists (e.g. facial smile_events) stay JSON, as extractors read them.
+Size limits are enforced while reading, so oversized or malformed bodies
+fail before they are fully received.
+
+Accepted bodies: a single TestItemCreate object, or {"items": [...]}.
+"""
+
+import sys
+from array import array
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import ijson
+
+NUMBER_TYPES = (int, float)
+
+# raw_data keys read through stream_columns, so they can be stored as binary channels
+SENSOR_STREAMS = frozenset({"taps", "coordinates", "accelerometer_data", "gyroscope_data"})
+
+
+class StreamLimitError(ValueError):
+    """Body, item or item count exceeded its limit."""
+
+
+class StreamFormatError(ValueError):
+    """Body is not valid JSON or not shaped like an item upload."""
+
+
+class StreamedItem:
+    """One parsed item: scalar fields and raw_data, plus typed sensor columns."""
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.columns: Dict[str, "RecordColumns"] = {}  # raw_data key -> columns
+
+    def channels(self) -> Dict[str, tuple]:
+        """{"<stream>.<field>": (dtype, little-endian bytes)} for every column."""
+        out = {}
+        for stream, columns in self.columns.items():
+            for field, (dtype, data) in columns.to_bytes().items():
+                out[f"{stream}.{field}"] = (dtype, data)
+        return out
+
+
+class RecordColumns:
+    """Column buffers for an array of flat records with numeric values."""
+
+    def __init__(self):
+        self.columns: Dict[str, array] = {}
+        self.rows = 0
+        self.current: Dict[str, Any] = {}
+
+    def set(self, key: str, value: Any) -> bool:
+        """Stage a value for the current record; False if it isn't a plain number."""
+        if isinstance(value, bool) or not isinstance(value, NUMBER_TYPES):
+            return False
+        self.current[key] = value
+        return True
+
+    def end_record(self) -> None:
+        for key, value in self.current.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = array("q") if isinstance(value, int) else array("d")
+                if self.rows:
+                    column = array("d", [float("nan")]) * self.rows
+                self.columns[key] = column
+            elif column.typecode == "q" and not isinstance(value, int):
+                column = self.columns[key] = array("d", column)
+            column.append(value)
+
+        for key, column in self.columns.items():
+            if key not in self.current:
+                if column.typecode == "q":
+                    column = self.columns[key] = array("d", column)
+                column.append(float("nan"))
+
+        self.current = {}
+        self.rows += 1
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Back to list-of-dicts form (used when a stream turns out not to be numeric)."""
+        records = [{} for _ in range(self.rows)]
+        for key, column in self.columns.items():
+            for record, value in zip(records, column):
+                if value == value:  # skip NaN fill-ins
+                    record[key] = value
+        return records
+
+    def to_bytes(self) -> Dict[str, tuple]:
+        out = {}
+        for key, column in self.columns.items():
+            if sys.byteorder != "little":
+                column = array(column.typecode, column)
+                column.byteswap()
+            out[key] = ("<i8" if column.typecode == "q" else "<f8", column.tobytes())
+        return out
+
+
+class _LimitedReader:
+    """Async file-like wrapper over body chunks that counts and caps bytes read."""
+
+    def __init__(self, chunks: AsyncIterator[bytes], max_bytes: int):
+        self._chunks = chunks.__aiter__()
+        self._buffer = b""
+        self._done = False
+        self.max_bytes = max_bytes
+        self.consumed = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        while not self._done and (size < 0 or len(self._buffer) < size):
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._done = True
+                break
+            self.consumed += len(chunk)
+            if self.consumed > self.max_bytes:
+                raise StreamLimitError(f"Request body exceeds {self.max_bytes} bytes")
+            self._buffer += chunk
+
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class _Builder:
+    """Builds a Python value from ijson events (generic path)."""
+
+    def __init__(self, stack: Optional[list] = None, keys: Optional[list] = None):
+        self.stack = stack or []
+        self.keys = keys or []
+        self.value = None
+
+    def event(self, event: str, value: Any) -> bool:
+        """Feed one event; True once the value is complete."""
+        if event == "map_key":
+            self.keys[-1] = value
+            return False
+        if event in ("start_map", "start_array"):
+            self.stack.append({} if event == "start_map" else [])
+            self.keys.append(None)
+            return False
+        if event in ("end_map", "end_array"):
+            self.keys.pop()
+            value = self.stack.pop()
+        return self._add(value)
+
+    def _add(self, value: Any) -> bool:
+        if not self.stack:
+            self.value = value
+            return True
+        top = self.stack[-1]
+        if isinstance(top, list):
+            top.append(value)
+        else:
+            top[self.keys[-1]] = value
+        return False
+
+
+async def iter_items(
+    chunks: AsyncIterator[bytes],
+    max_request_bytes: int,
+    max_item_bytes: int,
+    max_items: int,
+) -> AsyncIterator[StreamedItem]:
+    """Yield StreamedItems from a JSON body as it arrives."""
+    reader = _LimitedReader(chunks, max_request_bytes)
+    item_prefix: Optional[str] = None
+    item: Optional[StreamedItem] = None
+    item_start = 0
+    items_seen = 0
+    field: Optional[str] = None
+    raw_key: Optional[str] = None
+    builder: Optional[_Builder] = None   # generic value under construction
+    columns: Optional[RecordColumns] = None
+    record_key: Optional[str] = None
+    in_record = False
+
+    try:
+        async for prefix, event, value in ijson.parse_async(reader, use_float=True):
+            if item is not None and reader.consumed - item_start > max_item_bytes:
+                raise StreamLimitError(f"Item exceeds {max_item_bytes} bytes")
+
+            # ---------- locate items ----------
+            if item is None:
+                if item_prefix is None:
+                    # Top level: a single item, or {"items": [...]}
+                    if prefix == "" and event == "start_map":
+                        continue
+                    if prefix == "" and event == "map_key" and value == "items":
+                        item_prefix = "items.item"
+                        continue
+                    if not (prefix == "" and event == "map_key"):
+                        raise StreamFormatError("Body must be an item object or {\"items\": [...]}")
+                    item_prefix = ""
+                elif item_prefix == "items.item":
+                    if (prefix, event) in (("items", "start_array"), ("items", "end_array"), ("", "end_map")):
+                        continue
+                    if not (prefix == "items.item" and event == "start_map"):
+                        raise StreamFormatError("\"items\" must be a list of item objects")
+                else:
+                    raise StreamFormatError("Unexpected data after the item")
+
+                items_seen += 1
+                if items_seen > max_items:
+                    raise StreamLimitError(f"More than {max_items} items in one request")
+                item, item_start = StreamedItem(), reader.consumed
+                if event == "start_map":
+                    continue
+
+            raw_prefix = _join(item_prefix, "raw_data")
+
+            # ---------- sensor stream columns ----------
+            if columns is not None:
+                stream_prefix = _join(raw_prefix, raw_key)
+                record_prefix = stream_prefix + ".item"
+                if prefix == stream_prefix and event == "end_array":
+                    if columns.columns:
+                        item.columns[raw_key] = columns
+                    else:
+                        item.fields["raw_data"][raw_key] = columns.to_records()
+                    columns = None
+                    continue
+                if prefix == record_prefix and event == "start_map" and not in_record:
+                    in_record = True
+                    continue
+                if prefix == record_prefix and event == "map_key":
+                    record_key = value
+                    continue
+                if prefix == record_prefix and event == "end_map":
+                    columns.end_record()
+                    in_record = False
+                    continue
+                if in_record and prefix == _join(record_prefix, record_key) and columns.set(record_key, value):
+                    continue
+
+                # Not a flat numeric record stream: continue generically from here
+                records = columns.to_records()
+                stack, keys = [records], [None]
+                if in_record:
+                    stack.append(columns.current)
+                    keys.append(record_key)
+                builder = _Builder(stack, keys)
+                columns, in_record = None, False
+                # fall through so the current event goes to the builder
+
+            if builder is not None:
+                if builder.event(event, value):
+                    target = item.fields.setdefault("raw_data", {}) if raw_key is not None else item.fields
+                    target[raw_key if raw_key is not None else field] = builder.value
+                    builder = None
+                continue
+
+            # ---------- raw_data keys ----------
+            if prefix == raw_prefix and field == "raw_data":
+                if event == "start_map":
+                    item.fields["raw_data"] = {}
+                    continue
+                if event == "map_key":
+                    raw_key = value
+                    continue
+                if event == "end_map":
+                    raw_key = None
+                    field = None
+                    continue
+
+            if raw_key is not None and prefix == _join(raw_prefix, raw_key):
+                if event == "start_array" and raw_key in SENSOR_STREAMS:
+                    columns, in_record = RecordColumns(), False
+                    continue
+                builder = _Builder()
+                if builder.event(event, value):
+                    item.fields["raw_data"][raw_key] = builder.value
+                    builder = None
+                continue
+
+            # ---------- item fields ----------
+            if prefix == item_prefix and event == "map_key":
+                field = value
+                continue
+            if prefix == item_prefix and event == "end_map":
+                yield item
+                item, field, raw_key = None, None, None
+                continue
+
+            builder = _Builder()
+            if builder.event(event, value):
+                item.fields[field] = builder.value
+                builder = None
+
+    except ijson.IncompleteJSONError as e:
+        raise StreamFormatError(f"Malformed or truncated JSON: {e}") from e
+    except ijson.JSONError as e:
+        raise StreamFormatError(f"Malformed JSON: {e}") from e
+
+
+def _join(prefix: Optional[str], key: Optional[str]) -> str:
+    return f"{prefix}.{key}" if prefix else (key or "")
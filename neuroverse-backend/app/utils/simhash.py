@@ -0,0 +1,60 @@
+"""
+SimHash - 64-bit locality-sensitive fingerprints (Charikar, 2002)
+Each token is hashed to 64 bits; bit i of the fingerprint is set when more
+tokens have bit i set than not. Payloads sharing most of their tokens get
+fingerprints a few bits apart, so near-duplicates are found by Hamming
+distance instead of comparing payloads.
+
+For lookups, the fingerprint is split into BANDS 16-bit bands: two
+fingerprints at most BANDS - 1 bits apart agree exactly on at least one
+band (pigeonhole), so an index on each band finds every candidate with
+BANDS equality lookups.
+"""
+
+from typing import List
+
+import numpy as np
+
+BANDS = 4
+BAND_BITS = 64 // BANDS
+
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer over a uint64 array: well-spread 64-bit token hashes."""
+    z = np.asarray(values, dtype=np.uint64).copy()
+    with np.errstate(over="ignore"):
+        z += np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def simhash(token_hashes: np.ndarray) -> int:
+    """Fingerprint of a set of 64-bit token hashes (uint64 array)."""
+    hashes = np.ascontiguousarray(token_hashes, dtype="<u8")
+    if not len(hashes):
+        return 0
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 > len(hashes)
+    return int(np.packbits(votes, bitorder="little").view("<u8")[0])
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK).count("1")
+
+
+def bands(fingerprint: int) -> List[int]:
+    """The fingerprint's BANDS bands, low bits first."""
+    band_mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (BAND_BITS * i)) & band_mask for i in range(BANDS)]
+
+
+def to_signed(fingerprint: int) -> int:
+    """As a signed 64-bit integer (BIGINT column)."""
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def from_signed(value: int) -> int:
+    return value & _MASK
@@ -0,0 +1,136 @@
+"""
+t-digest - Mergeable streaming quantile sketch (Dunning & Ertl, 2019)
+Keeps a few hundred weighted centroids however many values were added,
+with the best accuracy in the tails (where percentile ranks matter most).
+Values are buffered and merged in sorted batches; rank and quantile
+lookups interpolate between centroids with a binary search.
+
+Serialized (to_bytes) as a small header plus float64 means and uint32
+weights: ~1-2 KB at the default compression.
+"""
+
+import math
+import struct
+from typing import Iterable, Optional
+
+import numpy as np
+
+_HEADER = struct.Struct("<HQdd")  # compression, count, min, max
+
+
+class TDigest:
+    """Streaming quantile sketch."""
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self._buffer: list = []
+        self._knots: Optional[tuple] = None  # (values, cumulative ranks) for lookups
+
+    def add(self, value: float) -> None:
+        self._buffer.append(value)
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._knots = None
+        if len(self._buffer) >= 5 * self.compression:
+            self._merge()
+
+    def update(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def cdf(self, value: float) -> float:
+        """Fraction of added values <= value (NaN when empty)."""
+        if self.count == 0:
+            return math.nan
+        if value < self.min:
+            return 0.0
+        if value >= self.max:
+            return 1.0
+        values, ranks = self._lookup_knots()
+        return float(np.interp(value, values, ranks)) / self.count
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q in [0, 1] (NaN when empty)."""
+        if self.count == 0:
+            return math.nan
+        values, ranks = self._lookup_knots()
+        return float(np.interp(q * self.count, ranks, values))
+
+    def percentile_rank(self, value: float) -> float:
+        """cdf() on a 0-100 scale."""
+        return 100.0 * self.cdf(value)
+
+    def to_bytes(self) -> bytes:
+        self._merge()
+        return (
+            _HEADER.pack(self.compression, self.count, self.min, self.max)
+            + self._means.astype("<f8").tobytes()
+            + self._weights.astype("<u4").tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TDigest":
+        compression, count, low, high = _HEADER.unpack_from(data)
+        digest = cls(compression)
+        size = (len(data) - _HEADER.size) // 12
+        digest.count, digest.min, digest.max = count, low, high
+        digest._means = np.frombuffer(data, "<f8", size, _HEADER.size).astype(float)
+        digest._weights = np.frombuffer(data, "<u4", size, _HEADER.size + 8 * size).astype(float)
+        return digest
+
+    # ============== PRIVATE HELPERS ==============
+
+    def _merge(self) -> None:
+        """Fold buffered values into the centroids (one sorted pass)."""
+        if not self._buffer:
+            return
+        means = np.concatenate([self._means, np.asarray(self._buffer, dtype=float)])
+        weights = np.concatenate([self._weights, np.ones(len(self._buffer))])
+        self._buffer = []
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        total = weights.sum()
+        merged_means, merged_weights = [], []
+        mean, weight = means[0], weights[0]
+        done = 0.0
+        limit = total * self._q_limit(0.0)
+        for next_mean, next_weight in zip(means[1:].tolist(), weights[1:].tolist()):
+            if done + weight + next_weight <= limit:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                merged_means.append(mean)
+                merged_weights.append(weight)
+                done += weight
+                limit = total * self._q_limit(done / total)
+                mean, weight = next_mean, next_weight
+        merged_means.append(mean)
+        merged_weights.append(weight)
+
+        self._means = np.array(merged_means)
+        self._weights = np.array(merged_weights)
+
+    def _q_limit(self, q: float) -> float:
+        """Largest quantile a centroid starting at q may reach (k1 scale function)."""
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+
+    def _lookup_knots(self) -> tuple:
+        """min, centroid means, max against their cumulative ranks (centroid centers)."""
+        if self._knots is None:
+            self._merge()
+            centers = np.cumsum(self._weights) - self._weights / 2
+            self._knots = (
+                np.concatenate([[self.min], self._means, [self.max]]),
+                np.concatenate([[0.0], centers, [float(self.count)]]),
+            )
+        return self._knots
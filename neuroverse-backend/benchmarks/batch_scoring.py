@@ -0,0 +1,90 @@
+"""
+Batch vs per-record scoring check
+Scores random feature sets (missing features, zeros, values on and around
+every cutoff, validity-check features and reaction-time lists) with
+FusionService.calculate_risk_scores one dict at a time and with
+FusionService.score_batch on the same rows as a matrix, under the built-in
+norms and an overridden version, and checks every risk, score, label and
+validity status/confidence is identical. Also times both.
+
+Usage (from neuroverse-backend/):
+    python -m benchmarks.batch_scoring [--rows 100000]
+
+Exits non-zero on any mismatch, or if score_batch is under 50x faster.
+
+Reference run (100000 rows per category, built-in version; matrix built
+from the dicts beforehand, as a what-if grid would be):
+    cognitive: 0 mismatches, 10.6k rows/s -> 1.40M rows/s (132x)
+    speech: 0 mismatches, 11.7k rows/s -> 1.92M rows/s (164x)
+    motor: 0 mismatches, 12.0k rows/s -> 1.72M rows/s (144x)
+    gait: 0 mismatches, 12.4k rows/s -> 1.76M rows/s (142x)
+    facial: 0 mismatches, 14.0k rows/s -> 1.80M rows/s (129x)
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from app.ml.fusion.batch_scoring import FEATURE_COLUMNS
+from app.ml.fusion.scoring_registry import ScoringConfig
+from app.services.fusion_service import FusionService
+from tests.scoring_fixtures import VERSIONS, random_features
+
+FIELDS = ("ad_risk", "pd_risk", "category_score", "stage", "severity", "ad_stage", "pd_stage")
+MIN_SPEEDUP = 50
+
+
+def check(category: str, features: list, scoring: ScoringConfig) -> tuple:
+    """(mismatches, per-record seconds, batch seconds)"""
+    fusion = FusionService(scoring)
+
+    async def score_each():
+        return [await fusion.calculate_risk_scores(category, row) for row in features]
+
+    started = time.perf_counter()
+    expected = asyncio.run(score_each())
+    scalar_seconds = time.perf_counter() - started
+
+    matrix = fusion.features_matrix(category, features)
+    started = time.perf_counter()
+    scores = fusion.score_batch(category, matrix)
+    batch_seconds = time.perf_counter() - started
+
+    mismatches = 0
+    for i, record in enumerate(expected):
+        got = [scores[field][i] for field in FIELDS] + [
+            scores["validity_status"][i], scores["validity_confidence"][i], scores["is_valid"][i]]
+        want = [record[field] for field in FIELDS] + [
+            record["validity"]["status"], record["validity"]["confidence"], record["validity"]["is_valid"]]
+        if got != want:
+            mismatches += 1
+            if mismatches <= 3:
+                print(f"  {category} row {i}: {features[i]}")
+                print(f"    expected {want}")
+                print(f"    got      {got}")
+    return mismatches, scalar_seconds, batch_seconds
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    failed = False
+    for scoring in VERSIONS:
+        print(f"Scoring version {scoring.version}:")
+        for seed, category in enumerate(FEATURE_COLUMNS):
+            features = random_features(category, args.rows, seed)
+            mismatches, scalar_seconds, batch_seconds = check(category, features, scoring)
+            speedup = scalar_seconds / batch_seconds
+            failed |= mismatches > 0 or speedup < MIN_SPEEDUP
+            print(
+                f"  {category}: {mismatches} mismatches, {args.rows / scalar_seconds / 1e3:.1f}k rows/s -> "
+                f"{args.rows / batch_seconds / 1e6:.2f}M rows/s ({speedup:.0f}x)"
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Replay fingerprint check
+Fingerprints synthetic sensor recordings the way FingerprintService does
+(payload_tokens + simhash) and checks that replays of a recording land
+within FINGERPRINT_MAX_DISTANCE bits of the original while distinct
+recordings do not. Also times fingerprinting and the band lookup over an
+in-memory index of random fingerprints (the item_fingerprints band
+indexes do the same equality lookups).
+
+Usage (from neuroverse-backend/):
+    python -m benchmarks.fingerprints [--recordings 300] [--index 1000000]
+
+Exits non-zero if an exact, shifted or re-encoded replay is missed or two
+distinct recordings are matched.
+
+Reference run (300 recordings of 500 samples, 1000000 indexed):
+    exact replay            detected 100.0%, max distance 0
+    shifted timestamps      detected 100.0%, max distance 0
+    float32 re-encoding     detected 100.0%, max distance 3   (sensor values only)
+    trimmed 5 samples       detected  83.0%
+    1% jitter               detected   0.0%   (not a replay; by design)
+    distinct recordings     0 matched, min distance 15, median 32
+    fingerprint 3.5 ms/item, lookup 60.7 candidates, 98.5 us/lookup
+The candidates are the ~15 random fingerprints sharing each 16-bit band;
+the service's indexes also key on item_name, which divides them further.
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.fingerprint_service import payload_tokens
+from app.utils.simhash import bands, hamming, simhash
+
+SAMPLES = 500
+MUST_DETECT = ("exact replay", "shifted timestamps", "float32 re-encoding")
+
+
+def recording(rng: np.random.Generator, n: int = SAMPLES) -> dict:
+    """A tapping/accelerometer-like item: timestamped records plus a few scalars."""
+    t0 = rng.uniform(1.6e12, 1.7e12)
+    t = t0 + np.cumsum(rng.uniform(15, 25, n))
+    walk = np.cumsum(rng.normal(0, 0.05, (n, 3)), axis=0)
+    return {
+        "device": "phone",
+        "hand": str(rng.choice(["left", "right"])),
+        "samples": [
+            {"t": float(t[i]), "x": float(walk[i, 0]), "y": float(walk[i, 1]), "z": float(walk[i, 2])}
+            for i in range(n)
+        ],
+    }
+
+
+def variants(raw: dict, rng: np.random.Generator) -> dict:
+    samples = raw["samples"]
+    shift = rng.uniform(1e6, 1e9)
+    return {
+        "exact replay": dict(raw),
+        "shifted timestamps": {**raw, "samples": [{**s, "t": s["t"] + shift} for s in samples]},
+        "float32 re-encoding": {**raw, "samples": [
+            {k: v if k == "t" else float(np.float32(v)) for k, v in s.items()} for s in samples
+        ]},
+        "trimmed 5 samples": {**raw, "samples": samples[5:]},
+        "1% jitter": {**raw, "samples": [
+            {k: v * (1 + rng.normal(0, 0.01)) if k != "t" else v for k, v in s.items()} for s in samples
+        ]},
+    }
+
+
+def fingerprint(raw: dict) -> int:
+    return simhash(payload_tokens(raw))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recordings", type=int, default=300)
+    parser.add_argument("--index", type=int, default=1000000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(11)
+    limit = settings.FINGERPRINT_MAX_DISTANCE
+
+    originals, distances = [], defaultdict(list)
+    started = time.perf_counter()
+    for _ in range(args.recordings):
+        raw = recording(rng)
+        original = fingerprint(raw)
+        originals.append(original)
+        for name, replay in variants(raw, rng).items():
+            distances[name].append(hamming(original, fingerprint(replay)))
+    per_item = (time.perf_counter() - started) * 1000 / (args.recordings * 6)
+
+    failed = False
+    for name, values in distances.items():
+        values = np.array(values)
+        rate = 100 * np.mean(values <= limit)
+        note = f", max distance {values.max()}" if name in MUST_DETECT else ""
+        print(f"{name:<22}  detected {rate:5.1f}%{note}")
+        failed |= name in MUST_DETECT and rate < 100
+
+    pairs = np.array([
+        hamming(a, b) for i, a in enumerate(originals) for b in originals[i + 1:]
+    ])
+    matched = int(np.sum(pairs <= limit))
+    print(f"{'distinct recordings':<22}  {matched} matched, "
+          f"min distance {pairs.min()}, median {int(np.median(pairs))}")
+    failed |= matched > 0
+
+    # Band index of random fingerprints, as the four (item_name, band) indexes
+    index = [defaultdict(list) for _ in range(4)]
+    for value in rng.integers(0, 2**63, args.index, dtype=np.int64).tolist():
+        value |= int(rng.integers(0, 2)) << 63
+        for i, band in enumerate(bands(value)):
+            index[i][band].append(value)
+    candidates = 0
+    started = time.perf_counter()
+    for value in originals:
+        found = {c for i, band in enumerate(bands(value)) for c in index[i].get(band, ())}
+        candidates += len(found)
+        min((hamming(value, c) for c in found), default=None)
+    per_lookup = (time.perf_counter() - started) * 1e6 / len(originals)
+    print(f"fingerprint {per_item:.1f} ms/item, lookup {candidates / len(originals):.1f} candidates, "
+          f"{per_lookup:.1f} us/lookup")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
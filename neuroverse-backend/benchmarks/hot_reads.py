@@ -0,0 +1,214 @@
+"""
+Hot-read benchmark
+Compares the ORM-hydrating implementations of the dashboard/alerts/stats
+reads with the column-level queries in app.db.queries.
+
+Usage (from neuroverse-backend/):
+    python -m benchmarks.hot_reads [--users 2000] [--repeat 50]
+
+Needs the Development requirements (aiosqlite).
+
+Reference run (SQLite, 2000 users / 20000 sessions, mean ms per call):
+    read                     orm ms  core ms
+    /tests/dashboard          14.4     3.0   (13 queries -> 3)
+    /doctors/dashboard        38.1    42.0   (7 -> 3; dominated by the table scans)
+    /doctors/alerts            6.2     6.1   (5-row results, hydration is negligible)
+    /feedback/admin/stats      4.5     2.6   (5 -> 2)
+Against PostgreSQL over a network the saved round trips weigh more.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, desc, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db import queries
+from app.db.database import Base
+from app.models import doctor_model, admin  # noqa: F401  (User relationships)
+from app.models.feedback import Feedback, FeedbackCategory, FeedbackStatus
+from app.models.test_session import TestSession
+from app.models.user import User
+from app.services.test_service import CATEGORY_CONFIG
+
+CATEGORIES = list(CATEGORY_CONFIG)
+
+
+# ============== ORM PATH (previous implementations) ==============
+
+async def orm_test_dashboard(db: AsyncSession, user_id: int):
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+
+    async def count(category=None, status=None):
+        query = select(func.count(TestSession.id)).where(TestSession.user_id == user_id)
+        if category:
+            query = query.where(TestSession.category == category)
+        if status:
+            query = query.where(TestSession.status == status)
+        return (await db.execute(query)).scalar() or 0
+
+    total, completed = await count(), await count(status="completed")
+    in_progress = (await db.execute(
+        select(TestSession).where(and_(
+            TestSession.user_id == user_id,
+            TestSession.status.in_(["created", "in_progress"]),
+        )).limit(1)
+    )).scalar_one_or_none()
+    categories = []
+    for category in CATEGORIES:
+        last = (await db.execute(
+            select(TestSession.completed_at).where(and_(
+                TestSession.user_id == user_id,
+                TestSession.category == category,
+                TestSession.status == "completed",
+            )).order_by(TestSession.completed_at.desc()).limit(1)
+        )).first()
+        categories.append((category, await count(category, "completed"), last, getattr(user, f"{category}_score")))
+    return total, completed, in_progress, categories
+
+
+async def orm_doctor_dashboard(db: AsyncSession):
+    now = datetime.utcnow()
+    completed = TestSession.status == "completed"
+    counts = [
+        (await db.execute(select(func.count(User.id)))).scalar(),
+        (await db.execute(select(func.count(TestSession.id)).where(
+            and_(completed, TestSession.completed_at >= now - timedelta(days=7))))).scalar(),
+        (await db.execute(select(func.count(TestSession.id)).where(
+            and_(completed, TestSession.completed_at >= now.replace(hour=0, minute=0))))).scalar(),
+        (await db.execute(select(func.count(User.id)).where(
+            or_(User.ad_risk_score >= 70, User.pd_risk_score >= 70)))).scalar(),
+    ]
+    last_test = func.max(TestSession.completed_at)
+    recent_ids = select(User.id).join(TestSession).where(completed).group_by(User.id).order_by(desc(last_test)).limit(5)
+    recent = (await db.execute(select(User).where(User.id.in_(recent_ids)))).scalars().all()
+    pending = (await db.execute(
+        select(TestSession, User).join(User, User.id == TestSession.user_id)
+        .where(completed).order_by(desc(TestSession.completed_at)).limit(5)
+    )).all()
+    return counts, recent, pending
+
+
+async def orm_alerts(db: AsyncSession):
+    now = datetime.utcnow()
+    high_risk = (await db.execute(
+        select(User).where(and_(
+            or_(User.ad_risk_score >= 70, User.pd_risk_score >= 70),
+            User.updated_at >= now - timedelta(days=7),
+        )).order_by(desc(User.updated_at)).limit(5)
+    )).scalars().all()
+    recent = (await db.execute(
+        select(TestSession, User).join(User, User.id == TestSession.user_id)
+        .where(and_(TestSession.status == "completed", TestSession.completed_at >= now - timedelta(hours=24)))
+        .order_by(desc(TestSession.completed_at)).limit(5)
+    )).all()
+    return high_risk, recent
+
+
+async def orm_feedback_stats(db: AsyncSession):
+    total = (await db.execute(select(func.count(Feedback.id)))).scalar()
+    pending = (await db.execute(select(func.count(Feedback.id)).where(Feedback.status == FeedbackStatus.PENDING))).scalar()
+    resolved = (await db.execute(select(func.count(Feedback.id)).where(Feedback.status == FeedbackStatus.RESOLVED))).scalar()
+    avg = (await db.execute(select(func.avg(Feedback.rating)).where(Feedback.rating.isnot(None)))).scalar()
+    breakdown = (await db.execute(select(Feedback.category, func.count(Feedback.id)).group_by(Feedback.category))).all()
+    return total, pending, resolved, avg, breakdown
+
+
+# ============== CORE PATH ==============
+
+async def core_doctor_dashboard(db: AsyncSession):
+    return (
+        await queries.fetch_doctor_dashboard_counts(db),
+        await queries.fetch_recent_patients(db),
+        await queries.fetch_completed_sessions(db),
+    )
+
+
+async def core_alerts(db: AsyncSession):
+    now = datetime.utcnow()
+    return (
+        await queries.fetch_high_risk_patients(db, since=now - timedelta(days=7)),
+        await queries.fetch_completed_sessions(db, since=now - timedelta(hours=24)),
+    )
+
+
+# ============== HARNESS ==============
+
+async def _seed(session_factory, users: int):
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    async with session_factory() as db:
+        await db.execute(insert(User), [
+            {
+                "id": i, "email": f"user{i}@bench.local", "password_hash": "!",
+                "first_name": "User", "last_name": str(i),
+                "ad_risk_score": rng.uniform(0, 100), "pd_risk_score": rng.uniform(0, 100),
+                "cognitive_score": rng.uniform(0, 100), "updated_at": now - timedelta(days=rng.uniform(0, 14)),
+            }
+            for i in range(1, users + 1)
+        ])
+        await db.execute(insert(TestSession), [
+            {
+                "user_id": rng.randint(1, users), "category": rng.choice(CATEGORIES),
+                "status": rng.choice(["completed", "completed", "completed", "created"]),
+                "completed_at": now - timedelta(hours=rng.uniform(0, 24 * 30)),
+            }
+            for _ in range(users * 10)
+        ])
+        await db.execute(insert(Feedback), [
+            {
+                "user_id": rng.randint(1, users), "message": "benchmark",
+                "category": rng.choice(list(FeedbackCategory)), "status": rng.choice(list(FeedbackStatus)),
+                "rating": rng.choice([None, 1, 2, 3, 4, 5]),
+            }
+            for _ in range(users)
+        ])
+        await db.commit()
+
+
+async def _time(session_factory, fn, repeat: int) -> float:
+    async with session_factory() as db:
+        await fn(db)  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            await fn(db)
+            db.expunge_all()
+        return (time.perf_counter() - start) / repeat * 1000
+
+
+async def run(users: int, repeat: int):
+    path = os.path.join(tempfile.mkdtemp(), "hot_reads.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await _seed(session_factory, users)
+
+    cases = [
+        ("/tests/dashboard", lambda db: orm_test_dashboard(db, 1), lambda db: queries.fetch_test_dashboard(db, 1)),
+        ("/doctors/dashboard", orm_doctor_dashboard, core_doctor_dashboard),
+        ("/doctors/alerts", orm_alerts, core_alerts),
+        ("/feedback/admin/stats", orm_feedback_stats, queries.fetch_feedback_stats),
+    ]
+
+    print(f"{users} users, {users * 10} sessions, {users} feedback rows; mean of {repeat} runs")
+    print(f"{'read':<24} {'orm ms':>8} {'core ms':>8} {'speedup':>8}")
+    for label, orm_fn, core_fn in cases:
+        orm_ms = await _time(session_factory, orm_fn, repeat)
+        core_ms = await _time(session_factory, core_fn, repeat)
+        print(f"{label:<24} {orm_ms:>8.2f} {core_ms:>8.2f} {orm_ms / core_ms:>7.1f}x")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.repeat))
@@ -0,0 +1,125 @@
+"""
+CompressedJSON benchmark
+Measures stored size and encode/decode latency of CompressedJSON against the
+plain JSON column type on a synthetic mix of test item payloads, and checks
+that legacy plain-JSON rows still read back.
+
+Usage (from neuroverse-backend/):
+    python -m benchmarks.json_compression [--items 300]
+
+Needs the Development requirements (aiosqlite) plus orjson and zstandard.
+
+Reference run (300 payloads, 1 in 4 of each kind):
+                           plain JSON  CompressedJSON
+    stored MB                   19.62            4.67
+    encode us/item               2827             632
+    decode us/item               1212             599
+    sqlite insert / select  1025/530 ms     220/461 ms
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import JSON, Column, Integer, LargeBinary, MetaData, Table, insert, select, type_coerce
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.types import CompressedJSON
+
+metadata = MetaData()
+plain = Table("plain_items", metadata, Column("id", Integer, primary_key=True), Column("raw_data", JSON))
+compressed = Table("compressed_items", metadata, Column("id", Integer, primary_key=True), Column("raw_data", CompressedJSON()))
+
+
+def synthetic_payloads(count: int, seed: int = 11) -> list:
+    """Roughly the production mix: gait IMU streams, spiral traces, tapping and small cognitive items."""
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:  # 30 s walk, 100 Hz accelerometer
+            payloads.append({"accelerometer": [
+                {"x": round(rng.gauss(0, 1), 4), "y": round(rng.gauss(0, 1), 4),
+                 "z": round(9.81 + rng.gauss(0, 1), 4), "timestamp": 1700000000000 + t * 10}
+                for t in range(3000)
+            ], "duration_s": 30})
+        elif kind == 1:  # spiral drawing
+            payloads.append({"coordinates": [
+                [round(rng.uniform(0, 400), 2), round(rng.uniform(0, 400), 2), t * 16]
+                for t in range(1500)
+            ], "pressure": [round(rng.random(), 3) for _ in range(1500)], "duration_ms": 24000})
+        elif kind == 2:  # finger tapping
+            payloads.append({"taps": [
+                {"timestamp": t * 180 + rng.randint(-20, 20), "x": rng.randint(100, 140), "y": rng.randint(500, 540)}
+                for t in range(120)
+            ], "duration_s": 20})
+        else:  # stroop
+            payloads.append({"correct": rng.randint(20, 30), "errors": rng.randint(0, 5),
+                             "reaction_times": [rng.randint(400, 1200) for _ in range(30)]})
+    return payloads
+
+
+def _time_per_item(fn, values) -> float:
+    start = time.perf_counter()
+    for value in values:
+        fn(value)
+    return (time.perf_counter() - start) / len(values) * 1e6
+
+
+async def run(items: int):
+    payloads = synthetic_payloads(items)
+    codec = CompressedJSON()
+
+    plain_bytes = [json.dumps(p).encode() for p in payloads]
+    stored_bytes = [codec.process_bind_param(p, None) for p in payloads]
+
+    print(f"{items} payloads")
+    print(f"{'':<22} {'plain JSON':>12} {'CompressedJSON':>15}")
+    print(f"{'stored MB':<22} {sum(map(len, plain_bytes)) / 1e6:>12.2f} {sum(map(len, stored_bytes)) / 1e6:>15.2f}")
+    print(f"{'encode us/item':<22} {_time_per_item(json.dumps, payloads):>12.0f} "
+          f"{_time_per_item(lambda p: codec.process_bind_param(p, None), payloads):>15.0f}")
+    print(f"{'decode us/item':<22} {_time_per_item(json.loads, plain_bytes):>12.0f} "
+          f"{_time_per_item(lambda b: codec.process_result_value(b, None), stored_bytes):>15.0f}")
+
+    # End to end through SQLite
+    workdir = tempfile.mkdtemp()
+    for table in (plain, compressed):
+        path = os.path.join(workdir, f"{table.name}.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all, tables=[table])
+        start = time.perf_counter()
+        async with engine.begin() as conn:
+            await conn.execute(insert(table), [{"id": i, "raw_data": p} for i, p in enumerate(payloads)])
+        write_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        async with engine.connect() as conn:
+            rows = (await conn.execute(select(table.c.raw_data))).scalars().all()
+        read_ms = (time.perf_counter() - start) * 1000
+        await engine.dispose()
+        assert rows == payloads
+        print(f"sqlite {table.name:<16} file {os.path.getsize(path) / 1e6:6.2f} MB, "
+              f"insert {write_ms:7.0f} ms, select {read_ms:7.0f} ms")
+
+    # Legacy rows: plain JSON bytes in a CompressedJSON column
+    engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(workdir, 'legacy.db')}")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all, tables=[compressed])
+        await conn.execute(
+            insert(compressed).values(raw_data=type_coerce(plain_bytes[3], LargeBinary)).values(id=1)
+        )
+        legacy = (await conn.execute(select(compressed.c.raw_data))).scalar_one()
+    await engine.dispose()
+    assert legacy == payloads[3]
+    print("legacy plain-JSON row: read OK")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(run(args.items))
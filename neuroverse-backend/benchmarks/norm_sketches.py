@@ -0,0 +1,72 @@
+"""
+Population norm sketch accuracy check
+Feeds skewed and discrete synthetic feature distributions through the
+t-digest used for population norms (one value at a time, with a
+serialize/deserialize round trip every so often as completions do) and
+compares its percentile ranks with the exact ranks over all values.
+Also reports the stored size and lookup time.
+
+Usage (from neuroverse-backend/):
+    python -m benchmarks.norm_sketches [--values 200000]
+
+Exits non-zero if a percentile rank is off by more than 1 point.
+
+Reference run (200000 values):
+    gait_speed (normal): max rank error 0.34 pts, 734 bytes, 10.6 us/lookup
+    stroop_mean_rt (lognormal): max rank error 0.08 pts, 758 bytes, 4.5 us/lookup
+    fluency_word_count (discrete): max rank error 0.00 pts, 794 bytes, 5.8 us/lookup
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.utils.tdigest import TDigest
+
+MAX_RANK_ERROR = 1.0  # percentile points
+ROUND_TRIP_EVERY = 1000
+
+
+def distributions(n: int) -> dict:
+    rng = np.random.default_rng(3)
+    return {
+        "gait_speed (normal)": rng.normal(1.0, 0.2, n),
+        "stroop_mean_rt (lognormal)": rng.lognormal(6.5, 0.4, n),
+        "fluency_word_count (discrete)": rng.poisson(16, n).astype(float),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--values", type=int, default=200000)
+    args = parser.parse_args()
+
+    failed = False
+    for name, values in distributions(args.values).items():
+        digest = TDigest()
+        for i, value in enumerate(values.tolist(), 1):
+            digest.add(value)
+            if i % ROUND_TRIP_EVERY == 0:
+                digest = TDigest.from_bytes(digest.to_bytes())
+        stored = digest.to_bytes()
+        digest = TDigest.from_bytes(stored)
+
+        ordered = np.sort(values)
+        probes = np.quantile(values, np.linspace(0.001, 0.999, 199))
+        exact = 100 * np.searchsorted(ordered, probes, side="right") / len(values)
+        started = time.perf_counter()
+        estimated = np.array([digest.percentile_rank(probe) for probe in probes])
+        lookup_us = (time.perf_counter() - started) / len(probes) * 1e6
+
+        # Discrete values: any rank between "< v" and "<= v" is right
+        below = 100 * np.searchsorted(ordered, probes, side="left") / len(values)
+        error = np.maximum(0, np.maximum(below - estimated, estimated - exact)).max()
+        failed |= error > MAX_RANK_ERROR
+        print(f"{name}: max rank error {error:.2f} pts, {len(stored)} bytes, {lookup_us:.1f} us/lookup")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Round-trip benchmark
+Counts SQL statements, commits and connections per endpoint by driving the
+app in-process against a throwaway SQLite database.
+
+Usage (from neuroverse-backend/):
+    python -m benchmarks.round_trips
+
+Needs the Development requirements (httpx, aiosqlite).
+
+Before/after removing post-commit refresh() (statements / commits):
+    POST /tests                   3 / 2  ->  2 / 1
+    POST /tests/{id}/start        3 / 2  ->  2 / 1
+    POST /tests/{id}/items        3 / 2  ->  2 / 1
+    POST /tests/{id}/items/batch 21 / 2  -> 11 / 1
+    POST /tests/{id}/complete     7 / 2  ->  6 / 1
+    POST /wellness/data           3 / 2  ->  2 / 1
+    PATCH /users/me               3 / 2  ->  2 / 1
+    POST /reports                 9 / 3  ->  7 / 2   (second commit closes get_report's reads)
+"""
+
+import asyncio
+import os
+import tempfile
+from collections import Counter
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.security import get_current_user_id
+from app.db import database
+from app.main import app
+from app.models.user import User
+
+USER_ID = 1
+
+
+class RoundTripCounter:
+    """Listens on an engine and tallies what goes over the wire."""
+
+    def __init__(self, engine):
+        self.counts = Counter()
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._on_execute)
+        event.listen(sync_engine, "commit", lambda conn: self.counts.update(["commits"]))
+        event.listen(sync_engine, "connect", lambda dbapi_conn, record: self.counts.update(["connects"]))
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.counts["statements"] += 1
+        verb = statement.lstrip().split(" ", 1)[0].upper()
+        self.counts[verb.lower()] += 1
+
+    def snapshot(self) -> Counter:
+        counts, self.counts = self.counts, Counter()
+        return counts
+
+
+async def _seed(session_factory):
+    async with session_factory() as db:
+        db.add(User(
+            id=USER_ID,
+            email="bench@neuroverse.local",
+            password_hash="!",
+            first_name="Bench",
+            last_name="Mark",
+            is_verified=True,
+        ))
+        await db.commit()
+
+
+async def run():
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "round_trips.db")
+    settings.UPLOAD_DIR = workdir
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False, autoflush=False,
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(database.Base.metadata.create_all)
+    await _seed(session_factory)
+
+    # get_db resolves AsyncSessionLocal at call time, so the real dependency
+    # (and its trailing commit) is exercised against the SQLite engine
+    database.AsyncSessionLocal = session_factory
+    app.dependency_overrides[get_current_user_id] = lambda: USER_ID
+    counter = RoundTripCounter(engine)
+
+    item = {
+        "item_name": "stroop",
+        "item_type": "cognitive",
+        "raw_data": {"trials": [{"correct": True, "reaction_time": 650}] * 20},
+    }
+    results = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def call(label, method, url, **kwargs):
+            counter.snapshot()
+            response = await client.request(method, url, **kwargs)
+            results.append((label, response.status_code, counter.snapshot()))
+            return response
+
+        session = (await call("POST /tests", "POST", "/api/v1/tests/", json={"category": "cognitive"})).json()
+        sid = session["id"]
+        await call("POST /tests/{id}/start", "POST", f"/api/v1/tests/{sid}/start")
+        await call("POST /tests/{id}/items", "POST", f"/api/v1/tests/{sid}/items", json=item)
+        await call("POST /tests/{id}/items/batch", "POST", f"/api/v1/tests/{sid}/items/batch",
+                   json={"items": [dict(item, item_name=f"stroop_{i}") for i in range(10)]})
+        await call("POST /tests/{id}/complete", "POST", f"/api/v1/tests/{sid}/complete")
+        await call("POST /wellness/data", "POST", "/api/v1/wellness/data",
+                   json={"sleep_hours": 7.5, "stress_level": 3})
+        await call("PATCH /users/me", "PATCH", "/api/v1/users/me", json={"phone": "+10000000000"})
+        await call("POST /reports", "POST", "/api/v1/reports/", json={})
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+    print(f"{'endpoint':<30} {'status':>6} {'stmts':>6} {'insert':>6} {'select':>6} {'update':>6} {'commits':>7}")
+    for label, status_code, c in results:
+        print(
+            f"{label:<30} {status_code:>6} {c['statements']:>6} {c['insert']:>6} "
+            f"{c['select']:>6} {c['update']:>6} {c['commits']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
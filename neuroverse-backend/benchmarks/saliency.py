@@ -0,0 +1,92 @@
+"""
+Spiral saliency check
+Draws synthetic Archimedean spirals (random centre, pitch, rotation and
+small hand noise), injects a tremor burst into one random stretch of each
+trace, and checks that spiral_saliency's top highlight covers the burst:
+its time span must overlap the burst's. Times the generator per trace, in
+both the legacy {x, y, timestamp_ms} record shape and binary channels.
+
+Usage (from neuroverse-backend/):
+    python -m benchmarks.saliency [--traces 200] [--points 1500]
+
+Exits non-zero if fewer than 95% of top highlights land on the burst.
+
+Reference run (200 traces, 1500 points):
+    top highlight on the tremor burst: 200/200 (100.0%)
+    records  6.71 ms/trace
+    channels 5.84 ms/trace
+"""
+
+import argparse
+import base64
+import sys
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+from app.ml.extractors.base_extractor import CHANNELS_KEY
+from app.ml.xai.saliency_generator import spiral_saliency
+
+MIN_HIT_RATE = 0.95
+BURST_MS = 1500  # Length of the injected tremor
+
+
+def synthetic(n: int, rng: np.random.Generator) -> Tuple[Dict, Tuple[float, float]]:
+    """A spiral trace (as records) and the (start, end) ms of its tremor burst."""
+    theta = np.linspace(0, rng.uniform(4, 7) * np.pi, n)
+    radius = rng.uniform(0, 10) + rng.uniform(6, 12) * theta
+    radius += rng.normal(0, 0.4, n)  # Steady hand noise
+    t = np.arange(n) * 20.0
+
+    start = rng.uniform(0.2, 0.9) * t[-1] - BURST_MS / 2
+    burst = (t >= start) & (t < start + BURST_MS)
+    radius[burst] += rng.uniform(3, 6) * np.sin(2 * np.pi * 5 * t[burst] / 1000)  # 5 Hz tremor
+
+    angle = theta + rng.uniform(0, 2 * np.pi)
+    x = rng.uniform(200, 400) + radius * np.cos(angle)
+    y = rng.uniform(200, 400) + radius * np.sin(angle)
+    records = [{"x": float(a), "y": float(b), "timestamp_ms": float(c)} for a, b, c in zip(x, y, t)]
+    return {"coordinates": records, "duration_ms": float(t[-1])}, (start, start + BURST_MS)
+
+
+def as_channels(raw: Dict) -> Dict:
+    """The same trace as binary float32/float64 channels."""
+    channels = {}
+    for field, dtype in (("x", "<f4"), ("y", "<f4"), ("timestamp_ms", "<f8")):
+        values = np.array([r[field] for r in raw["coordinates"]], dtype=dtype)
+        channels[f"coordinates.{field}"] = {"dtype": dtype, "data": base64.b64encode(values.tobytes()).decode()}
+    return {CHANNELS_KEY: channels, "duration_ms": raw["duration_ms"]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--traces", type=int, default=200)
+    parser.add_argument("--points", type=int, default=1500)
+    args = parser.parse_args()
+    rng = np.random.default_rng(7)
+
+    traces = [synthetic(args.points, rng) for _ in range(args.traces)]
+    binary = [as_channels(raw) for raw, _ in traces]
+
+    hits = 0
+    started = time.perf_counter()
+    for raw, (start, end) in traces:
+        top = spiral_saliency(raw)["highlights"][0]
+        hits += top["start_ms"] < end and top["end_ms"] >= start
+    records_ms = (time.perf_counter() - started) * 1000 / len(traces)
+
+    started = time.perf_counter()
+    for raw in binary:
+        spiral_saliency(raw)
+    channels_ms = (time.perf_counter() - started) * 1000 / len(binary)
+
+    rate = hits / len(traces)
+    print(f"top highlight on the tremor burst: {hits}/{len(traces)} ({rate:.1%})")
+    print(f"records  {records_ms:.2f} ms/trace")
+    print(f"channels {channels_ms:.2f} ms/trace")
+    return 0 if rate >= MIN_HIT_RATE else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+SHAP explainer check
+Explains synthetic feature sets of every category with ShapExplainer and
+compares the attributions with the Shapley formula evaluated coalition by
+coalition, checks that each sample's attributions add up to its risk minus
+the expected risk, and times single and batched explanations. SHAP
+interaction values are checked the same way (pairs against the Shapley
+interaction index, rows against the SHAP values).
+
+Usage (from neuroverse-backend/):
+    python -m benchmarks.shap_explainer [--samples 500] [--background 32]
+
+Exits non-zero if an attribution or interaction is off by more than 1e-9
+risk points.
+
+Reference run (500 samples, 32 background rows):
+    cognitive  exact     brute-force err 3.0e-14, sum err 1.9e-13, interaction err 2.3e-14, 2.49 ms single, 3.38 ms/sample batched
+    speech     additive  brute-force err 1.8e-15, sum err 8.9e-16, interaction err 2.7e-15, 0.37 ms single, 0.02 ms/sample batched
+    motor      exact     brute-force err 2.8e-16, sum err 1.8e-15, interaction err 1.1e-16, 0.43 ms single, 0.25 ms/sample batched
+    gait       exact     brute-force err 3.1e-15, sum err 1.2e-14, interaction err 2.7e-15, 0.58 ms single, 0.54 ms/sample batched
+    facial     exact     brute-force err 8.9e-16, sum err 1.8e-15, interaction err 5.6e-17, 0.27 ms single, 0.05 ms/sample batched
+Cognitive (8 features) evaluates 256 coalitions x 32 background rows per sample.
+"""
+
+import argparse
+import itertools
+import math
+import sys
+import time
+
+import numpy as np
+
+from app.ml.fusion.batch_scoring import FEATURE_COLUMNS, risk_batch
+from app.ml.fusion.scoring_registry import get_scoring_registry
+from app.ml.xai.shap_explainer import ShapExplainer, reference_background, summarize_background
+
+MAX_ERROR = 1e-9
+BRUTE_FORCE_SAMPLES = 5
+
+
+def synthetic(category: str, n: int, rng: np.random.Generator, norms) -> np.ndarray:
+    """Healthy reference values scaled 0.3-1.4x, 10% of features absent."""
+    reference = reference_background(category, norms)[0]
+    rows = reference * rng.uniform(0.3, 1.4, (n, len(reference)))
+    rows[rng.random(rows.shape) < 0.1] = np.nan
+    return rows
+
+
+def brute_force(explainer: ShapExplainer, x: np.ndarray) -> np.ndarray:
+    """The Shapley formula, one coalition value at a time."""
+    m = len(explainer.features)
+
+    def value(coalition):
+        rows = explainer.background.copy()
+        rows[:, list(coalition)] = x[list(coalition)]
+        return explainer.weights @ risk_batch(explainer.category, rows, explainer.norms)
+
+    phi = np.zeros((m, 2))
+    for i in range(m):
+        others = [j for j in range(m) if j != i]
+        for size in range(m):
+            weight = math.factorial(size) * math.factorial(m - size - 1) / math.factorial(m)
+            for coalition in itertools.combinations(others, size):
+                phi[i] += weight * (value(coalition + (i,)) - value(coalition))
+    return phi
+
+
+def brute_force_interactions(explainer: ShapExplainer, x: np.ndarray) -> np.ndarray:
+    """Off-diagonal SHAP interaction values, one coalition value at a time."""
+    m = len(explainer.features)
+
+    def value(coalition):
+        rows = explainer.background.copy()
+        rows[:, list(coalition)] = x[list(coalition)]
+        return explainer.weights @ risk_batch(explainer.category, rows, explainer.norms)
+
+    phi = np.zeros((m, m, 2))
+    for i, j in itertools.permutations(range(m), 2):
+        others = [k for k in range(m) if k not in (i, j)]
+        for size in range(m - 1):
+            weight = math.factorial(size) * math.factorial(m - size - 2) / (2 * math.factorial(m - 1))
+            for s in itertools.combinations(others, size):
+                phi[i, j] += weight * (value(s + (i, j)) - value(s + (i,)) - value(s + (j,)) + value(s))
+    return phi
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--background", type=int, default=32)
+    args = parser.parse_args()
+    scoring = get_scoring_registry().current()
+    rng = np.random.default_rng(5)
+
+    failed = False
+    for category in FEATURE_COLUMNS:
+        background = summarize_background(synthetic(category, 2000, rng, scoring.norms), args.background)
+        explainer = ShapExplainer(category, scoring, *background)
+        samples = synthetic(category, args.samples, rng, scoring.norms)
+
+        started = time.perf_counter()
+        result = explainer.explain(samples)
+        batched = (time.perf_counter() - started) * 1000 / len(samples)
+
+        started = time.perf_counter()
+        for row in samples[:20]:
+            explainer.explain(row[None])
+        single = (time.perf_counter() - started) * 1000 / 20
+
+        exact_error = max(
+            np.abs(brute_force(explainer, samples[i]) - result.values[i]).max() for i in range(BRUTE_FORCE_SAMPLES)
+        )
+        total = risk_batch(category, samples, scoring.norms) - result.base_values
+        sum_error = np.abs(result.values.sum(axis=1) - total).max()
+
+        interactions = explainer.interactions(samples[:BRUTE_FORCE_SAMPLES])
+        off_diagonal = ~np.eye(len(explainer.features), dtype=bool)
+        interaction_error = max(
+            np.abs(brute_force_interactions(explainer, samples[i]) - interactions[i])[off_diagonal].max(initial=0)
+            for i in range(BRUTE_FORCE_SAMPLES)
+        )
+        interaction_error = max(
+            interaction_error, np.abs(interactions.sum(axis=2) - result.values[:BRUTE_FORCE_SAMPLES]).max()
+        )
+
+        print(f"{category:<10} {'additive' if explainer.additive else 'exact':<9} "
+              f"brute-force err {exact_error:.1e}, sum err {sum_error:.1e}, interaction err {interaction_error:.1e}, "
+              f"{single:.2f} ms single, {batched:.2f} ms/sample batched")
+        failed |= max(exact_error, sum_error, interaction_error) > MAX_ERROR
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+-- ============================================================
+-- 001: Monthly range partitioning for test_items
+-- ============================================================
+-- Converts test_items into a table partitioned by RANGE (created_at), one
+-- partition per calendar month, and adds the archival bookkeeping used by
+-- app/jobs/archive_test_items.py.
+--
+-- Partitions for upcoming months are created by that job
+-- (create_test_items_partition); the DEFAULT partition only catches rows
+-- that arrive before their month exists.
+--
+-- Run once, in a maintenance window:
+--     psql "$DATABASE_URL" -f migrations/001_partition_test_items.sql
+
+BEGIN;
+
+-- ---------- helper: create one month's partition ----------
+CREATE OR REPLACE FUNCTION create_test_items_partition(month_start date)
+RETURNS text
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    period_start date := date_trunc('month', month_start)::date;
+    period_end   date := (date_trunc('month', month_start) + interval '1 month')::date;
+    partition    text := format('test_items_%s', to_char(period_start, 'YYYY_MM'));
+BEGIN
+    IF to_regclass(partition) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF test_items FOR VALUES FROM (%L) TO (%L)',
+            partition, period_start, period_end
+        );
+    END IF;
+    RETURN partition;
+END;
+$$;
+
+-- ---------- swap in the partitioned table ----------
+ALTER TABLE test_items RENAME TO test_items_legacy;
+ALTER INDEX IF EXISTS test_items_pkey RENAME TO test_items_legacy_pkey;
+ALTER INDEX IF EXISTS ix_test_items_id RENAME TO ix_test_items_legacy_id;
+ALTER INDEX IF EXISTS ix_test_items_session_id RENAME TO ix_test_items_legacy_session_id;
+
+CREATE TABLE test_items (
+    id               integer NOT NULL DEFAULT nextval('test_items_id_seq'),
+    session_id       integer NOT NULL REFERENCES test_sessions (id),
+    item_name        varchar NOT NULL,
+    item_type        varchar,
+    raw_data         json,
+    raw_data_archive varchar,
+    raw_value        varchar,
+    processed_value  double precision,
+    started_at       timestamptz,
+    completed_at     timestamptz,
+    created_at       timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+ALTER SEQUENCE test_items_id_seq OWNED BY test_items.id;
+CREATE INDEX ix_test_items_id ON test_items (id);
+CREATE INDEX ix_test_items_session_id ON test_items (session_id);
+
+CREATE TABLE test_items_default PARTITION OF test_items DEFAULT;
+
+-- One partition per month that already has data, plus the next few months
+SELECT create_test_items_partition(month::date)
+FROM (
+    SELECT DISTINCT date_trunc('month', COALESCE(created_at, now())) AS month FROM test_items_legacy
+    UNION
+    SELECT date_trunc('month', now()) + make_interval(months => n) FROM generate_series(0, 2) AS n
+) months;
+
+INSERT INTO test_items (
+    id, session_id, item_name, item_type, raw_data, raw_value, processed_value,
+    started_at, completed_at, created_at
+)
+SELECT
+    id, session_id, item_name, item_type, raw_data, raw_value, processed_value,
+    started_at, completed_at, COALESCE(created_at, now())
+FROM test_items_legacy;
+
+DROP TABLE test_items_legacy;
+
+-- ---------- archive bookkeeping ----------
+CREATE TABLE IF NOT EXISTS test_item_archives (
+    id             serial PRIMARY KEY,
+    partition_name varchar NOT NULL UNIQUE,
+    period_start   timestamptz NOT NULL,
+    period_end     timestamptz NOT NULL,
+    location       varchar,
+    items_count    integer DEFAULT 0,
+    size_bytes     bigint DEFAULT 0,
+    archived_at    timestamptz DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_test_item_archives_id ON test_item_archives (id);
+
+COMMIT;
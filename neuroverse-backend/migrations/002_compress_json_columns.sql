@@ -0,0 +1,30 @@
+-- ============================================================
+-- 002: Store large JSON columns as bytea (CompressedJSON)
+-- ============================================================
+-- test_items.raw_data, test_results.extracted_features and
+-- test_results.xai_explanation become bytea holding UTF-8 JSON; the
+-- application (app/db/types.py) zstd-compresses new payloads above 1 KB and
+-- reads plain-JSON rows transparently.
+--
+-- Existing rows are converted as plain JSON here; compress them afterwards,
+-- in batches and without holding long locks:
+--     python -m app.jobs.compress_json_columns
+--
+--     psql "$DATABASE_URL" -f migrations/002_compress_json_columns.sql
+
+BEGIN;
+
+ALTER TABLE test_items
+    ALTER COLUMN raw_data TYPE bytea USING convert_to(raw_data::text, 'UTF8');
+
+ALTER TABLE test_results
+    ALTER COLUMN extracted_features TYPE bytea USING convert_to(extracted_features::text, 'UTF8'),
+    ALTER COLUMN xai_explanation TYPE bytea USING convert_to(xai_explanation::text, 'UTF8');
+
+-- Payloads are already compressed by the application; skip pglz/TOAST compression
+ALTER TABLE test_items ALTER COLUMN raw_data SET STORAGE EXTERNAL;
+ALTER TABLE test_results
+    ALTER COLUMN extracted_features SET STORAGE EXTERNAL,
+    ALTER COLUMN xai_explanation SET STORAGE EXTERNAL;
+
+COMMIT;
@@ -0,0 +1,42 @@
+-- ============================================================
+-- 003: Per-user latest category results and composite risk sums
+-- ============================================================
+-- Tables behind RiskAggregateService (app/models/user_risk.py). Each latest
+-- result stores the composite weights it was added to the sums with, so a
+-- replaced result is taken out exactly even after the weights changed.
+--
+-- Fill them from the existing test_results afterwards:
+--     python -m app.jobs.recompute_user_risk
+--
+--     psql "$DATABASE_URL" -f migrations/003_user_risk_tables.sql
+
+BEGIN;
+
+CREATE TABLE user_category_results (
+    id             serial PRIMARY KEY,
+    user_id        integer NOT NULL REFERENCES users (id),
+    category       varchar NOT NULL,
+    test_result_id integer REFERENCES test_results (id),
+    ad_risk        double precision,
+    pd_risk        double precision,
+    category_score double precision,
+    ad_weight      double precision NOT NULL,
+    pd_weight      double precision NOT NULL,
+    completed_at   timestamptz NOT NULL,
+    updated_at     timestamptz DEFAULT now(),
+    CONSTRAINT uq_user_category_results_user_category UNIQUE (user_id, category)
+);
+
+CREATE INDEX ix_user_category_results_id ON user_category_results (id);
+CREATE INDEX ix_user_category_results_user_id ON user_category_results (user_id);
+
+CREATE TABLE user_risk_sums (
+    user_id         integer PRIMARY KEY REFERENCES users (id),
+    ad_weighted_sum double precision,
+    pd_weighted_sum double precision,
+    ad_weight_total double precision,
+    pd_weight_total double precision,
+    updated_at      timestamptz DEFAULT now()
+);
+
+COMMIT;
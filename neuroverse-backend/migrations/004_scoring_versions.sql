@@ -0,0 +1,50 @@
+-- ============================================================
+-- 004: Versioned scoring norms/weights and batch re-scoring
+-- ============================================================
+-- scoring_versions holds the clinical norms, risk scales and fusion weights
+-- (app/ml/fusion/scoring_registry.py); test_results.scoring_version records
+-- the version each result was scored with. rescore_checkpoints tracks the
+-- shards of app/jobs/rescore_results.py runs.
+--
+-- Existing results keep scoring_version NULL (scored before versioning);
+-- re-score them with the active version to stamp it:
+--     python -m app.jobs.rescore_results
+--
+--     psql "$DATABASE_URL" -f migrations/004_scoring_versions.sql
+
+BEGIN;
+
+CREATE TABLE scoring_versions (
+    id           serial PRIMARY KEY,
+    version      varchar(64) NOT NULL UNIQUE,
+    config       json NOT NULL,
+    description  varchar,
+    is_active    boolean DEFAULT false,
+    created_at   timestamptz DEFAULT now(),
+    activated_at timestamptz
+);
+
+CREATE INDEX ix_scoring_versions_id ON scoring_versions (id);
+CREATE INDEX ix_scoring_versions_is_active ON scoring_versions (is_active);
+
+ALTER TABLE test_results ADD COLUMN scoring_version varchar(64);
+CREATE INDEX ix_test_results_scoring_version ON test_results (scoring_version);
+
+CREATE TABLE rescore_checkpoints (
+    id              serial PRIMARY KEY,
+    run             varchar(64) NOT NULL,
+    scoring_version varchar(64) NOT NULL,
+    first_id        integer NOT NULL,
+    last_id         integer NOT NULL,
+    done_through_id integer NOT NULL,
+    rows_scored     integer,
+    rows_changed    integer,
+    finished_at     timestamptz,
+    updated_at      timestamptz DEFAULT now(),
+    CONSTRAINT uq_rescore_checkpoints_run_first_id UNIQUE (run, first_id)
+);
+
+CREATE INDEX ix_rescore_checkpoints_id ON rescore_checkpoints (id);
+CREATE INDEX ix_rescore_checkpoints_run ON rescore_checkpoints (run);
+
+COMMIT;
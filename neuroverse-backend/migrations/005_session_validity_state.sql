@@ -0,0 +1,15 @@
+-- ============================================================
+-- 005: Running validity counters on test sessions
+-- ============================================================
+-- test_sessions.validity_state holds SessionValidityTracker's counters,
+-- updated as items are added (app/services/fusion_service.py). Sessions
+-- opened before this migration start with NULL counters and are tracked
+-- from their next item on; completion still runs the full validity check.
+--
+--     psql "$DATABASE_URL" -f migrations/005_session_validity_state.sql
+
+BEGIN;
+
+ALTER TABLE test_sessions ADD COLUMN validity_state json;
+
+COMMIT;
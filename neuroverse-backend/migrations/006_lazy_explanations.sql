@@ -0,0 +1,28 @@
+-- ============================================================
+-- 006: Versioned lazy XAI explanations and spiral saliency maps
+-- ============================================================
+-- test_results.xai_version tags each stored explanation with the explainer
+-- and scoring version it was generated for (app/services/explanation_service.py);
+-- explanations stored before this migration have NULL and are regenerated
+-- on their next read. item_saliency caches the saliency map of each explained
+-- spiral drawing item outside test_items, so it survives the item's payload
+-- being archived. test_items is partitioned (PK (id, created_at)), so
+-- item_id carries no foreign key.
+--
+--     psql "$DATABASE_URL" -f migrations/006_lazy_explanations.sql
+
+BEGIN;
+
+ALTER TABLE test_results ADD COLUMN xai_version varchar(64);
+
+CREATE TABLE item_saliency (
+    item_id    integer PRIMARY KEY,
+    session_id integer NOT NULL REFERENCES test_sessions (id),
+    version    varchar(32) NOT NULL,
+    data       json,
+    created_at timestamptz DEFAULT now()
+);
+
+CREATE INDEX ix_item_saliency_session_id ON item_saliency (session_id);
+
+COMMIT;
@@ -0,0 +1,61 @@
+"""
+Synthetic sensor recordings and helpers for online vs batch feature checks
+(tests/test_online_features.py, benchmarks/online_features.py).
+"""
+
+import base64
+
+import numpy as np
+
+TOLERANCE = 1e-9
+
+
+def synthetic_walk(seconds: int, rate: int = 100, seed: int = 5) -> dict:
+    rng = np.random.default_rng(seed)
+    t = np.arange(seconds * rate) * (1000 // rate) + 1_700_000_000_000
+    phase = 2 * np.pi * 1.8 * np.arange(len(t)) / rate  # ~108 steps/min
+    return {
+        "x": rng.normal(0, 0.4, len(t)),
+        "y": rng.normal(0, 0.4, len(t)),
+        "z": 9.81 + 2.5 * np.sin(phase) + rng.normal(0, 0.3, len(t)),
+        "timestamp": t,
+    }
+
+
+def synthetic_taps(seconds: int, seed: int = 6) -> dict:
+    rng = np.random.default_rng(seed)
+    intervals = np.linspace(180, 240, seconds * 5) + rng.normal(0, 15, seconds * 5)  # slowing down
+    return {"timestamp_ms": np.cumsum(np.round(intervals)).astype(np.int64)}
+
+
+def as_item(stream: str, columns: dict) -> dict:
+    """Stored item raw_data with the columns as inline binary channels."""
+    channels = {}
+    for field, values in columns.items():
+        dtype = "<i8" if values.dtype.kind == "i" else "<f8"
+        channels[f"{stream}.{field}"] = {"dtype": dtype, "data": base64.b64encode(values.astype(dtype).tobytes()).decode()}
+    return {"_channels": channels}
+
+
+def chunked(columns: dict, rng: np.random.Generator):
+    """The columns split at random points, 1 to 400 samples per chunk."""
+    n = len(next(iter(columns.values())))
+    start = 0
+    while start < n:
+        size = int(rng.integers(1, 400))
+        yield {field: values[start:start + size] for field, values in columns.items()}
+        start += size
+
+
+def stream_online(extractor_class, columns: dict, rng: np.random.Generator) -> dict:
+    """Features of the columns fed to a fresh online extractor in random chunks."""
+    extractor = extractor_class()
+    for chunk in chunked(columns, rng):
+        extractor.update(chunk)
+    return extractor.features()
+
+
+def matches(online: dict, batch: dict) -> bool:
+    return online.keys() == batch.keys() and all(
+        np.isclose(online[k], batch[k], rtol=TOLERANCE, atol=TOLERANCE) for k in batch
+    )
@@ -0,0 +1,48 @@
+"""
+Random feature sets for batch vs per-record scoring checks
+(tests/test_batch_scoring.py, benchmarks/batch_scoring.py).
+"""
+
+import numpy as np
+
+from app.ml.fusion.batch_scoring import matrix_columns
+from app.ml.fusion.scoring_registry import ScoringConfig
+
+VERSIONS = [
+    ScoringConfig("builtin", {}),
+    ScoringConfig("overridden", {
+        "norms": {"MOCA_NORMAL": 27, "TAPPING_NORMAL_MIN": 4.5, "GAIT_SPEED_SLOW": 0.85, "BLINK_PD_THRESHOLD": 11},
+        "scales": {"severity": [[10, "low"], [45, "mild"], [None, "severe"]]},
+    }),
+]
+
+# Values that sit on cutoffs used by the assessments (norms and literals)
+EDGES = [0, 0.1, 0.25, 0.3, 0.4, 0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 1, 2, 3, 4, 5, 6,
+         10, 12, 14, 15, 18, 20, 30, 40, 95, 100, 120, 180, 800, 1200]
+
+
+def random_features(category: str, rows: int, seed: int) -> list:
+    """Missing features, zeros, values on and around every cutoff and reaction-time lists."""
+    rng = np.random.default_rng(seed)
+    names = [name for name in matrix_columns(category) if name not in ("too_fast_responses", "too_slow_responses")]
+    features = []
+    for _ in range(rows):
+        row = {}
+        for name in names:
+            kind = rng.integers(7)
+            if kind <= 1:
+                continue  # missing
+            elif kind == 2:
+                row[name] = float(rng.choice(EDGES))
+            elif kind == 3:
+                row[name] = float(rng.uniform(0, 1.2))
+            elif kind == 4:
+                row[name] = float(rng.uniform(0, 40))
+            elif kind == 5:
+                row[name] = float(rng.uniform(0, 1500))
+            else:
+                row[name] = int(rng.integers(0, 25))
+        if rng.integers(3) == 0:
+            row["reaction_times"] = rng.uniform(50, 4000, rng.integers(0, 40)).tolist()
+        features.append(row)
+    return features
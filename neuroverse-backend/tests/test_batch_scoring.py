@@ -0,0 +1,33 @@
+"""
+Batch vs per-record scoring parity
+FusionService.score_batch (with ValidityDetector.assess_batch) must give
+every row the same risks, score, labels and validity as
+calculate_risk_scores on that row's dict.
+"""
+
+import pytest
+
+from app.ml.fusion.batch_scoring import FEATURE_COLUMNS
+from app.services.fusion_service import FusionService
+from tests.scoring_fixtures import VERSIONS, random_features
+
+FIELDS = ("ad_risk", "pd_risk", "category_score", "stage", "severity", "ad_stage", "pd_stage")
+ROWS = 1000
+
+
+@pytest.mark.parametrize("scoring", VERSIONS, ids=lambda scoring: scoring.version)
+@pytest.mark.parametrize("seed, category", list(enumerate(FEATURE_COLUMNS)))
+async def test_score_batch_matches_calculate_risk_scores(scoring, seed, category):
+    fusion = FusionService(scoring)
+    features = random_features(category, ROWS, seed)
+
+    scores = fusion.score_batch(category, fusion.features_matrix(category, features))
+
+    for i, row in enumerate(features):
+        expected = await fusion.calculate_risk_scores(category, row)
+        assert [scores[field][i] for field in FIELDS] == [expected[field] for field in FIELDS], row
+        assert (
+            scores["validity_status"][i], scores["validity_confidence"][i], scores["is_valid"][i]
+        ) == (
+            expected["validity"]["status"], expected["validity"]["confidence"], expected["validity"]["is_valid"]
+        ), row
@@ -0,0 +1,69 @@
+"""Blob store placement of finished files (resumable upload parts) and integrity checks."""
+
+import os
+
+import pytest
+
+from app.core.blob_store import BlobIntegrityError, BlobStore
+
+
+def corrupt(store: BlobStore, digest: str) -> None:
+    """Flip the first byte of a stored blob, keeping its size."""
+    with open(store.path(digest), "r+b") as f:
+        first = f.read(1)
+        f.seek(0)
+        f.write(bytes([first[0] ^ 0xFF]))
+
+
+def test_linked_file_stays_and_can_be_placed_again(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    part = os.path.join(store.tmp_dir, "part")
+    with open(part, "wb") as f:
+        f.write(b"\x01" * 4096)
+
+    first = store.put_file(part, link=True)
+    assert os.path.exists(part)
+    assert store.read(first.digest, first.size) == b"\x01" * 4096
+
+    # A retried finalize links the same part again
+    assert store.put_file(part, link=True) == first
+    os.unlink(part)
+    assert store.verify(first.digest)
+    assert os.listdir(store.tmp_dir) == []
+
+
+def test_put_file_moves_by_default(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    part = os.path.join(store.tmp_dir, "part")
+    with open(part, "wb") as f:
+        f.write(b"abc")
+
+    ref = store.put_file(part)
+    assert not os.path.exists(part)
+    assert store.read(ref.digest) == b"abc"
+
+
+def test_dedup_replaces_a_corrupt_copy_of_the_same_size(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    ref = store.put(b"payload" * 100)
+    corrupt(store, ref.digest)
+
+    assert store.put(b"payload" * 100) == ref
+    assert store.verify(ref.digest)
+    assert len(os.listdir(store.quarantine_dir)) == 1
+
+
+def test_first_read_quarantines_a_corrupt_blob(tmp_path):
+    root = str(tmp_path / "blobs")
+    ref = BlobStore(root).put(b"payload" * 100)
+
+    store = BlobStore(root)  # new process: nothing verified yet
+    corrupt(store, ref.digest)
+    with pytest.raises(BlobIntegrityError):
+        store.read(ref.digest, ref.size)
+    assert not store.exists(ref.digest)
+    assert len(os.listdir(store.quarantine_dir)) == 1
+
+    # A re-upload restores it
+    assert store.put(b"payload" * 100) == ref
+    assert store.read(ref.digest, ref.size) == b"payload" * 100
@@ -0,0 +1,28 @@
+"""
+Client item payloads cannot set server-side raw_data keys
+("_channels", "_attachments", "_features", "_fingerprint", "_saliency").
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.ml.extractors.base_extractor import CHANNELS_KEY, FEATURES_KEY
+from app.models import doctor_model, admin  # noqa: F401  (User relationships)
+from app.schemas.test_item import TestItemCreate
+from app.services.test_service import TestService
+
+
+@pytest.mark.parametrize("key", ["_features", "_fingerprint", "_channels", "_attachments", "_saliency"])
+def test_reserved_raw_data_keys_are_rejected(key):
+    with pytest.raises(ValidationError):
+        TestItemCreate(item_name="finger_tapping", raw_data={"hand": "left", key: {}})
+
+
+def test_build_item_keeps_only_server_keys():
+    data = TestItemCreate.model_construct(
+        item_name="finger_tapping", item_type=None, channels=None, raw_value=None, processed_value=None,
+        started_at=None, completed_at=None,
+        raw_data={"hand": "left", FEATURES_KEY: {"tapping_rate": 99.0}, CHANNELS_KEY: {"taps.x": {"blob": "x"}}},
+    )
+    item = TestService(db=None).build_item(1, data, features={"tapping_rate": 4.5})
+    assert item.raw_data == {"hand": "left", FEATURES_KEY: {"tapping_rate": 4.5}}
@@ -0,0 +1,61 @@
+"""
+Streamed item uploads (/items/stream): sensor streams become binary
+channels, every other raw_data list stays as sent.
+"""
+
+import json
+
+from app.ml.extractors.base_extractor import stream_columns
+from app.models import doctor_model, admin  # noqa: F401  (User relationships)
+from app.models.test_item import TestItem
+from app.services.ml_service import MLService
+from app.utils.json_stream import iter_items
+
+LIMIT = 10 * 1024 * 1024
+
+
+async def streamed(body: dict, chunk_size: int = 7) -> list:
+    data = json.dumps(body).encode()
+
+    async def chunks():
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+
+    return [item async for item in iter_items(chunks(), LIMIT, LIMIT, 10)]
+
+
+async def test_facial_smile_events_stay_json_and_score_the_same():
+    raw = {
+        "frames_analyzed": 900,
+        "duration_seconds": 30.0,
+        "blink_count": 8,
+        "blink_rate": 16.0,
+        "smile_events": [
+            {"start_ms": 1000, "end_ms": 1800, "intensity": 0.6},
+            {"start_ms": 5200, "end_ms": 6100, "intensity": 0.9},
+        ],
+    }
+    (item,) = await streamed({"item_name": "facial_analysis", "raw_data": raw})
+
+    assert item.channels() == {}
+    assert item.fields["raw_data"] == raw
+
+    service = MLService()
+    posted = await service.extract_features("facial", [TestItem(item_name="facial_analysis", raw_data=raw)])
+    uploaded = await service.extract_features(
+        "facial", [TestItem(item_name="facial_analysis", raw_data=item.fields["raw_data"])]
+    )
+    assert uploaded == posted
+    assert uploaded["smile_count"] == 2
+
+
+async def test_sensor_streams_become_channels():
+    taps = [{"timestamp_ms": 200 * i, "x": 10.5, "y": 20.0} for i in range(50)]
+    (item,) = await streamed({"items": [{"item_name": "finger_tapping", "raw_data": {"hand": "left", "taps": taps}}]})
+
+    assert item.fields["raw_data"] == {"hand": "left"}
+    channels = item.channels()
+    assert set(channels) == {"taps.timestamp_ms", "taps.x", "taps.y"}
+
+    raw = {"_channels": {name: {"dtype": dtype, "data": data} for name, (dtype, data) in channels.items()}}
+    assert stream_columns(raw, "taps", ["timestamp_ms"])["timestamp_ms"].tolist() == [t["timestamp_ms"] for t in taps]
@@ -0,0 +1,51 @@
+"""CompressedJSON encoding: orjson and the stdlib fallback store the same bytes."""
+
+import decimal
+import enum
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.db import types
+
+
+class Level(enum.Enum):
+    HIGH = "High"
+
+
+DOCUMENT = {
+    "risk": float("nan"),
+    "bounds": [float("inf"), -float("inf"), 0.30000000000000004],
+    3: "int key",
+    date(2025, 1, 2): "date key",
+    "matrix": np.array([[1.0, np.nan], [2.5, 3.0]]),
+    "f32": np.array([0.1, 0.2], dtype=np.float32),
+    "scalars": [np.float32(0.1), np.int64(3), np.bool_(True)],
+    "completed_at": datetime(2025, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+    "level": Level.HIGH,
+    "amount": decimal.Decimal("1.10"),
+    "text": ("é", None),
+}
+
+
+@pytest.mark.skipif(types.orjson is None, reason="orjson not installed")
+def test_stdlib_fallback_encodes_like_orjson(monkeypatch):
+    encoded = types.dumps_json(DOCUMENT)
+    monkeypatch.setattr(types, "orjson", None)
+    assert types.dumps_json(DOCUMENT) == encoded
+    assert types.loads_json(encoded)["risk"] is None
+
+
+def test_compressed_values_need_zstandard(monkeypatch):
+    if types.zstandard is None:
+        pytest.skip("zstandard not installed")
+    stored = types.encode({"samples": list(range(1000))}, threshold=0)
+    assert types.is_compressed(stored)
+
+    monkeypatch.setattr(types, "zstandard", None)
+    with pytest.raises(RuntimeError):
+        types.to_json_bytes(stored)
+    with pytest.raises(RuntimeError):
+        types.decode(stored)
+    assert types.to_json_bytes(b'{"a":1}') == b'{"a":1}'
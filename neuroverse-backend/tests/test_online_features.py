@@ -0,0 +1,62 @@
+"""
+Online vs batch feature parity
+Features computed online while a recording streams in (any chunking) must
+equal the batch extraction of the stored item, so /complete can use the
+live item's raw_data["_features"] as they are.
+"""
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.ml.extractors.base_extractor import CHANNELS_KEY
+from app.ml.extractors.gait_extractor import OnlineGaitExtractor, extract_walking_features
+from app.ml.extractors.motor_extractor import OnlineTappingExtractor, extract_tapping_features
+from app.services.live_stream_service import LiveItem
+from tests.online_fixtures import as_item, chunked, matches, stream_online, synthetic_taps, synthetic_walk
+
+CASES = [
+    (OnlineGaitExtractor, extract_walking_features, synthetic_walk(30)),
+    (OnlineTappingExtractor, extract_tapping_features, synthetic_taps(30)),
+]
+
+
+@pytest.mark.parametrize("extractor_class, batch_fn, columns", CASES)
+@pytest.mark.parametrize("seed", range(10))
+def test_random_chunkings_match_batch(extractor_class, batch_fn, columns, seed):
+    batch = batch_fn(as_item(extractor_class.stream, columns))
+    online = stream_online(extractor_class, columns, np.random.default_rng(seed))
+    assert batch
+    assert matches(online, batch), (online, batch)
+
+
+@pytest.mark.parametrize("extractor_class, batch_fn, columns", CASES)
+def test_single_sample_chunks_match_batch(extractor_class, batch_fn, columns):
+    columns = {field: values[:500] for field, values in columns.items()}
+    extractor = extractor_class()
+    for i in range(len(next(iter(columns.values())))):
+        extractor.update({field: values[i:i + 1] for field, values in columns.items()})
+    assert matches(extractor.features(), batch_fn(as_item(extractor_class.stream, columns)))
+
+
+@pytest.mark.parametrize("extractor_class, batch_fn, columns", CASES)
+@pytest.mark.parametrize("seed", range(3))
+def test_stored_live_item_reproduces_features(tmp_path, monkeypatch, extractor_class, batch_fn, columns, seed):
+    """Re-extracting from the channels a live item stored gives its online features, fractional ms included."""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    rng = np.random.default_rng(seed)
+    columns = {
+        field: values + rng.uniform(0, 1, len(values)) if field.startswith("timestamp") else values
+        for field, values in columns.items()
+    }
+
+    live = LiveItem(extractor_class())
+    for chunk in chunked(columns, rng):
+        live.add(None, {field: values.tolist() for field, values in chunk.items()})
+    refs = live.finish()
+
+    raw = {CHANNELS_KEY: {
+        name: {"dtype": dtype, "blob": refs[name].digest, "size": refs[name].size}
+        for name, dtype in live.dtypes.items()
+    }}
+    assert matches(live.extractor.features(), batch_fn(raw))